@@ -0,0 +1,72 @@
+"""Benchmark de memoria por partida de backgammon.
+
+Crea muchas partidas iniciadas a la vez y mide con tracemalloc cuántos
+bytes ocupa cada una en promedio, junto con el tamaño de las instancias
+del core. Se ejecuta desde la raíz del proyecto:
+
+    python -m benchmarks.memoria_partidas --partidas 10000
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from core.BackgammonGame import BackgammonGame
+from core.Checker import Checker
+from core.ColorFicha import ColorFicha
+
+
+def medir_partidas(cantidad):
+    """Medir los bytes promedio que ocupa una partida recién iniciada.
+
+    Args:
+        cantidad (int): Partidas a mantener vivas durante la medición
+
+    Returns:
+        float: Bytes por partida
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    partidas = []
+    for numero in range(cantidad):
+        partida = BackgammonGame(f"Blancas {numero}", f"Negras {numero}")
+        partida.start_game()
+        partidas.append(partida)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # La lista que guarda las partidas no es parte de su costo
+    return (actual - inicio - sys.getsizeof(partidas)) / cantidad
+
+
+def tamano_instancia(objeto):
+    """Obtener el tamaño de una instancia incluyendo su __dict__ si lo tiene."""
+    tamano = sys.getsizeof(objeto)
+    if hasattr(objeto, "__dict__"):
+        tamano += sys.getsizeof(objeto.__dict__)
+    return tamano
+
+
+def main():
+    """Ejecutar el benchmark e imprimir el resultado."""
+    parser = argparse.ArgumentParser(description="Memoria por partida de backgammon")
+    parser.add_argument("--partidas", type=int, default=10000,
+                        help="Cantidad de partidas simultáneas")
+    argumentos = parser.parse_args()
+
+    partida = BackgammonGame("Blancas", "Negras")
+    partida.start_game()
+    fichas = [partida.board.quitar_ficha(23), partida.board.quitar_ficha(23)]
+    print(f"Checker:        {tamano_instancia(Checker(ColorFicha.BLANCA))} bytes")
+    print(f"Fichas iguales comparten instancia: {fichas[0] is fichas[1]}")
+    print(f"Player:         {tamano_instancia(partida.current_player)} bytes")
+    print(f"Dice:           {tamano_instancia(partida.dice)} bytes")
+    print(f"Board:          {tamano_instancia(partida.board)} bytes")
+    print(f"BackgammonGame: {tamano_instancia(partida)} bytes")
+    bytes_por_partida = medir_partidas(argumentos.partidas)
+    print(f"Memoria por partida ({argumentos.partidas} partidas): "
+          f"{bytes_por_partida:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Módulo de interfaz de línea de comandos para Backgammon."""
 import os
 from core.BackgammonGame import BackgammonGame
-from core.MoveExecutor import MoveExecutor
+from core.MoveTables import MoveTables
 from core.ColorFicha import ColorFicha
 
 
@@ -11,7 +11,6 @@ class CLI:
     def __init__(self):
         """Inicializar CLI."""
         self.__game = None
-        self.__move_executor = MoveExecutor()
         self.__running = True
 
     def limpiar_pantalla(self):
@@ -78,6 +77,7 @@ class CLI:
         print("4. Finalizar turno")
         print("5. Rendirse")
         print("6. Volver al menú principal")
+        print("7. Deshacer movimiento")
         print("="*50)
 
         # Mostrar dados si están lanzados
@@ -109,6 +109,8 @@ class CLI:
             self.rendirse()
         elif opcion == "6":
             self.volver_menu_principal()
+        elif opcion == "7":
+            self.deshacer_movimiento()
         else:
             print("\nOpción inválida. Presione Enter para continuar...")
             input()
@@ -164,6 +166,8 @@ class CLI:
         # Mostrar contenedores
         print(f"\n Bar Blancas: {board.contar_fichas_contenedor(ColorFicha.BLANCA)}")
         print(f" Bar Negras:  {board.contar_fichas_contenedor(ColorFicha.NEGRA)}")
+        print(f"\n Pips Blancas: {board.pips_blancas}")
+        print(f" Pips Negras:  {board.pips_negras}")
 
         print("\n " + "-"*48)
 
@@ -191,6 +195,7 @@ class CLI:
 
             if self.__game.dice.is_double():
                 print(f"¡DOBLES! Puedes mover 4 veces el valor {dados[0]}")
+            self.__pasar_turno_si_bloqueado()
 
             input("\nPresione Enter para continuar...")
         except RuntimeError as e:
@@ -215,27 +220,49 @@ class CLI:
         print(f"Movimientos disponibles: {self.__game.dice.last_roll}")
 
         try:
-            from_point = int(input("\nPunto de origen (0-23): ").strip())
+            from_point = int(input(
+                f"\nPunto de origen (0-23, {MoveTables.ORIGEN_BARRA} = barra): ").strip())
             dice_value = int(input("Valor del dado a usar: ").strip())
 
-            self.__move_executor.execute_move(
-                self.__game.board,
-                self.__game.dice,
-                self.__game.current_player,
-                from_point,
-                dice_value
-            )
+            _, _, destino, golpe, victoria = self.__game.apply_move(from_point, dice_value)
 
-            print(f"\n¡Ficha movida exitosamente!")
+            if destino == MoveTables.FUERA:
+                print("\n¡Ficha sacada del tablero!")
+            elif golpe:
+                print(f"\n¡Captura! Ficha movida al punto {destino}")
+            else:
+                print(f"\n¡Ficha movida exitosamente!")
+            if victoria:
+                print(f"¡{self.__game.winner.nombre} ha sacado todas sus fichas!")
             print(f"Movimientos restantes: {self.__game.dice.get_moves_remaining()}")
+            self.__pasar_turno_si_bloqueado()
 
         except ValueError as e:
             print(f"\nError: {e}")
-        except (ValueError, RuntimeError) as e:
+        except RuntimeError as e:
             print(f"\nError inesperado: {e}")
 
         input("\nPresione Enter para continuar...")
 
+    def __pasar_turno_si_bloqueado(self):
+        """Pasar el turno si a los dados que quedan no les queda ningún movimiento."""
+        jugador = self.__game.current_player.nombre
+        if self.__game.pasar_turno_si_bloqueado():
+            print(f"\n{jugador} no tiene movimientos posibles: pierde el resto del turno. "
+                  f"Ahora juega {self.__game.current_player.nombre}")
+
+    def deshacer_movimiento(self):
+        """Deshacer el último movimiento del turno actual."""
+        try:
+            origen, dado, _, _, _ = self.__game.undo_move()
+            lugar = "la barra" if origen == MoveTables.ORIGEN_BARRA else f"el punto {origen}"
+            print(f"\nMovimiento deshecho: la ficha volvió a {lugar} y el dado {dado} "
+                  f"está disponible otra vez.")
+        except RuntimeError as e:
+            print(f"\nError: {e}")
+
+        input("\nPresione Enter para continuar...")
+
     def finalizar_turno(self):
         """Finalizar el turno actual."""
         if self.__game.dice.has_moves_available():
@@ -1,22 +1,32 @@
 """Módulo del juego principal de Backgammon."""
 from core.Board import Board
+from core.Checker import Checker
 from core.BoardInitializer import BoardInitializer
 from core.Dice import Dice
+from core.GnuId import GnuId
+from core.MoveGenerator import MoveGenerator
+from core.MoveTables import MoveTables
 from core.Player import Player
 from core.ColorFicha import ColorFicha
 
 
 class BackgammonGame:
     """Coordina el flujo del juego de backgammon."""
-    def __init__(self, player1_name: str, player2_name: str):
+    __slots__ = ("__board", "__dice", "__players", "__current_player_index", "__game_started",
+                 "__game_over", "__winner", "__fichas_fuera_blancas", "__fichas_fuera_negras",
+                 "__historial", "__fichas_por_color")
+
+    def __init__(self, player1_name: str, player2_name: str, roller=None):
         """Inicializar juego con dos jugadores.
         
         Args:
             player1_name (str): Nombre del jugador 1 (fichas blancas)
             player2_name (str): Nombre del jugador 2 (fichas negras)
+            roller (DiceRoller): Generador de tiradas de la partida; con uno
+                con semilla la partida se puede reproducir
         """
         self.__board = Board()
-        self.__dice = Dice()
+        self.__dice = Dice(roller)
         # Crear jugadores
         self.__players = [
             Player(player1_name, ColorFicha.BLANCA),
@@ -29,6 +39,10 @@ class BackgammonGame:
         # Contadores de bear off
         self.__fichas_fuera_blancas = 0
         self.__fichas_fuera_negras = 0
+        # Movimientos del turno en curso, para poder deshacerlos
+        self.__historial = []
+        # Fichas que hay que sacar para ganar, según la variante
+        self.__fichas_por_color = BoardInitializer.VARIANTES["estandar"]
 
     @property
     def board(self):
@@ -70,15 +84,26 @@ class BackgammonGame:
         """Obtener cantidad de fichas negras sacadas del tablero."""
         return self.__fichas_fuera_negras
 
-    def start_game(self):
-        """Iniciar el juego configurando el tablero."""
-        BoardInitializer.inicializar_estandar(self.__board)
+    @property
+    def fichas_por_color(self):
+        """Obtener la cantidad de fichas de cada color en la variante en juego."""
+        return self.__fichas_por_color
+
+    def start_game(self, variante="estandar"):
+        """Iniciar el juego configurando el tablero.
+
+        Args:
+            variante (str): Variante a jugar (ver BoardInitializer.VARIANTES)
+        """
+        BoardInitializer.inicializar(self.__board, variante)
+        self.__fichas_por_color = BoardInitializer.VARIANTES[variante]
         self.__game_started = True
         self.__game_over = False
         self.__winner = None
         self.__current_player_index = 0
         self.__fichas_fuera_blancas = 0
         self.__fichas_fuera_negras = 0
+        self.__historial = []
 
     def roll_dice(self):
         """Lanzar los dados para el turno actual.
@@ -108,7 +133,10 @@ class BackgammonGame:
             raise RuntimeError("El juego ya ha terminado")
 
         self.__dice.clear_roll()
+        self.__historial = []
         self.__current_player_index = 1 - self.__current_player_index
+        self.__board.alternar_turno()
+
     def set_winner(self, player):
         """Establecer el ganador y finalizar el juego.
         
@@ -119,16 +147,19 @@ class BackgammonGame:
             raise ValueError("El jugador no pertenece a esta partida")
         self.__winner = player
         self.__game_over = True
+
     def reset_game(self):
         """Reiniciar el juego a su estado inicial."""
         self.__board = Board()
-        self.__dice = Dice()
+        self.__dice = Dice(self.__dice.roller)
         self.__current_player_index = 0
         self.__game_started = False
         self.__game_over = False
         self.__winner = None
         self.__fichas_fuera_blancas = 0
         self.__fichas_fuera_negras = 0
+        self.__historial = []
+
     def puede_hacer_bear_off(self, color):
         """Verificar si un jugador puede hacer bear off (sacar fichas).
         
@@ -142,21 +173,8 @@ class BackgammonGame:
         Returns:
             bool: True si puede hacer bear off
         """
-        # No puede hacer bear off si tiene fichas en la barra
-        if self.__board.contar_fichas_contenedor(color) > 0:
-            return False
-        if color == ColorFicha.BLANCA:
-            home_range = range(0, 6)
-            outside_home_range = range(6, 24)
-        else:
-            home_range = range(18, 24)
-            outside_home_range = range(0, 18)
-        # Verificar que NO hay fichas fuera del home
-        for punto in outside_home_range:
-            fichas = self.__board.obtener_fichas(punto)
-            if fichas and fichas[0].color == color:
-                return False
-        return True
+        # Fichas en la barra o fuera del home bloquean el bear off
+        return self.__board.todas_en_casa(color)
 
     def bear_off_ficha(self, color):
         """Sacar una ficha del tablero (bear off).
@@ -169,12 +187,12 @@ class BackgammonGame:
         """
         if color == ColorFicha.BLANCA:
             self.__fichas_fuera_blancas += 1
-            if self.__fichas_fuera_blancas == 15:
+            if self.__fichas_fuera_blancas == self.__fichas_por_color:
                 self.set_winner(self.current_player)
                 return True
         else:
             self.__fichas_fuera_negras += 1
-            if self.__fichas_fuera_negras == 15:
+            if self.__fichas_fuera_negras == self.__fichas_por_color:
                 self.set_winner(self.current_player)
                 return True
 
@@ -195,31 +213,259 @@ class BackgammonGame:
         """Verificar si hay al menos un punto de entrada posible desde la barra."""
         if not self.tiene_fichas_en_barra(color):
             return True  # No hay fichas en barra, no aplica
-        dados = list(self.__dice.last_roll)
-        if color == ColorFicha.BLANCA:
-            # Blancas entran por 18-23
-            for dado in dados:
-                punto_entrada = 24 - dado
-                if 18 <= punto_entrada <= 23:
-                    fichas = self.__board.obtener_fichas(punto_entrada)
-                    # Puede entrar si: vacío, propias, o 1 enemiga
-                    if not fichas:
-                        return True
-                    if fichas[0].color == color:
-                        return True
-                    if len(fichas) == 1:
-                        return True
-        else:
-            # Negras entran por 0-5
-            for dado in dados:
-                punto_entrada = dado - 1
-                if 0 <= punto_entrada <= 5:
-                    fichas = self.__board.obtener_fichas(punto_entrada)
-                    # Puede entrar si: vacío, propias, o 1 enemiga
-                    if not fichas:
-                        return True
-                    if fichas[0].color == color:
-                        return True
-                    if len(fichas) == 1:
+        entradas = MoveTables.ENTRADAS[color]
+        signo = 1 if color == ColorFicha.BLANCA else -1
+        for dado in self.__dice.last_roll:
+            # Puede entrar si: vacío, propias, o 1 enemiga
+            if self.__board.valor_punto(entradas[dado]) * signo >= -1:
+                return True
+        return False
+
+    def tiene_movimientos_legales(self):
+        """Verificar si el jugador actual puede mover con los dados que le quedan.
+
+        Basta con que algún dado tenga un movimiento legal, así que no se
+        generan jugadas: se desplaza la máscara de puntos propios según cada
+        dado y se cruza con la de puntos que el rival tiene bloqueados, y el
+        bear off se decide con la ficha más atrasada.
+
+        Returns:
+            bool: False si no hay dados o ningún dado se puede usar
+        """
+        if not self.__game_started or self.__game_over:
+            return False
+        color = self.current_player.color
+        rivales = self.__board.mascara_bloqueos(self.other_player.color)
+        dados = set(self.__dice.last_roll)
+        if self.tiene_fichas_en_barra(color):
+            entradas = MoveTables.ENTRADAS[color]
+            return any(not rivales >> entradas[dado] & 1 for dado in dados)
+
+        propias = self.__board.mascara_puntos(color)
+        libres = ~rivales & ((1 << 24) - 1)
+        en_casa = self.__board.todas_en_casa(color)
+        blancas = color == ColorFicha.BLANCA
+        for dado in dados:
+            destinos = propias >> dado if blancas else propias << dado
+            if destinos & libres:
+                return True
+            if en_casa and propias:
+                if blancas:
+                    # Sale exacta desde el punto dado - 1 o con sobrante la más atrasada
+                    if propias >> (dado - 1) & 1 or propias.bit_length() < dado:
                         return True
+                elif propias >> (24 - dado) & 1 or (propias & -propias).bit_length() > 25 - dado:
+                    return True
         return False
+
+    def pasar_turno_si_bloqueado(self):
+        """Terminar el turno si quedan dados pero ninguno se puede usar.
+
+        Returns:
+            bool: True si el turno se pasó al otro jugador
+        """
+        if (not self.__game_started or self.__game_over
+                or not self.__dice.get_moves_remaining() or self.tiene_movimientos_legales()):
+            return False
+        self.end_turn()
+        return True
+
+    def jugadas_legales(self):
+        """Obtener las jugadas completas legales del jugador actual.
+
+        Returns:
+            list: Jugadas (tuplas de movimientos (origen, dado)) con los dados
+                que quedan disponibles
+        """
+        return MoveGenerator.generar_jugadas(self.__board, self.current_player.color,
+                                             self.__dice.last_roll)
+
+    def iterar_jugadas_legales(self):
+        """Generar de a una las jugadas legales del jugador actual.
+
+        Como ``jugadas_legales`` pero sin armar la lista: golpes y puntos
+        primero, y se puede cortar en la primera (por ejemplo para sugerir
+        una jugada o saber si hay alguna).
+
+        Returns:
+            Iterator[tuple]: Jugadas (tuplas de movimientos (origen, dado))
+        """
+        return (jugada for jugada, _ in MoveGenerator.iterar_jugadas(
+            self.__board.posicion, self.current_player.color, self.__dice.last_roll))
+
+    def obtener_position_id(self):
+        """Obtener el position ID de GNU Backgammon de la posición actual.
+
+        Returns:
+            str: Position ID de 14 caracteres desde el jugador en turno
+        """
+        return GnuId.desde_board(self.__board)
+
+    def obtener_match_id(self):
+        """Obtener el match ID de GNU Backgammon con el turno y los dados.
+
+        Returns:
+            str: Match ID de 12 caracteres
+        """
+        if self.__game_over:
+            estado = GnuId.ESTADO_TERMINADO
+        elif self.__game_started:
+            estado = GnuId.ESTADO_JUGANDO
+        else:
+            estado = GnuId.ESTADO_SIN_JUEGO
+        return GnuId.codificar_match(self.__current_player_index, estado,
+                                     self.__dice.last_raw_roll)
+
+    def __validar_movimiento(self, origen, dado):
+        """Verificar un movimiento de un dado del jugador actual.
+
+        Args:
+            origen (int): Punto de origen (0-23) o MoveTables.ORIGEN_BARRA
+            dado (int): Valor del dado a usar
+
+        Returns:
+            int: Punto de destino o MoveTables.FUERA si es un bear off
+
+        Raises:
+            RuntimeError: Si el juego no está en curso
+            ValueError: Si el movimiento no es legal
+        """
+        if not self.__game_started:
+            raise RuntimeError("El juego no ha comenzado")
+        if self.__game_over:
+            raise RuntimeError("El juego ya ha terminado")
+        if dado not in self.__dice.last_roll:
+            raise ValueError("El valor del dado no está disponible")
+
+        color = self.current_player.color
+        signo = 1 if color == ColorFicha.BLANCA else -1
+        en_barra = self.__board.contar_fichas_contenedor(color) > 0
+        if origen == MoveTables.ORIGEN_BARRA:
+            if not en_barra:
+                raise ValueError("No hay fichas tuyas en la barra")
+        else:
+            if not 0 <= origen <= 23:
+                raise ValueError("Punto de origen inválido")
+            if en_barra:
+                raise ValueError("Debes mover las fichas de la barra primero")
+            if self.__board.valor_punto(origen) * signo <= 0:
+                raise ValueError("No hay fichas tuyas en el punto de origen")
+
+        destino = MoveTables.DESTINOS[color][origen][dado]
+        if destino == MoveTables.FUERA:
+            if not self.__board.todas_en_casa(color):
+                raise ValueError("No puedes sacar fichas aún. Todas deben estar en tu home.")
+            if (MoveTables.BEAR_OFF[color][origen][dado] == MoveTables.SALIDA_CON_SOBRANTE
+                    and self.__hay_fichas_mas_atras(color, origen)):
+                raise ValueError("Hay fichas más atrás: debes usar el dado exacto")
+        elif self.__board.valor_punto(destino) * signo < -1:
+            raise ValueError("El punto destino está bloqueado por el oponente")
+        return destino
+
+    def __hay_fichas_mas_atras(self, color, origen):
+        """Verificar si hay fichas propias más lejos de la salida que el origen."""
+        mascara = self.__board.mascara_puntos(color)
+        if color == ColorFicha.BLANCA:
+            return (mascara >> (origen + 1)) != 0
+        return (mascara & ((1 << origen) - 1)) != 0
+
+    def es_movimiento_legal(self, origen, dado):
+        """Verificar si un movimiento de un dado es legal para el jugador actual.
+
+        Args:
+            origen (int): Punto de origen (0-23) o MoveTables.ORIGEN_BARRA
+            dado (int): Valor del dado a usar
+
+        Returns:
+            bool: True si el movimiento se puede aplicar
+        """
+        try:
+            self.__validar_movimiento(origen, dado)
+        except (ValueError, RuntimeError):
+            return False
+        return True
+
+    def apply_move(self, origen, dado):
+        """Aplicar un movimiento del jugador actual y guardarlo para deshacerlo.
+
+        Resuelve entradas desde la barra, golpes y bear off, y consume el dado.
+
+        Args:
+            origen (int): Punto de origen (0-23) o MoveTables.ORIGEN_BARRA
+            dado (int): Valor del dado a usar
+
+        Returns:
+            tuple: (origen, dado, destino, golpe, victoria); destino es
+                MoveTables.FUERA si la ficha salió del tablero
+
+        Raises:
+            RuntimeError: Si el juego no está en curso
+            ValueError: Si el movimiento no es legal
+        """
+        destino = self.__validar_movimiento(origen, dado)
+        color = self.current_player.color
+        if origen == MoveTables.ORIGEN_BARRA:
+            ficha = self.__board.quitar_ficha_contenedor(color)
+        else:
+            ficha = self.__board.quitar_ficha(origen)
+
+        golpe = False
+        victoria = False
+        if destino == MoveTables.FUERA:
+            victoria = self.bear_off_ficha(color)
+        else:
+            if self.__board.obtener_color_punto(destino) not in (None, color):
+                self.__board.agregar_ficha_contenedor(self.__board.quitar_ficha(destino))
+                golpe = True
+            self.__board.agregar_ficha(destino, ficha)
+        self.__dice.use_move(dado)
+
+        registro = (origen, dado, destino, golpe, victoria)
+        self.__historial.append(registro)
+        return registro
+
+    def undo_move(self):
+        """Deshacer el último movimiento aplicado en el turno actual.
+
+        Restaura el tablero, el dado consumido, los contadores de bear off
+        y, si el movimiento había ganado la partida, el estado del juego.
+
+        Returns:
+            tuple: El registro del movimiento deshecho
+
+        Raises:
+            RuntimeError: Si no hay movimientos para deshacer
+        """
+        if not self.__historial:
+            raise RuntimeError("No hay movimientos para deshacer")
+        origen, dado, destino, golpe, victoria = self.__historial[-1]
+        if self.__game_over and not victoria:
+            raise RuntimeError("El juego ya ha terminado")
+        registro = self.__historial.pop()
+
+        color = self.current_player.color
+        if destino == MoveTables.FUERA:
+            if color == ColorFicha.BLANCA:
+                self.__fichas_fuera_blancas -= 1
+            else:
+                self.__fichas_fuera_negras -= 1
+            if victoria:
+                self.__game_over = False
+                self.__winner = None
+            ficha = Checker(color)
+        else:
+            ficha = self.__board.quitar_ficha(destino)
+            if golpe:
+                rival = self.other_player.color
+                self.__board.agregar_ficha(destino, self.__board.quitar_ficha_contenedor(rival))
+
+        if origen == MoveTables.ORIGEN_BARRA:
+            self.__board.agregar_ficha_contenedor(ficha)
+        else:
+            self.__board.agregar_ficha(origen, ficha)
+        self.__dice.restore_move(dado)
+        return registro
+
+    def can_undo(self):
+        """Verificar si hay movimientos del turno actual para deshacer."""
+        return bool(self.__historial)
@@ -0,0 +1,437 @@
+"""Base de datos de bear off de un lado, precalculada y leída con mmap.
+
+Para cada distribución de hasta 15 fichas en los 6 puntos de la casa
+guarda la probabilidad de terminar de sacarlas en exactamente n tiradas
+jugando para minimizar la cantidad esperada de tiradas, y la de sacar la
+primera ficha en n tiradas (para los gammons). Se genera una vez:
+
+    python -m core.BaseBearOff --output bearoff1.bin
+
+y se abre con ``BaseBearOff(ruta)``, que mapea el archivo en memoria sin
+leerlo: cada consulta lee solo su fila.
+"""
+import argparse
+import mmap
+import struct
+from math import comb
+
+import numpy as np
+
+from core.ColorFicha import ColorFicha
+
+
+class BaseBearOff:
+    """Distribuciones de tiradas para terminar el bear off, sin contacto con el rival.
+
+    Una posición de un lado es la tupla de fichas en los puntos 0-5 vistos
+    desde su dueño (el punto 0 es el más cercano a salir). Las posiciones
+    se numeran con el sistema combinatorio: las fichas y los 6 separadores
+    entre puntos ocupan 21 lugares y el rango es el de la combinación de
+    lugares de los separadores, así que hay C(21, 6) = 54264 posiciones y
+    la posición vacía es la 0.
+
+    El archivo tiene una cabecera y dos matrices uint16 (probabilidad por
+    65535) de una fila por posición y ``largo`` columnas: tiradas para
+    terminar y tiradas para sacar la primera ficha. Se puede generar una
+    base reducida con menos fichas: como la numeración no depende del
+    máximo de fichas, sus rangos coinciden con los de la base completa.
+    """
+    __slots__ = ("__archivo", "__mapa", "__fichas", "__largo", "__terminar", "__primera")
+
+    PUNTOS = 6
+    FICHAS = 15
+    MAGICO = b"BGBOFF1\0"
+    CABECERA = struct.Struct("<8sHHHI")
+    ESCALA = 65535
+    MAX_TIRADAS = 64
+
+    def __init__(self, ruta):
+        """Abrir una base generada con ``generar``.
+
+        Args:
+            ruta (str): Ruta del archivo
+        """
+        self.__archivo = open(ruta, "rb")
+        try:
+            self.__mapa = mmap.mmap(self.__archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__archivo.close()
+            raise ValueError("El archivo de bear off está vacío") from None
+        try:
+            fichas, largo, cantidad = BaseBearOff.leer_cabecera(self.__mapa)
+        except ValueError:
+            self.__mapa.close()
+            self.__archivo.close()
+            raise
+        self.__fichas = fichas
+        self.__largo = largo
+        tamano = cantidad * largo
+        self.__terminar = np.frombuffer(self.__mapa, dtype="<u2", count=tamano,
+                                        offset=BaseBearOff.CABECERA.size).reshape(cantidad, largo)
+        self.__primera = np.frombuffer(self.__mapa, dtype="<u2", count=tamano,
+                                       offset=BaseBearOff.CABECERA.size + 2 * tamano
+                                       ).reshape(cantidad, largo)
+
+    @staticmethod
+    def leer_cabecera(datos):
+        """Validar la cabecera de una base y que el archivo tenga todos sus datos.
+
+        Args:
+            datos (bytes-like): Contenido del archivo
+
+        Returns:
+            tuple: (fichas, largo, cantidad)
+        """
+        if len(datos) < BaseBearOff.CABECERA.size:
+            raise ValueError("El archivo no es una base de bear off de un lado")
+        magico, puntos, fichas, largo, cantidad = BaseBearOff.CABECERA.unpack_from(datos)
+        if (magico != BaseBearOff.MAGICO or puntos != BaseBearOff.PUNTOS
+                or not 0 < fichas <= BaseBearOff.FICHAS
+                or cantidad != BaseBearOff.cantidad(fichas)
+                or len(datos) < BaseBearOff.CABECERA.size + 4 * cantidad * largo):
+            raise ValueError("El archivo no es una base de bear off de un lado")
+        return fichas, largo, cantidad
+
+    def cerrar(self):
+        """Liberar el mapa en memoria y el archivo."""
+        self.__terminar = None
+        self.__primera = None
+        self.__mapa.close()
+        self.__archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @staticmethod
+    def cantidad(fichas=FICHAS):
+        """Obtener la cantidad de posiciones de un lado con hasta ``fichas`` fichas."""
+        return comb(fichas + BaseBearOff.PUNTOS, BaseBearOff.PUNTOS)
+
+    @property
+    def fichas(self):
+        """Obtener el máximo de fichas de las posiciones de la base."""
+        return self.__fichas
+
+    @property
+    def largo(self):
+        """Obtener la cantidad de columnas (tiradas 0..largo-1) de cada distribución."""
+        return self.__largo
+
+    @staticmethod
+    def rango(puntos):
+        """Obtener el número de una posición de un lado.
+
+        Args:
+            puntos (Sequence[int]): Fichas en los puntos 0-5 (15 o menos)
+
+        Returns:
+            int: Rango entre 0 y cantidad() - 1
+        """
+        if len(puntos) != BaseBearOff.PUNTOS or min(puntos) < 0 \
+                or sum(puntos) > BaseBearOff.FICHAS:
+            raise ValueError("Posición de bear off inválida")
+        rango = 0
+        lugar = -1
+        for separador, fichas in enumerate(puntos):
+            lugar += fichas + 1
+            rango += comb(lugar, separador + 1)
+        return rango
+
+    @staticmethod
+    def desrango(rango):
+        """Obtener la posición de un lado con un número dado.
+
+        Args:
+            rango (int): Número entre 0 y cantidad() - 1
+
+        Returns:
+            tuple: Fichas en los puntos 0-5
+        """
+        if not 0 <= rango < BaseBearOff.cantidad():
+            raise ValueError("Rango de bear off fuera de límites")
+        lugares = []
+        lugar = BaseBearOff.FICHAS + BaseBearOff.PUNTOS - 1
+        for separador in range(BaseBearOff.PUNTOS, 0, -1):
+            while comb(lugar, separador) > rango:
+                lugar -= 1
+            rango -= comb(lugar, separador)
+            lugares.append(lugar)
+            lugar -= 1
+        lugares.reverse()
+        anterior = -1
+        puntos = []
+        for lugar in lugares:
+            puntos.append(lugar - anterior - 1)
+            anterior = lugar
+        return tuple(puntos)
+
+    @staticmethod
+    def puntos_de(posicion, color):
+        """Extraer la posición de un lado de un color si todas sus fichas están en casa.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color a extraer
+
+        Returns:
+            tuple: Fichas en sus puntos 0-5, o None si tiene fichas fuera de
+                casa o en la barra
+        """
+        if color == ColorFicha.BLANCA:
+            if posicion[24] > 0 or any(valor > 0 for valor in posicion[6:24]):
+                return None
+            return tuple(max(valor, 0) for valor in posicion[0:6])
+        if posicion[25] < 0 or any(valor < 0 for valor in posicion[0:18]):
+            return None
+        return tuple(max(-valor, 0) for valor in posicion[23:17:-1])
+
+    @staticmethod
+    def es_bear_off(posicion):
+        """Verificar si ambos colores tienen todas sus fichas en casa (sin contacto)."""
+        return (BaseBearOff.puntos_de(posicion, ColorFicha.BLANCA) is not None
+                and BaseBearOff.puntos_de(posicion, ColorFicha.NEGRA) is not None)
+
+    def contiene(self, puntos):
+        """Verificar si una posición de un lado está en la base."""
+        return sum(puntos) <= self.__fichas
+
+    def cubre(self, posicion):
+        """Verificar si una posición completa es de bear off y ambos lados están en la base."""
+        for color in (ColorFicha.BLANCA, ColorFicha.NEGRA):
+            puntos = BaseBearOff.puntos_de(posicion, color)
+            if puntos is None or not self.contiene(puntos):
+                return False
+        return True
+
+    def __fila(self, puntos):
+        """Obtener la fila de una posición, validando que esté en la base."""
+        if not self.contiene(puntos):
+            raise ValueError("La posición tiene más fichas que la base")
+        return BaseBearOff.rango(puntos)
+
+    def distribucion(self, puntos):
+        """Probabilidad de terminar en exactamente n tiradas, n = 0..largo-1.
+
+        Args:
+            puntos (Sequence[int]): Fichas en los puntos 0-5
+
+        Returns:
+            numpy.ndarray: Probabilidades en float64
+        """
+        return self.__terminar[self.__fila(puntos)] / BaseBearOff.ESCALA
+
+    def distribucion_gammon(self, puntos):
+        """Probabilidad de sacar la primera ficha en exactamente n tiradas.
+
+        Args:
+            puntos (Sequence[int]): Fichas en los puntos 0-5
+
+        Returns:
+            numpy.ndarray: Probabilidades en float64; con menos de 15 fichas
+                la primera ya salió y vale 1 en n = 0
+        """
+        return self.__primera[self.__fila(puntos)] / BaseBearOff.ESCALA
+
+    def media(self, puntos):
+        """Cantidad esperada de tiradas para terminar el bear off."""
+        distribucion = self.distribucion(puntos)
+        return float(distribucion @ np.arange(self.__largo))
+
+    def probabilidades(self, posicion, color_en_turno):
+        """Probabilidades de una carrera de bear off para el color que tira.
+
+        Se supone que las tiradas de ambos lados son independientes, lo que
+        es exacto sin contacto salvo por la estrategia, que minimiza las
+        tiradas esperadas en vez de maximizar la probabilidad de ganar.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color_en_turno (ColorFicha): Color que tira primero
+
+        Returns:
+            tuple: (gana, gana gammon, pierde gammon) para ``color_en_turno``
+        """
+        rival = ColorFicha.NEGRA if color_en_turno == ColorFicha.BLANCA else ColorFicha.BLANCA
+        propias = BaseBearOff.puntos_de(posicion, color_en_turno)
+        rivales = BaseBearOff.puntos_de(posicion, rival)
+        if propias is None or rivales is None:
+            raise ValueError("La posición no es de bear off para ambos colores")
+        termina = self.distribucion(propias)
+        termina_rival = self.distribucion(rivales)
+        # P(X >= n) a partir de la distribución de X
+        quedan = np.cumsum(termina[::-1])[::-1]
+        quedan_rival = np.cumsum(termina_rival[::-1])[::-1]
+        # Tirando primero se gana si se termina en n tiradas y el rival necesita n o más
+        gana = float(termina @ quedan_rival)
+        primera_rival = np.cumsum(self.distribucion_gammon(rivales)[::-1])[::-1]
+        primera_propia = np.cumsum(self.distribucion_gammon(propias)[::-1])[::-1]
+        gana_gammon = float(termina @ primera_rival)
+        # El rival termina en su tirada m y nosotros ya tiramos m veces sin sacar ninguna
+        pierde_gammon = float(termina_rival[:-1] @ primera_propia[1:])
+        return min(gana, 1.0), gana_gammon, pierde_gammon
+
+    def evaluar(self, posicion, color):
+        """Equidad sin cubo para ``color`` después de mover, con el rival por tirar.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            float: Equidad entre -2 y 2
+        """
+        rival = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+        gana, gana_gammon, pierde_gammon = self.probabilidades(posicion, rival)
+        return 1 - 2 * gana + pierde_gammon - gana_gammon
+
+    @staticmethod
+    def sucesores_un_dado(puntos, dado):
+        """Posiciones a las que se llega moviendo una ficha con un dado.
+
+        Args:
+            puntos (tuple): Fichas en los puntos 0-5
+            dado (int): Valor del dado
+
+        Returns:
+            set: Posiciones resultantes (la misma si ya no quedan fichas)
+        """
+        ocupados = [punto for punto in range(BaseBearOff.PUNTOS) if puntos[punto]]
+        if not ocupados:
+            return {puntos}
+        alto = ocupados[-1]
+        resultados = set()
+        for punto in ocupados:
+            destino = punto - dado
+            if destino < -1 and punto != alto:
+                continue
+            nuevo = list(puntos)
+            nuevo[punto] -= 1
+            if destino >= 0:
+                nuevo[destino] += 1
+            resultados.add(tuple(nuevo))
+        return resultados
+
+    @staticmethod
+    def __resolver(orden, sucesores, terminales, cantidad, largo):
+        """Programación dinámica de las distribuciones minimizando la media.
+
+        Args:
+            orden (list): Rangos a resolver, con sus sucesores antes que ellos
+            sucesores (list): Por dado (índice 1-6), tupla de rangos sucesores
+                de cada rango
+            terminales (Iterable[int]): Rangos que ya cumplieron el objetivo
+            cantidad (int): Cantidad de posiciones
+            largo (int): Columnas de la distribución
+
+        Returns:
+            numpy.ndarray: Distribuciones (cantidad, largo) en float64
+        """
+        distribuciones = np.zeros((cantidad, largo))
+        medias = np.zeros(cantidad)
+        # mejores[pasos][dado][rango]: posición final óptima moviendo ``pasos + 1`` veces ese dado
+        mejores = [[None] + [np.zeros(cantidad, dtype=np.int64) for _ in range(6)]
+                   for _ in range(4)]
+        for terminal in terminales:
+            distribuciones[terminal, 0] = 1
+            for pasos in range(4):
+                for dado in range(1, 7):
+                    mejores[pasos][dado][terminal] = terminal
+        clave = medias.__getitem__
+        tiradas = [(dado_1, dado_2) for dado_1 in range(1, 7) for dado_2 in range(dado_1, 7)]
+        probabilidades = np.array([(1 if dado_1 == dado_2 else 2) / 36
+                                   for dado_1, dado_2 in tiradas])
+        for rango in orden:
+            for dado in range(1, 7):
+                hijos = sucesores[dado][rango]
+                mejores[0][dado][rango] = min(hijos, key=clave)
+                for pasos in range(1, 4):
+                    anteriores = mejores[pasos - 1][dado]
+                    mejores[pasos][dado][rango] = min((anteriores[hijo] for hijo in hijos),
+                                                      key=clave)
+            finales = []
+            for dado_1, dado_2 in tiradas:
+                if dado_1 == dado_2:
+                    finales.append(mejores[3][dado_1][rango])
+                    continue
+                candidatas = [mejores[0][dado_2][hijo] for hijo in sucesores[dado_1][rango]]
+                candidatas += [mejores[0][dado_1][hijo] for hijo in sucesores[dado_2][rango]]
+                finales.append(min(candidatas, key=clave))
+            distribuciones[rango, 1:] = probabilidades @ distribuciones[finales, :-1]
+            medias[rango] = 1 + probabilidades @ medias[finales]
+        return distribuciones
+
+    @staticmethod
+    def calcular(fichas=FICHAS):
+        """Calcular las dos matrices de distribuciones de la base.
+
+        Args:
+            fichas (int): Máximo de fichas de las posiciones (1-15)
+
+        Returns:
+            tuple: (tiradas para terminar, tiradas para sacar la primera
+                ficha), matrices (posiciones, largo) en float64 con el largo
+                recortado a la última columna usada
+        """
+        if not 0 < fichas <= BaseBearOff.FICHAS:
+            raise ValueError("La base debe tener entre 1 y 15 fichas")
+        cantidad = BaseBearOff.cantidad(fichas)
+        posiciones = [BaseBearOff.desrango(rango) for rango in range(cantidad)]
+        sucesores = [None] + [
+            tuple(tuple(BaseBearOff.rango(hijo)
+                        for hijo in sorted(BaseBearOff.sucesores_un_dado(puntos, dado)))
+                  for puntos in posiciones)
+            for dado in range(1, 7)]
+        pips = [sum((punto + 1) * fichas for punto, fichas in enumerate(puntos))
+                for puntos in posiciones]
+        por_pips = sorted(range(1, cantidad), key=pips.__getitem__)
+
+        terminar = BaseBearOff.__resolver(por_pips, sucesores, [0], cantidad,
+                                          BaseBearOff.MAX_TIRADAS)
+        completas = [rango for rango in por_pips if sum(posiciones[rango]) == BaseBearOff.FICHAS]
+        primera_afuera = [rango for rango in range(cantidad)
+                          if sum(posiciones[rango]) < BaseBearOff.FICHAS]
+        primera = BaseBearOff.__resolver(completas, sucesores, primera_afuera, cantidad,
+                                         BaseBearOff.MAX_TIRADAS)
+        largo = int(np.flatnonzero(terminar.any(axis=0))[-1]) + 1
+        return terminar[:, :largo], primera[:, :largo]
+
+    @staticmethod
+    def generar(ruta, fichas=FICHAS):
+        """Calcular la base y guardarla en un archivo.
+
+        Args:
+            ruta (str): Ruta del archivo a crear
+            fichas (int): Máximo de fichas de las posiciones (1-15)
+
+        Returns:
+            int: Bytes escritos
+        """
+        terminar, primera = BaseBearOff.calcular(fichas)
+        cantidad, largo = terminar.shape
+        cabecera = BaseBearOff.CABECERA.pack(BaseBearOff.MAGICO, BaseBearOff.PUNTOS,
+                                             fichas, largo, cantidad)
+        with open(ruta, "wb") as archivo:
+            archivo.write(cabecera)
+            for matriz in (terminar, primera):
+                archivo.write(np.rint(matriz * BaseBearOff.ESCALA).astype("<u2").tobytes())
+        return len(cabecera) + 4 * cantidad * largo
+
+
+def main(argumentos=None):
+    """Generar la base de bear off de un lado desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera la base de bear off de un lado")
+    parser.add_argument("--output", default="bearoff1.bin", help="Archivo a crear")
+    parser.add_argument("--checkers", type=int, default=BaseBearOff.FICHAS,
+                        help="Máximo de fichas por posición")
+    opciones = parser.parse_args(argumentos)
+    tamano = BaseBearOff.generar(opciones.output, opciones.checkers)
+    print(f"{BaseBearOff.cantidad(opciones.checkers)} posiciones, {tamano} bytes en "
+          f"{opciones.output}")
+    return tamano
+
+
+if __name__ == "__main__":
+    main()
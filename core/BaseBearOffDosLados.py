@@ -0,0 +1,386 @@
+"""Base de datos de bear off de dos lados, exacta, generada por capas y leída con mmap.
+
+Para cada par de posiciones de bear off (la del color que tira y la del
+rival) con hasta ``fichas`` fichas por lado guarda la probabilidad exacta,
+sin cubo, de que gane el color que tira jugando ambos a maximizarla. Se
+genera con varios procesos y se puede interrumpir y continuar:
+
+    python -m core.BaseBearOffDosLados --checkers 6 --workers 4 --output bearoff2.bin
+
+Con 6 fichas por lado son 924 x 924 pares (1,7 MB); cada ficha más
+multiplica el tamaño por alrededor de 3, por lo que la base completa de
+15 fichas no es práctica y se elige un subconjunto.
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.BaseBearOff import BaseBearOff
+from core.ColorFicha import ColorFicha
+
+# Sucesores por tirada y pips de cada posición, calculados una vez por proceso y cantidad de fichas
+_TABLAS = {}
+
+
+class BaseBearOffDosLados:
+    """Probabilidades exactas de ganar carreras de bear off sin contacto.
+
+    El archivo tiene una cabecera y una matriz uint16 (probabilidad por
+    65535) cuadrada: la fila es el rango (BaseBearOff.rango) de la
+    posición del color que tira y la columna el del rival, así que el
+    índice de un par es ``fila * cantidad + columna`` y ambos colores por
+    tirar están en la base. Con hasta 14 fichas por lado los dos ya
+    sacaron alguna y no hay gammons: la equidad es exactamente ``2p - 1``.
+
+    Los pares se calculan por capas de pips totales, porque cada jugada
+    baja los pips del que mueve. Al terminar cada capa se anota en la
+    cabecera, de modo que una generación interrumpida continúa desde la
+    primera capa incompleta. Los procesos leen las capas anteriores y
+    escriben su parte de la capa actual directamente en el archivo.
+    """
+    __slots__ = ("__archivo", "__mapa", "__fichas", "__cantidad", "__ganar")
+
+    MAGICO = b"BGBOFF2\0"
+    # magico, puntos, fichas, cantidad, capas completas
+    CABECERA = struct.Struct("<8sHHII")
+    DATOS = 64
+    ESCALA = 65535
+    FICHAS = 6
+
+    def __init__(self, ruta):
+        """Abrir una base completa generada con ``generar``.
+
+        Args:
+            ruta (str): Ruta del archivo
+        """
+        self.__archivo = open(ruta, "rb")
+        try:
+            self.__mapa = mmap.mmap(self.__archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__archivo.close()
+            raise ValueError("El archivo de bear off está vacío") from None
+        try:
+            fichas, cantidad, capas = BaseBearOffDosLados.leer_cabecera(self.__mapa)
+            if capas < BaseBearOffDosLados.capas(fichas):
+                raise ValueError("La base de bear off está incompleta; continúe la generación")
+        except ValueError:
+            self.__mapa.close()
+            self.__archivo.close()
+            raise
+        self.__fichas = fichas
+        self.__cantidad = cantidad
+        self.__ganar = np.frombuffer(self.__mapa, dtype="<u2", count=cantidad * cantidad,
+                                     offset=BaseBearOffDosLados.DATOS).reshape(cantidad, cantidad)
+
+    def cerrar(self):
+        """Liberar el mapa en memoria y el archivo."""
+        self.__ganar = None
+        self.__mapa.close()
+        self.__archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def fichas(self):
+        """Obtener el máximo de fichas por lado de la base."""
+        return self.__fichas
+
+    @property
+    def cantidad(self):
+        """Obtener la cantidad de posiciones de un lado (filas y columnas)."""
+        return self.__cantidad
+
+    @staticmethod
+    def capas(fichas):
+        """Obtener la cantidad de capas de pips totales de una base."""
+        return 2 * BaseBearOff.PUNTOS * fichas + 1
+
+    @staticmethod
+    def leer_cabecera(datos):
+        """Validar la cabecera de una base y obtener sus datos.
+
+        Args:
+            datos (bytes-like): Contenido del archivo (al menos la cabecera)
+
+        Returns:
+            tuple: (fichas, cantidad, capas completas)
+        """
+        if len(datos) < BaseBearOffDosLados.DATOS:
+            raise ValueError("El archivo no es una base de bear off de dos lados")
+        magico, puntos, fichas, cantidad, capas = BaseBearOffDosLados.CABECERA.unpack_from(datos)
+        if (magico != BaseBearOffDosLados.MAGICO or puntos != BaseBearOff.PUNTOS
+                or not 0 < fichas <= BaseBearOff.FICHAS
+                or cantidad != BaseBearOff.cantidad(fichas)
+                or len(datos) < BaseBearOffDosLados.DATOS + 2 * cantidad * cantidad):
+            raise ValueError("El archivo no es una base de bear off de dos lados")
+        return fichas, cantidad, capas
+
+    def contiene(self, puntos):
+        """Verificar si una posición de un lado está en la base."""
+        return sum(puntos) <= self.__fichas
+
+    def cubre(self, posicion):
+        """Verificar si una posición completa es de bear off y ambos lados están en la base."""
+        for color in (ColorFicha.BLANCA, ColorFicha.NEGRA):
+            puntos = BaseBearOff.puntos_de(posicion, color)
+            if puntos is None or not self.contiene(puntos):
+                return False
+        return True
+
+    def probabilidad(self, propias, rivales):
+        """Probabilidad de ganar del color que tira.
+
+        Args:
+            propias (Sequence[int]): Fichas del que tira en sus puntos 0-5
+            rivales (Sequence[int]): Fichas del rival en sus puntos 0-5
+
+        Returns:
+            float: Probabilidad de ganar sin cubo
+        """
+        if not self.contiene(propias) or not self.contiene(rivales):
+            raise ValueError("La posición tiene más fichas que la base")
+        fila = BaseBearOff.rango(propias)
+        columna = BaseBearOff.rango(rivales)
+        return float(self.__ganar[fila, columna]) / BaseBearOffDosLados.ESCALA
+
+    def probabilidad_posicion(self, posicion, color_en_turno):
+        """Probabilidad de ganar de ``color_en_turno`` en una posición completa.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color_en_turno (ColorFicha): Color que tira primero
+
+        Returns:
+            float: Probabilidad de ganar sin cubo
+        """
+        rival = ColorFicha.NEGRA if color_en_turno == ColorFicha.BLANCA else ColorFicha.BLANCA
+        propias = BaseBearOff.puntos_de(posicion, color_en_turno)
+        rivales = BaseBearOff.puntos_de(posicion, rival)
+        if propias is None or rivales is None:
+            raise ValueError("La posición no es de bear off para ambos colores")
+        return self.probabilidad(propias, rivales)
+
+    def evaluar(self, posicion, color):
+        """Equidad sin cubo para ``color`` después de mover, con el rival por tirar.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            float: Equidad entre -1 y 1 (sin gammons)
+        """
+        rival = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+        return 1 - 2 * self.probabilidad_posicion(posicion, rival)
+
+    @staticmethod
+    def tablas(fichas):
+        """Posiciones a las que se llega con cada una de las 21 tiradas y pips de cada una.
+
+        Args:
+            fichas (int): Máximo de fichas de las posiciones
+
+        Returns:
+            tuple: (lista con, por tirada, la terna (probabilidad, rangos
+                finales concatenados de todas las posiciones, inicio de cada
+                posición con un extremo final), pips por rango)
+        """
+        if fichas in _TABLAS:
+            return _TABLAS[fichas]
+        cantidad = BaseBearOff.cantidad(fichas)
+        posiciones = [BaseBearOff.desrango(rango) for rango in range(cantidad)]
+        pips = np.array([sum((punto + 1) * fichas_punto for punto, fichas_punto
+                             in enumerate(puntos)) for puntos in posiciones])
+        tiradas = []
+        for dado_1 in range(1, 7):
+            for dado_2 in range(dado_1, 7):
+                dados = (dado_1,) * 4 if dado_1 == dado_2 else (dado_1, dado_2)
+                planos = []
+                inicios = [0]
+                for puntos in posiciones:
+                    alcanzadas = set()
+                    for orden in {dados, dados[::-1]}:
+                        actuales = {puntos}
+                        for dado in orden:
+                            actuales = {nueva for actual in actuales
+                                        for nueva in BaseBearOff.sucesores_un_dado(actual, dado)}
+                        alcanzadas |= actuales
+                    planos.extend(sorted(BaseBearOff.rango(final) for final in alcanzadas))
+                    inicios.append(len(planos))
+                tiradas.append(((1 if dado_1 == dado_2 else 2) / 36,
+                                np.array(planos, dtype=np.int64),
+                                np.array(inicios, dtype=np.int64)))
+        _TABLAS[fichas] = (tiradas, pips)
+        return _TABLAS[fichas]
+
+    @staticmethod
+    def pares_de_capa(fichas, capa):
+        """Obtener los pares (que tira, rival) con ``capa`` pips en total.
+
+        Solo incluye pares en los que ambos colores tienen fichas; los demás
+        son terminales y se escriben al crear el archivo.
+
+        Returns:
+            tuple: (filas, columnas) como arreglos int64
+        """
+        _, pips = BaseBearOffDosLados.tablas(fichas)
+        filas = []
+        columnas = []
+        for pips_fila in range(1, capa):
+            grupo_fila = np.flatnonzero(pips == pips_fila)
+            grupo_columna = np.flatnonzero(pips == capa - pips_fila)
+            if len(grupo_fila) and len(grupo_columna):
+                filas.append(np.repeat(grupo_fila, len(grupo_columna)))
+                columnas.append(np.tile(grupo_columna, len(grupo_fila)))
+        if not filas:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(filas), np.concatenate(columnas)
+
+    @staticmethod
+    def calcular_parte(tarea):
+        """Calcular y escribir una parte de una capa (ejecutable en otro proceso).
+
+        Para cada par (a, b): P(a, b) = suma por tirada de
+        p(tirada) * (1 - min P(b, a')) sobre las posiciones a' alcanzables.
+
+        Args:
+            tarea (tuple): (ruta, fichas, capa, parte, partes)
+
+        Returns:
+            int: Pares calculados
+        """
+        ruta, fichas, capa, parte, partes = tarea
+        cantidad = BaseBearOff.cantidad(fichas)
+        filas, columnas = BaseBearOffDosLados.pares_de_capa(fichas, capa)
+        inicio = len(filas) * parte // partes
+        fin = len(filas) * (parte + 1) // partes
+        filas = filas[inicio:fin]
+        columnas = columnas[inicio:fin]
+        if not len(filas):
+            return 0
+        ganar = np.memmap(ruta, dtype="<u2", mode="r+", offset=BaseBearOffDosLados.DATOS,
+                          shape=(cantidad, cantidad))
+        tiradas, _ = BaseBearOffDosLados.tablas(fichas)
+        total = np.zeros(len(filas))
+        for probabilidad, planos, inicios in tiradas:
+            largos = inicios[filas + 1] - inicios[filas]
+            desplazamientos = np.cumsum(largos) - largos
+            # Rango final de cada (par, jugada), recorriendo los tramos de cada fila
+            alcanzadas = planos[np.arange(largos.sum()) - np.repeat(desplazamientos - inicios[filas],
+                                                                    largos)]
+            rivales = ganar[np.repeat(columnas, largos), alcanzadas]
+            total += probabilidad * (1 - np.minimum.reduceat(rivales, desplazamientos)
+                                     / BaseBearOffDosLados.ESCALA)
+        ganar[filas, columnas] = np.rint(np.minimum(total, 1) * BaseBearOffDosLados.ESCALA)
+        ganar.flush()
+        return len(filas)
+
+    @staticmethod
+    def crear_archivo(ruta, fichas):
+        """Crear el archivo con la cabecera y los pares terminales resueltos.
+
+        Si el que tira no tiene fichas ya ganó; si solo el rival no tiene,
+        ya perdió.
+        """
+        cantidad = BaseBearOff.cantidad(fichas)
+        with open(ruta, "wb") as archivo:
+            archivo.write(BaseBearOffDosLados.CABECERA.pack(
+                BaseBearOffDosLados.MAGICO, BaseBearOff.PUNTOS, fichas, cantidad, 0))
+            archivo.truncate(BaseBearOffDosLados.DATOS + 2 * cantidad * cantidad)
+        ganar = np.memmap(ruta, dtype="<u2", mode="r+", offset=BaseBearOffDosLados.DATOS,
+                          shape=(cantidad, cantidad))
+        ganar[0, :] = BaseBearOffDosLados.ESCALA
+        ganar.flush()
+        BaseBearOffDosLados.marcar_capas(ruta, 1)
+
+    @staticmethod
+    def marcar_capas(ruta, capas):
+        """Anotar en la cabecera cuántas capas están completas."""
+        with open(ruta, "r+b") as archivo:
+            archivo.seek(BaseBearOffDosLados.CABECERA.size - 4)
+            archivo.write(struct.pack("<I", capas))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+    @staticmethod
+    def generar(ruta, fichas=FICHAS, workers=1, informar=None):
+        """Generar la base, o continuar una generación interrumpida.
+
+        Args:
+            ruta (str): Ruta del archivo; si ya existe una base con la
+                misma cantidad de fichas se continúa desde su última capa
+            fichas (int): Máximo de fichas por lado (1-15)
+            workers (int): Procesos; con 1 se calcula en este proceso
+            informar (callable): Función que recibe (capa, capas, pares)
+                al terminar cada capa
+
+        Returns:
+            dict: fichas, pares calculados, capas, capas continuadas y segundos
+        """
+        if not 0 < fichas <= BaseBearOff.FICHAS:
+            raise ValueError("La base debe tener entre 1 y 15 fichas por lado")
+        if workers < 1:
+            raise ValueError("Debe usarse al menos un worker")
+        desde = 0
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as archivo, \
+                    mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                existentes, _, desde = BaseBearOffDosLados.leer_cabecera(mapa)
+            if existentes != fichas:
+                raise ValueError("El archivo existente es de otra cantidad de fichas")
+        if desde == 0:
+            BaseBearOffDosLados.crear_archivo(ruta, fichas)
+            desde = 1
+        capas = BaseBearOffDosLados.capas(fichas)
+
+        inicio = time.perf_counter()
+        pares = 0
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for capa in range(desde, capas):
+                tareas = [(ruta, fichas, capa, parte, workers) for parte in range(workers)]
+                if pool is None:
+                    calculados = [BaseBearOffDosLados.calcular_parte(tarea) for tarea in tareas]
+                else:
+                    calculados = list(pool.map(BaseBearOffDosLados.calcular_parte, tareas))
+                pares += sum(calculados)
+                BaseBearOffDosLados.marcar_capas(ruta, capa + 1)
+                if informar is not None:
+                    informar(capa + 1, capas, pares)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return {"fichas": fichas, "pares": pares, "capas": capas, "continuada_desde": desde,
+                "segundos": time.perf_counter() - inicio}
+
+
+def main(argumentos=None):
+    """Generar la base de bear off de dos lados desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera la base de bear off de dos lados")
+    parser.add_argument("--output", default="bearoff2.bin", help="Archivo a crear o continuar")
+    parser.add_argument("--checkers", type=int, default=BaseBearOffDosLados.FICHAS,
+                        help="Máximo de fichas por lado")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos en paralelo")
+    opciones = parser.parse_args(argumentos)
+
+    def informar(capa, capas, pares):
+        print(f"Capa {capa}/{capas}: {pares} pares")
+
+    resumen = BaseBearOffDosLados.generar(opciones.output, opciones.checkers, opciones.workers,
+                                          informar)
+    print(f"{resumen['pares']} pares en {resumen['segundos']:.1f} s, {opciones.output}")
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
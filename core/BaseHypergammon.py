@@ -0,0 +1,412 @@
+"""Solución exacta de hypergammon por iteración de valores, guardada y leída con mmap.
+
+Hypergammon se juega con 3 fichas por color (BoardInitializer.
+inicializar_hypergammon). Su espacio de estados es lo bastante chico para
+resolverlo entero: se generan con MoveGenerator las posiciones sucesoras de
+cada estado para cada una de las 21 tiradas y se itera la ecuación de
+Bellman hasta que las equidades sin cubo dejan de cambiar. Se genera con:
+
+    python -m core.BaseHypergammon --checkers 3 --workers 4 --output hyper3.bin
+
+El solucionador sirve para cualquier cantidad de fichas. Con 1 o 2 fichas
+por color se resuelve en segundos o un par de minutos; con 3 hay unos 250
+millones de sucesores (1 GB en int32) y generarlos lleva horas por núcleo,
+así que conviene usar varios workers.
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations_with_replacement
+from math import comb
+
+import numpy as np
+
+from core.ColorFicha import ColorFicha
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+class BaseHypergammon:
+    """Equidades exactas sin cubo de todas las posiciones de una variante chica.
+
+    Un lado es la tupla ordenada de los lugares de sus fichas vistos desde
+    su dueño: 0-23 son los puntos (0 es el más cercano a salir), 24 la barra
+    y 25 afuera. Cada lado se numera por su posición en el orden de
+    ``combinations_with_replacement``, y un estado (el que tira, el rival)
+    tiene el índice ``propio * lados + rival``.
+
+    El archivo tiene una cabecera y una matriz float32 (lados, lados) con la
+    equidad del que tira, incluyendo gammons y backgammons. Los índices que
+    no son posiciones válidas (fichas de ambos en un mismo punto o una
+    partida ya terminada) valen NaN.
+    """
+    __slots__ = ("__archivo", "__mapa", "__fichas", "__lados", "__equidades", "__numeros")
+
+    MAGICO = b"BGHYPER1"
+    # magico, fichas, lados, iteraciones, cambio de la última iteración
+    CABECERA = struct.Struct("<8sHIId")
+    DATOS = 64
+    FICHAS = 3
+    LUGARES = 26
+    BARRA = 24
+    AFUERA = 25
+    # Lados propios por tarea, para acotar la memoria de cada una
+    LADOS_POR_TAREA = 64
+    TOLERANCIA = 1e-7
+    MAX_ITERACIONES = 10000
+
+    def __init__(self, ruta):
+        """Abrir una base generada con ``generar``.
+
+        Args:
+            ruta (str): Ruta del archivo
+        """
+        self.__archivo = open(ruta, "rb")
+        try:
+            self.__mapa = mmap.mmap(self.__archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__archivo.close()
+            raise ValueError("El archivo de hypergammon está vacío") from None
+        try:
+            fichas, lados = BaseHypergammon.leer_cabecera(self.__mapa)
+        except ValueError:
+            self.__mapa.close()
+            self.__archivo.close()
+            raise
+        self.__fichas = fichas
+        self.__lados = lados
+        self.__numeros = {lado: numero for numero, lado in
+                          enumerate(BaseHypergammon.todos_los_lados(fichas))}
+        self.__equidades = np.frombuffer(self.__mapa, dtype="<f4", count=lados * lados,
+                                         offset=BaseHypergammon.DATOS).reshape(lados, lados)
+
+    @staticmethod
+    def leer_cabecera(datos):
+        """Validar la cabecera de una base y que el archivo tenga todas las equidades.
+
+        Args:
+            datos (bytes-like): Contenido del archivo
+
+        Returns:
+            tuple: (fichas, lados)
+        """
+        if len(datos) < BaseHypergammon.DATOS:
+            raise ValueError("El archivo no es una base de hypergammon")
+        magico, fichas, lados, _, _ = BaseHypergammon.CABECERA.unpack_from(datos)
+        if (magico != BaseHypergammon.MAGICO or fichas < 1
+                or lados != BaseHypergammon.cantidad_lados(fichas)
+                or len(datos) < BaseHypergammon.DATOS + 4 * lados * lados):
+            raise ValueError("El archivo no es una base de hypergammon")
+        return fichas, lados
+
+    def cerrar(self):
+        """Liberar el mapa en memoria y el archivo."""
+        self.__equidades = None
+        self.__mapa.close()
+        self.__archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def fichas(self):
+        """Obtener la cantidad de fichas por color de la base."""
+        return self.__fichas
+
+    @property
+    def iteraciones(self):
+        """Obtener las iteraciones que hicieron falta para resolver la base."""
+        return BaseHypergammon.CABECERA.unpack_from(self.__mapa)[3]
+
+    @property
+    def residuo(self):
+        """Obtener el mayor cambio de equidad en la última iteración."""
+        return BaseHypergammon.CABECERA.unpack_from(self.__mapa)[4]
+
+    @staticmethod
+    def cantidad_lados(fichas):
+        """Obtener la cantidad de disposiciones de un lado con ``fichas`` fichas."""
+        return comb(BaseHypergammon.LUGARES + fichas - 1, fichas)
+
+    @staticmethod
+    def todos_los_lados(fichas):
+        """Obtener todas las disposiciones de un lado, en el orden de su numeración."""
+        return list(combinations_with_replacement(range(BaseHypergammon.LUGARES), fichas))
+
+    @staticmethod
+    def lados_de(posicion, color):
+        """Extraer los lados (del que tira, del rival) de una posición completa.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que tira
+
+        Returns:
+            tuple: (lado propio, lado rival) sin contar las fichas afuera
+        """
+        signo = 1 if color == ColorFicha.BLANCA else -1
+        propio = []
+        rival = []
+        for punto in range(24):
+            valor = posicion[punto] * signo
+            relativo = punto if signo == 1 else 23 - punto
+            if valor > 0:
+                propio.extend([relativo] * valor)
+            elif valor < 0:
+                rival.extend([23 - relativo] * -valor)
+        barra_propia, barra_rival = (24, 25) if signo == 1 else (25, 24)
+        propio.extend([BaseHypergammon.BARRA] * abs(posicion[barra_propia]))
+        rival.extend([BaseHypergammon.BARRA] * abs(posicion[barra_rival]))
+        return sorted(propio), sorted(rival)
+
+    @staticmethod
+    def completar(lado, fichas):
+        """Agregar las fichas que faltan como fichas afuera."""
+        if len(lado) > fichas:
+            raise ValueError("El lado tiene más fichas que la base")
+        return tuple(lado) + (BaseHypergammon.AFUERA,) * (fichas - len(lado))
+
+    @staticmethod
+    def posicion_de(propio, rival):
+        """Armar la posición de 26 casillas con el que tira como blancas.
+
+        Args:
+            propio (tuple): Lugares de las fichas del que tira
+            rival (tuple): Lugares de las fichas del rival, vistos por él
+
+        Returns:
+            tuple: Contadores con signo de las 26 casillas
+        """
+        posicion = [0] * 26
+        for lugar in propio:
+            if lugar == BaseHypergammon.BARRA:
+                posicion[24] += 1
+            elif lugar != BaseHypergammon.AFUERA:
+                posicion[lugar] += 1
+        for lugar in rival:
+            if lugar == BaseHypergammon.BARRA:
+                posicion[25] -= 1
+            elif lugar != BaseHypergammon.AFUERA:
+                posicion[23 - lugar] -= 1
+        return tuple(posicion)
+
+    @staticmethod
+    def es_valido(propio, rival):
+        """Verificar que un estado es una posición en juego con el que tira por mover."""
+        if all(lugar == BaseHypergammon.AFUERA for lugar in propio) or \
+                all(lugar == BaseHypergammon.AFUERA for lugar in rival):
+            return False
+        puntos_propios = {lugar for lugar in propio if lugar < 24}
+        return not any(23 - lugar in puntos_propios for lugar in rival if lugar < 24)
+
+    @staticmethod
+    def valor_ganado(rival):
+        """Puntos ganados por sacar la última ficha contra un rival.
+
+        Args:
+            rival (tuple): Lugares del rival vistos por él
+
+        Returns:
+            int: 1, 2 si el rival no sacó ninguna o 3 si además tiene fichas
+                en la barra o en la casa del ganador
+        """
+        if BaseHypergammon.AFUERA in rival:
+            return 1
+        if any(lugar >= 18 for lugar in rival):
+            return 3
+        return 2
+
+    @staticmethod
+    def sucesores(tarea):
+        """Calcular los sucesores de un tramo de estados (ejecutable en otro proceso).
+
+        Los sucesores que terminan la partida apuntan a las casillas extra
+        ``total + 0/1/2``, que valen -1, -2 y -3 para el rival.
+
+        Args:
+            tarea (tuple): (fichas, primer número de lado propio, último + 1)
+
+        Returns:
+            list: Por tirada, par (índices sucesores concatenados, cantidad de
+                sucesores de cada estado del tramo; 0 si no es válido)
+        """
+        fichas, desde, hasta = tarea
+        lados = BaseHypergammon.todos_los_lados(fichas)
+        numeros = {lado: numero for numero, lado in enumerate(lados)}
+        total = len(lados) * len(lados)
+        resultado = [([], []) for _ in Expectimax.TIRADAS]
+        for propio in lados[desde:hasta]:
+            for rival in lados:
+                valido = BaseHypergammon.es_valido(propio, rival)
+                if valido:
+                    por_tirada = MoveGenerator.generar_por_tirada(
+                        BaseHypergammon.posicion_de(propio, rival), ColorFicha.BLANCA)
+                for (movimientos, _), (planos, largos) in zip(Expectimax.TIRADAS, resultado):
+                    if not valido:
+                        largos.append(0)
+                        continue
+                    indices = set()
+                    for _, nueva in por_tirada[movimientos]:
+                        nuevo_propio, nuevo_rival = BaseHypergammon.lados_de(nueva,
+                                                                             ColorFicha.BLANCA)
+                        nuevo_rival = BaseHypergammon.completar(nuevo_rival, fichas)
+                        if not nuevo_propio:
+                            indices.add(total + BaseHypergammon.valor_ganado(nuevo_rival) - 1)
+                        else:
+                            indices.add(numeros[nuevo_rival] * len(lados)
+                                        + numeros[BaseHypergammon.completar(nuevo_propio, fichas)])
+                    planos.extend(indices)
+                    largos.append(len(indices))
+        return [(np.array(planos, dtype=np.int32), np.array(largos, dtype=np.int64))
+                for planos, largos in resultado]
+
+    @staticmethod
+    def resolver(fichas=FICHAS, workers=1, tolerancia=TOLERANCIA,
+                 max_iteraciones=MAX_ITERACIONES, informar=None):
+        """Calcular las equidades exactas de todos los estados.
+
+        Args:
+            fichas (int): Fichas por color
+            workers (int): Procesos para generar los sucesores
+            tolerancia (float): Mayor cambio de equidad para dejar de iterar
+            max_iteraciones (int): Límite de iteraciones
+            informar (callable): Función que recibe (iteración, cambio)
+
+        Returns:
+            tuple: (matriz (lados, lados) de equidades con NaN en los estados
+                no válidos, iteraciones, último cambio)
+        """
+        if fichas < 1:
+            raise ValueError("Debe haber al menos una ficha por color")
+        if workers < 1:
+            raise ValueError("Debe usarse al menos un worker")
+        lados = BaseHypergammon.cantidad_lados(fichas)
+        total = lados * lados
+        partes = max(4 * workers, -(-lados // BaseHypergammon.LADOS_POR_TAREA))
+        cortes = [lados * parte // partes for parte in range(partes + 1)]
+        tareas = [(fichas, desde, hasta) for desde, hasta in zip(cortes, cortes[1:])
+                  if hasta > desde]
+        if workers == 1:
+            partes = [BaseHypergammon.sucesores(tarea) for tarea in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partes = list(pool.map(BaseHypergammon.sucesores, tareas))
+
+        validos = np.concatenate([parte[0][1] for parte in partes]) > 0
+        tiradas = []
+        for indice, (_, probabilidad) in enumerate(Expectimax.TIRADAS):
+            planos = np.concatenate([parte[indice][0] for parte in partes])
+            largos = np.concatenate([parte[indice][1] for parte in partes])[validos]
+            tiradas.append((probabilidad, planos, np.cumsum(largos) - largos))
+        del partes
+
+        # Las tres casillas extra son las victorias del que acaba de mover
+        valores = np.zeros(total + 3)
+        valores[total:] = (-1.0, -2.0, -3.0)
+        cambio = float("inf")
+        iteraciones = 0
+        while cambio > tolerancia and iteraciones < max_iteraciones:
+            nuevos = np.zeros(int(validos.sum()))
+            for probabilidad, planos, inicios in tiradas:
+                nuevos += probabilidad * np.maximum.reduceat(-valores[planos], inicios)
+            cambio = float(np.abs(nuevos - valores[:total][validos]).max())
+            valores[:total][validos] = nuevos
+            iteraciones += 1
+            if informar is not None:
+                informar(iteraciones, cambio)
+
+        equidades = np.full(total, np.nan)
+        equidades[validos] = valores[:total][validos]
+        return equidades.reshape(lados, lados), iteraciones, cambio
+
+    @staticmethod
+    def generar(ruta, fichas=FICHAS, workers=1, tolerancia=TOLERANCIA,
+                max_iteraciones=MAX_ITERACIONES, informar=None):
+        """Resolver la variante y guardar la base en un archivo.
+
+        Args:
+            ruta (str): Ruta del archivo a crear
+            fichas, workers, tolerancia, max_iteraciones, informar: Como en
+                ``resolver``
+
+        Returns:
+            dict: fichas, estados válidos, iteraciones, residuo, bytes y segundos
+        """
+        inicio = time.perf_counter()
+        equidades, iteraciones, cambio = BaseHypergammon.resolver(
+            fichas, workers, tolerancia, max_iteraciones, informar)
+        lados = equidades.shape[0]
+        cabecera = BaseHypergammon.CABECERA.pack(BaseHypergammon.MAGICO, fichas, lados,
+                                                 iteraciones, cambio)
+        with open(ruta, "wb") as archivo:
+            archivo.write(cabecera.ljust(BaseHypergammon.DATOS, b"\0"))
+            archivo.write(equidades.astype("<f4").tobytes())
+        return {"fichas": fichas, "estados": int(np.count_nonzero(~np.isnan(equidades))),
+                "iteraciones": iteraciones, "residuo": cambio,
+                "bytes": BaseHypergammon.DATOS + 4 * lados * lados,
+                "segundos": time.perf_counter() - inicio}
+
+    def equidad(self, posicion, color_en_turno):
+        """Equidad exacta sin cubo de ``color_en_turno`` antes de tirar.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color_en_turno (ColorFicha): Color que tira
+
+        Returns:
+            float: Equidad entre -3 y 3
+        """
+        propio, rival = BaseHypergammon.lados_de(posicion, color_en_turno)
+        propio = BaseHypergammon.completar(propio, self.__fichas)
+        rival = BaseHypergammon.completar(rival, self.__fichas)
+        if not BaseHypergammon.es_valido(propio, rival):
+            raise ValueError("La posición no es una posición en juego")
+        return float(self.__equidades[self.__numeros[propio], self.__numeros[rival]])
+
+    def evaluar(self, posicion, color):
+        """Equidad exacta para ``color`` después de mover, con el rival por tirar.
+
+        Cumple la interfaz de evaluador de Expectimax y Rollout, así que
+        sirve de referencia para comparar evaluadores.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            float: Equidad entre -3 y 3
+        """
+        propio, rival_visto = BaseHypergammon.lados_de(posicion, color)
+        if not propio:
+            return float(BaseHypergammon.valor_ganado(
+                BaseHypergammon.completar(rival_visto, self.__fichas)))
+        rival = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+        return -self.equidad(posicion, rival)
+
+
+def main(argumentos=None):
+    """Resolver hypergammon desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Resuelve hypergammon y guarda la base")
+    parser.add_argument("--output", default="hyper3.bin", help="Archivo a crear")
+    parser.add_argument("--checkers", type=int, default=BaseHypergammon.FICHAS,
+                        help="Fichas por color")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos para generar los sucesores")
+    parser.add_argument("--tolerance", type=float, default=BaseHypergammon.TOLERANCIA,
+                        help="Mayor cambio de equidad para dejar de iterar")
+    opciones = parser.parse_args(argumentos)
+    resumen = BaseHypergammon.generar(opciones.output, opciones.checkers, opciones.workers,
+                                      opciones.tolerance)
+    print(f"{resumen['estados']} posiciones, {resumen['iteraciones']} iteraciones "
+          f"(residuo {resumen['residuo']:.1e}), {resumen['bytes']} bytes en {opciones.output}")
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
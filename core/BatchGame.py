@@ -0,0 +1,423 @@
+"""Motor de partidas por lotes: miles de partidas avanzadas en "lockstep" con NumPy.
+
+Se ejecuta como módulo:
+
+    python -m core.BatchGame --games 10000 --seed 1 --blancas golosa --negras aleatoria
+
+Cada paso juega medio turno de todas las partidas activas a la vez: se
+tiran los dados de todas, se calculan las máscaras de movimientos legales
+de todas y una política vectorizada elige un movimiento por partida, hasta
+cuatro veces por turno. Las reglas son las de BackgammonGame y
+MoveGenerator (barra, golpes, bear off exacto o con sobrante, usar la
+mayor cantidad de dados y, si solo entra uno, el mayor).
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.Simulator import Simulator
+
+
+class BatchGame:
+    """Lote de K partidas guardado como arreglos.
+
+    ``tableros`` es un arreglo (K, 28) int8 con los 26 contadores con signo
+    de Board.posicion (blancas positivas, negras negativas; 24 es la barra
+    blanca y 25 la negra) más las fichas sacadas: 26 las blancas (positivo)
+    y 27 las negras (negativo), así que cada fila suma 0. ``turno_negras``
+    (K,) indica quién tira y ``dados`` (K, 2) la última tirada.
+
+    Internamente cada medio turno trabaja sobre la vista del que mueve
+    (``a_relativas``), donde siempre avanza hacia el punto 0 como las
+    blancas: los orígenes 0-23 son puntos y 24 la barra.
+    """
+    __slots__ = ("__tableros", "__turno_negras", "__dados", "__terminadas", "__ganadores",
+                 "__puntos", "__medios_turnos", "__fichas", "__politicas", "__rng")
+
+    COLUMNAS = 28
+    ORIGENES = 25
+    BARRA = 24
+    BARRA_RIVAL = 25
+    FUERA = 26
+    FUERA_RIVAL = 27
+
+    def __init__(self, partidas, semilla=None, politica_blancas="golosa",
+                 politica_negras="aleatoria", variante="estandar", tableros=None,
+                 turno_negras=None):
+        """Crear el lote de partidas.
+
+        Args:
+            partidas (int): Cantidad de partidas K
+            semilla (int): Semilla de dados y políticas
+            politica_blancas (str): Nombre en POLITICAS de la política blanca
+            politica_negras (str): Nombre en POLITICAS de la política negra
+            variante (str): Variante de BoardInitializer para la posición inicial
+            tableros (array-like): Posiciones (K, 26) o (K, 28) desde las que
+                empezar en lugar de la inicial
+            turno_negras (array-like): (K,) bool de quién tira en ``tableros``;
+                por defecto las blancas
+        """
+        if partidas < 1:
+            raise ValueError("El lote debe tener al menos una partida")
+        for nombre in (politica_blancas, politica_negras):
+            if nombre not in BatchGame.POLITICAS:
+                raise ValueError(f"Política desconocida: {nombre}")
+        if variante not in BoardInitializer.VARIANTES:
+            raise ValueError(f"Variante desconocida: {variante}")
+        self.__fichas = BoardInitializer.VARIANTES[variante]
+        if tableros is None:
+            board = Board()
+            BoardInitializer.inicializar(board, variante)
+            inicial = np.zeros(BatchGame.COLUMNAS, dtype=np.int8)
+            inicial[:26] = board.posicion
+            self.__tableros = np.tile(inicial, (partidas, 1))
+        else:
+            tableros = np.asarray(tableros, dtype=np.int8)
+            if tableros.shape not in ((partidas, 26), (partidas, BatchGame.COLUMNAS)):
+                raise ValueError("Los tableros deben tener forma (K, 26) o (K, 28)")
+            self.__tableros = np.zeros((partidas, BatchGame.COLUMNAS), dtype=np.int8)
+            self.__tableros[:, :tableros.shape[1]] = tableros
+            if tableros.shape[1] == 26:
+                # Las fichas que faltan en el tablero ya salieron
+                blancas = np.maximum(tableros, 0).sum(axis=1, dtype=np.int64)
+                negras = -np.minimum(tableros, 0).sum(axis=1, dtype=np.int64)
+                self.__tableros[:, BatchGame.FUERA] = self.__fichas - blancas
+                self.__tableros[:, BatchGame.FUERA_RIVAL] = negras - self.__fichas
+        self.__turno_negras = (np.zeros(partidas, dtype=bool) if turno_negras is None
+                               else np.array(turno_negras, dtype=bool).reshape(partidas))
+        self.__dados = np.zeros((partidas, 2), dtype=np.int8)
+        self.__terminadas = np.zeros(partidas, dtype=bool)
+        self.__ganadores = np.zeros(partidas, dtype=np.int8)
+        self.__puntos = np.zeros(partidas, dtype=np.int8)
+        self.__medios_turnos = np.zeros(partidas, dtype=np.int64)
+        self.__politicas = (BatchGame.POLITICAS[politica_blancas],
+                            BatchGame.POLITICAS[politica_negras])
+        self.__rng = np.random.default_rng(semilla)
+
+    @property
+    def tableros(self):
+        """Obtener el arreglo (K, 28) de tableros (sin copiar)."""
+        return self.__tableros
+
+    @property
+    def turno_negras(self):
+        """Obtener el arreglo (K,) que indica si tiran las negras."""
+        return self.__turno_negras
+
+    @property
+    def dados(self):
+        """Obtener la última tirada (K, 2) de cada partida."""
+        return self.__dados
+
+    @property
+    def terminadas(self):
+        """Obtener el arreglo (K,) de partidas terminadas."""
+        return self.__terminadas
+
+    @property
+    def ganadores(self):
+        """Obtener el ganador de cada partida: 1 blancas, -1 negras, 0 en curso."""
+        return self.__ganadores
+
+    @property
+    def puntos(self):
+        """Obtener los puntos de cada victoria: 1 simple, 2 gammon, 3 backgammon."""
+        return self.__puntos
+
+    @property
+    def medios_turnos(self):
+        """Obtener los medios turnos jugados por cada partida."""
+        return self.__medios_turnos
+
+    @staticmethod
+    def a_relativas(tableros, negras):
+        """Convertir tableros a la vista del que mueve, o de vuelta (es una involución).
+
+        Args:
+            tableros (numpy.ndarray): Lote (N, 28)
+            negras (numpy.ndarray): (N,) bool; las filas de las negras se espejan
+
+        Returns:
+            numpy.ndarray: Copia (N, 28) con las fichas del que mueve positivas
+        """
+        relativas = tableros.copy()
+        espejo = -tableros[negras]
+        relativas[negras, :24] = espejo[:, 23::-1]
+        relativas[negras, 24] = espejo[:, 25]
+        relativas[negras, 25] = espejo[:, 24]
+        relativas[negras, 26] = espejo[:, 27]
+        relativas[negras, 27] = espejo[:, 26]
+        return relativas
+
+    @staticmethod
+    def mascara_legal(relativas, dados):
+        """Calcular los orígenes desde los que se puede mover un dado.
+
+        Args:
+            relativas (numpy.ndarray): Lote (N, 28) en la vista del que mueve
+            dados (numpy.ndarray): (N,) valor del dado de cada fila; 0 si no hay
+
+        Returns:
+            numpy.ndarray: Máscara (N, 25) bool por origen (24 es la barra)
+        """
+        propias = relativas[:, :BatchGame.ORIGENES] > 0
+        dados = np.asarray(dados, dtype=np.int64)
+        origenes = np.arange(BatchGame.ORIGENES)
+        destinos = origenes[None, :] - dados[:, None]
+        # Puntos abiertos con casillas falsas a los lados para indexar cualquier destino
+        abiertos = np.zeros((len(relativas), 31), dtype=bool)
+        abiertos[:, 6:30] = relativas[:, :24] >= -1
+        indices = destinos + 6 + 31 * np.arange(len(relativas))[:, None]
+        legal = abiertos.ravel()[indices]
+        # Se saca con el dado exacto o desde la ficha más atrasada
+        ultima = BatchGame.BARRA - np.argmax(propias[:, ::-1], axis=1)
+        en_casa = ultima < 6
+        legal |= (destinos < 0) & en_casa[:, None] & ((destinos == -1)
+                                                      | (origenes[None, :] == ultima[:, None]))
+        legal &= propias & (dados > 0)[:, None]
+        legal[relativas[:, BatchGame.BARRA] > 0, :BatchGame.BARRA] = False
+        return legal
+
+    @staticmethod
+    def aplicar(relativas, filas, origenes, dados):
+        """Mover una ficha en cada fila indicada, en el lugar.
+
+        Args:
+            relativas (numpy.ndarray): Lote (N, 28) en la vista del que mueve
+            filas (numpy.ndarray): Filas a modificar, sin repetir
+            origenes (numpy.ndarray): Origen (0-24) de cada fila
+            dados (numpy.ndarray): Dado usado en cada fila
+        """
+        destinos = origenes - dados
+        relativas[filas, origenes] -= 1
+        sale = destinos < 0
+        relativas[filas[sale], BatchGame.FUERA] += 1
+        filas = filas[~sale]
+        destinos = destinos[~sale]
+        golpe = relativas[filas, destinos] == -1
+        relativas[filas[golpe], destinos[golpe]] = 0
+        relativas[filas[golpe], BatchGame.BARRA_RIVAL] -= 1
+        relativas[filas, destinos] += 1
+
+    @staticmethod
+    def mascara_turno(relativas, valores, restantes):
+        """Calcular los movimientos de un dado permitidos en el turno.
+
+        Aplica la regla de usar la mayor cantidad de dados: con dos dados
+        distintos sin usar solo se permiten primeros movimientos que dejan
+        jugar el otro dado; si ninguno lo deja, solo se permite el dado
+        mayor (si tiene algún movimiento). Con dobles cada movimiento legal
+        deja legales los de las demás fichas, así que jugarlos uno a uno
+        usa siempre la mayor cantidad posible.
+
+        Args:
+            relativas (numpy.ndarray): Lote (N, 28) en la vista del que mueve
+            valores (numpy.ndarray): (N, 2) valores de los dados
+            restantes (numpy.ndarray): (N, 2) usos que quedan de cada dado
+
+        Returns:
+            numpy.ndarray: Máscara (N, 2, 25) por dado y origen
+        """
+        mascara = np.stack([BatchGame.mascara_legal(relativas,
+                                                    np.where(restantes[:, dado] > 0,
+                                                             valores[:, dado], 0))
+                            for dado in range(2)], axis=1)
+        filas = np.flatnonzero((restantes[:, 0] > 0) & (restantes[:, 1] > 0))
+        if not len(filas):
+            return mascara
+        parcial = mascara[filas]
+        # Un movimiento deja jugar el otro dado si este tiene otro origen legal o el
+        # mismo origen con otra ficha: mover hacia adelante no quita movimientos ajenos
+        varias = relativas[filas, :BatchGame.ORIGENES] >= 2
+        otros = parcial[:, ::-1]
+        quedan = (otros.sum(axis=2, keepdims=True) - otros) > 0
+        ambos = parcial & (quedan | (otros & varias[:, None, :]))
+        # El resto (seguir con la misma ficha, entrar la última de la barra, completar
+        # la casa) se verifica aplicando el movimiento
+        filas_dudosas, dados, origenes = np.nonzero(parcial & ~ambos)
+        if len(filas_dudosas):
+            prueba = relativas[filas[filas_dudosas]]
+            BatchGame.aplicar(prueba, np.arange(len(prueba)), origenes,
+                              valores[filas[filas_dudosas], dados])
+            ambos[filas_dudosas, dados, origenes] = BatchGame.mascara_legal(
+                prueba, valores[filas[filas_dudosas], 1 - dados]).any(axis=1)
+        con_ambos = ambos.any(axis=(1, 2))
+        parcial[con_ambos] = ambos[con_ambos]
+        mayor = np.argmax(valores[filas], axis=1)
+        solo_mayor = np.flatnonzero(~con_ambos & parcial[np.arange(len(filas)), mayor].any(axis=1))
+        parcial[solo_mayor, 1 - mayor[solo_mayor]] = False
+        mascara[filas] = parcial
+        return mascara
+
+    @staticmethod
+    def politica_aleatoria(relativas, mascara, valores, rng):
+        """Elegir al azar uno de los movimientos permitidos de cada fila.
+
+        Returns:
+            numpy.ndarray: (N,) índice elegido en la máscara aplanada (2 * 25)
+        """
+        puntajes = np.where(mascara.reshape(len(mascara), -1),
+                            rng.random((len(mascara), 2 * BatchGame.ORIGENES)), -1.0)
+        return np.argmax(puntajes, axis=1)
+
+    @staticmethod
+    def politica_golosa(relativas, mascara, valores, rng):
+        """Elegir el movimiento que golpea, saca, hace punto o avanza la ficha más atrasada.
+
+        Puntúa cada movimiento permitido: golpear vale 8, sacar una ficha
+        6, cubrir una ficha propia sola 4, dejar sola la ficha del origen
+        resta 2 y mover desde más atrás suma un poco; los empates se
+        resuelven al azar.
+
+        Returns:
+            numpy.ndarray: (N,) índice elegido en la máscara aplanada (2 * 25)
+        """
+        origenes = np.arange(BatchGame.ORIGENES)
+        destinos = origenes[None, None, :] - valores[:, :, None].astype(np.int64)
+        ocupacion = np.take_along_axis(
+            np.broadcast_to(relativas[:, None, :24], (len(relativas), 2, 24)),
+            np.clip(destinos, 0, 23), axis=2)
+        en_tablero = destinos >= 0
+        origen = relativas[:, None, :BatchGame.ORIGENES]
+        puntajes = (8.0 * (en_tablero & (ocupacion == -1)) + 6.0 * ~en_tablero
+                    + 4.0 * (en_tablero & (ocupacion == 1))
+                    - 2.0 * ((origen == 2) & (origenes < BatchGame.BARRA))
+                    + origenes / 100 + rng.random(mascara.shape) / 1000)
+        puntajes = np.where(mascara, puntajes, -np.inf)
+        return np.argmax(puntajes.reshape(len(mascara), -1), axis=1)
+
+    @staticmethod
+    def jugar_turno(relativas, valores, politica, rng):
+        """Jugar un turno completo en la vista del que mueve, en el lugar.
+
+        Args:
+            relativas (numpy.ndarray): Lote (N, 28) en la vista del que mueve
+            valores (numpy.ndarray): (N, 2) dados de cada fila
+            politica (callable): Función de POLITICAS
+            rng (numpy.random.Generator): Generador para la política
+        """
+        valores = np.asarray(valores, dtype=np.int64)
+        dobles = valores[:, 0] == valores[:, 1]
+        restantes = np.ones((len(relativas), 2), dtype=np.int64)
+        restantes[dobles] = (4, 0)
+        for _ in range(4):
+            mascara = BatchGame.mascara_turno(relativas, valores, restantes)
+            filas = np.flatnonzero(mascara.reshape(len(mascara), -1).any(axis=1))
+            if not len(filas):
+                break
+            elecciones = politica(relativas[filas], mascara[filas], valores[filas], rng)
+            dados, origenes = np.divmod(elecciones, BatchGame.ORIGENES)
+            BatchGame.aplicar(relativas, filas, origenes, valores[filas, dados])
+            restantes[filas, dados] -= 1
+
+    def paso(self, dados=None):
+        """Jugar medio turno en todas las partidas activas.
+
+        Args:
+            dados (array-like): (K, 2) tirada de cada partida; por defecto se
+                tiran con el generador del lote
+
+        Returns:
+            int: Partidas que siguen activas
+        """
+        activas = np.flatnonzero(~self.__terminadas)
+        if not len(activas):
+            return 0
+        if dados is None:
+            tirada = self.__rng.integers(1, 7, size=(len(activas), 2))
+        else:
+            tirada = np.asarray(dados, dtype=np.int64).reshape(-1, 2)[activas]
+        self.__dados[activas] = tirada
+        negras = self.__turno_negras[activas]
+        relativas = BatchGame.a_relativas(self.__tableros[activas], negras)
+        for indice, politica in enumerate(self.__politicas):
+            filas = np.flatnonzero(negras == bool(indice))
+            if len(filas):
+                subconjunto = relativas[filas]
+                BatchGame.jugar_turno(subconjunto, tirada[filas], politica, self.__rng)
+                relativas[filas] = subconjunto
+
+        ganan = relativas[:, BatchGame.FUERA] == self.__fichas
+        gammon = relativas[:, BatchGame.FUERA_RIVAL] == 0
+        backgammon = gammon & ((relativas[:, BatchGame.BARRA_RIVAL] < 0)
+                               | (relativas[:, :6] < 0).any(axis=1))
+        self.__tableros[activas] = BatchGame.a_relativas(relativas, negras)
+        self.__medios_turnos[activas] += 1
+        terminan = activas[ganan]
+        self.__terminadas[terminan] = True
+        self.__ganadores[terminan] = np.where(negras[ganan], -1, 1)
+        self.__puntos[terminan] = 1 + gammon[ganan] + backgammon[ganan]
+        siguen = activas[~ganan]
+        self.__turno_negras[siguen] = ~self.__turno_negras[siguen]
+        return len(siguen)
+
+    def jugar(self, max_medios_turnos=Simulator.MAX_TURNOS):
+        """Jugar todas las partidas hasta el final.
+
+        Args:
+            max_medios_turnos (int): Límite de pasos
+
+        Returns:
+            dict: Contadores de Simulator.CONTADORES para el lote
+        """
+        for _ in range(max_medios_turnos):
+            if not self.paso():
+                break
+        else:
+            if not self.__terminadas.all():
+                raise RuntimeError("Una partida superó el máximo de turnos")
+        return self.resumen()
+
+    def resumen(self):
+        """Sumar los resultados de las partidas terminadas.
+
+        Returns:
+            dict: Contadores de Simulator.CONTADORES
+        """
+        totales = dict.fromkeys(Simulator.CONTADORES, 0)
+        terminadas = self.__terminadas
+        totales["partidas"] = int(terminadas.sum())
+        totales["turnos"] = int(self.__medios_turnos[terminadas].sum())
+        for signo, sufijo in ((1, "blancas"), (-1, "negras")):
+            ganadas = self.__ganadores == signo
+            totales["victorias_" + sufijo] = int(ganadas.sum())
+            totales["gammons_" + sufijo] = int((ganadas & (self.__puntos == 2)).sum())
+            totales["backgammons_" + sufijo] = int((ganadas & (self.__puntos == 3)).sum())
+        return totales
+
+
+BatchGame.POLITICAS = {
+    "aleatoria": BatchGame.politica_aleatoria,
+    "golosa": BatchGame.politica_golosa,
+}
+
+
+def main(argumentos=None):
+    """Simular un lote de partidas desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulador de partidas por lotes con NumPy")
+    parser.add_argument("--games", type=int, default=10000, help="Cantidad de partidas")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla")
+    parser.add_argument("--blancas", choices=sorted(BatchGame.POLITICAS), default="golosa",
+                        help="Política de las blancas")
+    parser.add_argument("--negras", choices=sorted(BatchGame.POLITICAS), default="aleatoria",
+                        help="Política de las negras")
+    parser.add_argument("--variante", choices=sorted(BoardInitializer.VARIANTES),
+                        default="estandar", help="Variante a jugar")
+    opciones = parser.parse_args(argumentos)
+    semilla = opciones.seed if opciones.seed is not None else random.randrange(2 ** 63)
+    inicio = time.perf_counter()
+    lote = BatchGame(opciones.games, semilla, opciones.blancas, opciones.negras,
+                     opciones.variante)
+    totales = lote.jugar()
+    totales["semilla"] = semilla
+    totales["segundos"] = time.perf_counter() - inicio
+    print(Simulator.formatear_reporte(totales))
+    return totales
+
+
+if __name__ == "__main__":
+    main()
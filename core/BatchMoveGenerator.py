@@ -0,0 +1,99 @@
+"""Módulo para generar las posiciones sucesoras de muchos tableros en una sola llamada."""
+import numpy as np
+
+from core.BatchGame import BatchGame
+
+
+class BatchMoveGenerator:
+    """Genera con NumPy las posiciones legales tras una tirada para un lote de tableros.
+
+    Es la versión por lotes de MoveGenerator.generar_posiciones: en lugar
+    de recorrer ficha por ficha y dado por dado en Python, expande todos
+    los tableros a la vez un dado por nivel (a lo sumo cuatro niveles) con
+    las máscaras de BatchGame, que ya aplican la barra, los golpes, el
+    bear off y las reglas de usar la mayor cantidad de dados y el mayor.
+    En cada nivel se descartan los estados repetidos del mismo tablero,
+    así que los órdenes distintos de una misma jugada no se multiplican.
+
+    El resultado es "ragged": todas las posiciones sucesoras en un solo
+    arreglo y los desplazamientos donde empiezan las de cada tablero,
+    listo para evaluarlas con una sola pasada de un evaluador por lotes.
+    Las sucesoras de cada tablero salen ordenadas por sus bytes, así que
+    quien elija la primera de las mejor valoradas desempata siempre igual,
+    sin depender del orden en que se expandieron las jugadas.
+    """
+
+    @staticmethod
+    def __claves(*columnas):
+        """Ver cada fila de varios arreglos como una sola clave de bytes comparable."""
+        bytes_fila = np.concatenate([np.ascontiguousarray(columna).view(np.uint8).reshape(
+            len(columna), columna[0:1].nbytes) for columna in columnas], axis=1)
+        return np.ascontiguousarray(bytes_fila).view(
+            np.dtype((np.void, bytes_fila.shape[1]))).ravel()
+
+    @staticmethod
+    def __unicos(padres, *columnas):
+        """Índices de la primera aparición de cada fila distinta, ordenados por tablero."""
+        # El tablero va primero y en big endian para que el orden de bytes sea el numérico
+        claves = BatchMoveGenerator.__claves(padres.astype(">u4"), *columnas)
+        return np.unique(claves, return_index=True)[1]
+
+    @staticmethod
+    def generar_posiciones(posiciones, negras, dados):
+        """Obtener las posiciones sucesoras de cada tablero con su tirada.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo como
+                Board.posicion
+            negras (array-like): (N,) bool, True si en esa fila mueven las negras
+            dados (array-like): (N, 2) tirada de cada fila (iguales si es doble)
+
+        Returns:
+            tuple: (sucesoras, inicios) con sucesoras (T, 26) int8 sin repetir
+            dentro de cada tablero e inicios (N + 1,) tales que las del
+            tablero i son ``sucesoras[inicios[i]:inicios[i + 1]]``, ordenadas
+            por sus bytes (no en el orden de MoveGenerator). Un tablero sin
+            movimientos tiene como única sucesora a sí mismo.
+        """
+        posiciones = np.asarray(posiciones, dtype=np.int8)
+        if posiciones.ndim != 2 or posiciones.shape[1] != 26:
+            raise ValueError("Las posiciones deben tener forma (N, 26)")
+        cantidad = len(posiciones)
+        negras = np.asarray(negras, dtype=bool).reshape(-1)
+        valores = np.asarray(dados, dtype=np.int64)
+        if negras.shape != (cantidad,) or valores.shape != (cantidad, 2):
+            raise ValueError("Se necesita un color y una tirada por posición")
+        if ((valores < 1) | (valores > 6)).any():
+            raise ValueError("Los dados deben valer entre 1 y 6")
+        if not cantidad:
+            return np.zeros((0, 26), dtype=np.int8), np.zeros(1, dtype=np.int64)
+
+        tableros = np.zeros((cantidad, BatchGame.COLUMNAS), dtype=np.int8)
+        tableros[:, :26] = posiciones
+        relativas = BatchGame.a_relativas(tableros, negras)
+        restantes = np.ones((cantidad, 2), dtype=np.int8)
+        restantes[valores[:, 0] == valores[:, 1]] = (4, 0)
+        padres = np.arange(cantidad)
+        hojas, padres_hojas = [], []
+        while True:
+            mascara = BatchGame.mascara_turno(relativas, valores[padres], restantes)
+            terminan = ~mascara.reshape(len(mascara), -1).any(axis=1)
+            hojas.append(relativas[terminan])
+            padres_hojas.append(padres[terminan])
+            filas, dados_usados, origenes = np.nonzero(mascara)
+            if not len(filas):
+                break
+            relativas = relativas[filas]
+            BatchGame.aplicar(relativas, np.arange(len(filas)), origenes,
+                              valores[padres[filas], dados_usados])
+            restantes = restantes[filas]
+            restantes[np.arange(len(filas)), dados_usados] -= 1
+            padres = padres[filas]
+            unicos = BatchMoveGenerator.__unicos(padres, relativas, restantes)
+            relativas, restantes, padres = relativas[unicos], restantes[unicos], padres[unicos]
+
+        padres = np.concatenate(padres_hojas)
+        absolutas = BatchGame.a_relativas(np.concatenate(hojas), negras[padres])[:, :26]
+        unicos = BatchMoveGenerator.__unicos(padres, absolutas)
+        inicios = np.searchsorted(padres[unicos], np.arange(cantidad + 1))
+        return np.ascontiguousarray(absolutas[unicos]), inicios
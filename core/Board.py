@@ -2,8 +2,24 @@
 
 Este módulo contiene la clase Board que representa el tablero de backgammon
 con sus 24 puntos y los contenedores para fichas capturadas.
+
+El estado completo se guarda en un único arreglo compacto de 26 enteros con
+signo (positivo = blancas, negativo = negras): las casillas 0-23 son los
+puntos, la 24 es la barra de las blancas y la 25 la barra de las negras.
+Las listas de fichas que exponen ``puntos``, ``obtener_fichas`` y los
+contenedores se construyen bajo demanda a partir de esos contadores.
+
+Además, el tablero mantiene un hash Zobrist de 64 bits que se actualiza en
+O(1) en cada alta o baja de ficha y que incluye el jugador en turno, junto
+con contadores de fichas fuera de casa, máscaras de puntos ocupados y el
+conteo de pips de cada color, de modo que las consultas de bear off, de
+carrera y de pips son constantes.
 """
+from array import array
+
+from core.Checker import Checker
 from core.ColorFicha import ColorFicha
+from core.Zobrist import Zobrist
 
 
 class Board:
@@ -15,56 +31,242 @@ class Board:
         puntos (list): Lista de 24 listas, cada una representa un punto
         contenedor_blancas (list): Fichas blancas capturadas
         contenedor_negras (list): Fichas negras capturadas
+        posicion (tuple): Contadores con signo de las 26 casillas
+        hash_posicion (int): Hash Zobrist de la posición y el turno
     """
+    __slots__ = ("__casillas", "__turno_negras", "__hash", "__fuera_blancas", "__fuera_negras",
+                 "__mascara_blancas", "__mascara_negras", "__bloqueos_blancas", "__bloqueos_negras",
+                 "__pips_blancas", "__pips_negras")
+
+    CASILLAS = 26
+    BARRA_BLANCAS = 24
+    BARRA_NEGRAS = 25
+    MAX_FICHAS = Zobrist.MAX_FICHAS
+    # Casillas que cuentan como "fuera de casa" para cada color (incluye la barra)
+    FUERA_DE_CASA_BLANCAS = tuple(6 <= casilla <= 24 for casilla in range(26))
+    FUERA_DE_CASA_NEGRAS = tuple(casilla <= 17 or casilla == 25 for casilla in range(26))
+    # Pips que aporta cada ficha según la casilla (la barra vale 25)
+    PIPS_BLANCAS = tuple(range(1, 25)) + (25, 0)
+    PIPS_NEGRAS = tuple(range(24, 0, -1)) + (0, 25)
 
     def __init__(self):
         """Inicializar tablero vacío con 24 puntos."""
-        self.__puntos = []
-        for _ in range(24):
-            self.__puntos.append([])
+        self.__casillas = array('b', bytes(Board.CASILLAS))
+        self.__turno_negras = False
+        self.__hash = 0
+        self.__fuera_blancas = 0
+        self.__fuera_negras = 0
+        self.__mascara_blancas = 0
+        self.__mascara_negras = 0
+        self.__bloqueos_blancas = 0
+        self.__bloqueos_negras = 0
+        self.__pips_blancas = 0
+        self.__pips_negras = 0
 
-        self.__contenedor_blancas = []
-        self.__contenedor_negras = []
+    def __recalcular_estado(self):
+        """Recalcular hash, contadores y máscaras tras un cambio masivo de casillas."""
+        self.__hash = Zobrist.calcular(self.__casillas, self.__turno_negras)
+        self.__fuera_blancas = 0
+        self.__fuera_negras = 0
+        self.__mascara_blancas = 0
+        self.__mascara_negras = 0
+        self.__bloqueos_blancas = 0
+        self.__bloqueos_negras = 0
+        self.__pips_blancas = 0
+        self.__pips_negras = 0
+        for casilla, valor in enumerate(self.__casillas):
+            if valor > 0:
+                self.__pips_blancas += valor * Board.PIPS_BLANCAS[casilla]
+                if Board.FUERA_DE_CASA_BLANCAS[casilla]:
+                    self.__fuera_blancas += valor
+                if casilla < 24:
+                    self.__mascara_blancas |= 1 << casilla
+                    if valor >= 2:
+                        self.__bloqueos_blancas |= 1 << casilla
+            elif valor < 0:
+                self.__pips_negras -= valor * Board.PIPS_NEGRAS[casilla]
+                if Board.FUERA_DE_CASA_NEGRAS[casilla]:
+                    self.__fuera_negras -= valor
+                if casilla < 24:
+                    self.__mascara_negras |= 1 << casilla
+                    if valor <= -2:
+                        self.__bloqueos_negras |= 1 << casilla
+
+    def __fijar_casilla(self, casilla, valor):
+        """Asignar el contador de una casilla actualizando el estado derivado en O(1)."""
+        if abs(valor) > Board.MAX_FICHAS:
+            raise ValueError("Una casilla no puede tener más de 15 fichas.")
+        anterior = self.__casillas[casilla]
+        claves = Zobrist.CLAVES[casilla]
+        self.__hash ^= claves[anterior] ^ claves[valor]
+        self.__casillas[casilla] = valor
+        delta_blancas = max(valor, 0) - max(anterior, 0)
+        delta_negras = max(-valor, 0) - max(-anterior, 0)
+        self.__pips_blancas += delta_blancas * Board.PIPS_BLANCAS[casilla]
+        self.__pips_negras += delta_negras * Board.PIPS_NEGRAS[casilla]
+        if Board.FUERA_DE_CASA_BLANCAS[casilla]:
+            self.__fuera_blancas += delta_blancas
+        if Board.FUERA_DE_CASA_NEGRAS[casilla]:
+            self.__fuera_negras += delta_negras
+        if casilla < 24:
+            bit = 1 << casilla
+            self.__mascara_blancas &= ~bit
+            self.__mascara_negras &= ~bit
+            self.__bloqueos_blancas &= ~bit
+            self.__bloqueos_negras &= ~bit
+            if valor > 0:
+                self.__mascara_blancas |= bit
+                if valor >= 2:
+                    self.__bloqueos_blancas |= bit
+            elif valor < 0:
+                self.__mascara_negras |= bit
+                if valor <= -2:
+                    self.__bloqueos_negras |= bit
+
+    @staticmethod
+    def __signo(color):
+        """Obtener el signo con el que se guarda un color (+1, -1 o 0)."""
+        if color == ColorFicha.BLANCA:
+            return 1
+        if color == ColorFicha.NEGRA:
+            return -1
+        return 0
+
+    @staticmethod
+    def __contar_lista(fichas):
+        """Convertir una lista de fichas de un mismo color en un contador con signo."""
+        blancas = sum(1 for ficha in fichas if ficha.color == ColorFicha.BLANCA)
+        negras = len(fichas) - blancas
+        if blancas and negras:
+            raise ValueError("Un punto no puede tener fichas de distinto color.")
+        return blancas - negras
+
+    @staticmethod
+    def __expandir(valor):
+        """Construir la lista de fichas que representa un contador con signo."""
+        if valor > 0:
+            return [Checker(ColorFicha.BLANCA) for _ in range(valor)]
+        return [Checker(ColorFicha.NEGRA) for _ in range(-valor)]
 
     @property
     def puntos(self):
         """Obtener lista de puntos del tablero."""
-        return self.__puntos
+        return [self.__expandir(self.__casillas[punto]) for punto in range(24)]
 
     @puntos.setter
     def puntos(self, nuevos_puntos):
         """Establecer nuevos puntos del tablero."""
         if isinstance(nuevos_puntos, list) and len(nuevos_puntos) == 24:
-            self.__puntos = nuevos_puntos
+            valores = [self.__contar_lista(fichas) for fichas in nuevos_puntos]
+            if any(abs(valor) > Board.MAX_FICHAS for valor in valores):
+                raise ValueError("Una casilla no puede tener más de 15 fichas.")
+            self.__casillas[0:24] = array('b', valores)
+            self.__recalcular_estado()
         else:
             raise ValueError("Los nuevos puntos deben ser una lista de 24 elementos.")
 
     @property
     def contenedor_blancas(self):
         """Obtener contenedor de fichas blancas."""
-        return self.__contenedor_blancas
+        return self.__expandir(self.__casillas[Board.BARRA_BLANCAS])
 
     @contenedor_blancas.setter
     def contenedor_blancas(self, nuevo_contenedor):
         """Establecer nuevo contenedor de fichas blancas."""
         if isinstance(nuevo_contenedor, list):
-            self.__contenedor_blancas = nuevo_contenedor
+            self.__fijar_casilla(Board.BARRA_BLANCAS, len(nuevo_contenedor))
         else:
             raise ValueError("El nuevo contenedor debe ser una lista.")
 
     @property
     def contenedor_negras(self):
         """Obtener contenedor de fichas negras."""
-        return self.__contenedor_negras
+        return self.__expandir(self.__casillas[Board.BARRA_NEGRAS])
 
     @contenedor_negras.setter
     def contenedor_negras(self, nuevo_contenedor):
         """Establecer nuevo contenedor de fichas negras."""
         if isinstance(nuevo_contenedor, list):
-            self.__contenedor_negras = nuevo_contenedor
+            self.__fijar_casilla(Board.BARRA_NEGRAS, -len(nuevo_contenedor))
         else:
             raise ValueError("El nuevo contenedor debe ser una lista.")
 
+    @property
+    def posicion(self):
+        """Obtener una copia inmutable de los 26 contadores con signo."""
+        return tuple(self.__casillas)
+
+    @property
+    def hash_posicion(self):
+        """Obtener el hash Zobrist de 64 bits de la posición y el turno."""
+        return self.__hash
+
+    @property
+    def turno_negras(self):
+        """Indicar si el componente de turno del hash corresponde a las negras."""
+        return self.__turno_negras
+
+    @property
+    def pips_blancas(self):
+        """Obtener el conteo de pips de las blancas (distancia total a sacar)."""
+        return self.__pips_blancas
+
+    @property
+    def pips_negras(self):
+        """Obtener el conteo de pips de las negras (distancia total a sacar)."""
+        return self.__pips_negras
+
+    def pips(self, color):
+        """Obtener el conteo de pips de un color."""
+        if color == ColorFicha.BLANCA:
+            return self.__pips_blancas
+        if color == ColorFicha.NEGRA:
+            return self.__pips_negras
+        return 0
+
+    def alternar_turno(self):
+        """Cambiar el jugador en turno dentro del hash."""
+        self.__turno_negras = not self.__turno_negras
+        self.__hash ^= Zobrist.TURNO
+
+    def cargar_posicion(self, posicion):
+        """Reemplazar el estado del tablero por 26 contadores con signo.
+
+        Args:
+            posicion (Sequence[int]): Valores de las casillas 0-25
+
+        Raises:
+            ValueError: Si la posición no tiene 26 casillas
+        """
+        if len(posicion) != Board.CASILLAS:
+            raise ValueError("La posición debe tener 26 casillas.")
+        if any(abs(valor) > Board.MAX_FICHAS for valor in posicion):
+            raise ValueError("Una casilla no puede tener más de 15 fichas.")
+        self.__casillas = array('b', posicion)
+        self.__recalcular_estado()
+
+    def copiar(self):
+        """Crear una copia independiente del tablero sin recorrer fichas."""
+        copia = Board()
+        copia.__casillas = array('b', self.__casillas)
+        copia.__turno_negras = self.__turno_negras
+        copia.__hash = self.__hash
+        copia.__fuera_blancas = self.__fuera_blancas
+        copia.__fuera_negras = self.__fuera_negras
+        copia.__mascara_blancas = self.__mascara_blancas
+        copia.__mascara_negras = self.__mascara_negras
+        copia.__bloqueos_blancas = self.__bloqueos_blancas
+        copia.__bloqueos_negras = self.__bloqueos_negras
+        copia.__pips_blancas = self.__pips_blancas
+        copia.__pips_negras = self.__pips_negras
+        return copia
+
+    def valor_punto(self, punto):
+        """Obtener el contador con signo de un punto (0 si es inválido)."""
+        if self.__es_punto_valido(punto):
+            return self.__casillas[punto]
+        return 0
+
     def __es_punto_valido(self, punto):
         """Verificar si un punto está dentro del rango válido (0-23)."""
         return 0 <= punto < 24
@@ -72,60 +274,74 @@ class Board:
     def agregar_ficha(self, punto, ficha):
         """Agregar una ficha a un punto específico."""
         if self.__es_punto_valido(punto):
-            self.__puntos[punto].append(ficha)
+            signo = self.__signo(ficha.color)
+            anterior = self.__casillas[punto]
+            if anterior * signo < 0:
+                raise ValueError("Un punto no puede tener fichas de distinto color.")
+            self.__fijar_casilla(punto, anterior + signo)
 
     def obtener_fichas(self, punto):
         """Obtener todas las fichas de un punto."""
         if self.__es_punto_valido(punto):
-            return self.__puntos[punto]
+            return self.__expandir(self.__casillas[punto])
         return []
 
     def contar_fichas(self, punto):
         """Contar cuántas fichas hay en un punto."""
         if self.__es_punto_valido(punto):
-            return len(self.__puntos[punto])
+            return abs(self.__casillas[punto])
         return 0
 
     def quitar_ficha(self, punto):
         """Quitar la última ficha de un punto."""
-        if self.__es_punto_valido(punto) and len(self.__puntos[punto]) > 0:
-            return self.__puntos[punto].pop()
+        if self.__es_punto_valido(punto):
+            valor = self.__casillas[punto]
+            if valor > 0:
+                self.__fijar_casilla(punto, valor - 1)
+                return Checker(ColorFicha.BLANCA)
+            if valor < 0:
+                self.__fijar_casilla(punto, valor + 1)
+                return Checker(ColorFicha.NEGRA)
         return None
 
     def punto_esta_vacio(self, punto):
         """Verificar si un punto está vacío."""
         if self.__es_punto_valido(punto):
-            return len(self.__puntos[punto]) == 0
+            return self.__casillas[punto] == 0
         return True
 
     def obtener_color_punto(self, punto):
         """Obtener el color de las fichas en un punto (si tiene fichas)."""
-        fichas = self.obtener_fichas(punto)
-        if len(fichas) > 0:
-            return fichas[0].color
+        valor = self.valor_punto(punto)
+        if valor > 0:
+            return ColorFicha.BLANCA
+        if valor < 0:
+            return ColorFicha.NEGRA
         return None
 
     def agregar_ficha_contenedor(self, ficha):
         """Agregar una ficha al contenedor correspondiente según su color."""
         if ficha.color == ColorFicha.BLANCA:
-            self.__contenedor_blancas.append(ficha)
+            self.__fijar_casilla(Board.BARRA_BLANCAS, self.__casillas[Board.BARRA_BLANCAS] + 1)
         elif ficha.color == ColorFicha.NEGRA:
-            self.__contenedor_negras.append(ficha)
+            self.__fijar_casilla(Board.BARRA_NEGRAS, self.__casillas[Board.BARRA_NEGRAS] - 1)
 
     def quitar_ficha_contenedor(self, color):
         """Quitar una ficha del contenedor según el color."""
-        if color == ColorFicha.BLANCA and len(self.__contenedor_blancas) > 0:
-            return self.__contenedor_blancas.pop()
-        if color == ColorFicha.NEGRA and len(self.__contenedor_negras) > 0:
-            return self.__contenedor_negras.pop()
+        if color == ColorFicha.BLANCA and self.__casillas[Board.BARRA_BLANCAS] > 0:
+            self.__fijar_casilla(Board.BARRA_BLANCAS, self.__casillas[Board.BARRA_BLANCAS] - 1)
+            return Checker(ColorFicha.BLANCA)
+        if color == ColorFicha.NEGRA and self.__casillas[Board.BARRA_NEGRAS] < 0:
+            self.__fijar_casilla(Board.BARRA_NEGRAS, self.__casillas[Board.BARRA_NEGRAS] + 1)
+            return Checker(ColorFicha.NEGRA)
         return None
 
     def contar_fichas_contenedor(self, color):
         """Contar cuántas fichas hay en el contenedor de un color."""
         if color == ColorFicha.BLANCA:
-            return len(self.__contenedor_blancas)
+            return self.__casillas[Board.BARRA_BLANCAS]
         if color == ColorFicha.NEGRA:
-            return len(self.__contenedor_negras)
+            return -self.__casillas[Board.BARRA_NEGRAS]
         return 0
 
     def contenedor_esta_vacio(self, color):
@@ -135,22 +351,73 @@ class Board:
     def limpiar_punto(self, punto):
         """Quitar todas las fichas de un punto."""
         if self.__es_punto_valido(punto):
-            fichas_removidas = self.__puntos[punto].copy()
-            self.__puntos[punto].clear()
+            fichas_removidas = self.__expandir(self.__casillas[punto])
+            self.__fijar_casilla(punto, 0)
             return fichas_removidas
         return []
 
     def tablero_esta_vacio(self):
         """Verificar si el tablero está completamente vacío."""
-        return all(len(punto) == 0 for punto in self.__puntos)
+        return not any(self.__casillas[0:24])
 
     def resetear_tablero(self):
         """Restablecer el tablero a su estado inicial vacío."""
-        self.__puntos = [[] for _ in range(24)]
-        self.__contenedor_blancas = []
-        self.__contenedor_negras = []
+        self.__casillas = array('b', bytes(Board.CASILLAS))
+        self.__turno_negras = False
+        self.__recalcular_estado()
 
     def limpiar_contenedores(self):
         """Limpiar ambos contenedores de fichas."""
-        self.__contenedor_blancas = []
-        self.__contenedor_negras = []
+        self.__fijar_casilla(Board.BARRA_BLANCAS, 0)
+        self.__fijar_casilla(Board.BARRA_NEGRAS, 0)
+
+    def fichas_fuera_de_casa(self, color):
+        """Contar las fichas de un color fuera de su home, incluida la barra.
+
+        Home de las blancas: puntos 0-5. Home de las negras: puntos 18-23.
+        """
+        if color == ColorFicha.BLANCA:
+            return self.__fuera_blancas
+        if color == ColorFicha.NEGRA:
+            return self.__fuera_negras
+        return 0
+
+    def todas_en_casa(self, color):
+        """Verificar si todas las fichas de un color en juego están en su home."""
+        return self.fichas_fuera_de_casa(color) == 0
+
+    def mascara_puntos(self, color):
+        """Obtener la máscara de bits de los puntos ocupados por un color.
+
+        El bit ``p`` vale 1 si el color tiene al menos una ficha en el punto p.
+        """
+        if color == ColorFicha.BLANCA:
+            return self.__mascara_blancas
+        if color == ColorFicha.NEGRA:
+            return self.__mascara_negras
+        return 0
+
+    def mascara_bloqueos(self, color):
+        """Obtener la máscara de bits de los puntos que un color tiene bloqueados.
+
+        El bit ``p`` vale 1 si el color tiene dos o más fichas en el punto p,
+        es decir, si el rival no puede caer en él.
+        """
+        if color == ColorFicha.BLANCA:
+            return self.__bloqueos_blancas
+        if color == ColorFicha.NEGRA:
+            return self.__bloqueos_negras
+        return 0
+
+    def es_carrera(self):
+        """Verificar si ya no hay contacto posible entre las fichas de ambos colores.
+
+        Hay carrera cuando ninguna ficha está en la barra y todas las blancas
+        están en puntos menores que todas las negras.
+        """
+        if self.__casillas[Board.BARRA_BLANCAS] or self.__casillas[Board.BARRA_NEGRAS]:
+            return False
+        if not self.__mascara_blancas or not self.__mascara_negras:
+            return True
+        punto_negra_mas_atrasada = (self.__mascara_negras & -self.__mascara_negras).bit_length() - 1
+        return self.__mascara_blancas.bit_length() - 1 < punto_negra_mas_atrasada
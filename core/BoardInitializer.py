@@ -9,6 +9,25 @@ from core.ColorFicha import ColorFicha
 
 class BoardInitializer:
     """Clase responsable de inicializar el tablero con diferentes configuraciones."""
+
+    # Fichas por color de cada variante
+    VARIANTES = {"estandar": 15, "hypergammon": 3}
+
+    @staticmethod
+    def inicializar(board, variante="estandar"):
+        """Configurar el tablero con la disposición inicial de una variante.
+
+        Args:
+            board (Board): El tablero a configurar
+            variante (str): Nombre de la variante, una clave de VARIANTES
+        """
+        if variante == "estandar":
+            BoardInitializer.inicializar_estandar(board)
+        elif variante == "hypergammon":
+            BoardInitializer.inicializar_hypergammon(board)
+        else:
+            raise ValueError(f"Variante desconocida: {variante}")
+
     @staticmethod
     def inicializar_estandar(board):
         """Configurar el tablero con la disposición estándar de backgammon.
@@ -36,3 +55,20 @@ class BoardInitializer:
             board.agregar_ficha(7, Checker(ColorFicha.BLANCA))
         for _ in range(5):
             board.agregar_ficha(5, Checker(ColorFicha.BLANCA))
+
+    @staticmethod
+    def inicializar_hypergammon(board):
+        """Configurar el tablero para hypergammon: 3 fichas por color.
+
+        Cada color empieza con una ficha en cada uno de los tres puntos más
+        lejanos de su casa (los puntos 24, 23 y 22 desde su lado).
+
+        Args:
+            board (Board): El tablero a configurar
+        """
+        board.resetear_tablero()
+        board.limpiar_contenedores()
+        for punto in (0, 1, 2):
+            board.agregar_ficha(punto, Checker(ColorFicha.NEGRA))
+        for punto in (23, 22, 21):
+            board.agregar_ficha(punto, Checker(ColorFicha.BLANCA))
@@ -3,16 +3,32 @@ del juego de backgammon con su color correspondiente."""
 from core.ColorFicha import ColorFicha
 
 class Checker:
-    """Clase que representa una ficha del backgammon."""
-    def __init__(self, color: ColorFicha):
-        """Inicializar ficha con su color."""
-        self.__color = color
+    """Clase que representa una ficha del backgammon.
+
+    Una ficha solo guarda su color, así que se comparte una única instancia
+    inmutable por color: ``Checker(color)`` siempre devuelve la misma.
+    """
+    __slots__ = ("__color",)
+    __instancias = {}
+
+    def __new__(cls, color: ColorFicha):
+        """Obtener la ficha compartida del color pedido."""
+        ficha = cls.__instancias.get(color)
+        if ficha is None:
+            ficha = super().__new__(cls)
+            object.__setattr__(ficha, "_Checker__color", color)
+            cls.__instancias[color] = ficha
+        return ficha
 
     @property
     def color(self):
         """Obtener el color de la ficha."""
         return self.__color
 
+    def __setattr__(self, nombre, valor):
+        """Impedir modificar una ficha compartida."""
+        raise AttributeError("Las fichas son inmutables")
+
     def __str__(self):
         """Representación en string de la ficha."""
         return f"Checker({self.__color.name})"
@@ -22,3 +38,7 @@ class Checker:
         if isinstance(other, Checker):
             return self.__color == other.color  # Usar property en lugar de atributo privado
         return False
+
+    def __hash__(self):
+        """Hash consistente con la igualdad por color."""
+        return hash(self.__color)
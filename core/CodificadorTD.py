@@ -0,0 +1,108 @@
+"""Codificación de posiciones como entradas de red neuronal al estilo TD-Gammon."""
+import numpy as np
+
+from core.ColorFicha import ColorFicha
+
+
+class CodificadorTD:
+    """Convierte posiciones en vectores de 198 entradas.
+
+    La posición se ve desde el color ``color``: sus puntos se numeran según
+    su propio sentido de avance (0 es el más cercano a salir) y el rival se
+    describe sobre esa misma numeración. Las entradas son:
+
+    - 24 puntos x 4 unidades para las fichas propias y otras tantas para
+      las del rival: n >= 1, n >= 2, n >= 3 y (n - 3) / 2 si n > 3 (192).
+    - Fichas en la barra / 2, propias y del rival (2).
+    - Fichas sacadas / 15, propias y del rival (2).
+    - Turno: (1, 0) si tira ``color`` y (0, 1) si tira el rival (2).
+
+    Todo se calcula con operaciones de NumPy sobre el lote completo, así
+    que codificar miles de posiciones cuesta casi lo mismo que codificar una.
+    """
+    __slots__ = ()
+
+    ENTRADAS = 198
+    UNIDADES_POR_PUNTO = 4
+    TOTAL_FICHAS = 15
+    # Índice de cada punto visto desde las negras (su punto 0 es el 23 absoluto)
+    __ESPEJO = np.arange(23, -1, -1)
+
+    @staticmethod
+    def relativas(posiciones, negras):
+        """Ver un lote de posiciones desde el color indicado en cada fila.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo
+            negras (array-like): Lote (N,) de bool, True si la vista es de
+                las negras
+
+        Returns:
+            tuple: (puntos (N, 24) con fichas propias positivas en su
+                numeración, barra propia (N,), barra rival (N,))
+        """
+        posiciones = np.asarray(posiciones, dtype=np.int8).reshape(-1, 26)
+        negras = np.asarray(negras, dtype=bool).reshape(-1)
+        puntos = np.where(negras[:, None], -posiciones[:, CodificadorTD.__ESPEJO],
+                          posiciones[:, :24])
+        barra_blancas = posiciones[:, 24]
+        barra_negras = -posiciones[:, 25]
+        barra_propia = np.where(negras, barra_negras, barra_blancas)
+        barra_rival = np.where(negras, barra_blancas, barra_negras)
+        return puntos, barra_propia, barra_rival
+
+    @staticmethod
+    def __unidades(fichas):
+        """Convertir contadores (N, 24) en las 4 unidades por punto (N, 96)."""
+        unidades = np.empty(fichas.shape + (CodificadorTD.UNIDADES_POR_PUNTO,), dtype=np.float32)
+        unidades[..., 0] = fichas >= 1
+        unidades[..., 1] = fichas >= 2
+        unidades[..., 2] = fichas >= 3
+        unidades[..., 3] = np.maximum(fichas - 3, 0) / 2
+        return unidades.reshape(fichas.shape[0], -1)
+
+    @staticmethod
+    def codificar_lote(posiciones, negras, en_turno=False):
+        """Codificar un lote de posiciones.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo
+            negras (array-like): Lote (N,) de bool, o un solo bool para todo
+                el lote, con el color desde el que se ve cada posición
+            en_turno (bool): True si tira el color de la vista
+
+        Returns:
+            numpy.ndarray: Matriz (N, 198) de float32
+        """
+        posiciones = np.asarray(posiciones, dtype=np.int8).reshape(-1, 26)
+        negras = np.broadcast_to(np.asarray(negras, dtype=bool), (posiciones.shape[0],))
+        puntos, barra_propia, barra_rival = CodificadorTD.relativas(posiciones, negras)
+        propias = np.maximum(puntos, 0)
+        rivales = np.maximum(-puntos, 0)
+        fuera_propias = CodificadorTD.TOTAL_FICHAS - propias.sum(axis=1) - barra_propia
+        fuera_rivales = CodificadorTD.TOTAL_FICHAS - rivales.sum(axis=1) - barra_rival
+
+        entradas = np.empty((posiciones.shape[0], CodificadorTD.ENTRADAS), dtype=np.float32)
+        entradas[:, 0:96] = CodificadorTD.__unidades(propias)
+        entradas[:, 96:192] = CodificadorTD.__unidades(rivales)
+        entradas[:, 192] = barra_propia / 2
+        entradas[:, 193] = barra_rival / 2
+        entradas[:, 194] = fuera_propias / CodificadorTD.TOTAL_FICHAS
+        entradas[:, 195] = fuera_rivales / CodificadorTD.TOTAL_FICHAS
+        entradas[:, 196] = en_turno
+        entradas[:, 197] = not en_turno
+        return entradas
+
+    @staticmethod
+    def codificar(posicion, color, en_turno=False):
+        """Codificar una posición vista desde un color.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color de la vista
+            en_turno (bool): True si tira ``color``
+
+        Returns:
+            numpy.ndarray: Vector (198,) de float32
+        """
+        return CodificadorTD.codificar_lote([posicion], color == ColorFicha.NEGRA, en_turno)[0]
@@ -2,17 +2,45 @@
 from core.DiceRoller import DiceRoller
 
 class Dice:
-    """Maneja dados y movimientos disponibles en backgammon."""
+    """Maneja dados y movimientos disponibles en backgammon.
 
-    def __init__(self):
-        """Inicializar dados sin lanzamiento."""
-        self.__available_moves = []
+    Los movimientos que quedan se guardan como un contador por cara (1-6),
+    así que usar o devolver un movimiento es O(1). ``last_roll`` se arma a
+    partir de los contadores respetando el orden original de los dados y
+    se guarda hasta el siguiente cambio.
+    """
+    __slots__ = ("__roller", "__last_raw_roll", "__conteos", "__maximos", "__orden",
+                 "__restantes", "__vista")
+
+    CARAS = 6
+
+    def __init__(self, roller=None):
+        """Inicializar dados sin lanzamiento.
+
+        Args:
+            roller (DiceRoller): Generador de tiradas propio; si es None se
+                usa DiceRoller.roll_two_dice con el generador global
+        """
+        self.__roller = roller
         self.__last_raw_roll = None
+        self.__conteos = [0] * (Dice.CARAS + 1)
+        self.__maximos = (0,) * (Dice.CARAS + 1)
+        self.__orden = ()
+        self.__restantes = 0
+        self.__vista = ()
 
     @property
     def last_roll(self):
         """Obtener los movimientos disponibles del último lanzamiento."""
-        return tuple(self.__available_moves)
+        if self.__vista is None:
+            conteos = self.__conteos
+            self.__vista = tuple(cara for cara in self.__orden for _ in range(conteos[cara]))
+        return self.__vista
+
+    @property
+    def roller(self):
+        """Obtener el generador de tiradas de los dados (None si es el global)."""
+        return self.__roller
 
     @property
     def last_raw_roll(self):
@@ -22,10 +50,10 @@ class Dice:
     @staticmethod
     def _process_roll(dice_values):
         """Aplicar reglas de backgammon a un lanzamiento.
-        
+
         Args:
             dice_values (tuple): Valores de los dos dados
-            
+
         Returns:
             tuple: Movimientos disponibles según reglas de backgammon
         """
@@ -38,57 +66,138 @@ class Dice:
     @staticmethod
     def _is_double_roll(moves):
         """Verificar si los movimientos corresponden a un doble.
-        
+
         Args:
             moves (tuple): Movimientos disponibles
-            
+
         Returns:
             bool: True si es doble, False si no
         """
         return len(moves) == 4 and len(set(moves)) == 1
 
+    def __cargar_movimientos(self, moves):
+        """Reemplazar los contadores por los de una secuencia de movimientos."""
+        conteos = [0] * (Dice.CARAS + 1)
+        orden = []
+        for move in moves:
+            if not 1 <= move <= Dice.CARAS:
+                raise ValueError("Los dados deben valer entre 1 y 6")
+            if not conteos[move]:
+                orden.append(move)
+            conteos[move] += 1
+        self.__conteos = conteos
+        self.__maximos = tuple(conteos)
+        self.__orden = tuple(orden)
+        self.__restantes = len(moves)
+        self.__vista = None
+
     def roll(self):
         """Lanzar dados y configurar movimientos disponibles.
-        
+
         Returns:
             tuple: Valores originales de los dados
         """
         # Generar números aleatorios
-        self.__last_raw_roll = DiceRoller.roll_two_dice()
+        if self.__roller is not None:
+            return self.set_roll(self.__roller.tirar())
+        return self.set_roll(DiceRoller.roll_two_dice())
+
+    def set_roll(self, dice_values):
+        """Configurar un lanzamiento con valores conocidos.
+
+        Sirve para recorrer tiradas concretas en búsquedas y simulaciones
+        sin pasar por el generador aleatorio.
+
+        Args:
+            dice_values (tuple): Valores de los dos dados
 
+        Returns:
+            tuple: Valores originales de los dados
+        """
+        dice_values = tuple(dice_values)
         # Aplicar reglas de backgammon
-        moves = self._process_roll(self.__last_raw_roll)
+        self.__cargar_movimientos(self._process_roll(dice_values))
+        self.__last_raw_roll = dice_values
+        return dice_values
 
-        # Configurar movimientos disponibles
-        self.__available_moves = list(moves)
+    def set_moves(self, moves):
+        """Configurar directamente los movimientos disponibles.
 
-        return self.__last_raw_roll
+        El lanzamiento original queda sin valores, como en una posición
+        cargada a mitad de turno.
+
+        Args:
+            moves (Sequence[int]): Movimientos disponibles en orden
+        """
+        self.__cargar_movimientos(tuple(moves))
+        self.__last_raw_roll = None
 
     def is_double(self):
-        """Verificar si el último lanzamiento fue un doble."""
-        return self._is_double_roll(tuple(self.__available_moves))
+        """Verificar si el último lanzamiento fue un doble sin movimientos usados."""
+        # Cuatro movimientos que quedan y todos de la misma cara
+        return self.__restantes == 4 and self.__conteos[self.__orden[0]] == 4
 
     def get_moves_remaining(self):
         """Obtener cantidad de movimientos restantes."""
-        return len(self.__available_moves)
+        return self.__restantes
 
     def use_move(self, move):
         """Usar un movimiento si está disponible.
-        
+
         Args:
             move (int): Valor del movimiento a usar
-            
+
         Returns:
             bool: True si se pudo usar, False si no
         """
-        if move in self.__available_moves:
-            self.__available_moves.remove(move)
+        if 1 <= move <= Dice.CARAS and self.__conteos[move]:
+            self.__conteos[move] -= 1
+            self.__restantes -= 1
+            self.__vista = None
             return True
         return False
 
+    def restore_move(self, move):
+        """Devolver un movimiento usado del lanzamiento actual.
+
+        El movimiento vuelve a su lugar según el orden original de los dados,
+        de modo que usar y devolver deja last_roll exactamente igual.
+
+        Args:
+            move (int): Valor del movimiento a devolver
+
+        Raises:
+            ValueError: Si el movimiento no fue usado en este lanzamiento
+        """
+        if not 1 <= move <= Dice.CARAS or self.__conteos[move] >= self.__maximos[move]:
+            raise ValueError("El movimiento no fue usado en este lanzamiento")
+        self.__conteos[move] += 1
+        self.__restantes += 1
+        self.__vista = None
+
+    def snapshot(self):
+        """Guardar el estado completo de los dados para restaurarlo después.
+
+        Returns:
+            tuple: Estado inmutable para pasar a restore
+        """
+        return (self.__last_raw_roll, tuple(self.__conteos), self.__maximos, self.__orden,
+                self.__restantes)
+
+    def restore(self, estado):
+        """Volver a un estado guardado con snapshot.
+
+        Args:
+            estado (tuple): Estado devuelto por snapshot
+        """
+        raw, conteos, self.__maximos, self.__orden, self.__restantes = estado
+        self.__last_raw_roll = raw
+        self.__conteos = list(conteos)
+        self.__vista = None
+
     def clear_roll(self):
         """Limpiar el lanzamiento actual."""
-        self.__available_moves = []
+        self.__cargar_movimientos(())
         self.__last_raw_roll = None
 
     def get_roll_values(self):
@@ -97,4 +206,4 @@ class Dice:
 
     def has_moves_available(self):
         """Verificar si quedan movimientos disponibles."""
-        return len(self.__available_moves) > 0
+        return self.__restantes > 0
@@ -1,14 +1,118 @@
 """Módulo para generar números aleatorios de dados."""
+import hashlib
 import random
 
+# Bytes aceptados (0-251, múltiplo de 6) convertidos a caras 1-6; el resto se descarta
+_CARAS_POR_BYTE = bytes(valor % 6 + 1 if valor < 252 else 0 for valor in range(256))
+_BYTES_DESCARTADOS = bytes(range(252, 256))
+
 
 class DiceRoller:
-    """Responsable únicamente de generar números aleatorios de dados."""
+    """Responsable únicamente de generar números aleatorios de dados.
+
+    El método estático ``roll_two_dice`` usa el generador global de
+    ``random``. Una instancia de DiceRoller, en cambio, tiene su propio
+    generador (con semilla o inyectado) y sirve las tiradas desde un buffer
+    de caras que se llena por bloques:
+
+    - Por defecto se usa ``random.Random``: cada bloque sale de
+      ``randbytes`` descartando los bytes 252-255 para que las seis caras
+      sean equiprobables.
+    - Cualquier generador con ``integers(bajo, alto, size=..., dtype=...)``
+      (por ejemplo ``numpy.random.Generator``) llena el bloque de una vez.
+    """
+    __slots__ = ("__rng", "__tamano_buffer", "__buffer", "__indice")
+
+    TAMANO_BUFFER = 65536
+
+    def __init__(self, seed=None, rng=None, tamano_buffer=TAMANO_BUFFER):
+        """Crear un generador de tiradas con su propio flujo aleatorio.
+
+        Args:
+            seed (int): Semilla para el generador por defecto
+            rng: Generador a usar en lugar de random.Random(seed)
+            tamano_buffer (int): Caras generadas en cada bloque
+        """
+        if rng is not None and seed is not None:
+            raise ValueError("Use una semilla o un generador, no ambos")
+        if tamano_buffer < 2:
+            raise ValueError("El buffer debe tener lugar para al menos una tirada")
+        if rng is None:
+            rng = random.Random(seed)
+        elif not hasattr(rng, "integers") and not hasattr(rng, "randbytes"):
+            raise TypeError("El generador debe tener integers o randbytes")
+        self.__rng = rng
+        self.__tamano_buffer = tamano_buffer - tamano_buffer % 2
+        self.__buffer = b""
+        self.__indice = 0
+
     @staticmethod
     def roll_two_dice():
         """Lanza dos dados de 6 caras.
-        
+
         Returns:
             tuple: Tupla con los valores de los dos dados (1-6)
         """
         return (random.randint(1, 6), random.randint(1, 6))
+
+    @staticmethod
+    def semilla_de_flujo(seed, indice):
+        """Derivar la semilla del flujo número ``indice`` de una semilla base.
+
+        Los flujos derivados no dependen del orden en que se crean, así que
+        la partida ``indice`` recibe siempre los mismos dados.
+
+        Args:
+            seed (int): Semilla base
+            indice (int): Número de flujo
+
+        Returns:
+            int: Semilla de 128 bits del flujo
+        """
+        digest = hashlib.sha256(f"{seed}:{indice}".encode("ascii")).digest()
+        return int.from_bytes(digest[:16], "little")
+
+    @staticmethod
+    def flujos(seed, cantidad, tamano_buffer=TAMANO_BUFFER):
+        """Crear generadores independientes a partir de una semilla base.
+
+        Args:
+            seed (int): Semilla base
+            cantidad (int): Cantidad de generadores
+            tamano_buffer (int): Caras por bloque de cada generador
+
+        Returns:
+            list: Un DiceRoller por flujo
+        """
+        return [DiceRoller(DiceRoller.semilla_de_flujo(seed, indice), tamano_buffer=tamano_buffer)
+                for indice in range(cantidad)]
+
+    def __rellenar(self):
+        """Generar un bloque nuevo de caras."""
+        rng = self.__rng
+        tamano = self.__tamano_buffer
+        if hasattr(rng, "integers"):
+            buffer = bytes(rng.integers(1, 7, size=tamano, dtype="uint8"))
+        else:
+            buffer = b""
+            while len(buffer) < tamano:
+                # Se piden bytes de más para cubrir el ~1.6% que se descarta
+                datos = rng.randbytes(tamano - len(buffer) + tamano // 32 + 8)
+                buffer += datos.translate(_CARAS_POR_BYTE, _BYTES_DESCARTADOS)
+            buffer = buffer[:tamano]
+        self.__buffer = buffer
+        self.__indice = 0
+
+    def tirar(self):
+        """Lanzar dos dados usando el buffer.
+
+        Returns:
+            tuple: Tupla con los valores de los dos dados (1-6)
+        """
+        indice = self.__indice
+        if indice >= len(self.__buffer):
+            self.__rellenar()
+            indice = 0
+        buffer = self.__buffer
+        self.__indice = indice + 2
+        return (buffer[indice], buffer[indice + 1])
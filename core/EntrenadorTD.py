@@ -0,0 +1,398 @@
+"""Entrenamiento TD(lambda) por autojuego de la red neuronal evaluadora.
+
+Se ejecuta como módulo:
+
+    python -m core.EntrenadorTD --games 10000 --workers 4 --checkpoints redes/
+
+Cada proceso juega en paralelo (en "lockstep") un lote de partidas contra
+sí mismo: en cada paso tira los dados de todas las partidas activas,
+genera sus jugadas candidatas con una sola llamada a BatchMoveGenerator,
+las evalúa todas en una sola pasada de la red y hace
+una única actualización TD(lambda) vectorizada para todas. Con varios
+procesos, cada ronda parte de los mismos pesos, cada proceso entrena su
+copia con sus propias partidas y al final se promedian los cambios.
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.BatchMoveGenerator import BatchMoveGenerator
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.CodificadorTD import CodificadorTD
+from core.DiceRoller import DiceRoller
+from core.EvaluadorRed import EvaluadorRed
+from core.RedNeuronal import RedNeuronal
+
+
+def _matriz_vista_negras():
+    """Matriz que pasa las salidas vistas por las negras al punto de vista de las blancas."""
+    matriz = np.zeros((RedNeuronal.SALIDAS, RedNeuronal.SALIDAS), dtype=np.float32)
+    matriz[0, 0] = -1
+    for salida_blancas, salida_negras in ((1, 3), (2, 4), (3, 1), (4, 2)):
+        matriz[salida_blancas, salida_negras] = 1
+    return matriz
+
+
+class EntrenadorTD:
+    """Entrena una RedNeuronal con TD(lambda) jugando partidas contra sí misma.
+
+    Las salidas de la red se expresan para el color que acaba de mover;
+    para el error temporal se llevan al punto de vista fijo de las blancas
+    (ganar de las negras es perder de las blancas, y sus gammons se
+    intercambian). Cada partida tiene sus trazas de elegibilidad, una por
+    salida, y el error de la última posición se mide contra el resultado
+    exacto de la partida.
+    """
+    __slots__ = ("__red", "__alfa", "__lambda", "__paralelas")
+
+    ALFA = 0.1
+    LAMBDA = 0.7
+    PARALELAS = 32
+    MAX_MEDIOS_TURNOS = 10000
+    # Transformación afín (constante, matriz) de cada punto de vista al de las blancas
+    VISTAS = (
+        (np.zeros(RedNeuronal.SALIDAS, dtype=np.float32),
+         np.eye(RedNeuronal.SALIDAS, dtype=np.float32)),
+        (np.array([1, 0, 0, 0, 0], dtype=np.float32), _matriz_vista_negras()),
+    )
+
+    def __init__(self, red=None, alfa=ALFA, lambda_td=LAMBDA, paralelas=PARALELAS):
+        """Configurar el entrenamiento.
+
+        Args:
+            red (RedNeuronal): Red a entrenar; por defecto una nueva
+            alfa (float): Tasa de aprendizaje
+            lambda_td (float): Decaimiento de las trazas de elegibilidad
+            paralelas (int): Partidas simultáneas por proceso
+        """
+        if alfa <= 0:
+            raise ValueError("La tasa de aprendizaje debe ser positiva")
+        if not 0 <= lambda_td <= 1:
+            raise ValueError("Lambda debe estar entre 0 y 1")
+        if paralelas < 1:
+            raise ValueError("Debe jugarse al menos una partida a la vez")
+        self.__red = red if red is not None else RedNeuronal()
+        self.__alfa = alfa
+        self.__lambda = lambda_td
+        self.__paralelas = paralelas
+
+    @property
+    def red(self):
+        """Obtener la red que se entrena."""
+        return self.__red
+
+    @staticmethod
+    def a_blancas(probabilidades, negras):
+        """Pasar probabilidades del color que movió al punto de vista de las blancas.
+
+        Args:
+            probabilidades (numpy.ndarray): Lote (N, 5)
+            negras (numpy.ndarray): Lote (N,) de bool, True si movieron las negras
+
+        Returns:
+            numpy.ndarray: Lote (N, 5) para las blancas
+        """
+        constante_negras, matriz_negras = EntrenadorTD.VISTAS[1]
+        vistas_negras = constante_negras + probabilidades @ matriz_negras.T
+        return np.where(negras[:, None], vistas_negras, probabilidades).astype(np.float32)
+
+    @staticmethod
+    def gradientes(red, entradas, negras):
+        """Calcular las salidas y sus gradientes, vistos por las blancas, de un lote.
+
+        Args:
+            red (RedNeuronal): Red a derivar
+            entradas (numpy.ndarray): Posiciones codificadas (n, 198)
+            negras (numpy.ndarray): Lote (n,) de bool, True si movieron las negras
+
+        Returns:
+            tuple: (salidas (n, 5) para las blancas, gradientes (n, 5, ...) de
+                cada salida respecto de cada parámetro, en el orden de
+                RedNeuronal.PARAMETROS)
+        """
+        _, _, pesos_salida, sesgos_salida = red.parametros
+        ocultas = red.ocultar(entradas)
+        salidas = RedNeuronal.sigmoide(ocultas @ pesos_salida + sesgos_salida)
+        # Derivada de cada salida vista por las blancas (k) respecto de cada neta de salida (j)
+        matrices = np.where(negras[:, None, None], EntrenadorTD.VISTAS[1][1],
+                            EntrenadorTD.VISTAS[0][1])
+        salida_neta = matrices * (salidas * (1 - salidas))[:, None, :]
+        oculta_neta = (salida_neta @ pesos_salida.T) * (ocultas * (1 - ocultas))[:, None, :]
+        return EntrenadorTD.a_blancas(salidas, negras), (
+            entradas[:, None, :, None] * oculta_neta[:, :, None, :],
+            oculta_neta,
+            ocultas[:, None, :, None] * salida_neta[:, :, None, :],
+            salida_neta,
+        )
+
+    @staticmethod
+    def __actualizar(red, trazas, cupos, entradas, negras, objetivos, alfa, lambda_td):
+        """Decaer y sumar las trazas de las partidas indicadas y aplicar el paso TD.
+
+        Args:
+            red (RedNeuronal): Red cuyos parámetros se modifican en el lugar
+            trazas (list): Trazas (cupos, 5, ...) de cada parámetro, que se
+                modifican en el lugar
+            cupos (numpy.ndarray): Partidas con posición anterior
+            entradas (numpy.ndarray): Posiciones anteriores codificadas (n, 198)
+            negras (numpy.ndarray): Color que movió en cada posición anterior
+            objetivos (numpy.ndarray): Valor siguiente para las blancas (n, 5)
+            alfa (float): Tasa de aprendizaje
+            lambda_td (float): Decaimiento de las trazas
+        """
+        salidas, gradientes = EntrenadorTD.gradientes(red, entradas, negras)
+        errores = np.zeros((trazas[0].shape[0], RedNeuronal.SALIDAS), dtype=np.float32)
+        errores[cupos] = objetivos - salidas
+        # Las trazas de partidas sin posición anterior están en cero y siguen así
+        todas = len(cupos) == len(errores)
+        for traza, gradiente in zip(trazas, gradientes):
+            traza *= lambda_td
+            if todas:
+                traza += gradiente
+            else:
+                traza[cupos] += gradiente
+        # Paso TD: suma de errores por trazas como un solo producto de matrices por parámetro
+        errores = errores.reshape(1, -1)
+        for parametro, traza in zip(red.parametros, trazas):
+            parametro += alfa * (errores @ traza.reshape(errores.shape[1], -1)).reshape(
+                parametro.shape)
+
+    @staticmethod
+    def jugar_ronda(red, roller, partidas, paralelas, alfa, lambda_td):
+        """Jugar y aprender de una cantidad de partidas en lockstep.
+
+        Args:
+            red (RedNeuronal): Red que elige las jugadas y se entrena en el lugar
+            roller (DiceRoller): Generador de las tiradas
+            partidas (int): Partidas a completar
+            paralelas (int): Partidas simultáneas
+            alfa (float): Tasa de aprendizaje
+            lambda_td (float): Decaimiento de las trazas
+
+        Returns:
+            dict: partidas, posiciones entrenadas y victorias de las blancas
+        """
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        inicial = np.array(board.posicion, dtype=np.int8)
+        cupos = min(paralelas, partidas)
+        formas = [(cupos, RedNeuronal.SALIDAS) + parametro.shape for parametro in red.parametros]
+        trazas = [np.zeros(forma, dtype=np.float32) for forma in formas]
+        posiciones = np.tile(inicial, (cupos, 1))
+        negras = np.zeros(cupos, dtype=bool)
+        anteriores = np.zeros((cupos, CodificadorTD.ENTRADAS), dtype=np.float32)
+        con_anterior = np.zeros(cupos, dtype=bool)
+        medios_turnos = [0] * cupos
+        activas = list(range(cupos))
+        iniciadas = cupos
+        estadisticas = {"partidas": 0, "posiciones": 0, "victorias_blancas": 0}
+
+        while activas:
+            tiradas = []
+            for cupo in activas:
+                if medios_turnos[cupo] == 0:
+                    # La primera tirada no es doble y decide quién empieza
+                    tirada = roller.tirar()
+                    while tirada[0] == tirada[1]:
+                        tirada = roller.tirar()
+                    negras[cupo] = tirada[0] < tirada[1]
+                else:
+                    negras[cupo] = not negras[cupo]
+                    tirada = roller.tirar()
+                tiradas.append(tirada)
+            # Todas las candidatas de todas las partidas salen de una sola llamada
+            indices = np.array(activas)
+            candidatas, limites = BatchMoveGenerator.generar_posiciones(
+                posiciones[indices], negras[indices], tiradas)
+
+            # Una sola pasada de la red para todas las candidatas de todas las partidas
+            negras_activas = negras[indices]
+            negras_candidatas = np.repeat(negras_activas, np.diff(limites))
+            entradas = CodificadorTD.codificar_lote(candidatas, negras_candidatas)
+            probabilidades = red.propagar(entradas)
+            terminadas, finales = EvaluadorRed.probabilidades_finales(candidatas,
+                                                                      negras_candidatas)
+            probabilidades[terminadas] = finales[terminadas]
+            equidades = RedNeuronal.equidad(probabilidades)
+            # Primera candidata de mayor equidad de cada partida: como BatchMoveGenerator
+            # ordena las sucesoras por sus bytes, los empates se desempatan por la
+            # posición y no por el orden en que se generaron las jugadas
+            inicios = limites[:-1]
+            mejores = np.maximum.reduceat(equidades, inicios)
+            empatadas = np.flatnonzero(equidades == np.repeat(mejores, np.diff(limites)))
+            elegidas = empatadas[np.searchsorted(empatadas, inicios)]
+
+            previas = con_anterior[indices]
+            if previas.any():
+                cupos_previos = indices[previas]
+                objetivos = EntrenadorTD.a_blancas(probabilidades[elegidas[previas]],
+                                                   negras_activas[previas])
+                EntrenadorTD.__actualizar(red, trazas, cupos_previos, anteriores[cupos_previos],
+                                          ~negras_activas[previas], objetivos, alfa, lambda_td)
+                estadisticas["posiciones"] += len(cupos_previos)
+
+            siguientes = []
+            for cupo, elegida in zip(activas, elegidas):
+                medios_turnos[cupo] += 1
+                if terminadas[elegida]:
+                    estadisticas["partidas"] += 1
+                    estadisticas["victorias_blancas"] += not negras[cupo]
+                    if iniciadas == partidas:
+                        continue
+                    iniciadas += 1
+                    posiciones[cupo] = inicial
+                    medios_turnos[cupo] = 0
+                    con_anterior[cupo] = False
+                    for traza in trazas:
+                        traza[cupo] = 0
+                elif medios_turnos[cupo] > EntrenadorTD.MAX_MEDIOS_TURNOS:
+                    raise RuntimeError("La partida superó el máximo de medios turnos")
+                else:
+                    posiciones[cupo] = candidatas[elegida]
+                    anteriores[cupo] = entradas[elegida]
+                    con_anterior[cupo] = True
+                siguientes.append(cupo)
+            activas = siguientes
+        return estadisticas
+
+    @staticmethod
+    def entrenar_ronda(tarea):
+        """Entrenar una copia de la red durante una ronda en un proceso.
+
+        Args:
+            tarea (tuple): (parámetros, semilla, partidas, paralelas, alfa, lambda)
+
+        Returns:
+            tuple: (cambio de cada parámetro, estadísticas de la ronda)
+        """
+        parametros, semilla, partidas, paralelas, alfa, lambda_td = tarea
+        red = RedNeuronal(*parametros[0].shape)
+        red.fijar_parametros(parametros)
+        estadisticas = EntrenadorTD.jugar_ronda(red, DiceRoller(semilla), partidas, paralelas,
+                                                alfa, lambda_td)
+        cambios = [nuevo - viejo for nuevo, viejo in zip(red.parametros, parametros)]
+        return cambios, estadisticas
+
+    def entrenar(self, partidas, workers=1, partidas_por_ronda=None, semilla=None,
+                 carpeta_checkpoints=None, rondas_por_checkpoint=1, informar=None):
+        """Entrenar la red con partidas de autojuego.
+
+        Args:
+            partidas (int): Partidas totales
+            workers (int): Procesos; con 1 se entrena en este proceso
+            partidas_por_ronda (int): Partidas de cada proceso entre
+                sincronizaciones; por defecto 4 veces las paralelas
+            semilla (int): Semilla base; si es None se elige una al azar
+            carpeta_checkpoints (str): Carpeta donde guardar los pesos, o None
+            rondas_por_checkpoint (int): Rondas entre checkpoints
+            informar (callable): Función que recibe las estadísticas
+                acumuladas al terminar cada ronda
+
+        Returns:
+            dict: partidas, posiciones, victorias_blancas, rondas, segundos,
+                posiciones_por_segundo y semilla
+        """
+        if partidas < 1:
+            raise ValueError("Debe jugarse al menos una partida")
+        if workers < 1:
+            raise ValueError("Debe usarse al menos un worker")
+        if partidas_por_ronda is None:
+            partidas_por_ronda = 4 * self.__paralelas
+        if semilla is None:
+            semilla = random.randrange(2 ** 63)
+        if carpeta_checkpoints is not None:
+            os.makedirs(carpeta_checkpoints, exist_ok=True)
+
+        totales = {"partidas": 0, "posiciones": 0, "victorias_blancas": 0, "rondas": 0,
+                   "semilla": semilla}
+        inicio = time.perf_counter()
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while totales["partidas"] < partidas:
+                restantes = partidas - totales["partidas"]
+                por_worker = [min(partidas_por_ronda, restantes * (indice + 1) // workers
+                                  - restantes * indice // workers)
+                              for indice in range(workers)]
+                semillas = [DiceRoller.semilla_de_flujo(semilla, totales["rondas"] * workers
+                                                        + indice) for indice in range(workers)]
+                if pool is None:
+                    resultados = [(None, EntrenadorTD.jugar_ronda(
+                        self.__red, DiceRoller(semillas[0]), por_worker[0], self.__paralelas,
+                        self.__alfa, self.__lambda))]
+                else:
+                    parametros = [parametro.copy() for parametro in self.__red.parametros]
+                    tareas = [(parametros, semilla_worker, cantidad, self.__paralelas,
+                               self.__alfa, self.__lambda)
+                              for semilla_worker, cantidad in zip(semillas, por_worker)
+                              if cantidad > 0]
+                    resultados = list(pool.map(EntrenadorTD.entrenar_ronda, tareas))
+                    for indice, parametro in enumerate(self.__red.parametros):
+                        parametro += sum(cambios[indice] for cambios, _ in resultados) \
+                            / len(resultados)
+
+                for _, estadisticas in resultados:
+                    for clave, valor in estadisticas.items():
+                        totales[clave] += valor
+                totales["rondas"] += 1
+                totales["segundos"] = time.perf_counter() - inicio
+                totales["posiciones_por_segundo"] = (totales["posiciones"] / totales["segundos"]
+                                                     if totales["segundos"] > 0 else 0.0)
+                if carpeta_checkpoints is not None and (
+                        totales["rondas"] % rondas_por_checkpoint == 0
+                        or totales["partidas"] >= partidas):
+                    self.__red.guardar(os.path.join(carpeta_checkpoints,
+                                                    f"red_{totales['partidas']:08d}.npz"))
+                if informar is not None:
+                    informar(dict(totales))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return totales
+
+
+def main(argumentos=None):
+    """Entrenar la red desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Entrenamiento TD(lambda) por autojuego")
+    parser.add_argument("--games", type=int, default=1000, help="Partidas totales")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Procesos en paralelo")
+    parser.add_argument("--parallel", type=int, default=EntrenadorTD.PARALELAS,
+                        help="Partidas simultáneas por proceso")
+    parser.add_argument("--round-games", type=int, default=None,
+                        help="Partidas por proceso entre sincronizaciones de pesos")
+    parser.add_argument("--alpha", type=float, default=EntrenadorTD.ALFA,
+                        help="Tasa de aprendizaje")
+    parser.add_argument("--lambda", dest="lambda_td", type=float, default=EntrenadorTD.LAMBDA,
+                        help="Decaimiento de las trazas")
+    parser.add_argument("--hidden", type=int, default=RedNeuronal.OCULTAS,
+                        help="Unidades ocultas de una red nueva")
+    parser.add_argument("--network", default=None, help="Red .npz desde la que continuar")
+    parser.add_argument("--checkpoints", default=None, help="Carpeta de checkpoints")
+    parser.add_argument("--checkpoint-every", type=int, default=10,
+                        help="Rondas entre checkpoints")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.network is not None:
+        red = RedNeuronal.cargar(opciones.network)
+    else:
+        red = RedNeuronal(ocultas=opciones.hidden, semilla=opciones.seed)
+    entrenador = EntrenadorTD(red, opciones.alpha, opciones.lambda_td, opciones.parallel)
+
+    def informar(totales):
+        print(f"Ronda {totales['rondas']}: {totales['partidas']} partidas, "
+              f"{totales['posiciones_por_segundo']:.0f} posiciones/s, "
+              f"blancas {100 * totales['victorias_blancas'] / totales['partidas']:.1f}%")
+
+    return entrenador.entrenar(opciones.games, opciones.workers, opciones.round_games,
+                               opciones.seed, opciones.checkpoints, opciones.checkpoint_every,
+                               informar)
+
+
+if __name__ == "__main__":
+    main()
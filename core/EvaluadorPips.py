@@ -0,0 +1,49 @@
+"""Evaluador heurístico de posiciones basado en el conteo de pips."""
+import math
+
+from core.Board import Board
+from core.ColorFicha import ColorFicha
+
+
+class EvaluadorPips:
+    """Estima la equidad de una posición a partir de la carrera y las fichas sueltas.
+
+    ``evaluar(posicion, color)`` devuelve la equidad para ``color`` cuando
+    acaba de mover y el rival tiene el turno. Es la interfaz que esperan
+    los motores de búsqueda: cualquier objeto con ese método y un atributo
+    ``LIMITES`` con el rango de sus valores sirve como evaluador.
+    """
+    __slots__ = ()
+
+    LIMITES = (-1.0, 1.0)
+    # Pips que vale tener el próximo turno
+    VENTAJA_TURNO = 8
+    PENALIZACION_BLOT = 4
+    ESCALA = 20.0
+
+    def evaluar(self, posicion, color):
+        """Evaluar una posición después de que ``color`` movió.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            float: Equidad estimada para ``color`` dentro de LIMITES
+        """
+        pips_blancas = 0
+        pips_negras = 0
+        blots_blancas = 0
+        blots_negras = 0
+        for casilla, valor in enumerate(posicion):
+            if valor > 0:
+                pips_blancas += valor * Board.PIPS_BLANCAS[casilla]
+                blots_blancas += valor == 1 and casilla < 24
+            elif valor < 0:
+                pips_negras -= valor * Board.PIPS_NEGRAS[casilla]
+                blots_negras += valor == -1 and casilla < 24
+        if color == ColorFicha.BLANCA:
+            ventaja = pips_negras - pips_blancas - EvaluadorPips.PENALIZACION_BLOT * blots_blancas
+        else:
+            ventaja = pips_blancas - pips_negras - EvaluadorPips.PENALIZACION_BLOT * blots_negras
+        return math.tanh((ventaja - EvaluadorPips.VENTAJA_TURNO) / EvaluadorPips.ESCALA)
@@ -0,0 +1,119 @@
+"""Evaluador de posiciones basado en una red neuronal con evaluación por lotes."""
+import numpy as np
+
+from core.CodificadorTD import CodificadorTD
+from core.ColorFicha import ColorFicha
+from core.RedNeuronal import RedNeuronal
+
+
+class EvaluadorRed:
+    """Evalúa posiciones con una RedNeuronal sobre entradas de CodificadorTD.
+
+    Cumple la interfaz de evaluador de los motores de búsqueda
+    (``evaluar(posicion, color)`` para el color que acaba de mover) y la
+    de las políticas (``elegir_jugada(opciones, color)``). Además expone
+    ``evaluar_lote``, que valora todas las posiciones de una vez: elegir
+    jugada codifica y evalúa todas las opciones de la tirada en una sola
+    llamada a la red.
+
+    Las posiciones terminadas no pasan por la red: valen exactamente 1, 2
+    o 3 para el color que sacó todas sus fichas.
+    """
+    __slots__ = ("__red",)
+
+    LIMITES = (-3.0, 3.0)
+
+    def __init__(self, red=None, semilla=None):
+        """Crear el evaluador.
+
+        Args:
+            red (RedNeuronal): Red a usar; por defecto una nueva sin entrenar
+            semilla (int): Semilla de la red nueva si no se indica ``red``
+        """
+        self.__red = red if red is not None else RedNeuronal(semilla=semilla)
+
+    @property
+    def red(self):
+        """Obtener la red neuronal del evaluador."""
+        return self.__red
+
+    @staticmethod
+    def probabilidades_finales(posiciones, negras):
+        """Detectar posiciones terminadas y sus probabilidades exactas.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo
+            negras (array-like): Lote (N,) de bool con el color de la vista
+
+        Returns:
+            tuple: (máscara (N,) de posiciones donde el color de la vista ya
+                sacó todas sus fichas, probabilidades (N, 5) para esas filas)
+        """
+        puntos, barra_propia, barra_rival = CodificadorTD.relativas(posiciones, negras)
+        propias = np.maximum(puntos, 0).sum(axis=1) + barra_propia
+        rivales = np.maximum(-puntos, 0).sum(axis=1) + barra_rival
+        terminadas = propias == 0
+        gammon = rivales == CodificadorTD.TOTAL_FICHAS
+        backgammon = gammon & ((barra_rival > 0) | (puntos[:, :6] < 0).any(axis=1))
+        probabilidades = np.zeros((len(terminadas), RedNeuronal.SALIDAS), dtype=np.float32)
+        probabilidades[:, 0] = 1
+        probabilidades[:, 1] = gammon
+        probabilidades[:, 2] = backgammon
+        return terminadas, probabilidades
+
+    def probabilidades_lote(self, posiciones, color):
+        """Obtener las 5 probabilidades de un lote de posiciones tras mover ``color``.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo
+            color (ColorFicha): Color que acaba de mover en todas
+
+        Returns:
+            numpy.ndarray: Probabilidades (N, 5) para ``color``
+        """
+        posiciones = np.asarray(posiciones, dtype=np.int8).reshape(-1, 26)
+        negras = np.full(posiciones.shape[0], color == ColorFicha.NEGRA)
+        probabilidades = self.__red.propagar(CodificadorTD.codificar_lote(posiciones, negras))
+        terminadas, finales = EvaluadorRed.probabilidades_finales(posiciones, negras)
+        if terminadas.any():
+            probabilidades[terminadas] = finales[terminadas]
+        return probabilidades
+
+    def evaluar_lote(self, posiciones, color):
+        """Evaluar un lote de posiciones tras mover ``color``.
+
+        Args:
+            posiciones (array-like): Lote (N, 26) de contadores con signo
+            color (ColorFicha): Color que acaba de mover en todas
+
+        Returns:
+            numpy.ndarray: Equidades (N,) para ``color``
+        """
+        return RedNeuronal.equidad(self.probabilidades_lote(posiciones, color))
+
+    def evaluar(self, posicion, color):
+        """Evaluar una posición después de que ``color`` movió.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            float: Equidad estimada para ``color`` dentro de LIMITES
+        """
+        return float(self.evaluar_lote([posicion], color)[0])
+
+    def elegir_jugada(self, opciones, color):
+        """Elegir la opción de mayor equidad evaluando todas en un solo lote.
+
+        Args:
+            opciones (list): Pares (jugada, posición resultante)
+            color (ColorFicha): Color que mueve
+
+        Returns:
+            tuple: El par elegido
+        """
+        if len(opciones) == 1:
+            return opciones[0]
+        equidades = self.evaluar_lote([posicion for _, posicion in opciones], color)
+        return opciones[int(np.argmax(equidades))]
@@ -0,0 +1,369 @@
+"""Motor de búsqueda expectimax con poda Star1/Star2 sobre las 21 tiradas distintas."""
+import time
+
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.EvaluadorPips import EvaluadorPips
+from core.MoveGenerator import MoveGenerator
+from core.TablaTransposicion import TablaTransposicion
+
+
+class PresupuestoAgotado(Exception):
+    """Se superó el límite de nodos o de tiempo de una búsqueda."""
+
+
+class Expectimax:
+    """Ordena las jugadas de una tirada por su equidad con búsqueda expectimax.
+
+    Un nivel de profundidad ("ply") es una tirada del rival: con
+    profundidad 0 se evalúa cada posición resultante con el evaluador; con
+    profundidad n cada posición es un nodo de azar que promedia las 21
+    tiradas distintas del rival (dobles con peso 1/36, el resto 2/36) y en
+    cada tirada el rival elige su mejor jugada buscando con profundidad
+    n - 1.
+
+    Los nodos de azar se podan con Star1: como toda equidad está dentro de
+    ``[minimo, maximo]``, los hijos ya calculados acotan el promedio y la
+    búsqueda se corta en cuanto queda fuera de la ventana alfa-beta. Con
+    Star2, antes de eso se sondea una jugada por tirada: su valor es una
+    cota inferior del rival que ajusta la cota superior del promedio y
+    permite cortar antes; el valor sondeado se reutiliza después.
+
+    La búsqueda avanza por profundidad creciente. Si se agota el
+    presupuesto de nodos o de tiempo, se devuelve el orden de la última
+    profundidad completa (la profundidad 0 siempre se completa).
+
+    Si el evaluador tiene ``evaluar_lote(posiciones, color)``, las hojas de
+    una misma tirada y el orden de las jugadas se evalúan en un solo lote.
+
+    Con una BaseBearOff o una BaseBearOffDosLados, las posiciones en las
+    que ambos colores tienen todas sus fichas en casa (y que la base
+    cubre) se valoran directamente con la base, sin buscar más allá.
+
+    Los finales se puntúan con la cantidad de fichas por color de la
+    variante (``fichas``): hay gammon si el rival no sacó ninguna.
+
+    Con una TablaTransposicion, los nodos de azar ya buscados (misma
+    posición, rival por tirar) se reutilizan entre jugadas, tiradas y
+    profundidades de la iteración. Solo se usan entradas de la misma
+    profundidad, así que el resultado es idéntico al de la búsqueda sin
+    tabla.
+    """
+
+    # (movimientos, probabilidad) de cada tirada distinta, primero las no dobles
+    TIRADAS = tuple(sorted(
+        (((dado_1, dado_2) if dado_1 != dado_2 else (dado_1,) * 4,
+          (1 if dado_1 == dado_2 else 2) / 36)
+         for dado_1 in range(1, 7) for dado_2 in range(dado_1, 7)),
+        key=lambda tirada: -tirada[1]))
+    MINIMO = -3.0
+    MAXIMO = 3.0
+    FICHAS = BoardInitializer.VARIANTES["estandar"]
+    # Cada cuántos nodos se consulta el reloj
+    INTERVALO_RELOJ = 256
+
+    def __init__(self, evaluador=None, limite_nodos=None, limite_segundos=None, star2=True,
+                 minimo=MINIMO, maximo=MAXIMO, tabla=None, bear_off=None, fichas=FICHAS):
+        """Configurar el motor de búsqueda.
+
+        Args:
+            evaluador: Objeto con ``evaluar(posicion, color)``; por defecto
+                EvaluadorPips
+            limite_nodos (int): Máximo de nodos por análisis, o None
+            limite_segundos (float): Máximo de tiempo por análisis, o None
+            star2 (bool): Sondear una jugada por tirada antes de Star1
+            minimo (float): Menor equidad posible (evaluador y finales)
+            maximo (float): Mayor equidad posible (evaluador y finales)
+            tabla (TablaTransposicion): Caché de nodos compartida entre
+                análisis, o None para no usar caché
+            bear_off: Base con ``cubre(posicion)`` y ``evaluar(posicion,
+                color)`` para valorar los finales de bear off sin contacto
+                (BaseBearOff o BaseBearOffDosLados), o None
+            fichas (int): Fichas por color de la variante (ver
+                BoardInitializer.VARIANTES)
+        """
+        if minimo >= maximo:
+            raise ValueError("El mínimo de equidad debe ser menor que el máximo")
+        if fichas < 1:
+            raise ValueError("Cada color debe tener al menos una ficha")
+        self.__evaluador = evaluador if evaluador is not None else EvaluadorPips()
+        self.__limite_nodos = limite_nodos
+        self.__limite_segundos = limite_segundos
+        self.__star2 = star2
+        self.__minimo = minimo
+        self.__maximo = maximo
+        self.__tabla = tabla
+        self.__bear_off = bear_off
+        self.__fichas = fichas
+        self.__lote = getattr(self.__evaluador, "evaluar_lote", None)
+        self.__nodos = 0
+        self.__fin = None
+        self.__con_presupuesto = False
+        self.__profundidad_completada = None
+
+    @property
+    def nodos(self):
+        """Obtener los nodos visitados en el último análisis."""
+        return self.__nodos
+
+    @property
+    def profundidad_completada(self):
+        """Obtener la mayor profundidad completada en el último análisis."""
+        return self.__profundidad_completada
+
+    @property
+    def tabla(self):
+        """Obtener la tabla de transposición en uso, o None."""
+        return self.__tabla
+
+    def analizar(self, posicion, color, movimientos, profundidad=1, margen=None):
+        """Ordenar las jugadas legales de una tirada por equidad.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que mueve
+            movimientos (tuple): Dados a usar, como Dice.last_roll
+            profundidad (int): Tiradas del rival a mirar hacia adelante
+            margen (float): Si se indica, las jugadas peores que la mejor por
+                más de este margen solo se acotan y se marcan como no exactas
+
+        Returns:
+            list: Tuplas (jugada, posición resultante, equidad, exacta) de
+                mayor a menor equidad; si exacta es False la equidad es
+                una cota superior
+        """
+        if profundidad < 0:
+            raise ValueError("La profundidad no puede ser negativa")
+        self.__nodos = 0
+        self.__fin = (time.perf_counter() + self.__limite_segundos
+                      if self.__limite_segundos is not None else None)
+        opciones = MoveGenerator.generar_posiciones(posicion, color, movimientos)
+        if self.__tabla is not None:
+            self.__tabla.nueva_generacion()
+
+        self.__con_presupuesto = False
+        ranking = self.__raiz(opciones, color, 0, margen)
+        self.__profundidad_completada = 0
+        self.__con_presupuesto = True
+        for nivel in range(1, profundidad + 1):
+            opciones = [(jugada, resultado) for jugada, resultado, _, _ in ranking]
+            try:
+                ranking = self.__raiz(opciones, color, nivel, margen)
+            except PresupuestoAgotado:
+                break
+            self.__profundidad_completada = nivel
+        self.__con_presupuesto = False
+        return ranking
+
+    def analizar_juego(self, game, profundidad=1, margen=None):
+        """Ordenar las jugadas del jugador actual de una partida con dados lanzados.
+
+        Args:
+            game (BackgammonGame): Partida a analizar
+            profundidad (int): Tiradas del rival a mirar hacia adelante
+            margen (float): Ver analizar
+
+        Returns:
+            list: Igual que analizar
+        """
+        if not game.dice.has_moves_available():
+            raise RuntimeError("No hay dados lanzados para analizar")
+        if game.fichas_por_color != self.__fichas:
+            raise ValueError("La partida no usa la cantidad de fichas del motor")
+        return self.analizar(game.board.posicion, game.current_player.color,
+                             game.dice.last_roll, profundidad, margen)
+
+    def __raiz(self, opciones, color, nivel, margen):
+        """Valorar cada jugada de la raíz y ordenarlas."""
+        if nivel == 0 and self.__lote is not None:
+            valores = self.__valores_hoja(opciones, color)
+            ranking = [(jugada, resultado, valor, True)
+                       for (jugada, resultado), valor in zip(opciones, valores)]
+            ranking.sort(key=lambda fila: fila[2], reverse=True)
+            return ranking
+        ranking = []
+        mejor = self.__minimo
+        for jugada, resultado in opciones:
+            alfa = self.__minimo if margen is None else max(self.__minimo, mejor - margen)
+            valor = self.__valor_despues(resultado, color, nivel, alfa, self.__maximo)
+            ranking.append((jugada, resultado, valor, valor > alfa or alfa <= self.__minimo))
+            mejor = max(mejor, valor)
+        ranking.sort(key=lambda fila: fila[2], reverse=True)
+        return ranking
+
+    def __contar_nodo(self):
+        """Contar un nodo y cortar la búsqueda si se agotó el presupuesto."""
+        self.__nodos += 1
+        if not self.__con_presupuesto:
+            return
+        if self.__limite_nodos is not None and self.__nodos > self.__limite_nodos:
+            raise PresupuestoAgotado()
+        if (self.__fin is not None and self.__nodos % Expectimax.INTERVALO_RELOJ == 0
+                and time.perf_counter() > self.__fin):
+            raise PresupuestoAgotado()
+
+    @staticmethod
+    def valor_final(posicion, color, fichas=FICHAS):
+        """Obtener la equidad de una partida terminada por el último movimiento.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+            fichas (int): Fichas por color de la variante
+
+        Returns:
+            float: 1, 2 o 3 si ``color`` sacó todas sus fichas, o None si la
+                partida sigue
+        """
+        if color == ColorFicha.BLANCA:
+            if max(posicion) > 0:
+                return None
+            rival = [-valor for valor in posicion]
+            casa_ganador, barra_rival = range(0, 6), 25
+        else:
+            if min(posicion) < 0:
+                return None
+            rival = list(posicion)
+            casa_ganador, barra_rival = range(18, 24), 24
+        if sum(valor for valor in rival if valor > 0) < fichas:
+            return 1.0
+        if rival[barra_rival] > 0 or any(rival[punto] > 0 for punto in casa_ganador):
+            return 3.0
+        return 2.0
+
+    def __ordenar(self, opciones, color):
+        """Ordenar jugadas de mejor a peor según el evaluador."""
+        if self.__lote is not None:
+            valores = self.__lote([resultado for _, resultado in opciones], color).tolist()
+            orden = sorted(range(len(opciones)), key=valores.__getitem__, reverse=True)
+            return [opciones[indice] for indice in orden]
+        evaluar = self.__evaluador.evaluar
+        return sorted(opciones, key=lambda opcion: evaluar(opcion[1], color), reverse=True)
+
+    def __valores_hoja(self, opciones, color):
+        """Valor de cada opción sin mirar adelante, evaluadas en un solo lote."""
+        for _ in opciones:
+            self.__contar_nodo()
+        valores = self.__lote([resultado for _, resultado in opciones], color).tolist()
+        for indice, (_, resultado) in enumerate(opciones):
+            final = Expectimax.valor_final(resultado, color, self.__fichas)
+            if final is not None:
+                valores[indice] = final
+            elif self.__bear_off is not None and self.__bear_off.cubre(resultado):
+                valores[indice] = self.__bear_off.evaluar(resultado, color)
+        return valores
+
+    def __valor_despues(self, posicion, color, profundidad, alfa, beta):
+        """Valor para ``color`` de la posición tras su jugada, con el rival por tirar."""
+        self.__contar_nodo()
+        final = Expectimax.valor_final(posicion, color, self.__fichas)
+        if final is not None:
+            return final
+        if self.__bear_off is not None and self.__bear_off.cubre(posicion):
+            return self.__bear_off.evaluar(posicion, color)
+        if profundidad == 0:
+            return self.__evaluador.evaluar(posicion, color)
+        tabla = self.__tabla
+        if tabla is None:
+            return self.__valor_azar(posicion, color, profundidad, alfa, beta)
+
+        clave = TablaTransposicion.clave(posicion, color == ColorFicha.BLANCA)
+        entrada = tabla.buscar(clave)
+        if entrada is not None and entrada[1] == profundidad:
+            valor, _, tipo = entrada
+            if (tipo == TablaTransposicion.EXACTA
+                    or (tipo == TablaTransposicion.INFERIOR and valor >= beta)
+                    or (tipo == TablaTransposicion.SUPERIOR and valor <= alfa)):
+                return valor
+        valor = self.__valor_azar(posicion, color, profundidad, alfa, beta)
+        if valor <= alfa:
+            tipo = TablaTransposicion.SUPERIOR
+        elif valor >= beta:
+            tipo = TablaTransposicion.INFERIOR
+        else:
+            tipo = TablaTransposicion.EXACTA
+        tabla.guardar(clave, profundidad, valor, tipo)
+        return valor
+
+    def __valor_tirada(self, opciones, color, profundidad, alfa, beta, inicial=None):
+        """Nodo de máximo: mejor jugada de ``color`` entre sus opciones para una tirada."""
+        if inicial is None:
+            mejor = self.__minimo
+            restantes = opciones
+        else:
+            mejor = inicial
+            restantes = opciones[1:]
+            if mejor >= beta:
+                return mejor
+        if profundidad == 0 and self.__lote is not None:
+            return max([mejor] + self.__valores_hoja(restantes, color)) if restantes else mejor
+        for _, resultado in restantes:
+            valor = self.__valor_despues(resultado, color, profundidad, max(alfa, mejor), beta)
+            if valor > mejor:
+                mejor = valor
+                if mejor >= beta:
+                    break
+        return mejor
+
+    def __valor_azar(self, posicion, color, profundidad, alfa, beta):
+        """Nodo de azar: promedio sobre las tiradas del rival con poda Star1/Star2."""
+        minimo = self.__minimo
+        maximo = self.__maximo
+        rival = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+        tiradas = Expectimax.TIRADAS
+        # Las 21 tiradas comparten los movimientos parciales al generarse juntas
+        por_tirada = MoveGenerator.generar_por_tirada(posicion, rival)
+        opciones_por_tirada = []
+        for movimientos, _ in tiradas:
+            opciones = por_tirada[movimientos]
+            if profundidad > 1:
+                opciones = self.__ordenar(opciones, rival)
+            opciones_por_tirada.append(opciones)
+
+        # Cota superior del valor de cada tirada para ``color``
+        superiores = [maximo] * len(tiradas)
+        sondas = [None] * len(tiradas)
+        if self.__star2:
+            acumulado = 0.0
+            restante = 1.0
+            for indice, (_, probabilidad) in enumerate(tiradas):
+                sonda = self.__valor_despues(opciones_por_tirada[indice][0][1], rival,
+                                             profundidad - 1, -maximo, -minimo)
+                sondas[indice] = sonda
+                superiores[indice] = -sonda
+                acumulado += probabilidad * -sonda
+                restante -= probabilidad
+                cota = acumulado + restante * maximo
+                if cota <= alfa:
+                    return cota
+
+        suma = 0.0
+        resto_inferior = minimo
+        resto_superior = sum(probabilidad * superior
+                             for (_, probabilidad), superior in zip(tiradas, superiores))
+        for indice, (_, probabilidad) in enumerate(tiradas):
+            superior = superiores[indice]
+            resto_inferior -= probabilidad * minimo
+            resto_superior -= probabilidad * superior
+            cota_superior = suma + probabilidad * superior + resto_superior
+            if cota_superior <= alfa:
+                return cota_superior
+            cota_inferior = suma + probabilidad * minimo + resto_inferior
+            if cota_inferior >= beta:
+                return cota_inferior
+            if superior <= minimo:
+                suma += probabilidad * superior
+                continue
+            # Ventana del hijo fuera de la cual el promedio sale de (alfa, beta)
+            alfa_hijo = (alfa - suma - resto_superior) / probabilidad
+            beta_hijo = (beta - suma - resto_inferior) / probabilidad
+            valor = -self.__valor_tirada(opciones_por_tirada[indice], rival, profundidad - 1,
+                                         -min(beta_hijo, superior), -max(alfa_hijo, minimo),
+                                         sondas[indice])
+            if valor <= alfa_hijo:
+                return suma + probabilidad * valor + resto_superior
+            if valor >= beta_hijo:
+                return suma + probabilidad * valor + resto_inferior
+            # Dentro de la ventana recortada el valor es exacto (o igual a la cota de la sonda)
+            suma += probabilidad * min(valor, superior)
+        return suma
@@ -0,0 +1,198 @@
+"""Codificación de posiciones y estado de partida en los IDs de GNU Backgammon."""
+import base64
+import binascii
+
+from core.Board import Board
+
+
+class GnuId:
+    """Convierte posiciones y estado de juego en los IDs de GNU Backgammon.
+
+    El position ID ocupa 80 bits: primero las fichas del jugador que no
+    tiene el turno y luego las del que lo tiene. Para cada jugador se
+    recorren sus puntos 1 a 24 (vistos desde su lado) y su barra, y cada
+    casilla con ``n`` fichas se escribe como ``n`` unos seguidos de un
+    cero. Los bits se empaquetan empezando por el menos significativo de
+    cada byte y los 10 bytes se escriben en base64 sin relleno (14
+    caracteres). Las fichas sacadas no se guardan: son las que faltan
+    hasta 15.
+
+    El match ID ocupa 66 bits (12 caracteres) con el cubo, el jugador en
+    turno, el estado de la partida, los dados y el marcador. El jugador 0
+    de GNU son las blancas y el jugador 1 las negras.
+    """
+
+    BITS_POSICION = 80
+    BYTES_POSICION = 10
+    LARGO_POSICION = 14
+    BYTES_MATCH = 9
+    LARGO_MATCH = 12
+
+    CUBO_CENTRADO = 3
+    ESTADO_SIN_JUEGO = 0
+    ESTADO_JUGANDO = 1
+    ESTADO_TERMINADO = 2
+
+    # (nombre, bit inicial, cantidad de bits) de cada campo del match ID
+    CAMPOS_MATCH = (
+        ("log_cubo", 0, 4),
+        ("duenio_cubo", 4, 2),
+        ("en_turno", 6, 1),
+        ("crawford", 7, 1),
+        ("estado", 8, 3),
+        ("decide", 11, 1),
+        ("doblada", 12, 1),
+        ("abandono", 13, 2),
+        ("dado_1", 15, 3),
+        ("dado_2", 18, 3),
+        ("largo_match", 21, 15),
+        ("puntaje_0", 36, 15),
+        ("puntaje_1", 51, 15),
+    )
+
+    @staticmethod
+    def __casillas_jugador(posicion, negras):
+        """Obtener los contadores de un jugador en su orden: puntos 1-24 y barra."""
+        if negras:
+            fichas = [-posicion[23 - punto] for punto in range(24)]
+            fichas.append(-posicion[Board.BARRA_NEGRAS])
+        else:
+            fichas = [posicion[punto] for punto in range(24)]
+            fichas.append(posicion[Board.BARRA_BLANCAS])
+        return [max(cantidad, 0) for cantidad in fichas]
+
+    @staticmethod
+    def codificar_posicion(posicion, turno_negras=False):
+        """Obtener el position ID de una posición.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            turno_negras (bool): True si las negras tienen el turno
+
+        Returns:
+            str: Position ID de 14 caracteres
+        """
+        rachas = "".join("1" * cantidad + "0"
+                         for negras in (not turno_negras, turno_negras)
+                         for cantidad in GnuId.__casillas_jugador(posicion, negras))
+        if len(rachas) > GnuId.BITS_POSICION:
+            raise ValueError("La posición tiene demasiadas fichas")
+        bits = int(rachas[::-1], 2)
+        datos = bits.to_bytes(GnuId.BYTES_POSICION, "little")
+        return base64.b64encode(datos).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def desde_board(board):
+        """Obtener el position ID de un tablero con su turno actual.
+
+        Args:
+            board (Board): Tablero a codificar
+
+        Returns:
+            str: Position ID de 14 caracteres
+        """
+        return GnuId.codificar_posicion(board.posicion, board.turno_negras)
+
+    @staticmethod
+    def __decodificar_base64(texto, largo, cantidad_bytes):
+        """Leer un ID en base64 sin relleno como entero little endian."""
+        if not isinstance(texto, str) or len(texto) != largo:
+            raise ValueError(f"El ID debe tener {largo} caracteres")
+        try:
+            datos = base64.b64decode(texto + "=" * (-largo % 4), validate=True)
+        except (binascii.Error, ValueError) as error:
+            raise ValueError("El ID no es base64 válido") from error
+        return int.from_bytes(datos[:cantidad_bytes], "little")
+
+    @staticmethod
+    def decodificar_posicion(texto, turno_negras=False):
+        """Reconstruir la posición de un position ID.
+
+        Args:
+            texto (str): Position ID de 14 caracteres
+            turno_negras (bool): True si las negras tienen el turno
+
+        Returns:
+            tuple: Contadores con signo de las 26 casillas, como Board.posicion
+
+        Raises:
+            ValueError: Si el ID no describe una posición válida
+        """
+        bits = GnuId.__decodificar_base64(texto, GnuId.LARGO_POSICION, GnuId.BYTES_POSICION)
+        # Cada casilla es una racha de unos terminada en cero
+        rachas = format(bits, "080b")[::-1].split("0")
+        if len(rachas) <= 50 or any(rachas[50:]):
+            raise ValueError("El position ID no describe 50 casillas")
+        posicion = [0] * Board.CASILLAS
+        for jugador, negras in enumerate((not turno_negras, turno_negras)):
+            cantidades = [len(racha) for racha in rachas[25 * jugador:25 * jugador + 25]]
+            if sum(cantidades) > Board.MAX_FICHAS:
+                raise ValueError("Un jugador tiene más de 15 fichas")
+            for casilla, cantidad in enumerate(cantidades):
+                if not cantidad:
+                    continue
+                if negras:
+                    destino = Board.BARRA_NEGRAS if casilla == 24 else 23 - casilla
+                    cantidad = -cantidad
+                else:
+                    destino = Board.BARRA_BLANCAS if casilla == 24 else casilla
+                if posicion[destino]:
+                    raise ValueError("Un punto tiene fichas de ambos colores")
+                posicion[destino] = cantidad
+        return tuple(posicion)
+
+    @staticmethod
+    def codificar_match(en_turno, estado, dados=None, valor_cubo=1,
+                        duenio_cubo=CUBO_CENTRADO, largo_match=0, puntajes=(0, 0)):
+        """Obtener el match ID de un estado de partida.
+
+        Args:
+            en_turno (int): Jugador en turno (0 blancas, 1 negras)
+            estado (int): ESTADO_SIN_JUEGO, ESTADO_JUGANDO o ESTADO_TERMINADO
+            dados (tuple): Dados lanzados, o None si aún no se lanzaron
+            valor_cubo (int): Valor del cubo de doblaje (potencia de 2)
+            duenio_cubo (int): Jugador dueño del cubo o CUBO_CENTRADO
+            largo_match (int): Puntos del match, 0 para partida por dinero
+            puntajes (tuple): Puntos de cada jugador
+
+        Returns:
+            str: Match ID de 12 caracteres
+        """
+        dado_1, dado_2 = dados if dados else (0, 0)
+        valores = {
+            "log_cubo": valor_cubo.bit_length() - 1,
+            "duenio_cubo": duenio_cubo,
+            "en_turno": en_turno,
+            "crawford": 0,
+            "estado": estado,
+            "decide": en_turno,
+            "doblada": 0,
+            "abandono": 0,
+            "dado_1": dado_1,
+            "dado_2": dado_2,
+            "largo_match": largo_match,
+            "puntaje_0": puntajes[0],
+            "puntaje_1": puntajes[1],
+        }
+        bits = 0
+        for nombre, inicio, largo in GnuId.CAMPOS_MATCH:
+            valor = valores[nombre]
+            if not 0 <= valor < (1 << largo):
+                raise ValueError(f"Valor fuera de rango para {nombre}")
+            bits |= valor << inicio
+        datos = bits.to_bytes(GnuId.BYTES_MATCH, "little")
+        return base64.b64encode(datos).decode("ascii")
+
+    @staticmethod
+    def decodificar_match(texto):
+        """Leer los campos de un match ID.
+
+        Args:
+            texto (str): Match ID de 12 caracteres
+
+        Returns:
+            dict: Valor de cada campo de CAMPOS_MATCH por nombre
+        """
+        bits = GnuId.__decodificar_base64(texto, GnuId.LARGO_MATCH, GnuId.BYTES_MATCH)
+        return {nombre: (bits >> inicio) & ((1 << largo) - 1)
+                for nombre, inicio, largo in GnuId.CAMPOS_MATCH}
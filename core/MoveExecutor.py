@@ -3,15 +3,18 @@ from core.Board import Board
 from core.Dice import Dice
 from core.Player import Player
 from core.ColorFicha import ColorFicha
+from core.MoveTables import MoveTables
 
 class MoveExecutor:
     """Responsable de ejecutar movimientos de fichas en el tablero."""
     @staticmethod
     def calculate_destination(from_point: int, dice_value: int, player_color: ColorFicha) -> int:
-        """Calcular el punto de destino según el color del jugador."""
-        if player_color == ColorFicha.BLANCA:
-            return from_point - dice_value
-        return from_point + dice_value
+        """Calcular el punto de destino según el color del jugador.
+
+        Returns:
+            int: Punto de destino o MoveTables.FUERA si sale del tablero
+        """
+        return MoveTables.DESTINOS[player_color][from_point][dice_value]
     @staticmethod
     def execute_move(board: Board, dice: Dice, player: Player, from_point: int, dice_value: int):
         """Ejecutar un movimiento de ficha."""
@@ -28,7 +31,7 @@ class MoveExecutor:
         # Calcular destino
         to_point = MoveExecutor.calculate_destination(from_point, dice_value, player.color)
         # Validar que el destino está dentro del tablero
-        if to_point < 0 or to_point > 23:
+        if to_point == MoveTables.FUERA:
             raise ValueError("El movimiento sale del tablero")
         # Ejecutar movimiento
         ficha = board.quitar_ficha(from_point)
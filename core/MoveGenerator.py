@@ -0,0 +1,486 @@
+"""Módulo para generar todas las jugadas legales de un turno."""
+from core.ColorFicha import ColorFicha
+from core.MoveTables import MoveTables
+
+
+class MoveGenerator:
+    """Genera las jugadas completas legales para una posición y una tirada.
+
+    Una jugada es una tupla de movimientos ``(origen, dado)`` en el orden en
+    que deben ejecutarse; el origen ``ORIGEN_BARRA`` indica una entrada desde
+    la barra. Se aplican todas las reglas del turno: entrar primero desde la
+    barra, golpes, bear off (exacto o con dado mayor sin fichas más atrás),
+    usar la mayor cantidad de dados posible y, si solo se puede usar uno de
+    dos dados distintos, usar el mayor.
+
+    La búsqueda trabaja sobre la lista de 26 contadores del tablero vista
+    desde el jugador que mueve (fichas propias positivas, avanzando hacia el
+    punto 0), así que no crea objetos Checker. Destinos y salidas se leen de
+    las tablas relativas de MoveTables.
+    """
+
+    ORIGEN_BARRA = MoveTables.ORIGEN_BARRA
+    BARRA_RIVAL = 25
+    # Dados a usar de cada una de las 21 tiradas distintas, como en Expectimax.TIRADAS
+    TIRADAS = tuple((dado_1, dado_2) if dado_1 != dado_2 else (dado_1,) * 4
+                    for dado_1 in range(1, 7) for dado_2 in range(dado_1, 7))
+
+    @staticmethod
+    def generar_jugadas(board, color, movimientos):
+        """Obtener las jugadas legales distintas sobre un tablero.
+
+        Args:
+            board (Board): Tablero sobre el que se mueve
+            color (ColorFicha): Color del jugador que mueve
+            movimientos (tuple): Dados a usar, como los devuelve
+                Dice._process_roll o Dice.last_roll
+
+        Returns:
+            list: Jugadas legales, una por posición resultante distinta
+        """
+        return [jugada for jugada, _ in
+                MoveGenerator.generar_posiciones(board.posicion, color, movimientos)]
+
+    @staticmethod
+    def generar_posiciones(posicion, color, movimientos):
+        """Obtener las jugadas legales junto con la posición a la que llevan.
+
+        Si no hay ningún movimiento posible se devuelve una única jugada
+        vacía con la posición sin cambios.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color del jugador que mueve
+            movimientos (tuple): Dados a usar
+
+        Returns:
+            list: Pares (jugada, posición resultante) sin posiciones repetidas
+        """
+        blancas = color == ColorFicha.BLANCA
+        relativa = MoveGenerator.__a_relativa(posicion, blancas)
+        fuera_de_casa = relativa[MoveGenerator.ORIGEN_BARRA]
+        for punto in range(6, 24):
+            if relativa[punto] > 0:
+                fuera_de_casa += relativa[punto]
+
+        hojas = [0, {}]
+        dados = tuple(movimientos)
+        if not dados:
+            hojas[1][tuple(relativa)] = ()
+        elif len(set(dados)) == 1:
+            MoveGenerator.__explorar(relativa, dados, 0, True, MoveGenerator.ORIGEN_BARRA,
+                                     (), fuera_de_casa, hojas)
+        else:
+            alto, bajo = max(dados), min(dados)
+            MoveGenerator.__explorar(relativa, (alto, bajo), 0, False,
+                                     MoveGenerator.ORIGEN_BARRA, (), fuera_de_casa, hojas)
+            MoveGenerator.__explorar(relativa, (bajo, alto), 0, False,
+                                     MoveGenerator.ORIGEN_BARRA, (), fuera_de_casa, hojas)
+            if hojas[0] == 1 and any(jugada[0][1] == alto for jugada in hojas[1].values()):
+                hojas[1] = {clave: jugada for clave, jugada in hojas[1].items()
+                            if jugada[0][1] == alto}
+
+        return [(MoveGenerator.__a_absoluta_jugada(jugada, blancas),
+                 MoveGenerator.__a_absoluta(clave, blancas))
+                for clave, jugada in hojas[1].items()]
+
+    @staticmethod
+    def iterar_jugadas(posicion, color, movimientos):
+        """Generar las jugadas legales de a una, sin armar la lista completa.
+
+        Devuelve los mismos pares (jugada, posición resultante) que
+        ``generar_posiciones``, cada posición una sola vez, pero a medida
+        que los encuentra: quien solo necesita la primera (saber si hay
+        alguna jugada, un bot goloso, una sugerencia) puede cortar ahí. En
+        cada paso se prueban primero los movimientos que golpean, después
+        los que hacen punto y después el resto, así que las primeras
+        jugadas suelen ser las más útiles. Las jugadas que usan todos los
+        dados salen enseguida; las más cortas solo pueden darse después de
+        recorrer todo, cuando se sabe que no hay una más larga.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color del jugador que mueve
+            movimientos (tuple): Dados a usar
+
+        Yields:
+            tuple: (jugada, posición resultante); si no hay movimientos, una
+                única jugada vacía con la posición sin cambios
+        """
+        blancas = color == ColorFicha.BLANCA
+        relativa = MoveGenerator.__a_relativa(posicion, blancas)
+        fuera_de_casa = relativa[MoveGenerator.ORIGEN_BARRA]
+        for punto in range(6, 24):
+            if relativa[punto] > 0:
+                fuera_de_casa += relativa[punto]
+        dados = tuple(movimientos)
+        if not dados:
+            yield (), MoveGenerator.__a_absoluta(relativa, blancas)
+            return
+        if len(set(dados)) == 1:
+            ordenes = (dados,)
+        else:
+            ordenes = ((max(dados), min(dados)), (min(dados), max(dados)))
+
+        vistas = set()
+        cortas = [0, {}]
+        for orden in ordenes:
+            for jugada, hoja in MoveGenerator.__recorrer(relativa, orden, 0, len(ordenes) == 1,
+                                                         MoveGenerator.ORIGEN_BARRA, (),
+                                                         fuera_de_casa):
+                if len(jugada) == len(dados):
+                    if hoja not in vistas:
+                        vistas.add(hoja)
+                        yield (MoveGenerator.__a_absoluta_jugada(jugada, blancas),
+                               MoveGenerator.__a_absoluta(hoja, blancas))
+                elif not vistas:
+                    MoveGenerator.__registrar(cortas, jugada, hoja)
+        if vistas:
+            return
+        hojas = cortas[1]
+        if cortas[0] == 1 and len(ordenes) == 2:
+            alto = ordenes[0][0]
+            if any(jugada[0][1] == alto for jugada in hojas.values()):
+                hojas = {clave: jugada for clave, jugada in hojas.items()
+                         if jugada[0][1] == alto}
+        for clave, jugada in hojas.items():
+            yield (MoveGenerator.__a_absoluta_jugada(jugada, blancas),
+                   MoveGenerator.__a_absoluta(clave, blancas))
+
+    @staticmethod
+    def hay_jugada(posicion, color, movimientos):
+        """Indicar si se puede mover al menos una ficha, cortando en la primera jugada.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color del jugador que mueve
+            movimientos (tuple): Dados a usar
+
+        Returns:
+            bool: True si hay alguna jugada no vacía
+        """
+        jugada, _ = next(MoveGenerator.iterar_jugadas(posicion, color, movimientos))
+        return bool(jugada)
+
+    @staticmethod
+    def generar_por_tirada(posicion, color, tiradas=TIRADAS):
+        """Obtener las jugadas legales de varias tiradas compartiendo los movimientos parciales.
+
+        Los movimientos de un dado desde la posición se calculan una sola vez
+        para todas las tiradas (el 3 de la 3-1 es el mismo que el de la 3-2,
+        la 5-3 y la 3-3), y cada estado intermedio se analiza una vez
+        (orígenes propios, fichas fuera de casa, punto más atrasado) para
+        todos los dados que siguen desde él. Las posiciones resultantes
+        repetidas entre tiradas se convierten a casillas absolutas una sola
+        vez. El resultado de cada tirada es idéntico, incluso en el orden,
+        al de ``generar_posiciones``.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color del jugador que mueve
+            tiradas (Iterable[tuple]): Dados a usar de cada tirada; por
+                defecto las 21 distintas
+
+        Returns:
+            dict: Para cada tupla de dados, la lista de pares (jugada,
+                posición resultante) sin posiciones repetidas
+        """
+        blancas = color == ColorFicha.BLANCA
+        raiz = tuple(MoveGenerator.__a_relativa(posicion, blancas))
+        fuera_de_casa = raiz[MoveGenerator.ORIGEN_BARRA] + sum(
+            fichas for fichas in raiz[6:24] if fichas > 0)
+        analisis = {}
+        primeros = {}
+        absolutas = {}
+        resultado = {}
+        for movimientos in tiradas:
+            dados = tuple(movimientos)
+            for dado in dados:
+                if dado not in primeros:
+                    primeros[dado] = MoveGenerator.__mover(raiz, dado, analisis)
+            if not dados:
+                hojas = {raiz: ()}
+            elif len(set(dados)) == 1:
+                # Desde cada primer movimiento compartido sigue la búsqueda en el lugar
+                dado = dados[0]
+                hojas = [0, {raiz: ()}]
+                for origen, estado in primeros[dado]:
+                    MoveGenerator.__explorar(list(estado), dados, 1, True, origen,
+                                             ((origen, dado),),
+                                             fuera_de_casa - (origen >= 6 > origen - dado), hojas)
+                hojas = hojas[1]
+            else:
+                hojas = MoveGenerator.__hojas_dos_dados(raiz, max(dados), min(dados), primeros,
+                                                        analisis)
+            if blancas:
+                resultado[movimientos] = [(jugada, clave) for clave, jugada in hojas.items()]
+                continue
+            opciones = []
+            for clave, jugada in hojas.items():
+                absoluta = absolutas.get(clave)
+                if absoluta is None:
+                    absoluta = absolutas[clave] = MoveGenerator.__a_absoluta(clave, False)
+                opciones.append((MoveGenerator.__a_absoluta_jugada(jugada, False), absoluta))
+            resultado[movimientos] = opciones
+        return resultado
+
+    @staticmethod
+    def __a_relativa(posicion, blancas):
+        """Convertir una posición absoluta a la vista del jugador que mueve."""
+        if blancas:
+            return list(posicion)
+        relativa = [-posicion[23 - punto] for punto in range(24)]
+        relativa.append(-posicion[25])
+        relativa.append(-posicion[24])
+        return relativa
+
+    @staticmethod
+    def __a_absoluta(relativa, blancas):
+        """Convertir una posición relativa de vuelta a casillas absolutas."""
+        if blancas:
+            return tuple(relativa)
+        absoluta = [-relativa[23 - punto] for punto in range(24)]
+        absoluta.append(-relativa[25])
+        absoluta.append(-relativa[24])
+        return tuple(absoluta)
+
+    @staticmethod
+    def __a_absoluta_jugada(jugada, blancas):
+        """Traducir los orígenes de una jugada relativa a puntos absolutos."""
+        if blancas:
+            return jugada
+        return tuple((origen if origen == MoveGenerator.ORIGEN_BARRA else 23 - origen, dado)
+                     for origen, dado in jugada)
+
+    @staticmethod
+    def __registrar(hojas, jugada, relativa):
+        """Guardar una jugada terminada si usa la mayor cantidad de dados vista."""
+        largo = len(jugada)
+        if largo > hojas[0]:
+            hojas[0] = largo
+            hojas[1] = {tuple(relativa): jugada}
+        elif largo == hojas[0]:
+            hojas[1].setdefault(tuple(relativa), jugada)
+
+    @staticmethod
+    def __analizar(relativa, analisis):
+        """Orígenes con fichas propias de mayor a menor, si hay fichas fuera de casa y
+        el punto propio más atrasado de un estado (con caché)."""
+        datos = analisis.get(relativa)
+        if datos is None:
+            if relativa[MoveGenerator.ORIGEN_BARRA] > 0:
+                datos = ((MoveGenerator.ORIGEN_BARRA,), True, MoveGenerator.ORIGEN_BARRA)
+            else:
+                origenes = tuple(punto for punto in range(23, -1, -1) if relativa[punto] > 0)
+                atras = origenes[0] if origenes else -1
+                datos = (origenes, atras >= 6, atras)
+            analisis[relativa] = datos
+        return datos
+
+    @staticmethod
+    def __mover(relativa, dado, analisis):
+        """Movimientos legales de un dado desde un estado, con origen decreciente.
+
+        Returns:
+            list: Pares (origen, estado resultante como tupla)
+        """
+        origenes, fuera_de_casa, atras = MoveGenerator.__analizar(relativa, analisis)
+        movimientos = []
+        for origen in origenes:
+            destino = origen - dado
+            if destino >= 0:
+                ocupante = relativa[destino]
+                if ocupante < -1:
+                    continue
+                nueva = list(relativa)
+                nueva[origen] -= 1
+                if ocupante == -1:
+                    nueva[destino] = 1
+                    nueva[MoveGenerator.BARRA_RIVAL] -= 1
+                else:
+                    nueva[destino] = ocupante + 1
+            elif fuera_de_casa or (destino < -1 and origen < atras):
+                # Sacar con sobrante solo desde el punto más atrasado
+                continue
+            else:
+                nueva = list(relativa)
+                nueva[origen] -= 1
+            movimientos.append((origen, tuple(nueva)))
+        return movimientos
+
+    @staticmethod
+    def __hojas_dos_dados(raiz, alto, bajo, primeros, analisis):
+        """Posiciones finales de una tirada no doble, en el orden de ``__explorar``."""
+        hojas = {}
+        largo = 0
+        sin_barra = raiz[MoveGenerator.ORIGEN_BARRA] <= 0
+        for primero, segundo in ((alto, bajo), (bajo, alto)):
+            invertido = primero == bajo
+            for origen, estado in primeros[primero]:
+                llegada = origen - primero
+                # Con el dado bajo primero, mover otra ficha sin sacar da la misma posición
+                # que el orden inverso, ya registrado: solo se cuentan
+                conmutan = invertido and sin_barra and llegada >= 0
+                origenes, fuera_de_casa, atras = MoveGenerator.__analizar(estado, analisis)
+                trabajo = list(estado)
+                movimiento = (origen, primero)
+                hubo_movimiento = False
+                for segundo_origen in origenes:
+                    destino = segundo_origen - segundo
+                    if destino >= 0:
+                        ocupante = estado[destino]
+                        if ocupante < -1:
+                            continue
+                        hubo_movimiento = True
+                        if conmutan and segundo_origen != llegada:
+                            continue
+                        trabajo[segundo_origen] -= 1
+                        if ocupante == -1:
+                            trabajo[destino] = 1
+                            trabajo[MoveGenerator.BARRA_RIVAL] -= 1
+                        else:
+                            trabajo[destino] = ocupante + 1
+                        hoja = tuple(trabajo)
+                        trabajo[destino] = ocupante
+                        if ocupante == -1:
+                            trabajo[MoveGenerator.BARRA_RIVAL] += 1
+                        trabajo[segundo_origen] += 1
+                    elif fuera_de_casa or (destino < -1 and segundo_origen < atras):
+                        continue
+                    else:
+                        hubo_movimiento = True
+                        trabajo[segundo_origen] -= 1
+                        hoja = tuple(trabajo)
+                        trabajo[segundo_origen] += 1
+                    if largo < 2:
+                        hojas = {}
+                        largo = 2
+                    if hoja not in hojas:
+                        hojas[hoja] = (movimiento, (segundo_origen, segundo))
+                if not hubo_movimiento and largo < 2:
+                    largo = 1
+                    hojas.setdefault(estado, (movimiento,))
+        if largo == 0:
+            return {raiz: ()}
+        if largo == 1 and any(jugada[0][1] == alto for jugada in hojas.values()):
+            hojas = {clave: jugada for clave, jugada in hojas.items() if jugada[0][1] == alto}
+        return hojas
+
+    @staticmethod
+    def __recorrer(relativa, dados, indice, dobles, limite, jugada, fuera_de_casa):
+        """Recorrer en profundidad las secuencias de un turno como generador.
+
+        Entrega (jugada, posición relativa) por cada secuencia que termina,
+        use o no todos los dados. Los movimientos de cada paso se ordenan
+        golpes primero, después los que hacen punto; con dobles los orígenes
+        no crecen, como en ``__explorar``.
+        """
+        if indice == len(dados):
+            yield jugada, tuple(relativa)
+            return
+        dado = dados[indice]
+        barra = MoveGenerator.ORIGEN_BARRA
+        if relativa[barra] > 0:
+            origenes = (barra,)
+        else:
+            origenes = range(min(limite, 23), -1, -1)
+        candidatos = []
+        for origen in origenes:
+            if relativa[origen] <= 0:
+                continue
+            destino = MoveTables.RELATIVOS[origen][dado]
+            if destino != MoveTables.FUERA:
+                ocupante = relativa[destino]
+                if ocupante < -1:
+                    continue
+                # 0 golpea, 1 hace punto, 2 el resto
+                candidatos.append((0 if ocupante == -1 else 1 if ocupante == 1 else 2,
+                                   origen, destino))
+            elif not fuera_de_casa and not (
+                    MoveTables.BEAR_OFF_RELATIVO[origen][dado] == MoveTables.SALIDA_CON_SOBRANTE
+                    and any(relativa[punto] > 0 for punto in range(origen + 1, 6))):
+                candidatos.append((2, origen, destino))
+        if not candidatos:
+            yield jugada, tuple(relativa)
+            return
+        candidatos.sort(key=lambda candidato: candidato[0])
+        for _, origen, destino in candidatos:
+            siguiente_limite = origen if dobles else barra
+            relativa[origen] -= 1
+            if destino == MoveTables.FUERA:
+                yield from MoveGenerator.__recorrer(relativa, dados, indice + 1, dobles,
+                                                    siguiente_limite, jugada + ((origen, dado),),
+                                                    fuera_de_casa)
+            else:
+                ocupante = relativa[destino]
+                if ocupante == -1:
+                    relativa[destino] = 1
+                    relativa[MoveGenerator.BARRA_RIVAL] -= 1
+                else:
+                    relativa[destino] = ocupante + 1
+                restantes = fuera_de_casa - 1 if origen >= 6 > destino else fuera_de_casa
+                yield from MoveGenerator.__recorrer(relativa, dados, indice + 1, dobles,
+                                                    siguiente_limite, jugada + ((origen, dado),),
+                                                    restantes)
+                relativa[destino] = ocupante
+                if ocupante == -1:
+                    relativa[MoveGenerator.BARRA_RIVAL] += 1
+            relativa[origen] += 1
+
+    @staticmethod
+    def __explorar(relativa, dados, indice, dobles, limite, jugada, fuera_de_casa, hojas):
+        """Recorrer en profundidad las secuencias de movimientos de un turno.
+
+        Con dobles los orígenes se recorren en orden no creciente: cualquier
+        secuencia legal puede reordenarse así sin cambiar su resultado, lo que
+        evita explorar permutaciones equivalentes.
+        """
+        if indice == len(dados):
+            MoveGenerator.__registrar(hojas, jugada, relativa)
+            return
+        dado = dados[indice]
+        destinos = MoveTables.RELATIVOS
+        salidas = MoveTables.BEAR_OFF_RELATIVO
+        hubo_movimiento = False
+        if relativa[MoveGenerator.ORIGEN_BARRA] > 0:
+            origenes = (MoveGenerator.ORIGEN_BARRA,)
+        else:
+            origenes = range(min(limite, 23), -1, -1)
+
+        for origen in origenes:
+            if relativa[origen] <= 0:
+                continue
+            destino = destinos[origen][dado]
+            siguiente_limite = origen if dobles else MoveGenerator.ORIGEN_BARRA
+            if destino != MoveTables.FUERA:
+                ocupante = relativa[destino]
+                if ocupante < -1:
+                    continue
+                hubo_movimiento = True
+                relativa[origen] -= 1
+                if ocupante == -1:
+                    relativa[destino] = 1
+                    relativa[MoveGenerator.BARRA_RIVAL] -= 1
+                else:
+                    relativa[destino] = ocupante + 1
+                restantes = fuera_de_casa - 1 if origen >= 6 > destino else fuera_de_casa
+                MoveGenerator.__explorar(relativa, dados, indice + 1, dobles, siguiente_limite,
+                                         jugada + ((origen, dado),), restantes, hojas)
+                relativa[destino] = ocupante
+                if ocupante == -1:
+                    relativa[MoveGenerator.BARRA_RIVAL] += 1
+                relativa[origen] += 1
+            else:
+                if fuera_de_casa:
+                    continue
+                if (salidas[origen][dado] == MoveTables.SALIDA_CON_SOBRANTE
+                        and any(relativa[punto] > 0 for punto in range(origen + 1, 6))):
+                    continue
+                hubo_movimiento = True
+                relativa[origen] -= 1
+                MoveGenerator.__explorar(relativa, dados, indice + 1, dobles, siguiente_limite,
+                                         jugada + ((origen, dado),), fuera_de_casa, hojas)
+                relativa[origen] += 1
+
+        if not hubo_movimiento:
+            MoveGenerator.__registrar(hojas, jugada, relativa)
@@ -0,0 +1,93 @@
+"""Tablas precalculadas de destinos de movimiento por color, origen y dado."""
+from core.ColorFicha import ColorFicha
+
+
+class MoveTables:
+    """Tablas de consulta con las reglas de dirección, bear off y entrada.
+
+    Todas las tablas se indexan ``[color][origen][dado]`` con ``origen`` en
+    0-23 o ``ORIGEN_BARRA`` y ``dado`` en 1-6 (la columna 0 no se usa):
+
+    - ``DESTINOS``: punto de destino, o ``FUERA`` si la ficha sale del tablero.
+    - ``BEAR_OFF``: ``NO_SALE``, ``SALIDA_EXACTA`` o ``SALIDA_CON_SOBRANTE``.
+    - ``ENTRADAS[color][dado]``: punto por el que entra una ficha de la barra.
+
+    ``RELATIVOS`` y ``BEAR_OFF_RELATIVO`` son las tablas vistas desde el
+    jugador que mueve (avanzando hacia el punto 0), que coinciden con las de
+    las blancas y son las que usa MoveGenerator.
+    """
+
+    ORIGEN_BARRA = 24
+    FUERA = -1
+    NO_SALE = 0
+    SALIDA_EXACTA = 1
+    SALIDA_CON_SOBRANTE = 2
+
+    @staticmethod
+    def __destino(color, origen, dado):
+        """Calcular el destino de un movimiento con aritmética directa."""
+        if color == ColorFicha.BLANCA:
+            destino = 24 - dado if origen == MoveTables.ORIGEN_BARRA else origen - dado
+        else:
+            destino = dado - 1 if origen == MoveTables.ORIGEN_BARRA else origen + dado
+        return destino if 0 <= destino <= 23 else MoveTables.FUERA
+
+    @staticmethod
+    def __tipo_bear_off(color, origen, dado):
+        """Clasificar si un movimiento saca la ficha y si el dado es exacto."""
+        if origen == MoveTables.ORIGEN_BARRA:
+            return MoveTables.NO_SALE
+        distancia = origen + 1 if color == ColorFicha.BLANCA else 24 - origen
+        if dado < distancia:
+            return MoveTables.NO_SALE
+        if dado == distancia:
+            return MoveTables.SALIDA_EXACTA
+        return MoveTables.SALIDA_CON_SOBRANTE
+
+    @staticmethod
+    def __construir(funcion, color):
+        """Construir una tabla [origen][dado] para un color."""
+        return tuple(
+            tuple([funcion(color, origen, 0)] + [funcion(color, origen, dado) for dado in range(1, 7)])
+            for origen in range(MoveTables.ORIGEN_BARRA + 1)
+        )
+
+    @staticmethod
+    def construir_tablas():
+        """Construir las tablas de destinos, bear off y entradas.
+
+        Returns:
+            tuple: (destinos, bear_off, entradas), cada una indexada por color
+        """
+        destinos = {}
+        bear_off = {}
+        entradas = {}
+        for color in ColorFicha:
+            destinos[color] = MoveTables.__construir(MoveTables.__destino, color)
+            bear_off[color] = MoveTables.__construir(MoveTables.__tipo_bear_off, color)
+            entradas[color] = destinos[color][MoveTables.ORIGEN_BARRA]
+        return destinos, bear_off, entradas
+
+    @staticmethod
+    def destino(color, origen, dado):
+        """Obtener el destino de un movimiento desde las tablas.
+
+        Args:
+            color (ColorFicha): Color de la ficha que se mueve
+            origen (int): Punto de origen (0-23) u ORIGEN_BARRA
+            dado (int): Valor del dado (1-6)
+
+        Returns:
+            int: Punto de destino o FUERA si la ficha sale del tablero
+        """
+        return MoveTables.DESTINOS[color][origen][dado]
+
+    @staticmethod
+    def punto_entrada(color, dado):
+        """Obtener el punto por el que entra una ficha desde la barra."""
+        return MoveTables.ENTRADAS[color][dado]
+
+
+MoveTables.DESTINOS, MoveTables.BEAR_OFF, MoveTables.ENTRADAS = MoveTables.construir_tablas()
+MoveTables.RELATIVOS = MoveTables.DESTINOS[ColorFicha.BLANCA]
+MoveTables.BEAR_OFF_RELATIVO = MoveTables.BEAR_OFF[ColorFicha.BLANCA]
@@ -4,6 +4,8 @@ from core.ColorFicha import ColorFicha
 
 class Player:
     """Representa un jugador en el juego de Backgammon."""
+    __slots__ = ("__nombre", "__color")
+
     def __init__(self, nombre: str, color: ColorFicha):
         """Inicializar jugador con nombre y color"""
         if not nombre or not nombre.strip():
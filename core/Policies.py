@@ -0,0 +1,95 @@
+"""Políticas para elegir jugadas sin intervención humana.
+
+Una política es cualquier objeto con ``elegir_jugada(opciones, color)``,
+donde ``opciones`` es la lista de pares (jugada, posición resultante) que
+devuelve MoveGenerator.generar_posiciones y el resultado es uno de esos
+pares. Todas las políticas de este módulo se crean con una semilla
+opcional para que las partidas simuladas sean reproducibles.
+"""
+import random
+
+from core.Board import Board
+from core.ColorFicha import ColorFicha
+
+
+class PoliticaAleatoria:
+    """Elige una jugada legal al azar con probabilidad uniforme."""
+    __slots__ = ("__rng",)
+
+    def __init__(self, semilla=None):
+        """Crear la política con su propio generador aleatorio."""
+        self.__rng = random.Random(semilla)
+
+    def elegir_jugada(self, opciones, color):
+        """Elegir una de las opciones al azar."""
+        return opciones[self.__rng.randrange(len(opciones))]
+
+
+class PoliticaPrimera:
+    """Elige siempre la primera jugada generada; útil como referencia determinista."""
+    __slots__ = ()
+
+    def __init__(self, semilla=None):
+        """Crear la política (la semilla no se usa)."""
+
+    def elegir_jugada(self, opciones, color):
+        """Elegir la primera opción."""
+        return opciones[0]
+
+
+class PoliticaGolosa:
+    """Elige la jugada que deja la mejor diferencia de pips con pocas fichas sueltas.
+
+    La puntuación de cada posición resultante es la ventaja en pips
+    (golpear suma los pips de la ficha rival enviada a la barra) menos una
+    penalización por cada ficha propia sola en un punto. Los empates se
+    resuelven al azar.
+    """
+    __slots__ = ("__rng",)
+
+    PENALIZACION_BLOT = 6
+
+    def __init__(self, semilla=None):
+        """Crear la política con su generador para desempates."""
+        self.__rng = random.Random(semilla)
+
+    @staticmethod
+    def puntuar(posicion, color):
+        """Puntuar una posición desde el punto de vista de un color.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que acaba de mover
+
+        Returns:
+            int: Mayor es mejor para el color
+        """
+        pips_blancas = 0
+        pips_negras = 0
+        blots_blancas = 0
+        blots_negras = 0
+        for casilla, valor in enumerate(posicion):
+            if valor > 0:
+                pips_blancas += valor * Board.PIPS_BLANCAS[casilla]
+                blots_blancas += valor == 1 and casilla < 24
+            elif valor < 0:
+                pips_negras -= valor * Board.PIPS_NEGRAS[casilla]
+                blots_negras += valor == -1 and casilla < 24
+        if color == ColorFicha.BLANCA:
+            return pips_negras - pips_blancas - PoliticaGolosa.PENALIZACION_BLOT * blots_blancas
+        return pips_blancas - pips_negras - PoliticaGolosa.PENALIZACION_BLOT * blots_negras
+
+    def elegir_jugada(self, opciones, color):
+        """Elegir la opción de mayor puntuación."""
+        puntuaciones = [PoliticaGolosa.puntuar(posicion, color) for _, posicion in opciones]
+        mejor = max(puntuaciones)
+        mejores = [indice for indice, puntuacion in enumerate(puntuaciones) if puntuacion == mejor]
+        return opciones[mejores[self.__rng.randrange(len(mejores))]]
+
+
+# Políticas disponibles por nombre para la línea de comandos del simulador
+POLITICAS = {
+    "aleatoria": PoliticaAleatoria,
+    "primera": PoliticaPrimera,
+    "golosa": PoliticaGolosa,
+}
@@ -0,0 +1,144 @@
+"""Perceptrón multicapa en NumPy para evaluar posiciones de backgammon."""
+import numpy as np
+
+from core.CodificadorTD import CodificadorTD
+
+
+class RedNeuronal:
+    """Red de una capa oculta con activaciones sigmoide.
+
+    Recibe lotes (N, entradas) y devuelve lotes (N, 5) con las
+    probabilidades, para el color de la vista, de: ganar, ganar gammon,
+    ganar backgammon, perder gammon y perder backgammon. Un lote completo
+    se evalúa con dos productos de matrices en float32.
+    """
+    __slots__ = ("__pesos_ocultos", "__sesgos_ocultos", "__pesos_salida", "__sesgos_salida")
+
+    SALIDAS = 5
+    OCULTAS = 80
+    # Nombres de los arreglos al guardar en disco
+    PARAMETROS = ("pesos_ocultos", "sesgos_ocultos", "pesos_salida", "sesgos_salida")
+
+    def __init__(self, entradas=CodificadorTD.ENTRADAS, ocultas=OCULTAS, semilla=None):
+        """Crear una red con pesos aleatorios (inicialización de Glorot).
+
+        Args:
+            entradas (int): Tamaño del vector de entrada
+            ocultas (int): Unidades de la capa oculta
+            semilla (int): Semilla para los pesos iniciales
+        """
+        if entradas < 1 or ocultas < 1:
+            raise ValueError("La red debe tener al menos una entrada y una unidad oculta")
+        rng = np.random.default_rng(semilla)
+        limite_oculta = np.sqrt(6 / (entradas + ocultas))
+        limite_salida = np.sqrt(6 / (ocultas + RedNeuronal.SALIDAS))
+        self.__pesos_ocultos = rng.uniform(-limite_oculta, limite_oculta,
+                                           (entradas, ocultas)).astype(np.float32)
+        self.__sesgos_ocultos = np.zeros(ocultas, dtype=np.float32)
+        self.__pesos_salida = rng.uniform(-limite_salida, limite_salida,
+                                          (ocultas, RedNeuronal.SALIDAS)).astype(np.float32)
+        self.__sesgos_salida = np.zeros(RedNeuronal.SALIDAS, dtype=np.float32)
+
+    @property
+    def entradas(self):
+        """Obtener el tamaño del vector de entrada."""
+        return self.__pesos_ocultos.shape[0]
+
+    @property
+    def ocultas(self):
+        """Obtener la cantidad de unidades ocultas."""
+        return self.__pesos_ocultos.shape[1]
+
+    @property
+    def parametros(self):
+        """Obtener los arreglos de parámetros, en el orden de PARAMETROS.
+
+        Los arreglos se devuelven sin copiar: modificarlos modifica la red.
+        """
+        return (self.__pesos_ocultos, self.__sesgos_ocultos, self.__pesos_salida,
+                self.__sesgos_salida)
+
+    def fijar_parametros(self, parametros):
+        """Reemplazar los parámetros por copias de otros con la misma forma.
+
+        Args:
+            parametros (Sequence[numpy.ndarray]): Arreglos en el orden de
+                PARAMETROS
+        """
+        parametros = [np.array(arreglo, dtype=np.float32) for arreglo in parametros]
+        if len(parametros) != len(RedNeuronal.PARAMETROS):
+            raise ValueError("Cantidad de parámetros inválida")
+        actuales = self.parametros
+        for arreglo, actual in zip(parametros, actuales):
+            if arreglo.shape != actual.shape:
+                raise ValueError("Los parámetros no tienen la forma de la red")
+        (self.__pesos_ocultos, self.__sesgos_ocultos, self.__pesos_salida,
+         self.__sesgos_salida) = parametros
+
+    @staticmethod
+    def sigmoide(valores):
+        """Aplicar la función logística elemento a elemento."""
+        return 1 / (1 + np.exp(-valores))
+
+    def ocultar(self, entradas):
+        """Calcular la activación de la capa oculta de un lote.
+
+        Args:
+            entradas (numpy.ndarray): Lote (N, entradas)
+
+        Returns:
+            numpy.ndarray: Lote (N, ocultas)
+        """
+        return RedNeuronal.sigmoide(entradas @ self.__pesos_ocultos + self.__sesgos_ocultos)
+
+    def propagar(self, entradas):
+        """Evaluar un lote de entradas.
+
+        Args:
+            entradas (numpy.ndarray): Lote (N, entradas) o vector (entradas,)
+
+        Returns:
+            numpy.ndarray: Probabilidades (N, 5), o (5,) para un vector
+        """
+        ocultas = self.ocultar(entradas)
+        return RedNeuronal.sigmoide(ocultas @ self.__pesos_salida + self.__sesgos_salida)
+
+    @staticmethod
+    def equidad(probabilidades):
+        """Convertir probabilidades en equidad sin cubo.
+
+        Args:
+            probabilidades (numpy.ndarray): Lote (..., 5) de salidas
+
+        Returns:
+            numpy.ndarray: Equidad (...) entre -3 y 3
+        """
+        gana, gana_gammon, gana_backgammon, pierde_gammon, pierde_backgammon = \
+            np.moveaxis(probabilidades, -1, 0)
+        return (2 * gana - 1 + gana_gammon - pierde_gammon + gana_backgammon
+                - pierde_backgammon)
+
+    def guardar(self, ruta):
+        """Guardar los parámetros en un archivo .npz.
+
+        Args:
+            ruta (str): Ruta del archivo
+        """
+        np.savez(ruta, **dict(zip(RedNeuronal.PARAMETROS, self.parametros)))
+
+    @staticmethod
+    def cargar(ruta):
+        """Crear una red con los parámetros de un archivo guardado.
+
+        Args:
+            ruta (str): Ruta del archivo .npz
+
+        Returns:
+            RedNeuronal: Red con la forma y los pesos guardados
+        """
+        with np.load(ruta) as datos:
+            parametros = [datos[nombre] for nombre in RedNeuronal.PARAMETROS]
+        entradas, ocultas = parametros[0].shape
+        red = RedNeuronal(entradas, ocultas)
+        red.fijar_parametros(parametros)
+        return red
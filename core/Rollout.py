@@ -0,0 +1,344 @@
+"""Rollouts Monte Carlo de posiciones de backgammon.
+
+Estima la equidad de una posición jugándola hasta el final muchas veces
+con una política rápida. Se ejecuta como módulo:
+
+    python -m core.Rollout --trials 1296 --workers 4 --seed 1 --truncate 12
+
+Con ``--variante hypergammon`` se parte de la posición inicial de esa
+variante (si no se indica ``--position``) y los finales se puntúan con 3
+fichas por color.
+
+Las pruebas se agrupan en bloques de 36: la prueba ``j`` de cada bloque
+empieza con la tirada número ``j`` de las 36 posibles (estratificación
+de la primera tirada) y el bloque tiene su propio flujo de dados y de
+políticas derivado de la semilla base, así que el resultado con una
+semilla dada es el mismo con cualquier cantidad de procesos.
+"""
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.DiceRoller import DiceRoller
+from core.EvaluadorPips import EvaluadorPips
+from core.Expectimax import Expectimax
+from core.GnuId import GnuId
+from core.MoveGenerator import MoveGenerator
+from core.Policies import POLITICAS
+
+
+class Rollout:
+    """Juega una posición muchas veces y resume la equidad obtenida.
+
+    El resultado de cada prueba se mide para el color que tiene el turno en
+    la posición inicial: ±1, ±2 o ±3 si la partida termina, o el valor del
+    evaluador si se trunca después de ``truncar`` medios turnos.
+
+    Reducción de varianza por suerte: en cada medio turno se calcula, con
+    el evaluador, el valor de la mejor jugada para cada una de las 21
+    tiradas. La suerte de la tirada obtenida es su valor menos el promedio
+    ponderado de las 21, así que su esperanza es exactamente 0 y la suma de
+    la suerte de una prueba sirve como variable de control: la equidad
+    ajustada es ``resultado - coeficiente * suerte``, con el coeficiente de
+    regresión estimado sobre las mismas pruebas (el evaluador no tiene por
+    qué estar en la escala de los puntos).
+    """
+
+    TAMANO_BLOQUE = 36
+    MAX_MEDIOS_TURNOS = 20000
+    Z_95 = 1.959964
+    # Las 36 tiradas ordenadas, una por prueba de cada bloque
+    PRIMERAS_TIRADAS = tuple((dado_1, dado_2) for dado_1 in range(1, 7) for dado_2 in range(1, 7))
+
+    @staticmethod
+    def __movimientos(tirada):
+        """Convertir una tirada en los dados a jugar (cuatro si es doble)."""
+        if tirada[0] == tirada[1]:
+            return (tirada[0],) * 4
+        return tirada
+
+    @staticmethod
+    def __valor_opcion(posicion, color, evaluador, fichas):
+        """Valor para ``color`` de la posición tras su jugada."""
+        final = Expectimax.valor_final(posicion, color, fichas)
+        if final is not None:
+            return final
+        return evaluador.evaluar(posicion, color)
+
+    @staticmethod
+    def __suerte(posicion, color, tirada, evaluador, fichas):
+        """Calcular la suerte de una tirada y las opciones que deja.
+
+        Returns:
+            tuple: (suerte para ``color``, opciones de la tirada obtenida)
+        """
+        obtenida = Rollout.__movimientos(tuple(sorted(tirada)))
+        promedio = 0.0
+        valor_obtenida = 0.0
+        opciones_obtenida = None
+        por_tirada = MoveGenerator.generar_por_tirada(posicion, color)
+        for movimientos, probabilidad in Expectimax.TIRADAS:
+            opciones = por_tirada[movimientos]
+            valor = max(Rollout.__valor_opcion(resultado, color, evaluador, fichas)
+                        for _, resultado in opciones)
+            promedio += probabilidad * valor
+            if movimientos == obtenida:
+                valor_obtenida = valor
+                opciones_obtenida = opciones
+        return valor_obtenida - promedio, opciones_obtenida
+
+    @staticmethod
+    def jugar_prueba(posicion, color, primera_tirada, roller, politicas, evaluador,
+                     truncar=None, reduccion_varianza=True, fichas=Expectimax.FICHAS):
+        """Jugar una prueba de rollout.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que tira primero
+            primera_tirada (tuple): Dados de la primera tirada
+            roller (DiceRoller): Generador para las tiradas siguientes
+            politicas (dict): Política de cada color
+            evaluador: Objeto con ``evaluar(posicion, color)``
+            truncar (int): Medios turnos antes de evaluar, o None
+            reduccion_varianza (bool): Acumular la suerte de las tiradas
+            fichas (int): Fichas por color de la variante
+
+        Returns:
+            tuple: (resultado, suerte, truncada) para ``color``
+        """
+        rival = {ColorFicha.BLANCA: ColorFicha.NEGRA, ColorFicha.NEGRA: ColorFicha.BLANCA}
+        actual = color
+        suerte = 0.0
+        tirada = primera_tirada
+        for medio_turno in range(1, Rollout.MAX_MEDIOS_TURNOS + 1):
+            if reduccion_varianza:
+                delta, opciones = Rollout.__suerte(posicion, actual, tirada, evaluador, fichas)
+                suerte += delta if actual == color else -delta
+            else:
+                opciones = MoveGenerator.generar_posiciones(posicion, actual,
+                                                            Rollout.__movimientos(tirada))
+            _, posicion = politicas[actual].elegir_jugada(opciones, actual)
+            signo = 1 if actual == color else -1
+            final = Expectimax.valor_final(posicion, actual, fichas)
+            if final is not None:
+                return signo * final, suerte, False
+            if truncar is not None and medio_turno >= truncar:
+                return signo * evaluador.evaluar(posicion, actual), suerte, True
+            actual = rival[actual]
+            tirada = roller.tirar()
+        raise RuntimeError("La prueba superó el máximo de medios turnos")
+
+    @staticmethod
+    def jugar_bloque(tarea):
+        """Jugar un bloque de pruebas con su propio flujo de dados.
+
+        Args:
+            tarea (tuple): (número de bloque, cantidad de pruebas, posición,
+                color, semilla, política, evaluador, truncar,
+                reducción de varianza, fichas por color)
+
+        Returns:
+            list: Tuplas (resultado, suerte, truncada) en orden de prueba
+        """
+        (bloque, cantidad, posicion, color, semilla, politica, evaluador, truncar,
+         reduccion_varianza, fichas) = tarea
+        roller = DiceRoller(DiceRoller.semilla_de_flujo(semilla, 3 * bloque), tamano_buffer=1024)
+        politicas = {
+            ColorFicha.BLANCA: POLITICAS[politica](
+                DiceRoller.semilla_de_flujo(semilla, 3 * bloque + 1)),
+            ColorFicha.NEGRA: POLITICAS[politica](
+                DiceRoller.semilla_de_flujo(semilla, 3 * bloque + 2)),
+        }
+        return [Rollout.jugar_prueba(posicion, color, Rollout.PRIMERAS_TIRADAS[indice], roller,
+                                     politicas, evaluador, truncar, reduccion_varianza, fichas)
+                for indice in range(cantidad)]
+
+    @staticmethod
+    def __media_y_error(valores):
+        """Calcular la media y el error estándar de una muestra."""
+        cantidad = len(valores)
+        media = sum(valores) / cantidad
+        if cantidad < 2:
+            return media, 0.0
+        varianza = sum((valor - media) ** 2 for valor in valores) / (cantidad - 1)
+        return media, math.sqrt(varianza / cantidad)
+
+    @staticmethod
+    def resumir(pruebas):
+        """Resumir los resultados de las pruebas.
+
+        Args:
+            pruebas (list): Tuplas (resultado, suerte, truncada)
+
+        Returns:
+            dict: equidad, error_estandar, intervalo (95%), equidad_sin_ajuste,
+                error_sin_ajuste, coeficiente, pruebas y truncadas
+        """
+        resultados = [resultado for resultado, _, _ in pruebas]
+        suertes = [suerte for _, suerte, _ in pruebas]
+        cantidad = len(pruebas)
+        media_resultado = sum(resultados) / cantidad
+        media_suerte = sum(suertes) / cantidad
+        covarianza = sum((resultado - media_resultado) * (suerte - media_suerte)
+                         for resultado, suerte in zip(resultados, suertes))
+        varianza_suerte = sum((suerte - media_suerte) ** 2 for suerte in suertes)
+        coeficiente = covarianza / varianza_suerte if varianza_suerte > 0 else 0.0
+        ajustados = [resultado - coeficiente * suerte
+                     for resultado, suerte in zip(resultados, suertes)]
+        equidad, error = Rollout.__media_y_error(ajustados)
+        equidad_sin_ajuste, error_sin_ajuste = Rollout.__media_y_error(resultados)
+        return {
+            "equidad": equidad,
+            "error_estandar": error,
+            "intervalo": (equidad - Rollout.Z_95 * error, equidad + Rollout.Z_95 * error),
+            "equidad_sin_ajuste": equidad_sin_ajuste,
+            "error_sin_ajuste": error_sin_ajuste,
+            "coeficiente": coeficiente,
+            "pruebas": cantidad,
+            "truncadas": sum(1 for _, _, truncada in pruebas if truncada),
+        }
+
+    @staticmethod
+    def ejecutar(posicion, color, pruebas=1296, workers=1, semilla=None, politica="golosa",
+                 evaluador=None, truncar=None, reduccion_varianza=True, fichas=Expectimax.FICHAS):
+        """Hacer el rollout de una posición con ``color`` por tirar.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            color (ColorFicha): Color que tira primero
+            pruebas (int): Cantidad de pruebas; conviene un múltiplo de 36
+            workers (int): Procesos a usar; con 1 se juega en este proceso
+            semilla (int): Semilla base; si es None se elige una al azar
+            politica (str): Nombre de la política de ambos colores
+            evaluador: Objeto con ``evaluar(posicion, color)``; por defecto
+                EvaluadorPips
+            truncar (int): Medios turnos antes de evaluar, o None para
+                jugar hasta el final
+            reduccion_varianza (bool): Ajustar por la suerte de las tiradas
+            fichas (int): Fichas por color de la variante (ver
+                BoardInitializer.VARIANTES)
+
+        Returns:
+            dict: Resultado de ``resumir`` más ``semilla`` y ``segundos``
+        """
+        if pruebas < 1:
+            raise ValueError("Debe jugarse al menos una prueba")
+        if workers < 1:
+            raise ValueError("Debe usarse al menos un worker")
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica}")
+        if truncar is not None and truncar < 1:
+            raise ValueError("El truncamiento debe ser de al menos un medio turno")
+        if fichas < 1:
+            raise ValueError("Cada color debe tener al menos una ficha")
+        if (sum(valor for valor in posicion if valor > 0) > fichas
+                or -sum(valor for valor in posicion if valor < 0) > fichas):
+            raise ValueError("La posición tiene más fichas que las de la variante")
+        if Expectimax.valor_final(posicion, ColorFicha.BLANCA, fichas) is not None or \
+                Expectimax.valor_final(posicion, ColorFicha.NEGRA, fichas) is not None:
+            raise ValueError("La posición ya está terminada")
+        if evaluador is None:
+            evaluador = EvaluadorPips()
+        if semilla is None:
+            semilla = random.randrange(2 ** 63)
+
+        posicion = tuple(posicion)
+        tareas = [(bloque, min(Rollout.TAMANO_BLOQUE, pruebas - inicio), posicion, color,
+                   semilla, politica, evaluador, truncar, reduccion_varianza, fichas)
+                  for bloque, inicio in enumerate(range(0, pruebas, Rollout.TAMANO_BLOQUE))]
+
+        inicio = time.perf_counter()
+        if workers == 1:
+            bloques = [Rollout.jugar_bloque(tarea) for tarea in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                bloques = list(pool.map(Rollout.jugar_bloque, tareas))
+        segundos = time.perf_counter() - inicio
+
+        resumen = Rollout.resumir([prueba for bloque in bloques for prueba in bloque])
+        resumen["semilla"] = semilla
+        resumen["segundos"] = segundos
+        return resumen
+
+    @staticmethod
+    def ejecutar_juego(game, **opciones):
+        """Hacer el rollout de la posición de una partida antes de tirar los dados.
+
+        Args:
+            game (BackgammonGame): Partida en curso con el jugador por tirar
+            **opciones: Parámetros de ``ejecutar``; ``fichas`` es por
+                defecto la de la variante de la partida
+
+        Returns:
+            dict: Igual que ejecutar, para el jugador actual
+        """
+        if game.dice.has_moves_available():
+            raise RuntimeError("El rollout se hace antes de tirar los dados")
+        opciones.setdefault("fichas", game.fichas_por_color)
+        return Rollout.ejecutar(game.board.posicion, game.current_player.color, **opciones)
+
+    @staticmethod
+    def formatear_reporte(resumen):
+        """Armar el texto del reporte de un rollout.
+
+        Args:
+            resumen (dict): Resultado de ejecutar
+
+        Returns:
+            str: Equidad con su intervalo, sin ajustar y velocidad
+        """
+        inferior, superior = resumen["intervalo"]
+        segundos = resumen["segundos"]
+        velocidad = resumen["pruebas"] / segundos if segundos > 0 else float("inf")
+        return "\n".join([
+            f"Pruebas:           {resumen['pruebas']} (semilla {resumen['semilla']}, "
+            f"truncadas {resumen['truncadas']})",
+            f"Tiempo:            {segundos:.2f} s ({velocidad:.1f} pruebas/s)",
+            f"Equidad:           {resumen['equidad']:+.4f} ± {resumen['error_estandar']:.4f} "
+            f"(95%: {inferior:+.4f} a {superior:+.4f})",
+            f"Sin ajuste:        {resumen['equidad_sin_ajuste']:+.4f} ± "
+            f"{resumen['error_sin_ajuste']:.4f}",
+        ])
+
+
+def main(argumentos=None):
+    """Ejecutar un rollout desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Rollout de una posición de backgammon")
+    parser.add_argument("--position", default=None,
+                        help="Position ID de GNU Backgammon (por defecto la inicial "
+                             "de la variante)")
+    parser.add_argument("--negras", action="store_true", help="Tiran las negras")
+    parser.add_argument("--trials", type=int, default=1296, help="Cantidad de pruebas")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base")
+    parser.add_argument("--policy", choices=sorted(POLITICAS), default="golosa",
+                        help="Política de ambos colores")
+    parser.add_argument("--truncate", type=int, default=None,
+                        help="Medios turnos antes de evaluar")
+    parser.add_argument("--variante", choices=sorted(BoardInitializer.VARIANTES),
+                        default="estandar", help="Variante, para puntuar los finales")
+    parser.add_argument("--sin-reduccion", action="store_true",
+                        help="No ajustar por la suerte de las tiradas")
+    opciones = parser.parse_args(argumentos)
+    if opciones.position is None:
+        board = Board()
+        BoardInitializer.inicializar(board, opciones.variante)
+        posicion = board.posicion
+    else:
+        posicion = GnuId.decodificar_posicion(opciones.position, opciones.negras)
+    color = ColorFicha.NEGRA if opciones.negras else ColorFicha.BLANCA
+    resumen = Rollout.ejecutar(posicion, color, opciones.trials, opciones.workers, opciones.seed,
+                               opciones.policy, truncar=opciones.truncate,
+                               reduccion_varianza=not opciones.sin_reduccion,
+                               fichas=BoardInitializer.VARIANTES[opciones.variante])
+    print(Rollout.formatear_reporte(resumen))
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
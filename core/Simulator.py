@@ -0,0 +1,215 @@
+"""Simulador de partidas de backgammon sin interfaz.
+
+Juega partidas completas entre dos políticas sobre BackgammonGame y
+reparte el trabajo en un pool de procesos. Se ejecuta como módulo:
+
+    python -m core.Simulator --games 1000 --workers 4 --seed 1
+
+Cada partida recibe dados y semillas de política derivados de la semilla
+base y de su número de partida, así que el resultado con una semilla dada
+es el mismo con cualquier cantidad de procesos.
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.BackgammonGame import BackgammonGame
+from core.ColorFicha import ColorFicha
+from core.DiceRoller import DiceRoller
+from core.MoveGenerator import MoveGenerator
+from core.Policies import POLITICAS
+
+
+class Simulator:
+    """Juega partidas automáticas y acumula sus estadísticas."""
+
+    MAX_TURNOS = 10000
+    BLOQUES_POR_WORKER = 8
+    # Contadores que se suman entre bloques de partidas
+    CONTADORES = ("partidas", "turnos", "victorias_blancas", "victorias_negras",
+                  "gammons_blancas", "gammons_negras", "backgammons_blancas",
+                  "backgammons_negras")
+
+    @staticmethod
+    def puntos_victoria(game):
+        """Calcular cuántos puntos vale la victoria de una partida terminada.
+
+        Args:
+            game (BackgammonGame): Partida con ganador
+
+        Returns:
+            int: 1 simple, 2 gammon o 3 backgammon
+        """
+        board = game.board
+        if game.winner.color == ColorFicha.BLANCA:
+            fuera_perdedor = game.fichas_fuera_negras
+            casa_ganador = range(0, 6)
+            barra_perdedor = board.contar_fichas_contenedor(ColorFicha.NEGRA)
+            perdedor = ColorFicha.NEGRA
+        else:
+            fuera_perdedor = game.fichas_fuera_blancas
+            casa_ganador = range(18, 24)
+            barra_perdedor = board.contar_fichas_contenedor(ColorFicha.BLANCA)
+            perdedor = ColorFicha.BLANCA
+        if fuera_perdedor:
+            return 1
+        if barra_perdedor or any(board.obtener_color_punto(punto) == perdedor
+                                 for punto in casa_ganador):
+            return 3
+        return 2
+
+    @staticmethod
+    def jugar_partida(numero, semilla, politica_blancas, politica_negras):
+        """Jugar una partida completa.
+
+        Args:
+            numero (int): Número de partida, que fija sus flujos aleatorios
+            semilla (int): Semilla base de la simulación
+            politica_blancas (str): Nombre de la política de las blancas
+            politica_negras (str): Nombre de la política de las negras
+
+        Returns:
+            tuple: (color ganador, puntos de la victoria, turnos jugados)
+        """
+        roller = DiceRoller(DiceRoller.semilla_de_flujo(semilla, 3 * numero),
+                            tamano_buffer=512)
+        politicas = {
+            ColorFicha.BLANCA: POLITICAS[politica_blancas](
+                DiceRoller.semilla_de_flujo(semilla, 3 * numero + 1)),
+            ColorFicha.NEGRA: POLITICAS[politica_negras](
+                DiceRoller.semilla_de_flujo(semilla, 3 * numero + 2)),
+        }
+        game = BackgammonGame("Blancas", "Negras", roller=roller)
+        game.start_game()
+        for turno in range(1, Simulator.MAX_TURNOS + 1):
+            game.roll_dice()
+            color = game.current_player.color
+            opciones = MoveGenerator.generar_posiciones(game.board.posicion, color,
+                                                        game.dice.last_roll)
+            jugada, _ = politicas[color].elegir_jugada(opciones, color)
+            for origen, dado in jugada:
+                game.apply_move(origen, dado)
+            if game.is_game_over:
+                return game.winner.color, Simulator.puntos_victoria(game), turno
+            game.end_turn()
+        raise RuntimeError("La partida superó el máximo de turnos")
+
+    @staticmethod
+    def jugar_bloque(tarea):
+        """Jugar un rango de partidas y sumar sus resultados.
+
+        Args:
+            tarea (tuple): (inicio, fin, semilla, política blancas, política negras)
+
+        Returns:
+            dict: Contadores de CONTADORES para el bloque
+        """
+        inicio, fin, semilla, politica_blancas, politica_negras = tarea
+        totales = dict.fromkeys(Simulator.CONTADORES, 0)
+        for numero in range(inicio, fin):
+            ganador, puntos, turnos = Simulator.jugar_partida(numero, semilla, politica_blancas,
+                                                              politica_negras)
+            sufijo = "blancas" if ganador == ColorFicha.BLANCA else "negras"
+            totales["partidas"] += 1
+            totales["turnos"] += turnos
+            totales["victorias_" + sufijo] += 1
+            if puntos == 2:
+                totales["gammons_" + sufijo] += 1
+            elif puntos == 3:
+                totales["backgammons_" + sufijo] += 1
+        return totales
+
+    @staticmethod
+    def simular(partidas, workers=1, semilla=None, politica_blancas="golosa",
+                politica_negras="aleatoria"):
+        """Jugar muchas partidas, en paralelo si hay más de un worker.
+
+        Args:
+            partidas (int): Cantidad de partidas
+            workers (int): Procesos a usar; con 1 se juega en este proceso
+            semilla (int): Semilla base; si es None se elige una al azar
+            politica_blancas (str): Nombre de la política de las blancas
+            politica_negras (str): Nombre de la política de las negras
+
+        Returns:
+            dict: Contadores totales más ``semilla`` y ``segundos``
+        """
+        if partidas < 1:
+            raise ValueError("Debe simularse al menos una partida")
+        if workers < 1:
+            raise ValueError("Debe usarse al menos un worker")
+        for nombre in (politica_blancas, politica_negras):
+            if nombre not in POLITICAS:
+                raise ValueError(f"Política desconocida: {nombre}")
+        if semilla is None:
+            semilla = random.randrange(2 ** 63)
+
+        cantidad_bloques = min(partidas, workers * Simulator.BLOQUES_POR_WORKER)
+        limites = [partidas * indice // cantidad_bloques for indice in range(cantidad_bloques + 1)]
+        tareas = [(limites[indice], limites[indice + 1], semilla, politica_blancas,
+                   politica_negras) for indice in range(cantidad_bloques)]
+
+        inicio = time.perf_counter()
+        if workers == 1:
+            resultados = [Simulator.jugar_bloque(tarea) for tarea in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                resultados = list(pool.map(Simulator.jugar_bloque, tareas))
+        segundos = time.perf_counter() - inicio
+
+        totales = dict.fromkeys(Simulator.CONTADORES, 0)
+        for resultado in resultados:
+            for clave, valor in resultado.items():
+                totales[clave] += valor
+        totales["semilla"] = semilla
+        totales["segundos"] = segundos
+        return totales
+
+    @staticmethod
+    def formatear_reporte(totales):
+        """Armar el texto del reporte de una simulación.
+
+        Args:
+            totales (dict): Resultado de simular
+
+        Returns:
+            str: Reporte con velocidad, turnos y tasas de victoria y gammon
+        """
+        partidas = totales["partidas"]
+        segundos = totales["segundos"]
+        velocidad = partidas / segundos if segundos > 0 else float("inf")
+        lineas = [
+            f"Partidas:          {partidas} (semilla {totales['semilla']})",
+            f"Tiempo:            {segundos:.2f} s ({velocidad:.1f} partidas/s)",
+            f"Turnos promedio:   {totales['turnos'] / partidas:.1f}",
+        ]
+        for sufijo, nombre in (("blancas", "Blancas"), ("negras", "Negras")):
+            victorias = totales["victorias_" + sufijo]
+            gammons = totales["gammons_" + sufijo] + totales["backgammons_" + sufijo]
+            lineas.append(
+                f"{nombre + ':':<18} victorias {100 * victorias / partidas:.1f}%  "
+                f"gammons {100 * gammons / partidas:.1f}%  "
+                f"backgammons {100 * totales['backgammons_' + sufijo] / partidas:.1f}%")
+        return "\n".join(lineas)
+
+
+def main(argumentos=None):
+    """Ejecutar la simulación desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulador de partidas de backgammon")
+    parser.add_argument("--games", type=int, default=100, help="Cantidad de partidas")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base")
+    parser.add_argument("--blancas", choices=sorted(POLITICAS), default="golosa",
+                        help="Política de las blancas")
+    parser.add_argument("--negras", choices=sorted(POLITICAS), default="aleatoria",
+                        help="Política de las negras")
+    opciones = parser.parse_args(argumentos)
+    totales = Simulator.simular(opciones.games, opciones.workers, opciones.seed,
+                                opciones.blancas, opciones.negras)
+    print(Simulator.formatear_reporte(totales))
+    return totales
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Tabla de transposición de tamaño fijo para los motores de búsqueda."""
+from array import array
+
+from core.Zobrist import Zobrist
+
+
+class TablaTransposicion:
+    """Caché de valores de búsqueda indexada por hash Zobrist.
+
+    La clave de una entrada combina el hash de la posición, el jugador en
+    turno y los dados pendientes (ver ``clave``). Las entradas se guardan en
+    arreglos paralelos de tamaño fijo, calculado a partir del límite de
+    memoria, así que la tabla nunca crece durante una búsqueda.
+
+    Cada clave puede ocupar dos casillas vecinas (un cubo de dos vías). Al
+    guardar una clave nueva con el cubo lleno se reemplaza la entrada menos
+    valiosa: la de menor profundidad, descontando ``PESO_EDAD`` por cada
+    búsqueda (generación) que pasó desde que se guardó. Así las entradas
+    profundas sobreviven a las superficiales y las de búsquedas viejas
+    terminan desplazadas aunque hayan sido profundas.
+
+    Los valores se guardan con su tipo: EXACTA, INFERIOR (el valor real es
+    mayor o igual) o SUPERIOR (el valor real es menor o igual), como los
+    devuelve una búsqueda alfa-beta que falla suave.
+    """
+    __slots__ = ("__mascara", "__claves", "__valores", "__profundidades", "__tipos",
+                 "__generaciones", "__generacion", "__consultas", "__aciertos", "__guardados",
+                 "__reemplazos")
+
+    VACIA = 0
+    EXACTA = 1
+    INFERIOR = 2
+    SUPERIOR = 3
+    LIMITE_BYTES = 16 * 1024 * 1024
+    # clave (8) + valor (8) + profundidad (1) + tipo (1) + generación (1)
+    BYTES_POR_ENTRADA = 19
+    PESO_EDAD = 2
+
+    def __init__(self, limite_bytes=LIMITE_BYTES):
+        """Reservar la tabla.
+
+        Args:
+            limite_bytes (int): Memoria máxima para las entradas; se usa la
+                mayor potencia de dos de entradas que entra en el límite
+        """
+        entradas = limite_bytes // TablaTransposicion.BYTES_POR_ENTRADA
+        if entradas < 2:
+            raise ValueError("El límite de memoria no alcanza para dos entradas")
+        entradas = 1 << (entradas.bit_length() - 1)
+        self.__mascara = entradas - 1
+        self.__claves = array('Q', bytes(8 * entradas))
+        self.__valores = array('d', bytes(8 * entradas))
+        self.__profundidades = array('b', bytes(entradas))
+        self.__tipos = array('B', bytes(entradas))
+        self.__generaciones = array('B', bytes(entradas))
+        self.__generacion = 0
+        self.__consultas = 0
+        self.__aciertos = 0
+        self.__guardados = 0
+        self.__reemplazos = 0
+
+    @staticmethod
+    def clave(posicion, turno_negras, movimientos=()):
+        """Calcular la clave de una posición, su turno y los dados pendientes.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            turno_negras (bool): True si mueven las negras
+            movimientos (Iterable[int]): Dados por jugar; vacío antes de tirar
+
+        Returns:
+            int: Clave de 64 bits
+        """
+        return Zobrist.calcular(posicion, turno_negras) ^ Zobrist.clave_dados(movimientos)
+
+    @staticmethod
+    def clave_board(board, movimientos=()):
+        """Calcular la clave de un tablero usando su hash incremental.
+
+        Args:
+            board (Board): Tablero con el turno ya fijado
+            movimientos (Iterable[int]): Dados por jugar; vacío antes de tirar
+
+        Returns:
+            int: Clave de 64 bits, igual a ``clave`` con la misma posición
+        """
+        return board.hash_posicion ^ Zobrist.clave_dados(movimientos)
+
+    @property
+    def capacidad(self):
+        """Obtener la cantidad de entradas de la tabla."""
+        return self.__mascara + 1
+
+    @property
+    def generacion(self):
+        """Obtener la generación actual (0-255)."""
+        return self.__generacion
+
+    def nueva_generacion(self):
+        """Marcar el inicio de una búsqueda nueva para envejecer las entradas guardadas."""
+        self.__generacion = (self.__generacion + 1) & 0xFF
+
+    def __edad(self, indice):
+        """Obtener cuántas generaciones pasaron desde que se guardó una entrada."""
+        return (self.__generacion - self.__generaciones[indice]) & 0xFF
+
+    def buscar(self, clave):
+        """Buscar una clave en la tabla.
+
+        Args:
+            clave (int): Clave de 64 bits
+
+        Returns:
+            tuple: (valor, profundidad, tipo) o None si no está
+        """
+        self.__consultas += 1
+        indice = clave & self.__mascara & ~1
+        for casilla in (indice, indice + 1):
+            if self.__tipos[casilla] != TablaTransposicion.VACIA and self.__claves[casilla] == clave:
+                self.__aciertos += 1
+                self.__generaciones[casilla] = self.__generacion
+                return (self.__valores[casilla], self.__profundidades[casilla],
+                        self.__tipos[casilla])
+        return None
+
+    def guardar(self, clave, profundidad, valor, tipo=EXACTA):
+        """Guardar un valor aplicando la política de reemplazo.
+
+        Si la clave ya está, se sobrescribe salvo que la entrada guardada
+        sea más profunda y de esta misma generación.
+
+        Args:
+            clave (int): Clave de 64 bits
+            profundidad (int): Profundidad con la que se calculó el valor
+            valor (float): Valor a guardar
+            tipo (int): EXACTA, INFERIOR o SUPERIOR
+        """
+        if tipo not in (TablaTransposicion.EXACTA, TablaTransposicion.INFERIOR,
+                        TablaTransposicion.SUPERIOR):
+            raise ValueError("Tipo de entrada inválido")
+        if not 0 <= profundidad <= 127:
+            raise ValueError("La profundidad debe estar entre 0 y 127")
+        tipos = self.__tipos
+        indice = clave & self.__mascara & ~1
+        destino = None
+        for casilla in (indice, indice + 1):
+            if tipos[casilla] != TablaTransposicion.VACIA and self.__claves[casilla] == clave:
+                if profundidad < self.__profundidades[casilla] and not self.__edad(casilla):
+                    return
+                destino = casilla
+                break
+        if destino is None:
+            if tipos[indice] == TablaTransposicion.VACIA:
+                destino = indice
+            elif tipos[indice + 1] == TablaTransposicion.VACIA:
+                destino = indice + 1
+            else:
+                destino = min((indice, indice + 1), key=self.__prioridad)
+                self.__reemplazos += 1
+        self.__claves[destino] = clave
+        self.__valores[destino] = valor
+        self.__profundidades[destino] = profundidad
+        tipos[destino] = tipo
+        self.__generaciones[destino] = self.__generacion
+        self.__guardados += 1
+
+    def __prioridad(self, indice):
+        """Valor de conservar una entrada: profundidad menos su edad ponderada."""
+        return self.__profundidades[indice] - TablaTransposicion.PESO_EDAD * self.__edad(indice)
+
+    def limpiar(self):
+        """Vaciar la tabla y reiniciar las estadísticas."""
+        capacidad = self.capacidad
+        self.__tipos = array('B', bytes(capacidad))
+        self.__generacion = 0
+        self.__consultas = 0
+        self.__aciertos = 0
+        self.__guardados = 0
+        self.__reemplazos = 0
+
+    def estadisticas(self):
+        """Obtener los contadores de uso de la tabla.
+
+        Returns:
+            dict: consultas, aciertos, fallos, tasa_aciertos, guardados,
+                reemplazos, ocupadas y capacidad
+        """
+        consultas = self.__consultas
+        return {
+            "consultas": consultas,
+            "aciertos": self.__aciertos,
+            "fallos": consultas - self.__aciertos,
+            "tasa_aciertos": self.__aciertos / consultas if consultas else 0.0,
+            "guardados": self.__guardados,
+            "reemplazos": self.__reemplazos,
+            "ocupadas": self.capacidad - self.__tipos.count(TablaTransposicion.VACIA),
+            "capacidad": self.capacidad,
+        }
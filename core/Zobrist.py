@@ -0,0 +1,77 @@
+"""Claves Zobrist para identificar posiciones de backgammon con un hash de 64 bits."""
+import random
+
+SEMILLA = 0x6A09E667F3BCC908
+MAX_FICHAS = 15
+CASILLAS = 26
+# Un turno nunca tiene más de cuatro movimientos del mismo dado
+MAX_MOVIMIENTOS = 4
+
+
+def _crear_claves():
+    """Generar las claves de casillas, turno y dados a partir de la semilla fija."""
+    generador = random.Random(SEMILLA)
+    claves = tuple(
+        tuple([0] + [generador.getrandbits(64) for _ in range(2 * MAX_FICHAS)])
+        for _ in range(CASILLAS)
+    )
+    turno = generador.getrandbits(64)
+    dados = tuple(
+        tuple([0] + [generador.getrandbits(64) for _ in range(MAX_MOVIMIENTOS)])
+        for _ in range(7)
+    )
+    return claves, turno, dados
+
+
+class Zobrist:
+    """Tablas de claves aleatorias fijas para el hash incremental del tablero.
+
+    Cada casilla del tablero (26) tiene una clave por contador con signo
+    posible (-15..15). La tabla de cada casilla tiene 31 entradas indexadas
+    directamente por el contador: los valores negativos usan el índice
+    negativo de Python, así que ``CLAVES[casilla][valor]`` funciona para
+    ambos colores sin desplazar el índice. El contador 0 tiene clave 0 para
+    que un tablero vacío tenga hash 0.
+
+    ``DADOS[cara][cantidad]`` identifica cuántos movimientos de cada cara
+    quedan por jugar, así que cualquier resto de una tirada (incluidos los
+    dobles a medio usar) tiene su propia clave y "sin dados" vale 0.
+    """
+
+    MAX_FICHAS = MAX_FICHAS
+    CLAVES, TURNO, DADOS = _crear_claves()
+
+    @staticmethod
+    def calcular(posicion, turno_negras=False):
+        """Calcular desde cero el hash de una posición.
+
+        Args:
+            posicion (Sequence[int]): Contadores con signo de las 26 casillas
+            turno_negras (bool): True si mueven las negras
+
+        Returns:
+            int: Hash de 64 bits de la posición
+        """
+        valor_hash = Zobrist.TURNO if turno_negras else 0
+        claves = Zobrist.CLAVES
+        for casilla, valor in enumerate(posicion):
+            valor_hash ^= claves[casilla][valor]
+        return valor_hash
+
+    @staticmethod
+    def clave_dados(movimientos):
+        """Calcular la clave de los movimientos que quedan por jugar.
+
+        Args:
+            movimientos (Iterable[int]): Dados pendientes, en cualquier orden
+
+        Returns:
+            int: Clave de 64 bits a combinar con el hash de la posición
+        """
+        conteos = [0] * 7
+        for dado in movimientos:
+            conteos[dado] += 1
+        valor_hash = 0
+        for cara in range(1, 7):
+            valor_hash ^= Zobrist.DADOS[cara][conteos[cara]]
+        return valor_hash
@@ -81,5 +81,11 @@ class InfoPanel:
         
         # Instrucciones
         inst_font = pygame.font.SysFont('Arial', 14)
-        texto_inst = inst_font.render("ESPACIO: Dados", True, (200, 200, 200))
-        self.__screen.blit(texto_inst, (panel_x + 20, panel_y + 250))
\ No newline at end of file
+        texto_inst = inst_font.render("ESPACIO: Dados   U: Deshacer", True, (200, 200, 200))
+        self.__screen.blit(texto_inst, (panel_x + 20, panel_y + 250))
+
+        # Conteo de pips (CORE)
+        board = self.__game.board
+        texto_pips = inst_font.render(
+            f"Pips  B: {board.pips_blancas}  N: {board.pips_negras}", True, (255, 255, 255))
+        self.__screen.blit(texto_pips, (panel_x + 20, panel_y + 272))
\ No newline at end of file
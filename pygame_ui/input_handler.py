@@ -1,5 +1,6 @@
 """Manejador de entrada del usuario - SOLO PRESENTACIÓN, LÓGICA EN EL CORE."""
 from core.ColorFicha import ColorFicha
+from core.MoveTables import MoveTables
 
 
 class InputHandler:
@@ -114,134 +115,98 @@ class InputHandler:
     def __intentar_reentry(self, punto_destino):
         """Intenta re-entrar una ficha desde la barra.
         
-        REGLA: Las fichas capturadas re-entran por el HOME del OPONENTE:
-        - Blancas → entran por puntos 18-23 (home de negras)
-        - Negras → entran por puntos 0-5 (home de blancas)
+        REGLA: Las fichas capturadas re-entran por el HOME del OPONENTE.
+        El dado de cada punto de entrada sale de MoveTables.ENTRADAS (CORE).
         """
         color = self.__game.current_player.color
+        entradas = MoveTables.ENTRADAS[color]
         
-        # BLANCAS entran por HOME de NEGRAS (puntos 18-23)
-        if color == ColorFicha.BLANCA:
-            if not (18 <= punto_destino <= 23):
-                return "Las blancas entran por los puntos 19-24"
-            # Dado necesario: punto 23→dado 1, punto 22→dado 2, ..., punto 18→dado 6
-            # Vienen del "punto 24 imaginario": dado = 24 - punto
-            dado_necesario = 24 - punto_destino
-        # NEGRAS entran por HOME de BLANCAS (puntos 0-5)
-        else:
-            if not (0 <= punto_destino <= 5):
-                return "Las negras entran por los puntos 1-6"
-            # Las negras avanzan: dado = punto + 1
-            dado_necesario = punto_destino + 1
+        # CORE: Dado que hace entrar la ficha por el punto clickeado
+        if punto_destino not in entradas[1:]:
+            puntos = sorted(punto + 1 for punto in entradas[1:])
+            return f"Tus fichas entran por los puntos {puntos[0]}-{puntos[-1]}"
+        dado_necesario = entradas.index(punto_destino)
         
         # Verificar dado disponible
         movimientos = list(self.__game.dice.last_roll)
         if dado_necesario not in movimientos:
             return f"No tienes el dado {dado_necesario} disponible. Dados: {movimientos}"
         
-        # Verificar destino
-        fichas_destino = self.__game.board.obtener_fichas(punto_destino)
-        if fichas_destino:
-            if fichas_destino[0].color != color:
-                if len(fichas_destino) == 1:
-                    return self.__ejecutar_reentry_con_captura(punto_destino, dado_necesario)
-                else:
-                    return f"El punto {punto_destino + 1} está bloqueado"
+        # CORE: Verificar que el punto de entrada no esté bloqueado
+        if not self.__game.es_movimiento_legal(MoveTables.ORIGEN_BARRA, dado_necesario):
+            return f"El punto {punto_destino + 1} está bloqueado"
         
+        if self.__game.board.obtener_color_punto(punto_destino) not in (None, color):
+            return self.__ejecutar_reentry_con_captura(punto_destino, dado_necesario)
         return self.__ejecutar_reentry_normal(punto_destino, dado_necesario)
     
     def __ejecutar_reentry_normal(self, punto_destino, dado_usado):
         """Ejecuta re-entry usando métodos del CORE."""
         try:
-            # CORE: Quitar de contenedor
-            ficha = self.__game.board.quitar_ficha_contenedor(self.__game.current_player.color)
-            if ficha is None:
-                return "Error: No hay fichas en la barra"
-            
-            # CORE: Agregar a tablero
-            self.__game.board.agregar_ficha(punto_destino, ficha)
-            # CORE: Usar dado
-            self.__game.dice.use_move(dado_usado)
-            
+            # CORE: Entrar desde la barra y usar el dado
+            self.__game.apply_move(MoveTables.ORIGEN_BARRA, dado_usado)
             return f"Ficha re-entrada en punto {punto_destino + 1}"
-        except Exception as e:
+        except (ValueError, RuntimeError) as e:
             return f"Error: {str(e)}"
     
     def __ejecutar_reentry_con_captura(self, punto_destino, dado_usado):
         """Ejecuta re-entry con captura usando métodos del CORE."""
         try:
-            # CORE: Quitar de contenedor
-            ficha_propia = self.__game.board.quitar_ficha_contenedor(self.__game.current_player.color)
-            if ficha_propia is None:
-                return "Error: No hay fichas en la barra"
-            
-            # CORE: Capturar
-            ficha_enemiga = self.__game.board.quitar_ficha(punto_destino)
-            if ficha_enemiga is None:
-                self.__game.board.agregar_ficha_contenedor(ficha_propia)
-                return "Error: No se pudo capturar"
-            
-            # CORE: Mover fichas
-            self.__game.board.agregar_ficha_contenedor(ficha_enemiga)
-            self.__game.board.agregar_ficha(punto_destino, ficha_propia)
-            # CORE: Usar dado
-            self.__game.dice.use_move(dado_usado)
-            
+            # CORE: Entrar desde la barra capturando la ficha enemiga
+            self.__game.apply_move(MoveTables.ORIGEN_BARRA, dado_usado)
             return f"¡Re-entrada con captura en punto {punto_destino + 1}!"
-        except Exception as e:
+        except (ValueError, RuntimeError) as e:
             return f"Error: {str(e)}"
     
     def __intentar_bear_off(self, punto_origen):
-        """Intenta sacar una ficha del tablero."""
+        """Intenta sacar una ficha del tablero.
+        
+        Qué dados sacan la ficha sale de MoveTables.BEAR_OFF y si se
+        pueden usar, de BackgammonGame.es_movimiento_legal (CORE).
+        """
         color = self.__game.current_player.color
         
         # LÓGICA DEL CORE: Verificar si puede hacer bear off
         if not self.__game.puede_hacer_bear_off(color):
             return "No puedes sacar fichas aún. Todas deben estar en tu home."
         
-        # Verificar que la ficha está en home
-        if color == ColorFicha.BLANCA:
-            if not (0 <= punto_origen <= 5):
-                return "Solo puedes sacar fichas desde tu home (puntos 1-6)"
-            distancia_necesaria = punto_origen + 1
-        else:
-            if not (18 <= punto_origen <= 23):
-                return "Solo puedes sacar fichas desde tu home (puntos 19-24)"
-            distancia_necesaria = 24 - punto_origen
+        # CORE: Dados con los que la ficha sale del tablero desde su punto
+        salidas = MoveTables.BEAR_OFF[color][punto_origen]
+        if salidas[6] == MoveTables.NO_SALE:
+            casa = [punto + 1 for punto in range(24)
+                    if MoveTables.BEAR_OFF[color][punto][6] != MoveTables.NO_SALE]
+            return f"Solo puedes sacar fichas desde tu home (puntos {casa[0]}-{casa[-1]})"
         
         # Verificar dados
         movimientos = list(self.__game.dice.last_roll)
-        dados_validos = [d for d in movimientos if d >= distancia_necesaria]
-        
+        dados_validos = sorted(d for d in set(movimientos) if salidas[d] != MoveTables.NO_SALE)
         if not dados_validos:
+            distancia_necesaria = salidas.index(MoveTables.SALIDA_EXACTA)
             return f"Necesitas un dado de al menos {distancia_necesaria}. Dados: {movimientos}"
         
-        dado_a_usar = min(dados_validos)
+        # El menor dado legal; si ninguno lo es, el CORE explica por qué
+        legales = [d for d in dados_validos if self.__game.es_movimiento_legal(punto_origen, d)]
+        dado_a_usar = legales[0] if legales else dados_validos[0]
         return self.__ejecutar_bear_off(punto_origen, dado_a_usar)
     
     def __ejecutar_bear_off(self, punto_origen, dado_usado):
         """Ejecuta el bear off usando métodos del CORE."""
         try:
-            # CORE: Quitar ficha
-            ficha = self.__game.board.quitar_ficha(punto_origen)
-            if ficha is None:
-                return "Error: No hay fichas en ese punto"
-            
-            # CORE: Usar dado
-            self.__game.dice.use_move(dado_usado)
-            # CORE: Registrar bear off (puede causar victoria)
-            victoria = self.__game.bear_off_ficha(ficha.color)
+            # CORE: Sacar ficha, usar dado y registrar bear off (puede causar victoria)
+            color = self.__game.current_player.color
+            _, _, _, _, victoria = self.__game.apply_move(punto_origen, dado_usado)
             
             # Obtener contador del CORE
             fichas_fuera = (self.__game.fichas_fuera_blancas 
-                          if ficha.color == ColorFicha.BLANCA 
+                          if color == ColorFicha.BLANCA 
                           else self.__game.fichas_fuera_negras)
             
+            total = self.__game.fichas_por_color
             if victoria:
-                return f"¡Ficha sacada! ({fichas_fuera}/15) - ¡VICTORIA!"
+                return f"¡Ficha sacada! ({fichas_fuera}/{total}) - ¡VICTORIA!"
             
-            return f"¡Ficha sacada! ({fichas_fuera}/15)"
-        except Exception as e:
+            return f"¡Ficha sacada! ({fichas_fuera}/{total})"
+        except (ValueError, RuntimeError) as e:
             return f"Error: {str(e)}"
     
     def __intentar_movimiento(self, origen, destino):
@@ -282,57 +247,32 @@ class InputHandler:
     def __ejecutar_movimiento_normal(self, origen, destino, distancia):
         """Ejecuta un movimiento normal usando métodos del CORE."""
         try:
-            # CORE: Mover ficha
-            ficha = self.__game.board.quitar_ficha(origen)
-            if ficha is None:
-                return "Error: No se pudo quitar la ficha"
-            
-            self.__game.board.agregar_ficha(destino, ficha)
-            # CORE: Usar dado
-            self.__game.dice.use_move(distancia)
-            
+            # CORE: Mover ficha y usar dado
+            self.__game.apply_move(origen, distancia)
             return f"Ficha movida de {origen + 1} a {destino + 1}"
-        except Exception as e:
+        except (ValueError, RuntimeError) as e:
             return f"Error: {str(e)}"
     
     def __ejecutar_movimiento_con_captura(self, origen, destino, distancia):
         """Ejecuta un movimiento con captura usando métodos del CORE."""
         try:
-            # CORE: Mover ficha propia
-            ficha_propia = self.__game.board.quitar_ficha(origen)
-            if ficha_propia is None:
-                return "Error: No se pudo quitar la ficha"
-            
-            # CORE: Capturar ficha enemiga
-            ficha_enemiga = self.__game.board.quitar_ficha(destino)
-            if ficha_enemiga is None:
-                self.__game.board.agregar_ficha(origen, ficha_propia)
-                return "Error: No se pudo capturar la ficha enemiga"
-            
-            # CORE: Mover fichas
-            self.__game.board.agregar_ficha_contenedor(ficha_enemiga)
-            self.__game.board.agregar_ficha(destino, ficha_propia)
-            # CORE: Usar dado
-            self.__game.dice.use_move(distancia)
-            
+            # CORE: Mover ficha propia y enviar la enemiga a la barra
+            self.__game.apply_move(origen, distancia)
             return f"¡Captura! Ficha movida de {origen + 1} a {destino + 1}"
-        except Exception as e:
+        except (ValueError, RuntimeError) as e:
             return f"Error en captura: {str(e)}"
     
     def verificar_fin_turno(self):
         """Verifica si el turno debe terminar (llama al CORE).
         
-        También verifica si no hay movimientos posibles desde la barra.
+        También pasa el turno si quedan dados pero ninguno se puede usar.
         """
-        # CORE: Verificar si hay fichas en barra sin movimientos posibles
-        if self.__game.tiene_fichas_en_barra(self.__game.current_player.color):
-            if self.__game.dice.last_raw_roll:
-                # CORE: Verificar si hay entrada posible
-                if not self.__game.hay_reentry_posible(self.__game.current_player.color):
-                    jugador_anterior = self.__game.current_player.nombre
-                    # CORE: Terminar turno
-                    self.__game.end_turn()
-                    return f"❌ No hay entrada posible desde la barra. Turno perdido. Turno de {self.__game.current_player.nombre}"
+        # CORE: Pasar el turno si no hay ningún movimiento legal
+        if self.__game.dice.last_raw_roll:
+            jugador_anterior = self.__game.current_player.nombre
+            if self.__game.pasar_turno_si_bloqueado():
+                return (f"❌ {jugador_anterior} no tiene movimientos posibles. Turno perdido. "
+                        f"Turno de {self.__game.current_player.nombre}")
         
         # Verificar fin normal de turno
         if self.__game.dice.last_raw_roll and self.__game.dice.get_moves_remaining() == 0:
@@ -342,6 +282,18 @@ class InputHandler:
             return f"Fin del turno de {jugador_anterior}. Turno de {self.__game.current_player.nombre}"
         return None
     
+    def deshacer_movimiento(self):
+        """Deshace el último movimiento del turno (llama al CORE)."""
+        self.cancelar_seleccion()
+        if not self.__game.can_undo():
+            return "No hay movimientos para deshacer"
+        
+        # CORE: Deshacer movimiento
+        origen, dado, _, _, _ = self.__game.undo_move()
+        if origen == MoveTables.ORIGEN_BARRA:
+            return f"Movimiento deshecho: ficha devuelta a la barra (dado {dado})"
+        return f"Movimiento deshecho: ficha devuelta al punto {origen + 1} (dado {dado})"
+    
     def cancelar_seleccion(self):
         """Cancela la selección actual."""
         self.__punto_origen = None
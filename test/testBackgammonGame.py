@@ -6,7 +6,13 @@ from core.Player import Player
 from core.ColorFicha import ColorFicha
 from core.Board import Board
 from core.Dice import Dice
+from core.DiceRoller import DiceRoller
 from core.Checker import Checker
+from core.MoveTables import MoveTables
+from core.GnuId import GnuId
+from core.MoveGenerator import MoveGenerator
+
+ORIGEN_BARRA = MoveTables.ORIGEN_BARRA
 
 
 class TestBackgammonGame(unittest.TestCase):
@@ -112,6 +118,16 @@ class TestBackgammonGame(unittest.TestCase):
 
         self.assertEqual(str(context.exception), "El juego ya ha terminado")
 
+    def test_end_turn_alterna_turno_en_hash(self):
+        """Test que end_turn alterna el componente de turno del hash del tablero."""
+        self.game.start_game()
+        hash_inicial = self.game.board.hash_posicion
+        self.game.end_turn()
+        self.assertTrue(self.game.board.turno_negras)
+        self.assertNotEqual(self.game.board.hash_posicion, hash_inicial)
+        self.game.end_turn()
+        self.assertEqual(self.game.board.hash_posicion, hash_inicial)
+
     def test_set_winner_jugador_valido(self):
         """Test establecer ganador con jugador válido."""
         self.game.start_game()
@@ -315,6 +331,18 @@ class TestBackgammonGame(unittest.TestCase):
         self.assertTrue(self.game.is_game_over)
         self.assertEqual(self.game.winner, self.game.current_player)
 
+    def test_hypergammon_victoria_al_sacar_3(self):
+        """Test que en hypergammon se gana al sacar la tercera ficha."""
+        self.game.start_game("hypergammon")
+        self.assertEqual(self.game.fichas_por_color, 3)
+        self.assertEqual(self.game.board.posicion[21:24], (1, 1, 1))
+        for _ in range(2):
+            self.assertFalse(self.game.bear_off_ficha(ColorFicha.BLANCA))
+        self.assertTrue(self.game.bear_off_ficha(ColorFicha.BLANCA))
+        self.assertTrue(self.game.is_game_over)
+        self.game.start_game()
+        self.assertEqual(self.game.fichas_por_color, 15)
+
     def test_bear_off_ficha_negra_victoria_al_sacar_15(self):
         """Test que negras ganan al sacar la ficha número 15."""
         self.game.start_game()
@@ -500,5 +528,254 @@ class TestBackgammonGame(unittest.TestCase):
         self.assertFalse(resultado)
 
 
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 1))
+    def test_jugadas_legales_jugador_actual(self, mock_roll):
+        """Test que jugadas_legales usa el color y los dados del turno."""
+        self.game.start_game()
+        self.game.roll_dice()
+        jugadas = self.game.jugadas_legales()
+        self.assertEqual(len(jugadas), 16)
+        for jugada in jugadas:
+            self.assertEqual(sorted(dado for _, dado in jugada), [1, 3])
+
+    def test_iterar_jugadas_legales(self):
+        """Test que la versión perezosa da las mismas jugadas y empieza por un golpe."""
+        self.__preparar_jugada((3, 1))
+        self.assertEqual({jugada for jugada in self.game.iterar_jugadas_legales()},
+                         set(self.game.jugadas_legales()))
+        # Una negra suelta en el 20 queda a tiro de la ficha del 23
+        self.game.board.limpiar_punto(20)
+        self.game.board.agregar_ficha(20, Checker(ColorFicha.NEGRA))
+        primera = next(self.game.iterar_jugadas_legales())
+        self.assertEqual(primera[0], (23, 3))
+        estado = self.__estado()
+        for origen, dado in primera:
+            self.game.apply_move(origen, dado)
+        self.assertEqual(self.game.board.contar_fichas_contenedor(ColorFicha.NEGRA), 1)
+        for _ in primera:
+            self.game.undo_move()
+        self.assertEqual(self.__estado(), estado)
+
+    def test_tiene_movimientos_legales(self):
+        """Test la detección rápida de movimientos contra MoveGenerator.hay_jugada."""
+        self.assertFalse(self.game.tiene_movimientos_legales())
+        # Blanca en la barra con la casa negra cerrada
+        barra = [0] * 26
+        barra[24], barra[10] = 1, 14
+        for punto in range(18, 24):
+            barra[punto] = -2
+        barra[0] = -3
+        # Blanca atrás de un bloqueo de cuatro puntos
+        bloqueo = [0] * 26
+        bloqueo[13], bloqueo[0] = 1, 14
+        for punto in (6, 7, 8, 9):
+            bloqueo[punto] = -2
+        bloqueo[23] = -7
+        # Bear off de ambos colores, con y sin fichas más atrás
+        salida = [0] * 26
+        salida[1], salida[4] = 2, 1
+        salida[22], salida[19] = -1, -2
+        casos = [(barra, tiradas) for tiradas in ((6, 5), (1, 2), (3, 3))]
+        casos += [(bloqueo, tiradas) for tiradas in ((4, 4), (5,), (6, 1), (2, 3))]
+        casos += [(salida, tiradas) for tiradas in ((6,), (3,), (5,), (2, 2), (1,))]
+        self.game.start_game()
+        for posicion, tiradas in casos:
+            for color in (ColorFicha.BLANCA, ColorFicha.NEGRA):
+                if self.game.current_player.color != color:
+                    self.game.end_turn()
+                self.game.board.cargar_posicion(posicion)
+                self.game.dice.set_moves(tiradas)
+                self.assertEqual(self.game.tiene_movimientos_legales(),
+                                 MoveGenerator.hay_jugada(posicion, color, tiradas),
+                                 (posicion, color, tiradas))
+        self.game.end_turn()
+        self.game.board.cargar_posicion(barra)
+        self.game.dice.set_moves((6, 5))
+        self.assertFalse(self.game.tiene_movimientos_legales())
+        # Con una sola negra en el 20 la blanca entra con el 4 golpeando
+        barra[20] = -1
+        self.game.board.cargar_posicion(barra)
+        self.assertFalse(self.game.tiene_movimientos_legales())
+        self.game.dice.set_moves((4, 4))
+        self.assertTrue(self.game.tiene_movimientos_legales())
+
+    def test_pasar_turno_si_bloqueado(self):
+        """Test que el turno pasa solo si quedan dados y ninguno se puede usar."""
+        self.__preparar_jugada((6, 6))
+        self.assertFalse(self.game.pasar_turno_si_bloqueado())
+        # Blanca en la barra frente a una casa negra cerrada
+        posicion = [0] * 26
+        posicion[24], posicion[10] = 1, 14
+        for punto in range(18, 24):
+            posicion[punto] = -2
+        posicion[0] = -3
+        self.game.board.cargar_posicion(posicion)
+        self.assertTrue(self.game.pasar_turno_si_bloqueado())
+        self.assertEqual(self.game.current_player.color, ColorFicha.NEGRA)
+        self.assertEqual(self.game.dice.get_moves_remaining(), 0)
+        self.assertFalse(self.game.pasar_turno_si_bloqueado())
+
+    def __preparar_jugada(self, dados):
+        """Iniciar partida con una tirada fija."""
+        self.game.start_game()
+        with patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=dados):
+            self.game.roll_dice()
+
+    def __estado(self):
+        """Capturar todo el estado que apply_move/undo_move deben restaurar."""
+        board = self.game.board
+        return (board.posicion, board.hash_posicion, board.pips_blancas, board.pips_negras,
+                self.game.dice.last_roll, self.game.fichas_fuera_blancas,
+                self.game.fichas_fuera_negras, self.game.is_game_over, self.game.winner)
+
+    def test_apply_move_y_undo_move(self):
+        """Test que aplicar y deshacer un movimiento restaura el estado exacto."""
+        self.__preparar_jugada((6, 5))
+        estado = self.__estado()
+        registro = self.game.apply_move(23, 6)
+        self.assertEqual(registro, (23, 6, 17, False, False))
+        self.assertEqual(self.game.board.valor_punto(17), 1)
+        self.assertEqual(self.game.dice.last_roll, (5,))
+        self.assertTrue(self.game.can_undo())
+        self.assertEqual(self.game.undo_move(), registro)
+        self.assertEqual(self.__estado(), estado)
+        self.assertFalse(self.game.can_undo())
+
+    def test_undo_todas_las_jugadas_legales(self):
+        """Test que cada jugada legal se deshace hasta la posición inicial."""
+        self.__preparar_jugada((3, 1))
+        estado = self.__estado()
+        for jugada in self.game.jugadas_legales():
+            for origen, dado in jugada:
+                self.game.apply_move(origen, dado)
+            for _ in jugada:
+                self.game.undo_move()
+            self.assertEqual(self.__estado(), estado)
+
+    def test_apply_move_entrada_desde_barra(self):
+        """Test que las entradas desde la barra se aplican y se deshacen."""
+        self.__preparar_jugada((6, 1))
+        self.game.board.agregar_ficha_contenedor(Checker(ColorFicha.BLANCA))
+        estado = self.__estado()
+
+        with self.assertRaises(ValueError):
+            self.game.apply_move(23, 6)
+        with self.assertRaises(ValueError):
+            self.game.apply_move(ORIGEN_BARRA, 6)
+        registro = self.game.apply_move(ORIGEN_BARRA, 1)
+        self.assertEqual(registro, (ORIGEN_BARRA, 1, 23, False, False))
+        self.assertEqual(self.game.board.contar_fichas_contenedor(ColorFicha.BLANCA), 0)
+        self.game.apply_move(23, 6)
+        self.game.undo_move()
+        self.game.undo_move()
+        self.assertEqual(self.__estado(), estado)
+
+    def test_apply_move_golpe(self):
+        """Test que un golpe manda la ficha rival a la barra y se deshace."""
+        self.__preparar_jugada((3, 1))
+        self.game.board.agregar_ficha(20, Checker(ColorFicha.NEGRA))
+        estado = self.__estado()
+        registro = self.game.apply_move(23, 3)
+        self.assertEqual(registro, (23, 3, 20, True, False))
+        self.assertEqual(self.game.board.valor_punto(20), 1)
+        self.assertEqual(self.game.board.contar_fichas_contenedor(ColorFicha.NEGRA), 1)
+        self.game.undo_move()
+        self.assertEqual(self.__estado(), estado)
+
+    def test_apply_move_bear_off_con_victoria(self):
+        """Test que deshacer el bear off ganador reabre la partida."""
+        self.__preparar_jugada((6, 2))
+        self.game.board.resetear_tablero()
+        self.game.board.agregar_ficha(3, Checker(ColorFicha.BLANCA))
+        self.game.board.agregar_ficha(23, Checker(ColorFicha.NEGRA))
+        for _ in range(14):
+            self.game.bear_off_ficha(ColorFicha.BLANCA)
+        estado = self.__estado()
+
+        registro = self.game.apply_move(3, 6)
+        self.assertEqual(registro[2:], (MoveTables.FUERA, False, True))
+        self.assertTrue(self.game.is_game_over)
+        self.assertEqual(self.game.fichas_fuera_blancas, 15)
+        self.game.undo_move()
+        self.assertEqual(self.__estado(), estado)
+
+    def test_apply_move_bear_off_con_sobrante_requiere_no_tener_fichas_atras(self):
+        """Test que el dado mayor solo saca si no hay fichas más atrás."""
+        self.__preparar_jugada((6, 1))
+        self.game.board.resetear_tablero()
+        self.game.board.agregar_ficha(2, Checker(ColorFicha.BLANCA))
+        self.game.board.agregar_ficha(4, Checker(ColorFicha.BLANCA))
+        self.game.board.agregar_ficha(23, Checker(ColorFicha.NEGRA))
+        self.assertFalse(self.game.es_movimiento_legal(2, 6))
+        self.assertTrue(self.game.es_movimiento_legal(4, 6))
+
+    def test_apply_move_ilegal(self):
+        """Test que los movimientos ilegales no cambian el estado."""
+        self.__preparar_jugada((6, 5))
+        estado = self.__estado()
+        for origen, dado in ((23, 4), (0, 6), (5, 6), (23, 5), (ORIGEN_BARRA, 6), (30, 6)):
+            self.assertFalse(self.game.es_movimiento_legal(origen, dado))
+            with self.assertRaises(ValueError):
+                self.game.apply_move(origen, dado)
+        self.assertEqual(self.__estado(), estado)
+        with self.assertRaises(RuntimeError):
+            self.game.undo_move()
+
+    def test_end_turn_limpia_historial(self):
+        """Test que no se pueden deshacer movimientos de un turno terminado."""
+        self.__preparar_jugada((6, 5))
+        self.game.apply_move(23, 6)
+        self.game.end_turn()
+        self.assertFalse(self.game.can_undo())
+        with self.assertRaises(RuntimeError):
+            self.game.undo_move()
+
+    def test_undo_move_no_revierte_rendicion(self):
+        """Test que tras una rendición no se deshacen movimientos."""
+        self.__preparar_jugada((6, 5))
+        self.game.apply_move(23, 6)
+        self.game.set_winner(self.game.other_player)
+        with self.assertRaises(RuntimeError):
+            self.game.undo_move()
+
+    def test_apply_move_sin_iniciar(self):
+        """Test que no se puede mover sin iniciar la partida."""
+        with self.assertRaises(RuntimeError):
+            self.game.apply_move(23, 6)
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(5, 2))
+    def test_ids_gnu(self, mock_roll):
+        """Test los IDs de posición y de partida del juego."""
+        self.assertEqual(GnuId.decodificar_match(self.game.obtener_match_id())["estado"],
+                         GnuId.ESTADO_SIN_JUEGO)
+        self.game.start_game()
+        self.game.end_turn()
+        self.assertEqual(self.game.obtener_position_id(), "4HPwATDgc/ABMA")
+        self.assertEqual(self.game.obtener_match_id(), "cAkAAAAAAAAA")
+        self.game.roll_dice()
+        campos = GnuId.decodificar_match(self.game.obtener_match_id())
+        self.assertEqual((campos["dado_1"], campos["dado_2"]), (5, 2))
+
+    def test_clases_del_juego_sin_dict(self):
+        """Test que las clases de una partida usan __slots__."""
+        self.game.start_game()
+        for objeto in (self.game, self.game.board, self.game.dice, self.game.current_player):
+            self.assertFalse(hasattr(objeto, "__dict__"))
+
+    def test_partida_con_roller_es_reproducible(self):
+        """Test que dos partidas con la misma semilla tienen los mismos dados."""
+        juego_a = BackgammonGame("Juan", "Maria", roller=DiceRoller(seed=9))
+        juego_b = BackgammonGame("Juan", "Maria", roller=DiceRoller(seed=9))
+        for juego in (juego_a, juego_b):
+            juego.start_game()
+        for _ in range(10):
+            self.assertEqual(juego_a.roll_dice(), juego_b.roll_dice())
+            juego_a.end_turn()
+            juego_b.end_turn()
+        roller = juego_a.dice.roller
+        juego_a.reset_game()
+        self.assertIs(juego_a.dice.roller, roller)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,181 @@
+"""Tests para la base de datos de bear off de un lado."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from functools import lru_cache
+import numpy as np
+from core.BaseBearOff import BaseBearOff, main
+from core.ColorFicha import ColorFicha
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+def posicion_completa(blancas, negras):
+    """Armar una posición de 26 casillas con ambos lados en casa."""
+    posicion = [0] * 26
+    for punto, fichas in enumerate(blancas):
+        posicion[punto] = fichas
+    for punto, fichas in enumerate(negras):
+        posicion[23 - punto] = -fichas
+    return posicion
+
+
+@lru_cache(maxsize=None)
+def media_exacta(puntos):
+    """Tiradas esperadas para terminar, recorriendo todas las jugadas con MoveGenerator."""
+    if sum(puntos) == 0:
+        return 0.0
+    posicion = tuple(posicion_completa(puntos, ()))
+    total = 1.0
+    for movimientos, probabilidad in Expectimax.TIRADAS:
+        opciones = MoveGenerator.generar_posiciones(posicion, ColorFicha.BLANCA, movimientos)
+        total += probabilidad * min(media_exacta(tuple(max(valor, 0) for valor in resultado[0:6]))
+                                    for _, resultado in opciones)
+    return total
+
+
+class TestBaseBearOff(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Generar una base reducida de hasta 4 fichas, rápida de calcular."""
+        cls.carpeta = tempfile.mkdtemp()
+        cls.ruta = os.path.join(cls.carpeta, "bearoff.bin")
+        cls.tamano = BaseBearOff.generar(cls.ruta, fichas=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.carpeta)
+
+    def setUp(self):
+        self.base = BaseBearOff(self.ruta)
+
+    def tearDown(self):
+        self.base.cerrar()
+
+    def test_rango_y_desrango(self):
+        """Test que la numeración es una biyección con la posición vacía en 0."""
+        self.assertEqual(BaseBearOff.cantidad(), 54264)
+        self.assertEqual(BaseBearOff.rango((0,) * 6), 0)
+        self.assertEqual(BaseBearOff.desrango(BaseBearOff.cantidad() - 1), (15,) + (0,) * 5)
+        for rango in range(0, BaseBearOff.cantidad(), 97):
+            self.assertEqual(BaseBearOff.rango(BaseBearOff.desrango(rango)), rango)
+        # Las posiciones con hasta n fichas ocupan los primeros rangos
+        for rango in range(BaseBearOff.cantidad(4)):
+            self.assertLessEqual(sum(BaseBearOff.desrango(rango)), 4)
+        with self.assertRaises(ValueError):
+            BaseBearOff.rango((16, 0, 0, 0, 0, 0))
+        with self.assertRaises(ValueError):
+            BaseBearOff.desrango(BaseBearOff.cantidad())
+
+    def test_sucesores_un_dado(self):
+        """Test que mover un dado coincide con MoveGenerator."""
+        rng = np.random.default_rng(3)
+        for _ in range(100):
+            puntos = tuple(int(valor) for valor in rng.multinomial(rng.integers(1, 16), [1 / 6] * 6))
+            dado = int(rng.integers(1, 7))
+            posicion = posicion_completa(puntos, ())
+            esperados = {tuple(max(valor, 0) for valor in resultado[0:6])
+                         for _, resultado in MoveGenerator.generar_posiciones(
+                             posicion, ColorFicha.BLANCA, (dado,))}
+            self.assertEqual(BaseBearOff.sucesores_un_dado(puntos, dado), esperados)
+
+    def test_medias_exactas(self):
+        """Test que las medias coinciden con la búsqueda exhaustiva sobre todas las jugadas."""
+        self.assertAlmostEqual(self.base.media((1, 0, 0, 0, 0, 0)), 1.0, places=3)
+        for rango in range(1, BaseBearOff.cantidad(2)):
+            puntos = BaseBearOff.desrango(rango)
+            self.assertAlmostEqual(self.base.media(puntos), media_exacta(puntos), places=3)
+
+    def test_distribuciones(self):
+        """Test que las distribuciones suman 1 y la posición vacía ya terminó."""
+        self.assertEqual(self.base.fichas, 4)
+        self.assertEqual(self.tamano, os.path.getsize(self.ruta))
+        np.testing.assert_allclose(self.base.distribucion((0,) * 6)[0], 1.0)
+        for puntos in ((0, 0, 0, 0, 0, 4), (2, 1, 0, 0, 1, 0), (0, 0, 3, 0, 0, 0)):
+            self.assertAlmostEqual(self.base.distribucion(puntos).sum(), 1.0, places=3)
+            # Con menos de 15 fichas la primera ya salió
+            self.assertAlmostEqual(self.base.distribucion_gammon(puntos)[0], 1.0, places=3)
+        self.assertTrue(self.base.contiene((0, 0, 0, 0, 0, 4)))
+        self.assertFalse(self.base.contiene((5, 0, 0, 0, 0, 0)))
+        with self.assertRaises(ValueError):
+            self.base.distribucion((5, 0, 0, 0, 0, 0))
+
+    def test_puntos_de_y_es_bear_off(self):
+        """Test extraer cada lado y detectar posiciones sin contacto."""
+        posicion = posicion_completa((1, 0, 2, 0, 0, 0), (0, 3, 0, 0, 0, 1))
+        self.assertEqual(BaseBearOff.puntos_de(posicion, ColorFicha.BLANCA), (1, 0, 2, 0, 0, 0))
+        self.assertEqual(BaseBearOff.puntos_de(posicion, ColorFicha.NEGRA), (0, 3, 0, 0, 0, 1))
+        self.assertTrue(BaseBearOff.es_bear_off(posicion))
+        self.assertTrue(self.base.cubre(posicion))
+        posicion[24] = 1
+        self.assertIsNone(BaseBearOff.puntos_de(posicion, ColorFicha.BLANCA))
+        self.assertFalse(BaseBearOff.es_bear_off(posicion))
+        posicion[24] = 0
+        posicion[10] = -1
+        self.assertIsNone(BaseBearOff.puntos_de(posicion, ColorFicha.NEGRA))
+        self.assertFalse(self.base.cubre(posicion_completa((5, 0, 0, 0, 0, 0), (1,))))
+
+    def test_probabilidades_y_evaluar(self):
+        """Test las probabilidades de carreras simples."""
+        # Una ficha en el punto 1 sale siempre en la primera tirada
+        posicion = posicion_completa((1, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0))
+        self.assertEqual(self.base.probabilidades(posicion, ColorFicha.BLANCA), (1.0, 0.0, 0.0))
+        self.assertAlmostEqual(self.base.evaluar(posicion, ColorFicha.BLANCA), -1.0)
+        # Cuatro fichas en el 6 contra una en el 1: solo se gana sacando 6-6
+        posicion = posicion_completa((0, 0, 0, 0, 0, 4), (1, 0, 0, 0, 0, 0))
+        gana, _, _ = self.base.probabilidades(posicion, ColorFicha.BLANCA)
+        self.assertAlmostEqual(gana, 1 / 36, places=3)
+        self.assertAlmostEqual(self.base.evaluar(posicion, ColorFicha.NEGRA),
+                               1 - 2 * gana, places=6)
+        with self.assertRaises(ValueError):
+            self.base.probabilidades([1] + [0] * 9 + [-1] + [0] * 15, ColorFicha.BLANCA)
+
+    def test_expectimax_usa_la_base(self):
+        """Test que Expectimax valora los finales sin contacto con la base."""
+        posicion = posicion_completa((0, 0, 1, 0, 0, 2), (0, 1, 0, 1, 0, 0))
+        ranking = Expectimax(bear_off=self.base).analizar(posicion, ColorFicha.BLANCA, (4, 1), 2)
+        for _, resultado, equidad, exacta in ranking:
+            self.assertTrue(exacta)
+            esperado = Expectimax.valor_final(resultado, ColorFicha.BLANCA)
+            if esperado is None:
+                esperado = self.base.evaluar(resultado, ColorFicha.BLANCA)
+            self.assertAlmostEqual(equidad, esperado)
+
+    def test_archivo_invalido(self):
+        """Test que se rechazan archivos vacíos, cortados o con otra cabecera."""
+        vacio = os.path.join(self.carpeta, "vacio.bin")
+        otro = os.path.join(self.carpeta, "otro.bin")
+        corto = os.path.join(self.carpeta, "corto.bin")
+        truncado = os.path.join(self.carpeta, "truncado.bin")
+        open(vacio, "wb").close()
+        with open(otro, "wb") as archivo:
+            archivo.write(b"\0" * 64)
+        with open(corto, "wb") as archivo:
+            archivo.write(BaseBearOff.MAGICO)
+        with open(self.ruta, "rb") as original, open(truncado, "wb") as archivo:
+            archivo.write(original.read(BaseBearOff.CABECERA.size + 10))
+        for ruta in (vacio, otro, corto, truncado):
+            with self.assertRaises(ValueError):
+                BaseBearOff(ruta)
+        with self.assertRaises(ValueError):
+            BaseBearOff.calcular(0)
+
+    def test_main(self):
+        """Test generar una base desde la línea de comandos."""
+        ruta = os.path.join(self.carpeta, "main.bin")
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            tamano = main(["--output", ruta, "--checkers", "2"])
+        with BaseBearOff(ruta) as base:
+            self.assertEqual(base.fichas, 2)
+            self.assertAlmostEqual(base.media((0, 1, 0, 0, 0, 0)), 1.0, places=3)
+        self.assertEqual(tamano, os.path.getsize(ruta))
+        self.assertIn("28 posiciones", salida.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
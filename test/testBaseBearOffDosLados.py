@@ -0,0 +1,162 @@
+"""Tests para la base de datos de bear off de dos lados."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from functools import lru_cache
+from core.BaseBearOff import BaseBearOff
+from core.BaseBearOffDosLados import BaseBearOffDosLados, main
+from core.ColorFicha import ColorFicha
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+def posicion_completa(blancas, negras):
+    """Armar una posición de 26 casillas con ambos lados en casa."""
+    posicion = [0] * 26
+    for punto, fichas in enumerate(blancas):
+        posicion[punto] = fichas
+    for punto, fichas in enumerate(negras):
+        posicion[23 - punto] = -fichas
+    return posicion
+
+
+@lru_cache(maxsize=None)
+def ganar_exacto(propias, rivales):
+    """Probabilidad de ganar del que tira, recorriendo todas las jugadas con MoveGenerator."""
+    if sum(propias) == 0:
+        return 1.0
+    if sum(rivales) == 0:
+        return 0.0
+    posicion = tuple(posicion_completa(propias, ()))
+    total = 0.0
+    for movimientos, probabilidad in Expectimax.TIRADAS:
+        opciones = MoveGenerator.generar_posiciones(posicion, ColorFicha.BLANCA, movimientos)
+        total += probabilidad * (1 - min(
+            ganar_exacto(rivales, tuple(max(valor, 0) for valor in resultado[0:6]))
+            for _, resultado in opciones))
+    return total
+
+
+class TestBaseBearOffDosLados(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Generar una base chica de hasta 3 fichas por lado."""
+        cls.carpeta = tempfile.mkdtemp()
+        cls.ruta = os.path.join(cls.carpeta, "bearoff2.bin")
+        cls.resumen = BaseBearOffDosLados.generar(cls.ruta, fichas=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.carpeta)
+
+    def setUp(self):
+        self.base = BaseBearOffDosLados(self.ruta)
+
+    def tearDown(self):
+        self.base.cerrar()
+
+    def test_generar(self):
+        """Test el resumen de la generación y el tamaño del archivo."""
+        self.assertEqual(self.base.fichas, 3)
+        self.assertEqual(self.base.cantidad, 84)
+        self.assertEqual(self.resumen["capas"], 37)
+        self.assertEqual(self.resumen["pares"], 83 * 83)
+        self.assertEqual(os.path.getsize(self.ruta), BaseBearOffDosLados.DATOS + 2 * 84 * 84)
+
+    def test_probabilidades_exactas(self):
+        """Test que coincide con la búsqueda exhaustiva sobre todas las jugadas."""
+        for fila in range(1, BaseBearOff.cantidad(2)):
+            for columna in range(1, BaseBearOff.cantidad(2)):
+                propias = BaseBearOff.desrango(fila)
+                rivales = BaseBearOff.desrango(columna)
+                self.assertAlmostEqual(self.base.probabilidad(propias, rivales),
+                                       ganar_exacto(propias, rivales), places=4)
+
+    def test_terminales_y_casos_simples(self):
+        """Test pares terminales y carreras de una ficha."""
+        vacia = (0,) * 6
+        una = (1, 0, 0, 0, 0, 0)
+        self.assertEqual(self.base.probabilidad(vacia, una), 1.0)
+        self.assertEqual(self.base.probabilidad(una, vacia), 0.0)
+        self.assertEqual(self.base.probabilidad(una, (0, 0, 0, 0, 0, 3)), 1.0)
+        # Tres fichas en el 6: solo 6-6 las saca en una tirada
+        self.assertAlmostEqual(self.base.probabilidad((0, 0, 0, 0, 0, 3), una), 1 / 36, places=4)
+        with self.assertRaises(ValueError):
+            self.base.probabilidad((4, 0, 0, 0, 0, 0), una)
+
+    def test_posiciones_completas_y_evaluar(self):
+        """Test consultar con posiciones de 26 casillas desde ambos colores."""
+        posicion = posicion_completa((0, 0, 0, 0, 0, 3), (1, 0, 0, 0, 0, 0))
+        self.assertTrue(self.base.cubre(posicion))
+        blancas = self.base.probabilidad_posicion(posicion, ColorFicha.BLANCA)
+        negras = self.base.probabilidad_posicion(posicion, ColorFicha.NEGRA)
+        self.assertAlmostEqual(blancas, 1 / 36, places=4)
+        self.assertEqual(negras, 1.0)
+        self.assertAlmostEqual(self.base.evaluar(posicion, ColorFicha.NEGRA), 1 - 2 * blancas)
+        self.assertFalse(self.base.cubre(posicion_completa((4,), (1,))))
+        contacto = posicion_completa((1,), (1,))
+        contacto[10] = 1
+        self.assertFalse(self.base.cubre(contacto))
+        with self.assertRaises(ValueError):
+            self.base.probabilidad_posicion(contacto, ColorFicha.BLANCA)
+
+    def test_expectimax_usa_la_base(self):
+        """Test que Expectimax valora los finales sin contacto con la base."""
+        posicion = posicion_completa((0, 1, 0, 0, 0, 2), (0, 0, 1, 1, 0, 0))
+        ranking = Expectimax(bear_off=self.base).analizar(posicion, ColorFicha.BLANCA, (2, 1), 2)
+        for _, resultado, equidad, _ in ranking:
+            self.assertAlmostEqual(equidad, self.base.evaluar(resultado, ColorFicha.BLANCA))
+
+    def test_continuar_generacion(self):
+        """Test que una generación interrumpida continúa y da el mismo archivo."""
+        ruta = os.path.join(self.carpeta, "interrumpida.bin")
+
+        def interrumpir(capa, capas, pares):
+            if capa == 15:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            BaseBearOffDosLados.generar(ruta, 3, informar=interrumpir)
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados(ruta)
+        resumen = BaseBearOffDosLados.generar(ruta, 3)
+        self.assertEqual(resumen["continuada_desde"], 15)
+        with open(ruta, "rb") as continuada, open(self.ruta, "rb") as completa:
+            self.assertEqual(continuada.read(), completa.read())
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados.generar(ruta, 2)
+
+    def test_archivo_invalido_y_parametros(self):
+        """Test que se rechazan archivos ajenos y parámetros inválidos."""
+        otro = os.path.join(self.carpeta, "otro.bin")
+        with open(otro, "wb") as archivo:
+            archivo.write(b"\0" * 128)
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados(otro)
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados.generar(otro, 2)
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados.generar(os.path.join(self.carpeta, "x.bin"), 0)
+        with self.assertRaises(ValueError):
+            BaseBearOffDosLados.generar(os.path.join(self.carpeta, "x.bin"), 2, workers=0)
+
+    def test_main_con_workers(self):
+        """Test generar con varios procesos desde la línea de comandos."""
+        ruta = os.path.join(self.carpeta, "main.bin")
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            resumen = main(["--output", ruta, "--checkers", "2", "--workers", "2"])
+        self.assertEqual(resumen["pares"], 27 * 27)
+        self.assertIn("Capa 25/25", salida.getvalue())
+        with BaseBearOffDosLados(ruta) as base, BaseBearOffDosLados(self.ruta) as mayor:
+            self.assertAlmostEqual(base.probabilidad((0, 1, 1, 0, 0, 0), (2, 0, 0, 0, 0, 0)),
+                                   mayor.probabilidad((0, 1, 1, 0, 0, 0), (2, 0, 0, 0, 0, 0)),
+                                   places=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Tests para la solución exacta de hypergammon."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from core.BaseBearOff import BaseBearOff
+from core.BaseBearOffDosLados import BaseBearOffDosLados
+from core.BaseHypergammon import BaseHypergammon, main
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+class TestBaseHypergammon(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Resolver la variante de una ficha por color, que lleva menos de un segundo."""
+        cls.carpeta = tempfile.mkdtemp()
+        cls.ruta = os.path.join(cls.carpeta, "hyper1.bin")
+        cls.resumen = BaseHypergammon.generar(cls.ruta, fichas=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.carpeta)
+
+    def setUp(self):
+        self.base = BaseHypergammon(self.ruta)
+
+    def tearDown(self):
+        self.base.cerrar()
+
+    def test_numeracion_de_lados(self):
+        """Test la cantidad y el orden de las disposiciones de un lado."""
+        self.assertEqual(BaseHypergammon.cantidad_lados(3), 3276)
+        lados = BaseHypergammon.todos_los_lados(2)
+        self.assertEqual(len(lados), BaseHypergammon.cantidad_lados(2))
+        self.assertEqual(lados[0], (0, 0))
+        self.assertEqual(lados[-1], (BaseHypergammon.AFUERA, BaseHypergammon.AFUERA))
+
+    def test_lados_y_posiciones(self):
+        """Test convertir entre posiciones completas y lados desde ambos colores."""
+        board = Board()
+        BoardInitializer.inicializar_hypergammon(board)
+        posicion = board.posicion
+        self.assertEqual(BaseHypergammon.lados_de(posicion, ColorFicha.BLANCA),
+                         ([21, 22, 23], [21, 22, 23]))
+        self.assertEqual(BaseHypergammon.lados_de(posicion, ColorFicha.NEGRA),
+                         ([21, 22, 23], [21, 22, 23]))
+        self.assertEqual(BaseHypergammon.posicion_de((21, 22, 23), (21, 22, 23)), posicion)
+        golpeada = BaseHypergammon.posicion_de((3, 24, 25), (24, 25, 25))
+        self.assertEqual(golpeada[3], 1)
+        self.assertEqual(golpeada[24], 1)
+        self.assertEqual(golpeada[25], -1)
+        self.assertEqual(BaseHypergammon.lados_de(golpeada, ColorFicha.NEGRA), ([24], [3, 24]))
+
+    def test_validez_y_valor_ganado(self):
+        """Test detectar estados imposibles y puntos de cada victoria."""
+        self.assertTrue(BaseHypergammon.es_valido((5,), (10,)))
+        # El punto 5 del que tira es el 18 del rival
+        self.assertFalse(BaseHypergammon.es_valido((5,), (18,)))
+        self.assertFalse(BaseHypergammon.es_valido((25,), (10,)))
+        self.assertTrue(BaseHypergammon.es_valido((24,), (24,)))
+        self.assertEqual(BaseHypergammon.valor_ganado((3, 25)), 1)
+        self.assertEqual(BaseHypergammon.valor_ganado((3, 10)), 2)
+        self.assertEqual(BaseHypergammon.valor_ganado((3, 24)), 3)
+        self.assertEqual(BaseHypergammon.valor_ganado((3, 20)), 3)
+
+    def test_generar(self):
+        """Test el resumen de la resolución y el archivo."""
+        self.assertEqual(self.base.fichas, 1)
+        self.assertEqual(self.resumen["estados"], 601)
+        self.assertLessEqual(self.base.residuo, BaseHypergammon.TOLERANCIA)
+        self.assertEqual(self.base.iteraciones, self.resumen["iteraciones"])
+        self.assertEqual(os.path.getsize(self.ruta), self.resumen["bytes"])
+
+    def test_ecuacion_de_bellman(self):
+        """Test que la equidad de cada estado es la de la mejor jugada de cada tirada."""
+        for propio, rival in (((7,), (12,)), ((24,), (3,)), ((2,), (24,)), ((15,), (20,))):
+            posicion = BaseHypergammon.posicion_de(propio, rival)
+            esperada = 0.0
+            for movimientos, probabilidad in Expectimax.TIRADAS:
+                opciones = MoveGenerator.generar_posiciones(posicion, ColorFicha.BLANCA,
+                                                            movimientos)
+                esperada += probabilidad * max(self.base.evaluar(resultado, ColorFicha.BLANCA)
+                                               for _, resultado in opciones)
+            self.assertAlmostEqual(self.base.equidad(posicion, ColorFicha.BLANCA), esperada,
+                                   places=5)
+
+    def test_carreras_coinciden_con_bear_off(self):
+        """Test que en carreras de bear off la equidad es 2 * (2p - 1) (siempre gammon)."""
+        ruta = os.path.join(self.carpeta, "bearoff.bin")
+        BaseBearOffDosLados.generar(ruta, fichas=1)
+        with BaseBearOffDosLados(ruta) as bear_off:
+            for propio in range(6):
+                for rival in range(6):
+                    posicion = BaseHypergammon.posicion_de((propio,), (rival,))
+                    puntos_propios = BaseBearOff.puntos_de(posicion, ColorFicha.BLANCA)
+                    puntos_rivales = BaseBearOff.puntos_de(posicion, ColorFicha.NEGRA)
+                    ganar = bear_off.probabilidad(puntos_propios, puntos_rivales)
+                    self.assertAlmostEqual(self.base.equidad(posicion, ColorFicha.BLANCA),
+                                           2 * (2 * ganar - 1), places=4)
+
+    def test_evaluar_desde_ambos_colores(self):
+        """Test que evaluar usa la vista del rival y valora las partidas terminadas."""
+        posicion = BaseHypergammon.posicion_de((7,), (12,))
+        self.assertAlmostEqual(self.base.evaluar(posicion, ColorFicha.NEGRA),
+                               -self.base.equidad(posicion, ColorFicha.BLANCA))
+        espejo = [-valor for valor in reversed(posicion[:24])] + [-posicion[25], -posicion[24]]
+        self.assertAlmostEqual(self.base.equidad(espejo, ColorFicha.NEGRA),
+                               self.base.equidad(posicion, ColorFicha.BLANCA))
+        terminada = [0] * 26
+        terminada[20] = -1
+        self.assertEqual(self.base.evaluar(terminada, ColorFicha.BLANCA), 2.0)
+        terminada[20] = 0
+        terminada[3] = -1
+        self.assertEqual(self.base.evaluar(terminada, ColorFicha.BLANCA), 3.0)
+        with self.assertRaises(ValueError):
+            self.base.equidad(terminada, ColorFicha.BLANCA)
+
+    def test_archivo_invalido_y_parametros(self):
+        """Test que se rechazan archivos ajenos y parámetros inválidos."""
+        otro = os.path.join(self.carpeta, "otro.bin")
+        with open(otro, "wb") as archivo:
+            archivo.write(b"\0" * 128)
+        corto = os.path.join(self.carpeta, "corto.bin")
+        with open(corto, "wb") as archivo:
+            archivo.write(BaseHypergammon.MAGICO)
+        for ruta in (otro, corto):
+            with self.assertRaises(ValueError):
+                BaseHypergammon(ruta)
+        with self.assertRaises(ValueError):
+            BaseHypergammon.resolver(0)
+        with self.assertRaises(ValueError):
+            BaseHypergammon.resolver(1, workers=0)
+
+    def test_main_con_workers(self):
+        """Test resolver con varios procesos desde la línea de comandos."""
+        ruta = os.path.join(self.carpeta, "main.bin")
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            resumen = main(["--output", ruta, "--checkers", "1", "--workers", "2"])
+        self.assertEqual(resumen["estados"], 601)
+        self.assertIn("601 posiciones", salida.getvalue())
+        with open(ruta, "rb") as archivo, open(self.ruta, "rb") as original:
+            self.assertEqual(archivo.read(), original.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""Tests para el motor de partidas por lotes."""
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from core.BatchGame import BatchGame, main
+from core.ColorFicha import ColorFicha
+from core.MoveGenerator import MoveGenerator
+from core.Simulator import Simulator
+
+
+def finales(tablero, negras, valores):
+    """Posiciones absolutas alcanzables recorriendo todas las máscaras de un turno."""
+    completo = np.zeros((1, BatchGame.COLUMNAS), dtype=np.int8)
+    completo[0, :26] = tablero[:26]
+    relativa = BatchGame.a_relativas(completo, np.array([negras]))
+    valores = np.array([valores], dtype=np.int64)
+    restantes = np.array([[4, 0] if valores[0, 0] == valores[0, 1] else [1, 1]])
+    resultado = set()
+    vistos = set()
+    pendientes = [(relativa, restantes)]
+    while pendientes:
+        relativa, restantes = pendientes.pop()
+        clave = (relativa.tobytes(), restantes.tobytes())
+        if clave in vistos:
+            continue
+        vistos.add(clave)
+        mascara = BatchGame.mascara_turno(relativa, valores, restantes)[0]
+        if not mascara.any():
+            absoluta = BatchGame.a_relativas(relativa, np.array([negras]))
+            resultado.add(tuple(int(valor) for valor in absoluta[0, :26]))
+            continue
+        for dado, origen in zip(*np.nonzero(mascara)):
+            siguiente = relativa.copy()
+            BatchGame.aplicar(siguiente, np.array([0]), np.array([origen]),
+                              valores[:, dado])
+            quedan = restantes.copy()
+            quedan[0, dado] -= 1
+            pendientes.append((siguiente, quedan))
+    return resultado
+
+
+def esperados(tablero, negras, valores):
+    """Posiciones que genera MoveGenerator para la misma tirada."""
+    color = ColorFicha.NEGRA if negras else ColorFicha.BLANCA
+    movimientos = tuple(valores) * 2 if valores[0] == valores[1] else tuple(valores)
+    return {tuple(posicion) for _, posicion in
+            MoveGenerator.generar_posiciones(list(tablero[:26]), color, movimientos)}
+
+
+class TestBatchGame(unittest.TestCase):
+
+    def test_coincide_con_move_generator_en_partidas(self):
+        """Test que las máscaras generan las mismas posiciones que MoveGenerator."""
+        azar = random.Random(4)
+        lote = BatchGame(40, semilla=2, politica_negras="golosa")
+        for paso in range(120):
+            if paso % 6 == 0:
+                for fila in np.flatnonzero(~lote.terminadas):
+                    valores = (azar.randint(1, 6), azar.randint(1, 6))
+                    tablero = lote.tableros[fila]
+                    negras = bool(lote.turno_negras[fila])
+                    self.assertEqual(finales(tablero, negras, valores),
+                                     esperados(tablero, negras, valores),
+                                     (tablero.tolist(), negras, valores))
+            if not lote.paso():
+                break
+
+    def test_coincide_con_move_generator_en_casos_limite(self):
+        """Test barra, bear off con sobrante y regla del dado mayor."""
+        casos = []
+        # Dos blancas en la barra y casa negra casi cerrada
+        barra = [0] * 26
+        barra[24] = 2
+        barra[10] = 13
+        for punto in (18, 19, 20, 21, 22):
+            barra[punto] = -2
+        barra[0] = -5
+        casos += [(barra, False, (6, 6)), (barra, False, (1, 3)), (barra, False, (6, 2))]
+        # Bear off negro con fichas atrás
+        salida = [0] * 26
+        salida[23] = -2
+        salida[20] = -1
+        salida[3] = 4
+        casos += [(salida, True, (6, 5)), (salida, True, (1, 2)), (salida, True, (4, 4))]
+        # Solo entra un dado de la barra: debe ser el mayor
+        mayor = [0] * 26
+        mayor[24] = 1
+        mayor[12] = 14
+        for punto in (18, 19, 20, 21, 23):
+            mayor[punto] = -2
+        mayor[0] = -5
+        casos += [(mayor, False, (3, 1)), (mayor, False, (4, 6))]
+        # Una sola ficha que puede mover un dado u otro pero no ambos
+        bloqueo = [0] * 26
+        bloqueo[13] = 1
+        bloqueo[0] = 14
+        for punto in (6, 7, 8, 9):
+            bloqueo[punto] = -2
+        bloqueo[23] = -7
+        casos += [(bloqueo, False, (5, 2)), (bloqueo, False, (3, 1))]
+        for tablero, negras, valores in casos:
+            self.assertEqual(finales(tablero, negras, valores),
+                             esperados(tablero, negras, valores), (tablero, negras, valores))
+
+    def test_tableros_de_26_casillas_y_puntos(self):
+        """Test completar las fichas sacadas y puntuar gammons y backgammons."""
+        tableros = np.zeros((3, 26), dtype=np.int8)
+        tableros[:, 0] = 1
+        tableros[0, 5] = -15
+        tableros[1, 20] = -15
+        tableros[2, 25] = -1
+        tableros[2, 5] = -14
+        lote = BatchGame(3, semilla=1, tableros=tableros)
+        self.assertTrue((lote.tableros[:, BatchGame.FUERA] == 14).all())
+        self.assertTrue((lote.tableros.astype(int).sum(axis=1) == 0).all())
+        self.assertEqual(lote.paso(), 0)
+        self.assertEqual(lote.ganadores.tolist(), [1, 1, 1])
+        self.assertEqual(lote.puntos.tolist(), [3, 2, 3])
+        totales = lote.resumen()
+        self.assertEqual(totales["victorias_blancas"], 3)
+        self.assertEqual(totales["backgammons_blancas"], 2)
+        self.assertEqual(totales["turnos"], 3)
+
+    def test_turno_negras_y_dados_fijos(self):
+        """Test mover las negras con una tirada dada."""
+        tableros = np.zeros((1, 26), dtype=np.int8)
+        tableros[0, 0] = -2
+        tableros[0, 10] = 2
+        lote = BatchGame(1, semilla=1, tableros=tableros, turno_negras=[True])
+        lote.paso(dados=[[6, 5]])
+        self.assertEqual(lote.dados.tolist(), [[6, 5]])
+        self.assertFalse(lote.turno_negras[0])
+        posicion = lote.tableros[0, :26].tolist()
+        self.assertIn(tuple(posicion), esperados(tableros[0], True, (6, 5)))
+
+    def test_reproducible_y_consistente(self):
+        """Test que la semilla fija el resultado y las fichas se conservan."""
+        uno = BatchGame(30, semilla=7).jugar()
+        dos = BatchGame(30, semilla=7).jugar()
+        self.assertEqual(uno, dos)
+        self.assertEqual(uno["victorias_blancas"] + uno["victorias_negras"], 30)
+        self.assertEqual(set(uno), set(Simulator.CONTADORES))
+        lote = BatchGame(20, semilla=3, variante="hypergammon")
+        lote.jugar()
+        self.assertTrue(lote.terminadas.all())
+        self.assertTrue((lote.tableros.astype(int).sum(axis=1) == 0).all())
+        ganadas = np.where(lote.ganadores == 1, lote.tableros[:, BatchGame.FUERA],
+                           -lote.tableros[:, BatchGame.FUERA_RIVAL])
+        self.assertTrue((ganadas == 3).all())
+
+    def test_parametros_invalidos(self):
+        """Test que se rechazan parámetros inválidos."""
+        with self.assertRaises(ValueError):
+            BatchGame(0)
+        with self.assertRaises(ValueError):
+            BatchGame(2, politica_blancas="experta")
+        with self.assertRaises(ValueError):
+            BatchGame(2, variante="nackgammon")
+        with self.assertRaises(ValueError):
+            BatchGame(2, tableros=np.zeros((3, 26)))
+        with self.assertRaises(RuntimeError):
+            BatchGame(2, semilla=1).jugar(max_medios_turnos=3)
+
+    def test_main(self):
+        """Test simular desde la línea de comandos."""
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            totales = main(["--games", "12", "--seed", "5", "--blancas", "aleatoria"])
+        self.assertEqual(totales["partidas"], 12)
+        self.assertEqual(totales["semilla"], 5)
+        self.assertIn("12 (semilla 5)", salida.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
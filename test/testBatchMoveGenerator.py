@@ -0,0 +1,97 @@
+"""Tests para la generación de sucesoras por lotes."""
+import unittest
+
+import numpy as np
+
+from core.BatchGame import BatchGame
+from core.BatchMoveGenerator import BatchMoveGenerator
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+def esperadas(posicion, negras, dados):
+    """Posiciones que genera MoveGenerator, como conjunto de tuplas."""
+    color = ColorFicha.NEGRA if negras else ColorFicha.BLANCA
+    movimientos = tuple(dados) * 2 if dados[0] == dados[1] else tuple(dados)
+    return {tuple(resultado) for _, resultado in
+            MoveGenerator.generar_posiciones([int(valor) for valor in posicion], color,
+                                             movimientos)}
+
+
+class TestBatchMoveGenerator(unittest.TestCase):
+
+    def assertCoincide(self, posiciones, negras, dados):
+        """Comparar cada tablero del lote con MoveGenerator."""
+        sucesoras, inicios = BatchMoveGenerator.generar_posiciones(posiciones, negras, dados)
+        self.assertEqual(inicios.shape, (len(posiciones) + 1,))
+        self.assertEqual(inicios[-1], len(sucesoras))
+        for indice, posicion in enumerate(posiciones):
+            propias = [tuple(int(valor) for valor in fila)
+                       for fila in sucesoras[inicios[indice]:inicios[indice + 1]]]
+            self.assertEqual(len(propias), len(set(propias)))
+            # Ordenadas por bytes: el desempate de quien elige la primera no depende del orden
+            claves = [fila.tobytes() for fila in sucesoras[inicios[indice]:inicios[indice + 1]]]
+            self.assertEqual(claves, sorted(claves))
+            self.assertEqual(set(propias), esperadas(posicion, negras[indice], dados[indice]),
+                             (list(posicion), negras[indice], dados[indice]))
+
+    def test_todas_las_tiradas_desde_la_inicial(self):
+        """Test las 21 tiradas de ambos colores desde la posición inicial en un lote."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        tiradas = [movimientos[:2] for movimientos, _ in Expectimax.TIRADAS]
+        posiciones = [board.posicion] * (2 * len(tiradas))
+        negras = [False] * len(tiradas) + [True] * len(tiradas)
+        self.assertCoincide(posiciones, negras, tiradas * 2)
+
+    def test_posiciones_de_partidas(self):
+        """Test posiciones variadas tomadas de partidas por lotes y tiradas al azar."""
+        lote = BatchGame(40, semilla=5, politica_negras="golosa")
+        rng = np.random.default_rng(2)
+        posiciones, negras = [], []
+        for _ in range(60):
+            lote.paso()
+            activas = np.flatnonzero(~lote.terminadas)
+            posiciones.extend(lote.tableros[activas[:4], :26])
+            negras.extend(lote.turno_negras[activas[:4]])
+        dados = rng.integers(1, 7, size=(len(posiciones), 2))
+        self.assertCoincide(np.array(posiciones), negras, dados)
+
+    def test_sin_movimientos_y_bear_off(self):
+        """Test que un tablero bloqueado se devuelve igual y el bear off con sobrante."""
+        bloqueada = [0] * 26
+        bloqueada[24] = 2
+        bloqueada[10] = 13
+        for punto in range(18, 24):
+            bloqueada[punto] = -2
+        bloqueada[0] = -3
+        salida = [0] * 26
+        salida[2] = 2
+        salida[1] = 1
+        salida[23] = -3
+        sucesoras, inicios = BatchMoveGenerator.generar_posiciones(
+            [bloqueada, salida], [False, False], [(6, 4), (6, 5)])
+        self.assertEqual(inicios.tolist(), [0, 1, 2])
+        self.assertEqual(sucesoras[0].tolist(), bloqueada)
+        self.assertEqual(sucesoras[1, :3].tolist(), [0, 1, 0])
+        self.assertCoincide([bloqueada, salida], [False, True], [(6, 4), (3, 3)])
+
+    def test_parametros_invalidos_y_lote_vacio(self):
+        """Test que se validan las formas y los dados."""
+        with self.assertRaises(ValueError):
+            BatchMoveGenerator.generar_posiciones(np.zeros((2, 24)), [False] * 2, [(1, 2)] * 2)
+        with self.assertRaises(ValueError):
+            BatchMoveGenerator.generar_posiciones(np.zeros((2, 26)), [False], [(1, 2)] * 2)
+        with self.assertRaises(ValueError):
+            BatchMoveGenerator.generar_posiciones(np.zeros((1, 26)), [False], [(0, 2)])
+        sucesoras, inicios = BatchMoveGenerator.generar_posiciones(np.zeros((0, 26)), [],
+                                                                    np.zeros((0, 2)))
+        self.assertEqual(sucesoras.shape, (0, 26))
+        self.assertEqual(inicios.tolist(), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
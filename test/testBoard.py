@@ -4,6 +4,8 @@ import unittest
 from core.Board import Board
 from core.Checker import Checker
 from core.ColorFicha import ColorFicha
+from core.Zobrist import Zobrist
+from core.BoardInitializer import BoardInitializer
 
 class TestBoard(unittest.TestCase):
 
@@ -217,3 +219,225 @@ class TestBoard(unittest.TestCase):
         # Test con punto muy grande
         result = self.tablero.limpiar_punto(100)
         self.assertEqual(result, [])
+
+    def test_posicion_tablero_vacio(self):
+        """Test que un tablero vacío tiene las 26 casillas en cero."""
+        self.assertEqual(self.tablero.posicion, (0,) * 26)
+
+    def test_posicion_signos_por_color(self):
+        """Test que las blancas se guardan en positivo y las negras en negativo."""
+        self.tablero.agregar_ficha(3, self.ficha_blanca)
+        self.tablero.agregar_ficha(3, self.ficha_blanca)
+        self.tablero.agregar_ficha(20, self.ficha_negra)
+        self.tablero.agregar_ficha_contenedor(self.ficha_blanca)
+        self.tablero.agregar_ficha_contenedor(self.ficha_negra)
+        posicion = self.tablero.posicion
+        self.assertEqual(posicion[3], 2)
+        self.assertEqual(posicion[20], -1)
+        self.assertEqual(posicion[Board.BARRA_BLANCAS], 1)
+        self.assertEqual(posicion[Board.BARRA_NEGRAS], -1)
+        self.assertEqual(self.tablero.valor_punto(20), -1)
+        self.assertEqual(self.tablero.valor_punto(30), 0)
+
+    def test_agregar_ficha_color_distinto_lanza_error(self):
+        """Test que no se pueden mezclar colores en un mismo punto."""
+        self.tablero.agregar_ficha(4, self.ficha_blanca)
+        with self.assertRaises(ValueError):
+            self.tablero.agregar_ficha(4, self.ficha_negra)
+        self.assertEqual(self.tablero.contar_fichas(4), 1)
+
+    def test_setter_puntos_colores_mezclados(self):
+        """Test que el setter rechaza puntos con fichas de ambos colores."""
+        nuevos_puntos = [[] for _ in range(24)]
+        nuevos_puntos[0] = [self.ficha_blanca, self.ficha_negra]
+        with self.assertRaises(ValueError):
+            self.tablero.puntos = nuevos_puntos
+
+    def test_copiar_tablero_independiente(self):
+        """Test que la copia no comparte estado con el original."""
+        self.tablero.agregar_ficha(7, self.ficha_negra)
+        copia = self.tablero.copiar()
+        self.assertEqual(copia.posicion, self.tablero.posicion)
+        copia.quitar_ficha(7)
+        self.assertEqual(self.tablero.contar_fichas(7), 1)
+        self.assertEqual(copia.contar_fichas(7), 0)
+
+    def test_copiar_conserva_mascaras(self):
+        """Test que la copia conserva las máscaras de puntos y de bloqueos."""
+        BoardInitializer.inicializar_estandar(self.tablero)
+        copia = self.tablero.copiar()
+        for color in (ColorFicha.BLANCA, ColorFicha.NEGRA):
+            self.assertEqual(copia.mascara_puntos(color), self.tablero.mascara_puntos(color))
+            self.assertEqual(copia.mascara_bloqueos(color),
+                             self.tablero.mascara_bloqueos(color))
+        self.assertNotEqual(copia.mascara_bloqueos(ColorFicha.BLANCA), 0)
+
+    def test_cargar_posicion(self):
+        """Test cargar una posición completa de 26 casillas."""
+        posicion = [0] * 26
+        posicion[5] = 3
+        posicion[18] = -2
+        posicion[Board.BARRA_NEGRAS] = -1
+        self.tablero.cargar_posicion(posicion)
+        self.assertEqual(self.tablero.obtener_color_punto(5), ColorFicha.BLANCA)
+        self.assertEqual(self.tablero.contar_fichas(18), 2)
+        self.assertEqual(self.tablero.contar_fichas_contenedor(ColorFicha.NEGRA), 1)
+
+    def test_cargar_posicion_longitud_invalida(self):
+        """Test que cargar_posicion valida la cantidad de casillas."""
+        with self.assertRaises(ValueError):
+            self.tablero.cargar_posicion([0] * 24)
+
+    def test_hash_tablero_vacio_es_cero(self):
+        """Test que el tablero vacío con turno de blancas tiene hash 0."""
+        self.assertEqual(self.tablero.hash_posicion, 0)
+
+    def test_hash_incremental_coincide_con_calculo_completo(self):
+        """Test que el hash incremental es igual al recalculado desde cero."""
+        self.tablero.agregar_ficha(0, self.ficha_blanca)
+        self.tablero.agregar_ficha(0, self.ficha_blanca)
+        self.tablero.agregar_ficha(13, self.ficha_negra)
+        self.tablero.agregar_ficha_contenedor(self.ficha_negra)
+        self.tablero.quitar_ficha(0)
+        self.assertEqual(self.tablero.hash_posicion,
+                         Zobrist.calcular(self.tablero.posicion))
+
+    def test_hash_vuelve_al_valor_original(self):
+        """Test que deshacer los cambios restaura el hash."""
+        self.tablero.agregar_ficha(5, self.ficha_blanca)
+        hash_inicial = self.tablero.hash_posicion
+        self.tablero.agregar_ficha_contenedor(self.ficha_blanca)
+        self.tablero.agregar_ficha(9, self.ficha_negra)
+        self.assertNotEqual(self.tablero.hash_posicion, hash_inicial)
+        self.tablero.quitar_ficha(9)
+        self.tablero.quitar_ficha_contenedor(ColorFicha.BLANCA)
+        self.assertEqual(self.tablero.hash_posicion, hash_inicial)
+
+    def test_hash_distingue_colores(self):
+        """Test que la misma casilla con distinto color da distinto hash."""
+        otro = Board()
+        self.tablero.agregar_ficha(3, self.ficha_blanca)
+        otro.agregar_ficha(3, self.ficha_negra)
+        self.assertNotEqual(self.tablero.hash_posicion, otro.hash_posicion)
+
+    def test_alternar_turno_cambia_hash(self):
+        """Test que el componente de turno se alterna con alternar_turno."""
+        self.tablero.agregar_ficha(3, self.ficha_blanca)
+        hash_blancas = self.tablero.hash_posicion
+        self.tablero.alternar_turno()
+        self.assertTrue(self.tablero.turno_negras)
+        self.assertEqual(self.tablero.hash_posicion,
+                         Zobrist.calcular(self.tablero.posicion, True))
+        self.tablero.alternar_turno()
+        self.assertEqual(self.tablero.hash_posicion, hash_blancas)
+
+    def test_copiar_conserva_hash(self):
+        """Test que la copia conserva el hash y el turno."""
+        self.tablero.agregar_ficha(12, self.ficha_negra)
+        self.tablero.alternar_turno()
+        copia = self.tablero.copiar()
+        self.assertEqual(copia.hash_posicion, self.tablero.hash_posicion)
+        self.assertTrue(copia.turno_negras)
+
+    def test_agregar_ficha_excede_maximo(self):
+        """Test que una casilla no admite más de 15 fichas."""
+        for _ in range(15):
+            self.tablero.agregar_ficha(2, self.ficha_blanca)
+        with self.assertRaises(ValueError):
+            self.tablero.agregar_ficha(2, self.ficha_blanca)
+
+    def test_fichas_fuera_de_casa_incremental(self):
+        """Test que el contador de fichas fuera de casa sigue cada cambio."""
+        self.tablero.agregar_ficha(10, self.ficha_blanca)
+        self.tablero.agregar_ficha(3, self.ficha_blanca)
+        self.tablero.agregar_ficha(20, self.ficha_negra)
+        self.tablero.agregar_ficha(5, self.ficha_negra)
+        self.assertEqual(self.tablero.fichas_fuera_de_casa(ColorFicha.BLANCA), 1)
+        self.assertEqual(self.tablero.fichas_fuera_de_casa(ColorFicha.NEGRA), 1)
+        self.tablero.agregar_ficha_contenedor(self.ficha_blanca)
+        self.assertEqual(self.tablero.fichas_fuera_de_casa(ColorFicha.BLANCA), 2)
+        self.tablero.quitar_ficha(10)
+        self.tablero.quitar_ficha_contenedor(ColorFicha.BLANCA)
+        self.assertTrue(self.tablero.todas_en_casa(ColorFicha.BLANCA))
+        self.tablero.limpiar_punto(5)
+        self.assertTrue(self.tablero.todas_en_casa(ColorFicha.NEGRA))
+        self.assertEqual(self.tablero.fichas_fuera_de_casa("otro"), 0)
+
+    def test_fichas_fuera_de_casa_tras_cargar_posicion(self):
+        """Test que cargar_posicion recalcula los contadores."""
+        posicion = [0] * 26
+        posicion[12] = 4
+        posicion[2] = -3
+        posicion[Board.BARRA_NEGRAS] = -1
+        self.tablero.cargar_posicion(posicion)
+        self.assertEqual(self.tablero.fichas_fuera_de_casa(ColorFicha.BLANCA), 4)
+        self.assertEqual(self.tablero.fichas_fuera_de_casa(ColorFicha.NEGRA), 4)
+        copia = self.tablero.copiar()
+        self.assertEqual(copia.fichas_fuera_de_casa(ColorFicha.NEGRA), 4)
+
+    def test_mascara_puntos(self):
+        """Test que la máscara marca los puntos ocupados por cada color."""
+        self.tablero.agregar_ficha(0, self.ficha_blanca)
+        self.tablero.agregar_ficha(7, self.ficha_negra)
+        self.assertEqual(self.tablero.mascara_puntos(ColorFicha.BLANCA), 1)
+        self.assertEqual(self.tablero.mascara_puntos(ColorFicha.NEGRA), 1 << 7)
+        self.tablero.quitar_ficha(7)
+        self.assertEqual(self.tablero.mascara_puntos(ColorFicha.NEGRA), 0)
+
+    def test_mascara_bloqueos(self):
+        """Test que la máscara de bloqueos marca solo los puntos con dos o más fichas."""
+        self.tablero.agregar_ficha(3, self.ficha_negra)
+        self.assertEqual(self.tablero.mascara_bloqueos(ColorFicha.NEGRA), 0)
+        self.tablero.agregar_ficha(3, Checker(ColorFicha.NEGRA))
+        self.assertEqual(self.tablero.mascara_bloqueos(ColorFicha.NEGRA), 1 << 3)
+        self.tablero.quitar_ficha(3)
+        self.assertEqual(self.tablero.mascara_bloqueos(ColorFicha.NEGRA), 0)
+        BoardInitializer.inicializar_estandar(self.tablero)
+        esperada = sum(1 << punto for punto in range(24) if self.tablero.valor_punto(punto) >= 2)
+        self.assertEqual(self.tablero.mascara_bloqueos(ColorFicha.BLANCA), esperada)
+        self.assertEqual(self.tablero.mascara_bloqueos("otro"), 0)
+
+    def test_es_carrera(self):
+        """Test la detección de carrera sin contacto."""
+        self.tablero.agregar_ficha(4, self.ficha_blanca)
+        self.tablero.agregar_ficha(9, self.ficha_negra)
+        self.assertTrue(self.tablero.es_carrera())
+        self.tablero.agregar_ficha(12, self.ficha_blanca)
+        self.assertFalse(self.tablero.es_carrera())
+        self.tablero.quitar_ficha(12)
+        self.tablero.agregar_ficha_contenedor(self.ficha_negra)
+        self.assertFalse(self.tablero.es_carrera())
+
+    def test_pips_tablero_inicial(self):
+        """Test que la posición inicial tiene 167 pips por color."""
+        BoardInitializer.inicializar_estandar(self.tablero)
+        self.assertEqual(self.tablero.pips_blancas, 167)
+        self.assertEqual(self.tablero.pips_negras, 167)
+        self.assertEqual(self.tablero.pips(ColorFicha.BLANCA), 167)
+        self.assertEqual(self.tablero.pips("otro"), 0)
+
+    def test_pips_movimiento_golpe_y_bear_off(self):
+        """Test que los pips se actualizan al mover, golpear y sacar fichas."""
+        self.tablero.agregar_ficha(10, self.ficha_blanca)
+        self.tablero.agregar_ficha(7, self.ficha_negra)
+        self.assertEqual(self.tablero.pips_blancas, 11)
+        self.assertEqual(self.tablero.pips_negras, 17)
+        # Blanca golpea en el punto 7
+        self.tablero.quitar_ficha(10)
+        self.tablero.agregar_ficha_contenedor(self.tablero.quitar_ficha(7))
+        self.tablero.agregar_ficha(7, self.ficha_blanca)
+        self.assertEqual(self.tablero.pips_blancas, 8)
+        self.assertEqual(self.tablero.pips_negras, 25)
+        # Sacar la ficha blanca
+        self.tablero.quitar_ficha(7)
+        self.assertEqual(self.tablero.pips_blancas, 0)
+
+    def test_pips_tras_cargar_posicion(self):
+        """Test que cargar_posicion recalcula los pips."""
+        posicion = [0] * 26
+        posicion[0] = 2
+        posicion[23] = -1
+        posicion[Board.BARRA_BLANCAS] = 1
+        self.tablero.cargar_posicion(posicion)
+        self.assertEqual(self.tablero.pips_blancas, 27)
+        self.assertEqual(self.tablero.pips_negras, 1)
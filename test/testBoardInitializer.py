@@ -148,5 +148,24 @@ class TestBoardInitializer(unittest.TestCase):
         self.assertEqual(total_fichas_negras_1, total_fichas_negras_2)
 
 
+    def test_inicializar_hypergammon(self):
+        """Test que hypergammon empieza con 3 fichas por color en los puntos más lejanos."""
+        BoardInitializer.inicializar_hypergammon(self.tablero)
+        posicion = self.tablero.posicion
+        self.assertEqual(posicion[21:24], (1, 1, 1))
+        self.assertEqual(posicion[0:3], (-1, -1, -1))
+        self.assertEqual(sum(abs(valor) for valor in posicion), 6)
+
+    def test_inicializar_variante(self):
+        """Test elegir la variante por nombre."""
+        BoardInitializer.inicializar(self.tablero, "hypergammon")
+        self.assertEqual(self.tablero.posicion[23], 1)
+        BoardInitializer.inicializar(self.tablero)
+        self.assertEqual(self.tablero.posicion[23], 2)
+        self.assertEqual(BoardInitializer.VARIANTES["hypergammon"], 3)
+        with self.assertRaises(ValueError):
+            BoardInitializer.inicializar(self.tablero, "nackgammon")
+
+
 if __name__ == '__main__':
     unittest.main()
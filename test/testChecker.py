@@ -58,3 +58,23 @@ class TestChecker(unittest.TestCase):
 
         self.assertFalse(ficha_blanca == ficha_negra)
         self.assertFalse(ficha_negra == ficha_blanca)
+
+    def test_fichas_del_mismo_color_son_la_misma_instancia(self):
+        """Test que cada color tiene una única ficha compartida."""
+        self.assertIs(Checker(ColorFicha.BLANCA), Checker(ColorFicha.BLANCA))
+        self.assertIs(Checker(ColorFicha.NEGRA), Checker(ColorFicha.NEGRA))
+        self.assertIsNot(Checker(ColorFicha.BLANCA), Checker(ColorFicha.NEGRA))
+
+    def test_ficha_inmutable(self):
+        """Test que una ficha compartida no se puede modificar."""
+        ficha = Checker(ColorFicha.BLANCA)
+        with self.assertRaises(AttributeError):
+            ficha.color = ColorFicha.NEGRA
+        with self.assertRaises(AttributeError):
+            ficha.otro_atributo = 1
+        self.assertFalse(hasattr(ficha, "__dict__"))
+
+    def test_ficha_hashable(self):
+        """Test que las fichas se pueden usar en conjuntos."""
+        fichas = {Checker(ColorFicha.BLANCA), Checker(ColorFicha.BLANCA), Checker(ColorFicha.NEGRA)}
+        self.assertEqual(len(fichas), 2)
@@ -16,7 +16,6 @@ class TestCLI(unittest.TestCase):
         """Test que el CLI se inicializa correctamente."""
         # pylint: disable=protected-access
         self.assertIsNone(self.cli._CLI__game)
-        self.assertIsNotNone(self.cli._CLI__move_executor)
         self.assertTrue(self.cli._CLI__running)
 
     def test_cli_tiene_metodo_limpiar_pantalla(self):
@@ -148,6 +147,19 @@ class TestCLI(unittest.TestCase):
         self.cli._CLI__game.start_game()
         self.cli.ver_tablero()
 
+    @patch('builtins.print')
+    @patch('builtins.input', return_value='')
+    @patch('cli.Cli.CLI.limpiar_pantalla')
+    def test_ver_tablero_muestra_pips(self, _mock_limpiar, _mock_input, mock_print):
+        """Test que ver tablero muestra el conteo de pips de ambos colores."""
+        # pylint: disable=protected-access
+        self.cli._CLI__game = BackgammonGame("Juan", "Maria")
+        self.cli._CLI__game.start_game()
+        self.cli.ver_tablero()
+        impreso = [str(llamada.args[0]) for llamada in mock_print.call_args_list if llamada.args]
+        self.assertIn("\n Pips Blancas: 167", impreso)
+        self.assertIn(" Pips Negras:  167", impreso)
+
     @patch('builtins.print')
     @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 5))
     @patch('builtins.input', return_value='')
@@ -159,6 +171,26 @@ class TestCLI(unittest.TestCase):
         self.cli.lanzar_dados()
         self.assertEqual(self.cli._CLI__game.dice.last_raw_roll, (3, 5))
 
+    @patch('builtins.print')
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(6, 5))
+    @patch('builtins.input', return_value='')
+    def test_lanzar_dados_sin_movimientos_pasa_turno(self, _mock_input, _mock_roll, mock_print):
+        """Test que si la tirada no tiene movimientos el turno pasa solo."""
+        # pylint: disable=protected-access
+        self.cli._CLI__game = BackgammonGame("Juan", "Maria")
+        self.cli._CLI__game.start_game()
+        posicion = [0] * 26
+        posicion[24], posicion[10] = 1, 14
+        for punto in range(18, 24):
+            posicion[punto] = -2
+        posicion[0] = -3
+        self.cli._CLI__game.board.cargar_posicion(posicion)
+        self.cli.lanzar_dados()
+        self.assertEqual(self.cli._CLI__game.current_player.nombre, "Maria")
+        impreso = " ".join(str(llamada.args[0]) for llamada in mock_print.call_args_list
+                           if llamada.args)
+        self.assertIn("Juan no tiene movimientos posibles", impreso)
+
     @patch('builtins.print')
     @patch('builtins.input', return_value='')
     def test_lanzar_dados_sin_juego(self, _mock_input, _mock_print):
@@ -403,11 +435,6 @@ class TestCLI(unittest.TestCase):
         # pylint: disable=protected-access
         self.assertIsNone(self.cli._CLI__game)
 
-    def test_move_executor_inicializado(self):
-        """Test que move_executor está inicializado."""
-        # pylint: disable=protected-access
-        self.assertIsNotNone(self.cli._CLI__move_executor)
-
     def test_cli_puede_crear_juego(self):
         """Test que CLI puede crear un juego."""
         # pylint: disable=protected-access
@@ -416,6 +443,32 @@ class TestCLI(unittest.TestCase):
         self.assertIsNotNone(self.cli._CLI__game)
         self.assertEqual(self.cli._CLI__game.current_player.nombre, "Jugador1")
 
+    @patch('builtins.print')
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 5))
+    @patch('builtins.input', side_effect=['23', '3', '', ''])
+    def test_deshacer_movimiento(self, _mock_input, _mock_roll, _mock_print):
+        """Test deshacer el movimiento hecho desde el CLI."""
+        # pylint: disable=protected-access
+        self.cli._CLI__game = BackgammonGame("Juan", "Maria")
+        self.cli._CLI__game.start_game()
+        self.cli._CLI__game.roll_dice()
+        posicion = self.cli._CLI__game.board.posicion
+        self.cli.mover_ficha()
+        self.assertNotEqual(self.cli._CLI__game.board.posicion, posicion)
+        self.cli.deshacer_movimiento()
+        self.assertEqual(self.cli._CLI__game.board.posicion, posicion)
+        self.assertEqual(self.cli._CLI__game.dice.last_roll, (3, 5))
+
+    @patch('builtins.print')
+    @patch('builtins.input', return_value='')
+    def test_deshacer_movimiento_sin_movimientos(self, _mock_input, mock_print):
+        """Test deshacer cuando no hay movimientos en el turno."""
+        # pylint: disable=protected-access
+        self.cli._CLI__game = BackgammonGame("Juan", "Maria")
+        self.cli._CLI__game.start_game()
+        self.cli.deshacer_movimiento()
+        mock_print.assert_any_call("\nError: No hay movimientos para deshacer")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+"""Tests para el codificador de entradas de la red neuronal."""
+import unittest
+import numpy as np
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.CodificadorTD import CodificadorTD
+from core.ColorFicha import ColorFicha
+
+
+class TestCodificadorTD(unittest.TestCase):
+
+    def setUp(self):
+        """Preparar la posición inicial."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        self.inicial = board.posicion
+
+    def test_posicion_inicial(self):
+        """Test las unidades de los puntos de la posición inicial."""
+        entradas = CodificadorTD.codificar(self.inicial, ColorFicha.BLANCA)
+        self.assertEqual(entradas.shape, (198,))
+        self.assertEqual(entradas.dtype, np.float32)
+        # 5 fichas blancas en el punto 5: tres unidades llenas y (5 - 3) / 2
+        self.assertEqual(list(entradas[20:24]), [1, 1, 1, 1])
+        # 2 fichas en el punto 23
+        self.assertEqual(list(entradas[92:96]), [1, 1, 0, 0])
+        # Las 2 negras del punto 0 están en la casa de las blancas
+        self.assertEqual(list(entradas[96:100]), [1, 1, 0, 0])
+        self.assertEqual(list(entradas[96 + 92:96 + 96]), [0, 0, 0, 0])
+        self.assertEqual(list(entradas[192:198]), [0, 0, 0, 0, 0, 1])
+
+    def test_simetria(self):
+        """Test que la posición inicial se ve igual desde ambos colores."""
+        blancas = CodificadorTD.codificar(self.inicial, ColorFicha.BLANCA)
+        negras = CodificadorTD.codificar(self.inicial, ColorFicha.NEGRA)
+        np.testing.assert_array_equal(blancas, negras)
+
+    def test_barra_fuera_y_turno(self):
+        """Test las entradas de barra, fichas sacadas y turno."""
+        posicion = [0] * 26
+        posicion[24] = 2
+        posicion[3] = 10
+        posicion[25] = -1
+        posicion[20] = -4
+        entradas = CodificadorTD.codificar(posicion, ColorFicha.NEGRA, en_turno=True)
+        self.assertAlmostEqual(entradas[192], 0.5)
+        self.assertAlmostEqual(entradas[193], 1.0)
+        self.assertAlmostEqual(entradas[194], 10 / 15)
+        self.assertAlmostEqual(entradas[195], 3 / 15)
+        self.assertEqual(list(entradas[196:198]), [1, 0])
+        # Las cuatro negras del 20 absoluto están en su punto 3
+        self.assertEqual(list(entradas[12:16]), [1, 1, 1, 0.5])
+
+    def test_lote_igual_a_individual(self):
+        """Test que codificar un lote da lo mismo que codificar cada posición."""
+        otra = list(self.inicial)
+        otra[23] -= 1
+        otra[22] += 1
+        lote = CodificadorTD.codificar_lote([self.inicial, otra], [False, True])
+        np.testing.assert_array_equal(lote[0], CodificadorTD.codificar(self.inicial,
+                                                                      ColorFicha.BLANCA))
+        np.testing.assert_array_equal(lote[1], CodificadorTD.codificar(otra, ColorFicha.NEGRA))
+
+
+if __name__ == '__main__':
+    unittest.main()
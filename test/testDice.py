@@ -1,4 +1,5 @@
 from core.Dice import Dice
+from core.DiceRoller import DiceRoller
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -301,3 +302,94 @@ class TestDice(TestCase):
 
             dice.use_move(5)
             self.assertFalse(dice.has_moves_available())  # Ya no quedan movimientos
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(5, 2))
+    def test_restore_move_recupera_orden(self, mock_roll):
+        """Test que devolver un movimiento deja last_roll como estaba"""
+        self.dice.roll()
+        self.dice.use_move(5)
+        self.dice.restore_move(5)
+        self.assertEqual(self.dice.last_roll, (5, 2))
+        self.dice.use_move(2)
+        self.dice.restore_move(2)
+        self.assertEqual(self.dice.last_roll, (5, 2))
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(4, 4))
+    def test_restore_move_dobles(self, mock_roll):
+        """Test devolver movimientos de un doble"""
+        self.dice.roll()
+        self.dice.use_move(4)
+        self.dice.use_move(4)
+        self.dice.restore_move(4)
+        self.assertEqual(self.dice.last_roll, (4, 4, 4))
+        self.assertTrue(self.dice.has_moves_available())
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(5, 2))
+    def test_restore_move_no_usado(self, mock_roll):
+        """Test que no se puede devolver un movimiento que no se usó"""
+        with self.assertRaises(ValueError):
+            self.dice.restore_move(5)
+        self.dice.roll()
+        with self.assertRaises(ValueError):
+            self.dice.restore_move(5)
+        with self.assertRaises(ValueError):
+            self.dice.restore_move(3)
+
+    def test_set_roll(self):
+        """Test configurar una tirada conocida sin lanzar"""
+        self.assertEqual(self.dice.set_roll((6, 6)), (6, 6))
+        self.assertEqual(self.dice.last_roll, (6, 6, 6, 6))
+        self.assertTrue(self.dice.is_double())
+        self.assertEqual(self.dice.last_raw_roll, (6, 6))
+        with self.assertRaises(ValueError):
+            self.dice.set_roll((0, 3))
+
+    def test_set_moves(self):
+        """Test configurar movimientos sueltos respetando su orden"""
+        self.dice.set_moves([3, 5])
+        self.assertEqual(self.dice.last_roll, (3, 5))
+        self.assertIsNone(self.dice.last_raw_roll)
+        self.assertTrue(self.dice.use_move(5))
+        self.dice.restore_move(5)
+        self.assertEqual(self.dice.last_roll, (3, 5))
+
+    def test_is_double_con_set_moves(self):
+        """Test que cuatro movimientos distintos no son un doble"""
+        self.dice.set_moves([1, 2, 3, 4])
+        self.assertFalse(self.dice.is_double())
+        self.dice.set_moves([4, 4, 4, 4])
+        self.assertTrue(self.dice.is_double())
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(5, 2))
+    def test_last_roll_se_reutiliza_hasta_un_cambio(self, mock_roll):
+        """Test que last_roll devuelve la misma tupla mientras no cambien los dados"""
+        self.dice.roll()
+        vista = self.dice.last_roll
+        self.assertIs(self.dice.last_roll, vista)
+        self.dice.use_move(2)
+        self.assertEqual(self.dice.last_roll, (5,))
+        self.assertIsNot(self.dice.last_roll, vista)
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 3))
+    def test_snapshot_y_restore(self, mock_roll):
+        """Test volver a un estado guardado de los dados"""
+        self.dice.roll()
+        self.dice.use_move(3)
+        estado = self.dice.snapshot()
+        self.dice.set_roll((6, 1))
+        self.dice.use_move(6)
+        self.dice.restore(estado)
+        self.assertEqual(self.dice.last_roll, (3, 3, 3))
+        self.assertEqual(self.dice.last_raw_roll, (3, 3))
+        self.dice.restore_move(3)
+        self.assertTrue(self.dice.is_double())
+        with self.assertRaises(ValueError):
+            self.dice.restore_move(3)
+
+    def test_roll_con_roller_propio(self):
+        """Test que los dados usan el generador recibido"""
+        dice_a = Dice(DiceRoller(seed=3))
+        dice_b = Dice(DiceRoller(seed=3))
+        for _ in range(20):
+            self.assertEqual(dice_a.roll(), dice_b.roll())
+            self.assertEqual(dice_a.last_roll, dice_b.last_roll)
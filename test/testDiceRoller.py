@@ -1,5 +1,6 @@
 """Tests para la clase DiceRoller."""
 import unittest
+import random
 from unittest.mock import patch
 from core.DiceRoller import DiceRoller
 
@@ -111,6 +112,50 @@ class TestDiceRoller(unittest.TestCase):
 
         self.assertEqual(result, (6, 6))
 
+    def test_instancia_con_semilla_es_reproducible(self):
+        """Test que dos generadores con la misma semilla dan las mismas tiradas."""
+        roller_a = DiceRoller(seed=42)
+        roller_b = DiceRoller(seed=42)
+        tiradas_a = [roller_a.tirar() for _ in range(200)]
+        self.assertEqual(tiradas_a, [roller_b.tirar() for _ in range(200)])
+        roller_c = DiceRoller(seed=43)
+        self.assertNotEqual(tiradas_a, [roller_c.tirar() for _ in range(200)])
+
+    def test_tirar_valores_en_rango_al_rellenar_buffer(self):
+        """Test que las tiradas siguen siendo válidas al cruzar bloques del buffer."""
+        roller = DiceRoller(seed=7, tamano_buffer=5)
+        for _ in range(1000):
+            dado_1, dado_2 = roller.tirar()
+            self.assertIn(dado_1, range(1, 7))
+            self.assertIn(dado_2, range(1, 7))
+
+    def test_tirar_con_generador_tipo_numpy(self):
+        """Test que se acepta un generador con el método integers."""
+        class GeneradorFijo:
+            """Generador que siempre devuelve la misma secuencia."""
+            def integers(self, bajo, alto, size, dtype):
+                return bytes([3, 5] * (size // 2))
+
+        roller = DiceRoller(rng=GeneradorFijo(), tamano_buffer=4)
+        self.assertEqual([roller.tirar() for _ in range(3)], [(3, 5)] * 3)
+
+    def test_generador_invalido(self):
+        """Test que se rechazan configuraciones inválidas."""
+        with self.assertRaises(TypeError):
+            DiceRoller(rng=object())
+        with self.assertRaises(ValueError):
+            DiceRoller(seed=1, rng=random.Random(1))
+        with self.assertRaises(ValueError):
+            DiceRoller(tamano_buffer=1)
+
+    def test_flujos_independientes(self):
+        """Test que los flujos derivados son estables y distintos entre sí."""
+        flujos = DiceRoller.flujos(11, 3)
+        tiradas = [[flujo.tirar() for _ in range(50)] for flujo in flujos]
+        self.assertEqual(len({tuple(lista) for lista in tiradas}), 3)
+        otra = DiceRoller(DiceRoller.semilla_de_flujo(11, 2))
+        self.assertEqual([otra.tirar() for _ in range(50)], tiradas[2])
+
 
 if __name__ == '__main__':
     unittest.main()
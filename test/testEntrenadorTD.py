@@ -0,0 +1,109 @@
+"""Tests para el entrenamiento TD(lambda) por autojuego."""
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from core.DiceRoller import DiceRoller
+from core.EntrenadorTD import EntrenadorTD, main
+from core.RedNeuronal import RedNeuronal
+
+
+class TestEntrenadorTD(unittest.TestCase):
+
+    def setUp(self):
+        """Crear una red chica para que las partidas sean rápidas."""
+        self.red = RedNeuronal(ocultas=4, semilla=2)
+
+    def test_a_blancas(self):
+        """Test que las salidas de las negras se invierten para las blancas."""
+        probabilidades = np.array([[0.7, 0.2, 0.1, 0.05, 0.01]] * 2, dtype=np.float32)
+        vistas = EntrenadorTD.a_blancas(probabilidades, np.array([False, True]))
+        np.testing.assert_allclose(vistas[0], probabilidades[0])
+        np.testing.assert_allclose(vistas[1], [0.3, 0.05, 0.01, 0.2, 0.1], rtol=1e-6)
+
+    def test_gradientes_por_diferencias_finitas(self):
+        """Test que los gradientes coinciden con diferencias finitas."""
+        red = RedNeuronal(entradas=3, ocultas=2, semilla=5)
+        entradas = np.array([[0.5, 1.0, 0.0], [1.0, 0.25, 0.5]], dtype=np.float32)
+        negras = np.array([False, True])
+        _, gradientes = EntrenadorTD.gradientes(red, entradas, negras)
+        paso = 1e-2
+        for parametro, gradiente in zip(red.parametros, gradientes):
+            for indice in np.ndindex(parametro.shape):
+                original = parametro[indice]
+                parametro[indice] = original + paso
+                arriba = EntrenadorTD.a_blancas(red.propagar(entradas), negras)
+                parametro[indice] = original - paso
+                abajo = EntrenadorTD.a_blancas(red.propagar(entradas), negras)
+                parametro[indice] = original
+                numerico = (arriba - abajo) / (2 * paso)
+                np.testing.assert_allclose(gradiente[(slice(None), slice(None)) + indice],
+                                           numerico, atol=2e-3)
+
+    def test_jugar_ronda(self):
+        """Test que una ronda completa sus partidas y modifica la red."""
+        antes = [parametro.copy() for parametro in self.red.parametros]
+        estadisticas = EntrenadorTD.jugar_ronda(self.red, DiceRoller(1), 3, 2, 0.1, 0.7)
+        self.assertEqual(estadisticas["partidas"], 3)
+        self.assertGreater(estadisticas["posiciones"], 3 * 10)
+        self.assertLessEqual(estadisticas["victorias_blancas"], 3)
+        self.assertTrue(any((viejo != nuevo).any()
+                            for viejo, nuevo in zip(antes, self.red.parametros)))
+
+    def test_entrenar_reproducible_y_checkpoints(self):
+        """Test que la misma semilla da los mismos pesos y se guardan checkpoints."""
+        otra = RedNeuronal(ocultas=4, semilla=2)
+        informes = []
+        with tempfile.TemporaryDirectory() as carpeta:
+            totales = EntrenadorTD(self.red, paralelas=2).entrenar(
+                4, partidas_por_ronda=2, semilla=3, carpeta_checkpoints=carpeta,
+                informar=informes.append)
+            archivos = sorted(os.listdir(carpeta))
+        EntrenadorTD(otra, paralelas=2).entrenar(4, partidas_por_ronda=2, semilla=3)
+        for propio, ajeno in zip(self.red.parametros, otra.parametros):
+            np.testing.assert_array_equal(propio, ajeno)
+        self.assertEqual(totales["partidas"], 4)
+        self.assertEqual(totales["rondas"], 2)
+        self.assertGreater(totales["posiciones_por_segundo"], 0)
+        self.assertEqual(archivos, ["red_00000002.npz", "red_00000004.npz"])
+        self.assertEqual([informe["partidas"] for informe in informes], [2, 4])
+
+    def test_entrenar_con_workers(self):
+        """Test que con varios procesos se promedian los cambios de cada uno."""
+        antes = [parametro.copy() for parametro in self.red.parametros]
+        totales = EntrenadorTD(self.red, paralelas=1).entrenar(2, workers=2, semilla=1)
+        self.assertEqual(totales["partidas"], 2)
+        self.assertEqual(totales["rondas"], 1)
+        self.assertTrue(any((viejo != nuevo).any()
+                            for viejo, nuevo in zip(antes, self.red.parametros)))
+
+    def test_parametros_invalidos(self):
+        """Test que se rechazan parámetros inválidos."""
+        with self.assertRaises(ValueError):
+            EntrenadorTD(alfa=0)
+        with self.assertRaises(ValueError):
+            EntrenadorTD(lambda_td=1.5)
+        with self.assertRaises(ValueError):
+            EntrenadorTD(paralelas=0)
+        with self.assertRaises(ValueError):
+            EntrenadorTD(self.red).entrenar(0)
+        with self.assertRaises(ValueError):
+            EntrenadorTD(self.red).entrenar(1, workers=0)
+
+    def test_main(self):
+        """Test el entrenamiento desde la línea de comandos, continuando una red guardada."""
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "inicial.npz")
+            self.red.guardar(ruta)
+            salida = io.StringIO()
+            with redirect_stdout(salida):
+                totales = main(["--games", "2", "--workers", "1", "--parallel", "2",
+                                "--network", ruta, "--seed", "4"])
+        self.assertEqual(totales["partidas"], 2)
+        self.assertIn("Ronda 1: 2 partidas", salida.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
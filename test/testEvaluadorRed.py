@@ -0,0 +1,90 @@
+"""Tests para el evaluador basado en red neuronal."""
+import unittest
+import numpy as np
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.EvaluadorRed import EvaluadorRed
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+
+
+class EvaluadorEscalar:
+    """Envoltorio sin evaluar_lote para comparar con la evaluación por lotes."""
+
+    def __init__(self, evaluador):
+        self.evaluador = evaluador
+
+    def evaluar(self, posicion, color):
+        """Evaluar una posición con el evaluador envuelto."""
+        return self.evaluador.evaluar(posicion, color)
+
+
+class TestEvaluadorRed(unittest.TestCase):
+
+    def setUp(self):
+        """Crear un evaluador con una red sin entrenar y la posición inicial."""
+        self.evaluador = EvaluadorRed(semilla=1)
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        self.inicial = board.posicion
+        self.opciones = MoveGenerator.generar_posiciones(self.inicial, ColorFicha.BLANCA, (6, 4))
+
+    def test_lote_igual_a_individual(self):
+        """Test que evaluar en lote coincide con evaluar de a una."""
+        posiciones = [posicion for _, posicion in self.opciones]
+        lote = self.evaluador.evaluar_lote(posiciones, ColorFicha.BLANCA)
+        self.assertEqual(lote.shape, (len(posiciones),))
+        for posicion, equidad in zip(posiciones, lote):
+            self.assertAlmostEqual(self.evaluador.evaluar(posicion, ColorFicha.BLANCA), equidad,
+                                   places=5)
+        minimo, maximo = EvaluadorRed.LIMITES
+        self.assertTrue(((lote > minimo) & (lote < maximo)).all())
+
+    def test_posiciones_terminadas(self):
+        """Test que las posiciones terminadas valen 1, 2 o 3 exactos."""
+        simple = [0] * 26
+        simple[3] = -10
+        gammon = [0] * 26
+        gammon[10] = -15
+        backgammon = [0] * 26
+        backgammon[2] = -15
+        equidades = self.evaluador.evaluar_lote([simple, gammon, backgammon], ColorFicha.BLANCA)
+        np.testing.assert_array_equal(equidades, [1.0, 2.0, 3.0])
+        negras = [0] * 26
+        negras[24] = 1
+        negras[5] = 14
+        self.assertEqual(self.evaluador.evaluar(negras, ColorFicha.NEGRA), 3.0)
+
+    def test_elegir_jugada(self):
+        """Test que se elige la opción de mayor equidad y se prefiere ganar."""
+        elegida = self.evaluador.elegir_jugada(self.opciones, ColorFicha.BLANCA)
+        equidades = self.evaluador.evaluar_lote([posicion for _, posicion in self.opciones],
+                                                ColorFicha.BLANCA)
+        self.assertEqual(elegida, self.opciones[int(np.argmax(equidades))])
+        posicion = [0] * 26
+        posicion[0] = 1
+        posicion[3] = 1
+        posicion[20] = -2
+        opciones = MoveGenerator.generar_posiciones(posicion, ColorFicha.BLANCA, (4, 1))
+        _, resultado = self.evaluador.elegir_jugada(opciones, ColorFicha.BLANCA)
+        self.assertEqual(max(resultado), 0)
+
+    def test_expectimax_por_lotes(self):
+        """Test que Expectimax da los mismos valores evaluando hojas en lote."""
+        final = [0] * 26
+        final[2] = 1
+        final[4] = 1
+        final[9] = 1
+        final[20] = -1
+        final[14] = -2
+        por_lotes = Expectimax(self.evaluador).analizar(final, ColorFicha.NEGRA, (5, 3), 1)
+        escalar = Expectimax(EvaluadorEscalar(self.evaluador)).analizar(final, ColorFicha.NEGRA,
+                                                                       (5, 3), 1)
+        self.assertEqual([fila[0] for fila in por_lotes], [fila[0] for fila in escalar])
+        for fila_lote, fila_escalar in zip(por_lotes, escalar):
+            self.assertAlmostEqual(fila_lote[2], fila_escalar[2], places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
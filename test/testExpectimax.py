@@ -0,0 +1,179 @@
+"""Tests para el motor de búsqueda expectimax."""
+import unittest
+from unittest.mock import patch
+from core.BackgammonGame import BackgammonGame
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.EvaluadorPips import EvaluadorPips
+from core.Expectimax import Expectimax
+from core.MoveGenerator import MoveGenerator
+from core.TablaTransposicion import TablaTransposicion
+
+
+def valor_sin_poda(posicion, color, profundidad, evaluador):
+    """Expectimax completo sin poda, como referencia."""
+    final = Expectimax.valor_final(posicion, color)
+    if final is not None:
+        return final
+    if profundidad == 0:
+        return evaluador.evaluar(posicion, color)
+    rival = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+    total = 0.0
+    for movimientos, probabilidad in Expectimax.TIRADAS:
+        opciones = MoveGenerator.generar_posiciones(posicion, rival, movimientos)
+        total -= probabilidad * max(valor_sin_poda(resultado, rival, profundidad - 1, evaluador)
+                                    for _, resultado in opciones)
+    return total
+
+
+class TestExpectimax(unittest.TestCase):
+
+    def setUp(self):
+        """Preparar la posición inicial y un final de partida pequeño."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        self.inicial = board.posicion
+        self.final = [0] * 26
+        self.final[2] = 1
+        self.final[4] = 1
+        self.final[9] = 1
+        self.final[20] = -1
+        self.final[14] = -2
+
+    def test_tiradas(self):
+        """Test que hay 21 tiradas distintas con probabilidades que suman 1."""
+        self.assertEqual(len(Expectimax.TIRADAS), 21)
+        self.assertAlmostEqual(sum(probabilidad for _, probabilidad in Expectimax.TIRADAS), 1.0)
+        dobles = [movimientos for movimientos, _ in Expectimax.TIRADAS if len(movimientos) == 4]
+        self.assertEqual(len(dobles), 6)
+
+    def test_valor_final(self):
+        """Test el valor de victorias simples, gammons y backgammons."""
+        posicion = [0] * 26
+        posicion[10] = -3
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA), 1.0)
+        posicion[10] = -15
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA), 2.0)
+        posicion[10] = -14
+        posicion[25] = -1
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA), 3.0)
+        self.assertIsNone(Expectimax.valor_final(self.inicial, ColorFicha.NEGRA))
+
+    def test_valor_final_hypergammon(self):
+        """Test que los finales de hypergammon se puntúan con 3 fichas por color."""
+        fichas = BoardInitializer.VARIANTES["hypergammon"]
+        posicion = [0] * 26
+        posicion[2] = -3
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA, fichas), 3.0)
+        posicion[2], posicion[12] = 0, -3
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA, fichas), 2.0)
+        posicion[12] = -2
+        self.assertEqual(Expectimax.valor_final(posicion, ColorFicha.BLANCA, fichas), 1.0)
+        # Una blanca por sacar: cualquier tirada gana con backgammon
+        posicion = [0] * 26
+        posicion[0] = 1
+        posicion[2] = -3
+        ranking = Expectimax(fichas=fichas).analizar(posicion, ColorFicha.BLANCA, (2, 1), 1)
+        self.assertEqual(ranking[0][2], 3.0)
+        game = BackgammonGame("Juan", "Maria")
+        game.start_game("hypergammon")
+        with patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 1)):
+            game.roll_dice()
+        with self.assertRaises(ValueError):
+            Expectimax().analizar_juego(game)
+        self.assertTrue(Expectimax(fichas=fichas).analizar_juego(game, 0))
+
+    def test_profundidad_cero_ordena_por_evaluador(self):
+        """Test que sin profundidad las equidades son las del evaluador."""
+        evaluador = EvaluadorPips()
+        ranking = Expectimax().analizar(self.inicial, ColorFicha.BLANCA, (6, 4), 0)
+        self.assertEqual(len(ranking), len(MoveGenerator.generar_posiciones(
+            self.inicial, ColorFicha.BLANCA, (6, 4))))
+        for _, resultado, equidad, exacta in ranking:
+            self.assertTrue(exacta)
+            self.assertAlmostEqual(equidad, evaluador.evaluar(resultado, ColorFicha.BLANCA))
+        equidades = [fila[2] for fila in ranking]
+        self.assertEqual(equidades, sorted(equidades, reverse=True))
+
+    def test_poda_no_cambia_los_valores(self):
+        """Test que Star1 y Star2 dan los mismos valores que expectimax sin poda."""
+        evaluador = EvaluadorPips()
+        for star2 in (True, False):
+            for profundidad in (1, 2):
+                ranking = Expectimax(star2=star2).analizar(self.final, ColorFicha.NEGRA, (5, 3),
+                                                           profundidad)
+                for _, resultado, equidad, _ in ranking:
+                    self.assertAlmostEqual(
+                        equidad, valor_sin_poda(resultado, ColorFicha.NEGRA, profundidad, evaluador))
+
+    def test_tabla_de_transposicion(self):
+        """Test que la tabla no cambia los valores y ahorra nodos al repetir el análisis."""
+        tabla = TablaTransposicion(limite_bytes=1 << 20)
+        sin_tabla = Expectimax().analizar(self.final, ColorFicha.NEGRA, (5, 3), 2)
+        motor = Expectimax(tabla=tabla)
+        primera = motor.analizar(self.final, ColorFicha.NEGRA, (5, 3), 2)
+        nodos_primera = motor.nodos
+        segunda = motor.analizar(self.final, ColorFicha.NEGRA, (5, 3), 2)
+        self.assertEqual(primera, sin_tabla)
+        self.assertEqual(segunda, sin_tabla)
+        self.assertLess(motor.nodos, nodos_primera)
+        self.assertGreater(tabla.estadisticas()["aciertos"], 0)
+
+    def test_margen_acota_las_jugadas_descartadas(self):
+        """Test que con margen la mejor jugada es exacta y el resto son cotas."""
+        completo = Expectimax().analizar(self.inicial, ColorFicha.BLANCA, (3, 1), 1)
+        motor = Expectimax()
+        podado = motor.analizar(self.inicial, ColorFicha.BLANCA, (3, 1), 1, margen=0.0)
+        self.assertEqual(podado[0][:3], completo[0][:3])
+        self.assertTrue(podado[0][3])
+        valores = {resultado: equidad for _, resultado, equidad, _ in completo}
+        for _, resultado, equidad, exacta in podado:
+            if exacta:
+                self.assertAlmostEqual(equidad, valores[resultado])
+            else:
+                self.assertGreaterEqual(equidad + 1e-9, valores[resultado])
+
+    def test_apertura_tres_uno(self):
+        """Test que a 1 ply la mejor apertura con 3-1 es hacer el punto 5."""
+        ranking = Expectimax().analizar(self.inicial, ColorFicha.BLANCA, (3, 1), 1)
+        self.assertEqual(sorted(ranking[0][0]), [(5, 1), (7, 3)])
+
+    def test_presupuesto_de_nodos(self):
+        """Test que al agotar el presupuesto se devuelve la última profundidad completa."""
+        motor = Expectimax(limite_nodos=50)
+        ranking = motor.analizar(self.inicial, ColorFicha.BLANCA, (6, 5), 2)
+        self.assertEqual(motor.profundidad_completada, 0)
+        self.assertEqual(len(ranking), len(MoveGenerator.generar_posiciones(
+            self.inicial, ColorFicha.BLANCA, (6, 5))))
+
+    def test_presupuesto_de_tiempo(self):
+        """Test que un límite de tiempo nulo deja solo la profundidad 0."""
+        motor = Expectimax(limite_segundos=0.0)
+        with patch.object(Expectimax, 'INTERVALO_RELOJ', 1):
+            motor.analizar(self.inicial, ColorFicha.BLANCA, (6, 5), 1)
+        self.assertEqual(motor.profundidad_completada, 0)
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 1))
+    def test_analizar_juego(self, _mock_roll):
+        """Test analizar el turno actual de una partida."""
+        game = BackgammonGame("Juan", "Maria")
+        game.start_game()
+        with self.assertRaises(RuntimeError):
+            Expectimax().analizar_juego(game)
+        game.roll_dice()
+        ranking = Expectimax().analizar_juego(game, 0)
+        self.assertEqual(len(ranking), 16)
+
+    def test_parametros_invalidos(self):
+        """Test que se rechazan límites de equidad y profundidades inválidas."""
+        with self.assertRaises(ValueError):
+            Expectimax(minimo=1.0, maximo=1.0)
+        with self.assertRaises(ValueError):
+            Expectimax(fichas=0)
+        with self.assertRaises(ValueError):
+            Expectimax().analizar(self.inicial, ColorFicha.BLANCA, (3, 1), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
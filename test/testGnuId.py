@@ -0,0 +1,88 @@
+"""Tests para los IDs de GNU Backgammon."""
+import unittest
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.Checker import Checker
+from core.ColorFicha import ColorFicha
+from core.GnuId import GnuId
+
+
+class TestGnuId(unittest.TestCase):
+
+    def setUp(self):
+        """Configurar un tablero con la posición inicial."""
+        self.board = Board()
+        BoardInitializer.inicializar_estandar(self.board)
+
+    def test_posicion_inicial(self):
+        """Test que la posición inicial da el ID conocido de GNU Backgammon."""
+        self.assertEqual(GnuId.desde_board(self.board), "4HPwATDgc/ABMA")
+        self.board.alternar_turno()
+        self.assertEqual(GnuId.desde_board(self.board), "4HPwATDgc/ABMA")
+
+    def test_decodificar_posicion_inicial(self):
+        """Test que el ID de la posición inicial se decodifica al tablero."""
+        self.assertEqual(GnuId.decodificar_posicion("4HPwATDgc/ABMA"), self.board.posicion)
+        self.assertEqual(GnuId.decodificar_posicion("4HPwATDgc/ABMA", True), self.board.posicion)
+
+    def test_ida_y_vuelta_con_barra(self):
+        """Test codificar y decodificar con fichas en la barra y fuera."""
+        self.board.quitar_ficha(23)
+        self.board.agregar_ficha_contenedor(Checker(ColorFicha.BLANCA))
+        self.board.quitar_ficha(18)
+        self.board.quitar_ficha(18)
+        self.board.agregar_ficha_contenedor(Checker(ColorFicha.NEGRA))
+        for turno_negras in (False, True):
+            texto = GnuId.codificar_posicion(self.board.posicion, turno_negras)
+            self.assertEqual(len(texto), GnuId.LARGO_POSICION)
+            self.assertEqual(GnuId.decodificar_posicion(texto, turno_negras),
+                             self.board.posicion)
+
+    def test_turno_cambia_el_id_de_posicion_asimetrica(self):
+        """Test que el ID depende de qué jugador tiene el turno."""
+        self.board.quitar_ficha(23)
+        blancas = GnuId.codificar_posicion(self.board.posicion, False)
+        negras = GnuId.codificar_posicion(self.board.posicion, True)
+        self.assertNotEqual(blancas, negras)
+
+    def test_tablero_vacio(self):
+        """Test que un tablero vacío se codifica con todos los bits en cero."""
+        texto = GnuId.codificar_posicion(Board().posicion)
+        self.assertEqual(texto, "AAAAAAAAAAAAAA")
+        self.assertEqual(GnuId.decodificar_posicion(texto), Board().posicion)
+
+    def test_decodificar_id_invalido(self):
+        """Test que los IDs mal formados lanzan ValueError."""
+        for texto in ("", "4HPwATDgc/ABM", "4HPwATDgc/AB*A", "//////////////", None):
+            with self.assertRaises(ValueError):
+                GnuId.decodificar_posicion(texto)
+
+    def test_match_id_conocido(self):
+        """Test el match ID de GNU Backgammon con el jugador 1 en turno."""
+        texto = GnuId.codificar_match(1, GnuId.ESTADO_JUGANDO)
+        self.assertEqual(texto, "cAkAAAAAAAAA")
+        campos = GnuId.decodificar_match(texto)
+        self.assertEqual(campos["en_turno"], 1)
+        self.assertEqual(campos["duenio_cubo"], GnuId.CUBO_CENTRADO)
+        self.assertEqual(campos["estado"], GnuId.ESTADO_JUGANDO)
+
+    def test_match_id_con_dados(self):
+        """Test que los dados y el marcador se conservan en el match ID."""
+        texto = GnuId.codificar_match(0, GnuId.ESTADO_JUGANDO, (5, 2), valor_cubo=4,
+                                      duenio_cubo=1, largo_match=7, puntajes=(3, 6))
+        self.assertEqual(len(texto), GnuId.LARGO_MATCH)
+        campos = GnuId.decodificar_match(texto)
+        self.assertEqual((campos["dado_1"], campos["dado_2"]), (5, 2))
+        self.assertEqual(campos["log_cubo"], 2)
+        self.assertEqual(campos["duenio_cubo"], 1)
+        self.assertEqual(campos["largo_match"], 7)
+        self.assertEqual((campos["puntaje_0"], campos["puntaje_1"]), (3, 6))
+
+    def test_match_id_valor_fuera_de_rango(self):
+        """Test que un valor que no entra en su campo lanza ValueError."""
+        with self.assertRaises(ValueError):
+            GnuId.codificar_match(0, GnuId.ESTADO_JUGANDO, (8, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
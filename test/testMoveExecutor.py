@@ -42,7 +42,7 @@ class TestMoveExecutor(unittest.TestCase):
         """Test ejecutar movimiento exitoso con jugador blanco."""
         # Preparar tablero
         self.board.agregar_ficha(10, Checker(ColorFicha.BLANCA))
-        self.dice._Dice__available_moves = [3]
+        self.dice.set_moves([3])
         # Ejecutar movimiento
         MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         # Verificar
@@ -54,7 +54,7 @@ class TestMoveExecutor(unittest.TestCase):
         """Test ejecutar movimiento exitoso con jugador negro."""
         # Preparar tablero
         self.board.agregar_ficha(5, Checker(ColorFicha.NEGRA))
-        self.dice._Dice__available_moves = [4]
+        self.dice.set_moves([4])
         # Ejecutar movimiento
         MoveExecutor.execute_move(self.board, self.dice, self.player_black, 5, 4)
         # Verificar
@@ -65,14 +65,14 @@ class TestMoveExecutor(unittest.TestCase):
     def test_execute_move_dado_no_disponible(self):
         """Test error cuando el valor del dado no está disponible."""
         self.board.agregar_ficha(10, Checker(ColorFicha.BLANCA))
-        self.dice._Dice__available_moves = [2, 5]  # Solo 2 y 5 disponibles
+        self.dice.set_moves([2, 5])  # Solo 2 y 5 disponibles
         with self.assertRaises(ValueError) as context:
             MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         self.assertEqual(str(context.exception), "El valor del dado no está disponible")
 
     def test_execute_move_punto_vacio(self):
         """Test error cuando no hay fichas en el punto de origen."""
-        self.dice._Dice__available_moves = [3]
+        self.dice.set_moves([3])
         with self.assertRaises(ValueError) as context:
             MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         self.assertEqual(str(context.exception), "No hay fichas en el punto de origen")
@@ -81,7 +81,7 @@ class TestMoveExecutor(unittest.TestCase):
         """Test error cuando la ficha no pertenece al jugador."""
         # Ficha negra en el tablero, intenta mover jugador blanco
         self.board.agregar_ficha(10, Checker(ColorFicha.NEGRA))
-        self.dice._Dice__available_moves = [3]
+        self.dice.set_moves([3])
         with self.assertRaises(ValueError) as context:
             MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         self.assertEqual(str(context.exception), "La ficha no pertenece al jugador actual")
@@ -89,7 +89,7 @@ class TestMoveExecutor(unittest.TestCase):
     def test_execute_move_destino_fuera_tablero_negativo(self):
         """Test error cuando el destino es negativo (jugador blanco)."""
         self.board.agregar_ficha(2, Checker(ColorFicha.BLANCA))
-        self.dice._Dice__available_moves = [5]
+        self.dice.set_moves([5])
         with self.assertRaises(ValueError) as context:
             MoveExecutor.execute_move(self.board, self.dice, self.player_white, 2, 5)
         self.assertEqual(str(context.exception), "El movimiento sale del tablero")
@@ -97,7 +97,7 @@ class TestMoveExecutor(unittest.TestCase):
     def test_execute_move_destino_fuera_tablero_mayor_23(self):
         """Test error cuando el destino es mayor a 23 (jugador negro)."""
         self.board.agregar_ficha(20, Checker(ColorFicha.NEGRA))
-        self.dice._Dice__available_moves = [6]
+        self.dice.set_moves([6])
         with self.assertRaises(ValueError) as context:
             MoveExecutor.execute_move(self.board, self.dice, self.player_black, 20, 6)
         self.assertEqual(str(context.exception), "El movimiento sale del tablero")
@@ -105,7 +105,7 @@ class TestMoveExecutor(unittest.TestCase):
     def test_execute_move_usa_dado_correctamente(self):
         """Test que el dado se consume después del movimiento."""
         self.board.agregar_ficha(10, Checker(ColorFicha.BLANCA))
-        self.dice._Dice__available_moves = [3, 5]
+        self.dice.set_moves([3, 5])
         self.assertEqual(self.dice.get_moves_remaining(), 2)
         MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         self.assertEqual(self.dice.get_moves_remaining(), 1)
@@ -116,7 +116,7 @@ class TestMoveExecutor(unittest.TestCase):
         # Preparar tablero con 2 fichas blancas
         self.board.agregar_ficha(10, Checker(ColorFicha.BLANCA))
         self.board.agregar_ficha(8, Checker(ColorFicha.BLANCA))
-        self.dice._Dice__available_moves = [3, 2]
+        self.dice.set_moves([3, 2])
         # Primer movimiento
         MoveExecutor.execute_move(self.board, self.dice, self.player_white, 10, 3)
         self.assertEqual(self.board.contar_fichas(7), 1)
@@ -129,7 +129,7 @@ class TestMoveExecutor(unittest.TestCase):
     def test_execute_move_con_tablero_inicializado(self):
         """Test movimiento en tablero con configuración estándar."""
         BoardInitializer.inicializar_estandar(self.board)
-        self.dice._Dice__available_moves = [3]
+        self.dice.set_moves([3])
         # Mover ficha blanca desde punto 23
         MoveExecutor.execute_move(self.board, self.dice, self.player_white, 23, 3)
         # Verificar
@@ -153,7 +153,7 @@ class TestMoveExecutor(unittest.TestCase):
         """Test que el movimiento mantiene la integridad del tablero."""
         self.board.agregar_ficha(15, Checker(ColorFicha.BLANCA))
         total_fichas_antes = sum(self.board.contar_fichas(i) for i in range(24))
-        self.dice._Dice__available_moves = [4]
+        self.dice.set_moves([4])
         MoveExecutor.execute_move(self.board, self.dice, self.player_white, 15, 4)
         total_fichas_despues = sum(self.board.contar_fichas(i) for i in range(24))
         # El total de fichas debe ser el mismo
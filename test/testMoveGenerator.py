@@ -0,0 +1,230 @@
+"""Tests para la clase MoveGenerator."""
+import random
+import unittest
+from core.MoveGenerator import MoveGenerator
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.Dice import Dice
+
+
+def sigue_en_juego(posicion):
+    """Indicar si ambos colores tienen fichas en el tablero."""
+    return any(valor > 0 for valor in posicion) and any(valor < 0 for valor in posicion)
+
+
+class TestMoveGenerator(unittest.TestCase):
+
+    def setUp(self):
+        """Configurar objetos antes de cada prueba."""
+        self.posicion = [0] * 26
+
+    def __posiciones(self, color, movimientos):
+        """Obtener el conjunto de posiciones resultantes."""
+        return {posicion for _, posicion in
+                MoveGenerator.generar_posiciones(self.posicion, color, movimientos)}
+
+    def test_apertura_tres_uno(self):
+        """Test cantidad de jugadas distintas para un 3-1 de apertura."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        jugadas = MoveGenerator.generar_jugadas(board, ColorFicha.BLANCA, (3, 1))
+        self.assertEqual(len(jugadas), 16)
+
+    def test_jugadas_sin_duplicar_posiciones(self):
+        """Test que no hay dos jugadas que lleven a la misma posición."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        resultado = MoveGenerator.generar_posiciones(board.posicion, ColorFicha.NEGRA, (4, 4, 4, 4))
+        posiciones = [posicion for _, posicion in resultado]
+        self.assertEqual(len(posiciones), len(set(posiciones)))
+        for jugada, _ in resultado:
+            self.assertEqual(len(jugada), 4)
+
+    def test_dobles_desde_process_roll(self):
+        """Test que acepta los movimientos de dobles de Dice._process_roll."""
+        self.posicion[10] = 1
+        jugadas = {jugada for jugada, _ in MoveGenerator.generar_posiciones(
+            self.posicion, ColorFicha.BLANCA, Dice._process_roll((2, 2)))}
+        self.assertEqual(jugadas, {((10, 2), (8, 2), (6, 2), (4, 2))})
+
+    def test_entrada_desde_barra_primero(self):
+        """Test que con fichas en la barra solo se puede entrar primero."""
+        self.posicion[5] = 2
+        self.posicion[Board.BARRA_BLANCAS] = 1
+        for jugada, _ in MoveGenerator.generar_posiciones(self.posicion, ColorFicha.BLANCA, (3, 5)):
+            self.assertEqual(jugada[0][0], MoveGenerator.ORIGEN_BARRA)
+
+    def test_entrada_bloqueada_jugada_vacia(self):
+        """Test que sin entrada posible la única jugada es vacía."""
+        self.posicion[Board.BARRA_NEGRAS] = -1
+        self.posicion[2] = 2
+        self.posicion[4] = 3
+        self.posicion[20] = -2
+        resultado = MoveGenerator.generar_posiciones(self.posicion, ColorFicha.NEGRA, (3, 5))
+        self.assertEqual(resultado, [((), tuple(self.posicion))])
+
+    def test_golpe_envia_ficha_rival_a_barra(self):
+        """Test que caer sobre una ficha rival solitaria la manda a la barra."""
+        self.posicion[8] = 1
+        self.posicion[5] = -1
+        posiciones = self.__posiciones(ColorFicha.BLANCA, (3,))
+        esperado = [0] * 26
+        esperado[5] = 1
+        esperado[Board.BARRA_NEGRAS] = -1
+        self.assertEqual(posiciones, {tuple(esperado)})
+
+    def test_punto_bloqueado(self):
+        """Test que no se puede caer en un punto con dos fichas rivales."""
+        self.posicion[8] = 1
+        self.posicion[5] = -2
+        self.assertEqual(self.__posiciones(ColorFicha.BLANCA, (3,)), {tuple(self.posicion)})
+
+    def test_debe_usar_ambos_dados(self):
+        """Test que si se pueden usar los dos dados no se aceptan jugadas de uno."""
+        self.posicion[12] = -1
+        self.posicion[15] = -2
+        self.posicion[19] = -2
+        for jugada, _ in MoveGenerator.generar_posiciones(self.posicion, ColorFicha.NEGRA, (3, 4)):
+            self.assertEqual(len(jugada), 2)
+
+    def test_solo_se_puede_usar_dado_menor(self):
+        """Test que si el dado mayor nunca se puede usar se juega el menor."""
+        self.posicion[12] = 1
+        self.posicion[6] = -2
+        self.posicion[4] = -2
+        jugadas = {jugada for jugada, _ in MoveGenerator.generar_posiciones(
+            self.posicion, ColorFicha.BLANCA, (2, 6))}
+        self.assertEqual(jugadas, {((12, 2),)})
+
+    def test_regla_dado_mayor(self):
+        """Test que si solo se puede usar un dado debe ser el mayor."""
+        self.posicion[12] = 1
+        self.posicion[5] = -2
+        jugadas = {jugada for jugada, _ in MoveGenerator.generar_posiciones(
+            self.posicion, ColorFicha.BLANCA, (2, 5))}
+        self.assertEqual(jugadas, {((12, 5),)})
+
+    def test_bear_off_exacto_y_con_dado_mayor(self):
+        """Test bear off con dado exacto y con dado mayor sin fichas atrás."""
+        self.posicion[2] = 1
+        self.posicion[0] = 1
+        posiciones = self.__posiciones(ColorFicha.BLANCA, (6, 3))
+        self.assertEqual(posiciones, {(0,) * 26})
+
+    def test_bear_off_dado_mayor_con_fichas_atras(self):
+        """Test que no se saca con dado mayor si hay fichas en puntos más altos."""
+        self.posicion[4] = 1
+        self.posicion[1] = 1
+        jugadas = {jugada for jugada, _ in MoveGenerator.generar_posiciones(
+            self.posicion, ColorFicha.BLANCA, (3,))}
+        self.assertEqual(jugadas, {((4, 3),)})
+
+    def test_bear_off_requiere_todas_en_casa(self):
+        """Test que no se puede sacar con fichas fuera del home."""
+        self.posicion[18] = -1
+        self.posicion[10] = -1
+        jugadas = [jugada for jugada, _ in MoveGenerator.generar_posiciones(
+            self.posicion, ColorFicha.NEGRA, (6,))]
+        self.assertEqual(jugadas, [((10, 6),)])
+
+    def test_negras_sacan_fichas(self):
+        """Test bear off de las negras desde su home."""
+        self.posicion[23] = -2
+        posiciones = self.__posiciones(ColorFicha.NEGRA, (1, 1, 1, 1))
+        self.assertEqual(posiciones, {(0,) * 26})
+
+    def test_sin_movimientos(self):
+        """Test que sin dados se devuelve la jugada vacía."""
+        self.posicion[3] = 1
+        resultado = MoveGenerator.generar_posiciones(self.posicion, ColorFicha.BLANCA, ())
+        self.assertEqual(resultado, [((), tuple(self.posicion))])
+
+    def test_por_tirada_igual_a_generar_posiciones(self):
+        """Test que compartir movimientos entre tiradas da lo mismo, en el mismo orden."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        posiciones = [(board.posicion, ColorFicha.BLANCA), (board.posicion, ColorFicha.NEGRA)]
+        # Posiciones de partidas al azar, con golpes, barra y bear off
+        azar = random.Random(3)
+        for _ in range(3):
+            posicion, color = board.posicion, ColorFicha.BLANCA
+            while sigue_en_juego(posicion) and len(posiciones) < 200:
+                dados = (azar.randint(1, 6), azar.randint(1, 6))
+                movimientos = dados if dados[0] != dados[1] else dados * 2
+                posiciones.append((posicion, color))
+                _, posicion = azar.choice(MoveGenerator.generar_posiciones(posicion, color,
+                                                                           movimientos))
+                color = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+        for posicion, color in posiciones:
+            por_tirada = MoveGenerator.generar_por_tirada(posicion, color)
+            self.assertEqual(list(por_tirada), list(MoveGenerator.TIRADAS))
+            for movimientos in MoveGenerator.TIRADAS:
+                self.assertEqual(por_tirada[movimientos],
+                                 MoveGenerator.generar_posiciones(posicion, color, movimientos))
+
+    def test_por_tirada_elegidas_y_regla_dado_mayor(self):
+        """Test pedir solo algunas tiradas, incluida la vacía, en casos límite."""
+        self.posicion[24] = 1
+        self.posicion[12] = 14
+        for punto in (18, 19, 20, 21, 23):
+            self.posicion[punto] = -2
+        self.posicion[0] = -5
+        tiradas = [(3, 1), (1, 3), (6, 6, 6, 6), ()]
+        por_tirada = MoveGenerator.generar_por_tirada(self.posicion, ColorFicha.BLANCA, tiradas)
+        self.assertEqual(set(por_tirada), {(3, 1), (1, 3), (6, 6, 6, 6), ()})
+        for movimientos in tiradas:
+            self.assertEqual(por_tirada[movimientos],
+                             MoveGenerator.generar_posiciones(self.posicion, ColorFicha.BLANCA,
+                                                              movimientos))
+        self.assertEqual(por_tirada[()], [((), tuple(self.posicion))])
+
+    def test_iterar_jugadas_igual_a_generar_posiciones(self):
+        """Test que el generador da las mismas posiciones, cada una una vez."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        azar = random.Random(8)
+        posicion, color = board.posicion, ColorFicha.BLANCA
+        while sigue_en_juego(posicion):
+            dados = (azar.randint(1, 6), azar.randint(1, 6))
+            movimientos = dados if dados[0] != dados[1] else dados * 2
+            esperadas = MoveGenerator.generar_posiciones(posicion, color, movimientos)
+            generadas = list(MoveGenerator.iterar_jugadas(posicion, color, movimientos))
+            self.assertEqual(len(generadas), len(esperadas))
+            self.assertEqual({resultado for _, resultado in generadas},
+                             {resultado for _, resultado in esperadas})
+            self.assertEqual(MoveGenerator.hay_jugada(posicion, color, movimientos),
+                             bool(esperadas[0][0]))
+            _, posicion = azar.choice(esperadas)
+            color = ColorFicha.NEGRA if color == ColorFicha.BLANCA else ColorFicha.BLANCA
+
+    def test_iterar_jugadas_golpes_primero(self):
+        """Test que la primera jugada generada golpea si se puede."""
+        self.posicion[12] = 2
+        self.posicion[5] = 2
+        self.posicion[9] = -1
+        self.posicion[0] = -2
+        primera, resultado = next(MoveGenerator.iterar_jugadas(self.posicion, ColorFicha.BLANCA,
+                                                               (3, 2)))
+        self.assertEqual(primera[0], (12, 3))
+        self.assertEqual(resultado[MoveGenerator.BARRA_RIVAL], -1)
+
+    def test_iterar_jugadas_regla_dado_mayor_y_sin_movimientos(self):
+        """Test las jugadas de un solo dado con la regla del mayor y la jugada vacía."""
+        self.posicion[12] = 1
+        self.posicion[5] = -2
+        self.assertEqual(list(MoveGenerator.iterar_jugadas(self.posicion, ColorFicha.BLANCA,
+                                                           (2, 5))),
+                         MoveGenerator.generar_posiciones(self.posicion, ColorFicha.BLANCA,
+                                                          (2, 5)))
+        self.assertTrue(MoveGenerator.hay_jugada(self.posicion, ColorFicha.BLANCA, (2, 5)))
+        self.posicion[7] = -2
+        self.posicion[10] = -2
+        self.assertEqual(list(MoveGenerator.iterar_jugadas(self.posicion, ColorFicha.BLANCA,
+                                                           (2, 5))),
+                         [((), tuple(self.posicion))])
+        self.assertFalse(MoveGenerator.hay_jugada(self.posicion, ColorFicha.BLANCA, (2, 5)))
+        self.assertFalse(MoveGenerator.hay_jugada(self.posicion, ColorFicha.BLANCA, ()))
+
+if __name__ == '__main__':
+    unittest.main()
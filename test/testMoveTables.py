@@ -0,0 +1,50 @@
+"""Tests para la clase MoveTables."""
+import unittest
+from core.MoveTables import MoveTables
+from core.ColorFicha import ColorFicha
+
+
+class TestMoveTables(unittest.TestCase):
+
+    def test_destino_blancas_avanzan_hacia_cero(self):
+        """Test que las blancas restan el dado al punto de origen."""
+        self.assertEqual(MoveTables.destino(ColorFicha.BLANCA, 10, 3), 7)
+        self.assertEqual(MoveTables.destino(ColorFicha.BLANCA, 6, 6), 0)
+
+    def test_destino_negras_avanzan_hacia_23(self):
+        """Test que las negras suman el dado al punto de origen."""
+        self.assertEqual(MoveTables.destino(ColorFicha.NEGRA, 5, 4), 9)
+        self.assertEqual(MoveTables.destino(ColorFicha.NEGRA, 17, 6), 23)
+
+    def test_destino_fuera_del_tablero(self):
+        """Test que los movimientos que salen del tablero devuelven FUERA."""
+        self.assertEqual(MoveTables.destino(ColorFicha.BLANCA, 2, 5), MoveTables.FUERA)
+        self.assertEqual(MoveTables.destino(ColorFicha.NEGRA, 20, 6), MoveTables.FUERA)
+
+    def test_puntos_de_entrada(self):
+        """Test que las entradas desde la barra usan el home del rival."""
+        for dado in range(1, 7):
+            self.assertEqual(MoveTables.punto_entrada(ColorFicha.BLANCA, dado), 24 - dado)
+            self.assertEqual(MoveTables.punto_entrada(ColorFicha.NEGRA, dado), dado - 1)
+            self.assertEqual(MoveTables.destino(ColorFicha.BLANCA, MoveTables.ORIGEN_BARRA, dado),
+                             24 - dado)
+
+    def test_tipo_bear_off(self):
+        """Test la clasificación de salidas exactas y con sobrante."""
+        blancas = MoveTables.BEAR_OFF[ColorFicha.BLANCA]
+        negras = MoveTables.BEAR_OFF[ColorFicha.NEGRA]
+        self.assertEqual(blancas[2][3], MoveTables.SALIDA_EXACTA)
+        self.assertEqual(blancas[2][6], MoveTables.SALIDA_CON_SOBRANTE)
+        self.assertEqual(blancas[2][2], MoveTables.NO_SALE)
+        self.assertEqual(negras[21][3], MoveTables.SALIDA_EXACTA)
+        self.assertEqual(negras[21][5], MoveTables.SALIDA_CON_SOBRANTE)
+        self.assertEqual(negras[MoveTables.ORIGEN_BARRA][6], MoveTables.NO_SALE)
+
+    def test_tablas_relativas_son_las_de_blancas(self):
+        """Test que las tablas relativas coinciden con las de las blancas."""
+        self.assertIs(MoveTables.RELATIVOS, MoveTables.DESTINOS[ColorFicha.BLANCA])
+        self.assertIs(MoveTables.BEAR_OFF_RELATIVO, MoveTables.BEAR_OFF[ColorFicha.BLANCA])
+
+
+if __name__ == '__main__':
+    unittest.main()
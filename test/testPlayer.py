@@ -117,6 +117,13 @@ class TestPlayer(unittest.TestCase):
         with self.assertRaises(AttributeError):
             player.color = ColorFicha.NEGRA
 
+    def test_player_sin_dict(self):
+        """Test que Player usa __slots__ y no acepta atributos nuevos."""
+        player = Player("Juan", ColorFicha.BLANCA)
+        self.assertFalse(hasattr(player, "__dict__"))
+        with self.assertRaises(AttributeError):
+            player.puntaje = 3
+
 
 if __name__ == '__main__':
     unittest.main()
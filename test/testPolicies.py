@@ -0,0 +1,54 @@
+"""Tests para las políticas de elección de jugadas."""
+import unittest
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.ColorFicha import ColorFicha
+from core.MoveGenerator import MoveGenerator
+from core.Policies import POLITICAS, PoliticaAleatoria, PoliticaGolosa, PoliticaPrimera
+
+
+class TestPolicies(unittest.TestCase):
+
+    def setUp(self):
+        """Generar las opciones de la tirada inicial 6-4 de las blancas."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        self.posicion = board.posicion
+        self.opciones = MoveGenerator.generar_posiciones(self.posicion, ColorFicha.BLANCA, (6, 4))
+
+    def test_todas_devuelven_una_opcion(self):
+        """Test que cada política devuelve uno de los pares recibidos."""
+        for politica in POLITICAS.values():
+            elegida = politica(1).elegir_jugada(self.opciones, ColorFicha.BLANCA)
+            self.assertIn(elegida, self.opciones)
+
+    def test_aleatoria_reproducible(self):
+        """Test que la política aleatoria con semilla repite sus elecciones."""
+        politica_a = PoliticaAleatoria(5)
+        politica_b = PoliticaAleatoria(5)
+        for _ in range(20):
+            self.assertEqual(politica_a.elegir_jugada(self.opciones, ColorFicha.BLANCA),
+                             politica_b.elegir_jugada(self.opciones, ColorFicha.BLANCA))
+
+    def test_primera(self):
+        """Test que la política primera elige la primera opción."""
+        self.assertIs(PoliticaPrimera().elegir_jugada(self.opciones, ColorFicha.BLANCA),
+                      self.opciones[0])
+
+    def test_golosa_prefiere_golpear(self):
+        """Test que la política golosa golpea una ficha suelta cuando puede."""
+        posicion = list(self.posicion)
+        posicion[16] = -1
+        posicion[0] = -4
+        opciones = MoveGenerator.generar_posiciones(posicion, ColorFicha.BLANCA, (6, 1))
+        _, resultado = PoliticaGolosa(1).elegir_jugada(opciones, ColorFicha.BLANCA)
+        self.assertEqual(resultado[Board.BARRA_NEGRAS], -1)
+
+    def test_golosa_puntuar_simetrica(self):
+        """Test que la posición inicial puntúa igual para ambos colores."""
+        self.assertEqual(PoliticaGolosa.puntuar(self.posicion, ColorFicha.BLANCA),
+                         PoliticaGolosa.puntuar(self.posicion, ColorFicha.NEGRA))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests para la red neuronal en NumPy."""
+import os
+import tempfile
+import unittest
+import numpy as np
+from core.RedNeuronal import RedNeuronal
+
+
+class TestRedNeuronal(unittest.TestCase):
+
+    def setUp(self):
+        """Crear una red chica con semilla fija."""
+        self.red = RedNeuronal(entradas=6, ocultas=4, semilla=3)
+
+    def test_propagar_lote(self):
+        """Test la forma y el rango de las salidas para un lote y un vector."""
+        entradas = np.random.default_rng(0).random((7, 6), dtype=np.float32)
+        salidas = self.red.propagar(entradas)
+        self.assertEqual(salidas.shape, (7, 5))
+        self.assertTrue(((salidas > 0) & (salidas < 1)).all())
+        np.testing.assert_allclose(self.red.propagar(entradas[2]), salidas[2], rtol=1e-6)
+
+    def test_semilla_reproducible(self):
+        """Test que la misma semilla da los mismos pesos."""
+        otra = RedNeuronal(entradas=6, ocultas=4, semilla=3)
+        for propio, ajeno in zip(self.red.parametros, otra.parametros):
+            np.testing.assert_array_equal(propio, ajeno)
+        self.assertEqual((self.red.entradas, self.red.ocultas), (6, 4))
+
+    def test_equidad(self):
+        """Test la equidad sin cubo a partir de las cinco probabilidades."""
+        probabilidades = np.array([[1.0, 0.0, 0.0, 0.0, 0.0],
+                                   [0.0, 0.0, 0.0, 1.0, 1.0],
+                                   [0.5, 0.2, 0.1, 0.1, 0.0]])
+        np.testing.assert_allclose(RedNeuronal.equidad(probabilidades), [1.0, -3.0, 0.2])
+
+    def test_guardar_y_cargar(self):
+        """Test que una red guardada se recupera con los mismos pesos."""
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "red.npz")
+            self.red.guardar(ruta)
+            cargada = RedNeuronal.cargar(ruta)
+        entradas = np.ones((2, 6), dtype=np.float32)
+        np.testing.assert_array_equal(cargada.propagar(entradas), self.red.propagar(entradas))
+
+    def test_fijar_parametros(self):
+        """Test que fijar parámetros copia los arreglos y valida su forma."""
+        otra = RedNeuronal(entradas=6, ocultas=4, semilla=9)
+        self.red.fijar_parametros(otra.parametros)
+        otra.parametros[1][:] = 5
+        self.assertFalse((self.red.parametros[1] == 5).any())
+        with self.assertRaises(ValueError):
+            self.red.fijar_parametros(RedNeuronal(entradas=6, ocultas=3).parametros)
+        with self.assertRaises(ValueError):
+            self.red.fijar_parametros(otra.parametros[:2])
+        with self.assertRaises(ValueError):
+            RedNeuronal(entradas=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
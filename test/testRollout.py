@@ -0,0 +1,146 @@
+"""Tests para el motor de rollouts."""
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from core.BackgammonGame import BackgammonGame
+from core.ColorFicha import ColorFicha
+from core.DiceRoller import DiceRoller
+from core.EvaluadorPips import EvaluadorPips
+from core.GnuId import GnuId
+from core.Policies import PoliticaGolosa
+from core.Rollout import Rollout, main
+
+
+class TestRollout(unittest.TestCase):
+
+    def setUp(self):
+        """Preparar una carrera corta con las blancas por tirar."""
+        self.carrera = [0] * 26
+        self.carrera[1] = 2
+        self.carrera[4] = 1
+        self.carrera[21] = -2
+        self.carrera[19] = -1
+
+    def test_primeras_tiradas(self):
+        """Test que cada bloque cubre las 36 tiradas una vez."""
+        self.assertEqual(len(set(Rollout.PRIMERAS_TIRADAS)), 36)
+        self.assertEqual(Rollout.TAMANO_BLOQUE, 36)
+
+    def test_victoria_segura(self):
+        """Test que una posición ganada con cualquier tirada vale 1 sin error."""
+        posicion = [0] * 26
+        posicion[0] = 1
+        posicion[12] = -3
+        resumen = Rollout.ejecutar(posicion, ColorFicha.BLANCA, 36, semilla=1)
+        self.assertEqual(resumen["equidad"], 1.0)
+        self.assertEqual(resumen["error_estandar"], 0.0)
+        self.assertEqual(resumen["truncadas"], 0)
+
+    def test_victoria_segura_hypergammon(self):
+        """Test que en hypergammon tres negras en la casa blanca son backgammon."""
+        posicion = [0] * 26
+        posicion[0] = 1
+        posicion[2] = -3
+        resumen = Rollout.ejecutar(posicion, ColorFicha.BLANCA, 36, semilla=1, fichas=3)
+        self.assertEqual(resumen["equidad"], 3.0)
+        game = BackgammonGame("Juan", "Maria")
+        game.start_game("hypergammon")
+        game.board.cargar_posicion(posicion)
+        self.assertEqual(Rollout.ejecutar_juego(game, pruebas=36, semilla=1)["equidad"], 3.0)
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            resumen = main(["--position", GnuId.codificar_posicion(posicion), "--trials", "2",
+                            "--seed", "1", "--variante", "hypergammon"])
+        self.assertEqual(resumen["equidad"], 3.0)
+
+    def test_variante_con_demasiadas_fichas(self):
+        """Test que no se hace el rollout de 15 fichas puntuando con 3."""
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 1, fichas=2)
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            resumen = main(["--variante", "hypergammon", "--trials", "2", "--seed", "1",
+                            "--truncate", "2"])
+        self.assertEqual(resumen["pruebas"], 2)
+        with self.assertRaises(ValueError), redirect_stdout(salida):
+            main(["--position", "4HPwATDgc/ABMA", "--variante", "hypergammon", "--trials", "2"])
+
+    def test_jugar_prueba_truncada(self):
+        """Test que una prueba truncada devuelve el valor del evaluador."""
+        politicas = {ColorFicha.BLANCA: PoliticaGolosa(1), ColorFicha.NEGRA: PoliticaGolosa(2)}
+        posicion = [0] * 26
+        posicion[20] = 2
+        posicion[3] = -2
+        resultado, _, truncada = Rollout.jugar_prueba(posicion, ColorFicha.BLANCA, (2, 1),
+                                                      DiceRoller(1), politicas, EvaluadorPips(),
+                                                      truncar=1)
+        self.assertTrue(truncada)
+        self.assertGreater(resultado, -1.0)
+        self.assertLess(resultado, 1.0)
+
+    def test_resultado_no_depende_de_los_workers(self):
+        """Test que repartir los bloques en procesos no cambia el resultado."""
+        uno = Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 72, workers=1, semilla=4)
+        dos = Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 72, workers=2, semilla=4)
+        for clave in ("equidad", "error_estandar", "equidad_sin_ajuste", "coeficiente"):
+            self.assertEqual(uno[clave], dos[clave])
+
+    def test_reduccion_de_varianza(self):
+        """Test que el ajuste por suerte mantiene la media cruda y reduce el error."""
+        resumen = Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 72, semilla=2)
+        sin_ajuste = Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 72, semilla=2,
+                                      reduccion_varianza=False)
+        self.assertEqual(resumen["equidad_sin_ajuste"], sin_ajuste["equidad"])
+        self.assertEqual(sin_ajuste["coeficiente"], 0.0)
+        self.assertLessEqual(resumen["error_estandar"], resumen["error_sin_ajuste"])
+        inferior, superior = resumen["intervalo"]
+        self.assertLessEqual(inferior, resumen["equidad"])
+        self.assertGreaterEqual(superior, resumen["equidad"])
+
+    def test_resumir_con_control_perfecto(self):
+        """Test que una suerte que explica todo el resultado anula el error."""
+        pruebas = [(0.5 + suerte, suerte, False) for suerte in (-1.0, 0.25, 0.5, 0.25)]
+        resumen = Rollout.resumir(pruebas)
+        self.assertAlmostEqual(resumen["coeficiente"], 1.0)
+        self.assertAlmostEqual(resumen["equidad"], 0.5)
+        self.assertAlmostEqual(resumen["error_estandar"], 0.0)
+
+    def test_parametros_invalidos(self):
+        """Test que se rechazan parámetros y posiciones inválidas."""
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 0)
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 1, workers=0)
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 1, politica="inexistente")
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(self.carrera, ColorFicha.BLANCA, 1, truncar=0)
+        terminada = [0] * 26
+        terminada[5] = -1
+        with self.assertRaises(ValueError):
+            Rollout.ejecutar(terminada, ColorFicha.BLANCA, 1)
+
+    @patch('core.DiceRoller.DiceRoller.roll_two_dice', return_value=(3, 1))
+    def test_ejecutar_juego(self, _mock_roll):
+        """Test que el rollout de una partida se hace antes de tirar."""
+        game = BackgammonGame("Juan", "Maria")
+        game.start_game()
+        resumen = Rollout.ejecutar_juego(game, pruebas=2, semilla=1, truncar=2)
+        self.assertEqual(resumen["pruebas"], 2)
+        game.roll_dice()
+        with self.assertRaises(RuntimeError):
+            Rollout.ejecutar_juego(game, pruebas=2)
+
+    def test_main(self):
+        """Test el rollout desde la línea de comandos."""
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            resumen = main(["--trials", "3", "--seed", "5", "--truncate", "2"])
+        self.assertEqual(resumen["pruebas"], 3)
+        self.assertEqual(resumen["truncadas"], 3)
+        self.assertIn("Equidad:", salida.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests para el simulador de partidas."""
+import unittest
+from unittest.mock import patch
+from core.BackgammonGame import BackgammonGame
+from core.Checker import Checker
+from core.ColorFicha import ColorFicha
+from core.Simulator import Simulator, main
+
+
+class TestSimulator(unittest.TestCase):
+
+    def test_jugar_partida_reproducible(self):
+        """Test que una partida depende solo de su número y la semilla."""
+        resultado = Simulator.jugar_partida(3, 42, "golosa", "aleatoria")
+        self.assertEqual(resultado, Simulator.jugar_partida(3, 42, "golosa", "aleatoria"))
+        ganador, puntos, turnos = resultado
+        self.assertIn(ganador, (ColorFicha.BLANCA, ColorFicha.NEGRA))
+        self.assertIn(puntos, (1, 2, 3))
+        self.assertGreater(turnos, 0)
+
+    def test_simular_totales(self):
+        """Test que los contadores suman la cantidad de partidas."""
+        totales = Simulator.simular(6, semilla=1, politica_blancas="aleatoria")
+        self.assertEqual(totales["partidas"], 6)
+        self.assertEqual(totales["victorias_blancas"] + totales["victorias_negras"], 6)
+        self.assertEqual(totales["semilla"], 1)
+        self.assertGreater(totales["turnos"], 0)
+
+    def test_resultado_no_depende_de_los_workers(self):
+        """Test que repartir las partidas en procesos no cambia el resultado."""
+        uno = Simulator.simular(4, workers=1, semilla=8)
+        dos = Simulator.simular(4, workers=2, semilla=8)
+        for clave in Simulator.CONTADORES:
+            self.assertEqual(uno[clave], dos[clave])
+
+    def test_simular_parametros_invalidos(self):
+        """Test que se rechazan parámetros inválidos."""
+        with self.assertRaises(ValueError):
+            Simulator.simular(0)
+        with self.assertRaises(ValueError):
+            Simulator.simular(1, workers=0)
+        with self.assertRaises(ValueError):
+            Simulator.simular(1, politica_negras="inexistente")
+
+    def test_puntos_victoria(self):
+        """Test que se distinguen victoria simple, gammon y backgammon."""
+        game = BackgammonGame("Juan", "Maria")
+        game.start_game()
+        game.board.resetear_tablero()
+        game.board.agregar_ficha(10, Checker(ColorFicha.NEGRA))
+        game.set_winner(game.current_player)
+        self.assertEqual(Simulator.puntos_victoria(game), 2)
+        game.board.agregar_ficha(3, Checker(ColorFicha.NEGRA))
+        self.assertEqual(Simulator.puntos_victoria(game), 3)
+        game.bear_off_ficha(ColorFicha.NEGRA)
+        self.assertEqual(Simulator.puntos_victoria(game), 1)
+
+    @patch('builtins.print')
+    def test_main_imprime_reporte(self, mock_print):
+        """Test la ejecución desde la línea de comandos."""
+        totales = main(["--games", "2", "--seed", "3", "--negras", "primera"])
+        self.assertEqual(totales["partidas"], 2)
+        reporte = mock_print.call_args[0][0]
+        self.assertIn("partidas/s", reporte)
+        self.assertIn("gammons", reporte)
+
+
+if __name__ == '__main__':
+    unittest.main()
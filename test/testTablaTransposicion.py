@@ -0,0 +1,103 @@
+"""Tests para la tabla de transposición."""
+import unittest
+from core.Board import Board
+from core.BoardInitializer import BoardInitializer
+from core.TablaTransposicion import TablaTransposicion
+
+
+class TestTablaTransposicion(unittest.TestCase):
+
+    def setUp(self):
+        """Crear una tabla chica para forzar colisiones."""
+        self.tabla = TablaTransposicion(limite_bytes=TablaTransposicion.BYTES_POR_ENTRADA * 8)
+
+    def test_capacidad_potencia_de_dos(self):
+        """Test que la capacidad es la mayor potencia de dos dentro del límite."""
+        self.assertEqual(self.tabla.capacidad, 8)
+        tabla = TablaTransposicion(limite_bytes=TablaTransposicion.BYTES_POR_ENTRADA * 100)
+        self.assertEqual(tabla.capacidad, 64)
+        with self.assertRaises(ValueError):
+            TablaTransposicion(limite_bytes=10)
+
+    def test_guardar_y_buscar(self):
+        """Test guardar una entrada y recuperarla con sus estadísticas."""
+        self.assertIsNone(self.tabla.buscar(42))
+        self.tabla.guardar(42, 3, 0.25, TablaTransposicion.INFERIOR)
+        self.assertEqual(self.tabla.buscar(42), (0.25, 3, TablaTransposicion.INFERIOR))
+        estadisticas = self.tabla.estadisticas()
+        self.assertEqual(estadisticas["consultas"], 2)
+        self.assertEqual(estadisticas["aciertos"], 1)
+        self.assertEqual(estadisticas["fallos"], 1)
+        self.assertEqual(estadisticas["tasa_aciertos"], 0.5)
+        self.assertEqual(estadisticas["ocupadas"], 1)
+
+    def test_clave_cero(self):
+        """Test que la clave 0 (tablero vacío sin dados) se puede guardar."""
+        self.tabla.guardar(0, 1, -1.0)
+        self.assertEqual(self.tabla.buscar(0), (-1.0, 1, TablaTransposicion.EXACTA))
+
+    def test_misma_clave_conserva_la_mas_profunda(self):
+        """Test que una entrada superficial no pisa una más profunda de la misma búsqueda."""
+        self.tabla.guardar(5, 3, 1.0)
+        self.tabla.guardar(5, 1, 2.0)
+        self.assertEqual(self.tabla.buscar(5)[0], 1.0)
+        self.tabla.nueva_generacion()
+        self.tabla.guardar(5, 1, 2.0)
+        self.assertEqual(self.tabla.buscar(5)[0], 2.0)
+
+    def test_reemplazo_por_profundidad(self):
+        """Test que con el cubo lleno se reemplaza la entrada menos profunda."""
+        self.tabla.guardar(0, 5, 0.5)
+        self.tabla.guardar(8, 1, 0.1)
+        self.tabla.guardar(16, 3, 0.3)
+        self.assertIsNotNone(self.tabla.buscar(0))
+        self.assertIsNone(self.tabla.buscar(8))
+        self.assertIsNotNone(self.tabla.buscar(16))
+        self.assertEqual(self.tabla.estadisticas()["reemplazos"], 1)
+
+    def test_reemplazo_por_edad(self):
+        """Test que las entradas de búsquedas viejas ceden su lugar."""
+        self.tabla.guardar(0, 5, 0.5)
+        for _ in range(3):
+            self.tabla.nueva_generacion()
+        self.tabla.guardar(8, 2, 0.2)
+        self.tabla.guardar(16, 1, 0.1)
+        self.assertIsNone(self.tabla.buscar(0))
+        self.assertIsNotNone(self.tabla.buscar(8))
+        self.assertIsNotNone(self.tabla.buscar(16))
+
+    def test_parametros_invalidos(self):
+        """Test que se rechazan tipos y profundidades inválidas."""
+        with self.assertRaises(ValueError):
+            self.tabla.guardar(1, 1, 0.0, TablaTransposicion.VACIA)
+        with self.assertRaises(ValueError):
+            self.tabla.guardar(1, 200, 0.0)
+
+    def test_limpiar(self):
+        """Test que limpiar vacía la tabla y las estadísticas."""
+        self.tabla.guardar(3, 1, 0.0)
+        self.tabla.buscar(3)
+        self.tabla.limpiar()
+        self.assertIsNone(self.tabla.buscar(3))
+        self.assertEqual(self.tabla.estadisticas()["ocupadas"], 0)
+        self.assertEqual(self.tabla.estadisticas()["consultas"], 1)
+
+    def test_claves(self):
+        """Test que la clave distingue turno y dados y coincide con la del tablero."""
+        board = Board()
+        BoardInitializer.inicializar_estandar(board)
+        posicion = board.posicion
+        clave = TablaTransposicion.clave(posicion, False)
+        self.assertEqual(clave, board.hash_posicion)
+        self.assertNotEqual(clave, TablaTransposicion.clave(posicion, True))
+        self.assertEqual(TablaTransposicion.clave(posicion, False, (3, 1)),
+                         TablaTransposicion.clave(posicion, False, (1, 3)))
+        self.assertNotEqual(TablaTransposicion.clave(posicion, False, (3, 1)), clave)
+        self.assertNotEqual(TablaTransposicion.clave(posicion, False, (2, 2, 2)),
+                            TablaTransposicion.clave(posicion, False, (2, 2, 2, 2)))
+        self.assertEqual(TablaTransposicion.clave_board(board, (6, 5)),
+                         TablaTransposicion.clave(posicion, False, (6, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()